@@ -24,6 +24,9 @@ class EpisodeGenerator:
             'Authorization': f'token {token}',
             'Accept': 'application/vnd.github.v3+json'
         }
+        # One keep-alive connection for every request of the run
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
     
     def fetch_recent_activity(self, hours=2):
         """Fetch issues and PRs updated in the last N hours"""
@@ -41,9 +44,7 @@ class EpisodeGenerator:
         }
         
         try:
-            response = requests.get(issues_url, headers=self.headers, params=issues_params, timeout=30)
-            response.raise_for_status()
-            all_items = response.json()
+            all_items = list(self._paginate(issues_url, issues_params))
         except Exception as e:
             print(f"Error fetching activity: {e}")
             return [], []
@@ -57,7 +58,7 @@ class EpisodeGenerator:
         for pr in prs[:20]:  # Limit to 20 PRs to avoid rate limits
             pr_url = f"{self.api_base}/repos/{self.owner}/{self.repo_name}/pulls/{pr['number']}"
             try:
-                pr_response = requests.get(pr_url, headers=self.headers, timeout=30)
+                pr_response = self.session.get(pr_url, timeout=30)
                 pr_response.raise_for_status()
                 detailed_prs.append(pr_response.json())
             except Exception as e:
@@ -67,6 +68,15 @@ class EpisodeGenerator:
         print(f"Found {len(issues)} issues and {len(detailed_prs)} PRs")
         return issues, detailed_prs
     
+    def _paginate(self, url, params=None):
+        """Yield the items of every page, following the Link header's next URL"""
+        while url:
+            response = self.session.get(url, params=params, timeout=30)
+            response.raise_for_status()
+            yield from response.json()
+            # The next URL already carries the query parameters
+            url, params = response.links.get('next', {}).get('url'), None
+    
     def generate_episode(self, issues, prs):
         """Generate an episode JSON from issues and PRs"""
         
@@ -14,19 +14,26 @@ sys.path.insert(0, WORLD_DIR)
 
 from world_state_manager import (
     load_world_state, save_world_state, get_agent_by_id,
-    get_all_agents, increment_tick
+    get_all_agents, get_all_regions, increment_tick
 )
 from knowledge_manager import load_knowledge, get_all_ideas
 from agent_navigator import (
     move_agent_one_step, assign_idea_to_agent,
     select_next_idea_for_agent, get_agent_status_summary
 )
+from spatial_index import RegionIndex
 
 
-def update_single_agent(agent: dict, ideas: list) -> dict:
+def update_single_agent(agent: dict, ideas: list, regions: RegionIndex = None) -> dict:
     """
     Update a single agent's state.
     
+    Args:
+        agent: Agent dict to update
+        ideas: Available ideas
+        regions: Optional index of world regions, built once per tick,
+            used to plan new paths from the agent's location
+    
     Returns:
         Dict with update status and details
     """
@@ -38,7 +45,7 @@ def update_single_agent(agent: dict, ideas: list) -> dict:
         if ideas:
             selected_idea = select_next_idea_for_agent(agent, ideas, strategy='random')
             if selected_idea:
-                assign_idea_to_agent(agent, selected_idea)
+                assign_idea_to_agent(agent, selected_idea, regions)
                 return {
                     'agent_id': agent_id,
                     'action': 'assigned_idea',
@@ -104,12 +111,13 @@ def update_all_agents() -> dict:
     
     updates = []
     agents = get_all_agents(world_state)
+    regions = RegionIndex(get_all_regions(world_state))
     
     for agent in agents:
         print(f"\n📍 Updating agent: {agent.get('id')}")
         print(f"   Before: {get_agent_status_summary(agent)}")
         
-        update_result = update_single_agent(agent, ideas)
+        update_result = update_single_agent(agent, ideas, regions)
         updates.append(update_result)
         
         print(f"   Action: {update_result.get('action')}")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for batch agent matching.
+
+Validates that the keyword automaton and shared pattern scoring give the
+same scores as the per-agent path, and that --batch assignments equal the
+single-issue results for the same seed.
+"""
+
+import json
+import random
+import re
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+SCRIPT = REPO_ROOT / "tools" / "match-issue-to-agent.py"
+
+# Import the module by loading it directly
+import importlib.util
+spec = importlib.util.spec_from_file_location("match_issue_to_agent", SCRIPT)
+match_issue_to_agent = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(match_issue_to_agent)
+
+
+ISSUES = [
+    {"number": 1, "title": "Fix crash in login module", "body": "Users experiencing crashes when logging in"},
+    {"number": 2, "title": "Slow page load", "body": "Dashboard takes 10 seconds to load"},
+    {"number": 3, "title": "Update README", "body": "The installation guide needs improvement"},
+    {"number": 4, "title": "Improve test coverage", "body": "Add unit tests for auth module"},
+    {"number": 5, "title": "Zzz qqq", "body": ""},
+]
+
+
+class TestBatchScoring(unittest.TestCase):
+    """Test the shared scoring path against the per-agent reference."""
+
+    def test_scores_match_per_agent_path(self):
+        """Combined scoring must equal calculate_match_score for every agent."""
+        agents = list(match_issue_to_agent.AGENT_PATTERNS)
+        vocabulary = [
+            keyword
+            for patterns in match_issue_to_agent.AGENT_PATTERNS.values()
+            for keyword in patterns['keywords']
+        ] + ["the", "ci/cd", "docs/index.html", ".github/agents", "notes.md", "ſlow"]
+
+        rng = random.Random(7)
+        for _ in range(200):
+            text = " ".join(rng.choices(vocabulary, k=rng.randint(0, 25)))
+            scores = match_issue_to_agent.calculate_match_scores(text, agents)
+            for agent in agents:
+                self.assertEqual(
+                    scores[agent],
+                    match_issue_to_agent.calculate_match_score(text, agent),
+                    f"{agent} differs for {text!r}"
+                )
+
+    def test_find_keywords_reports_overlaps(self):
+        """Keywords that overlap or prefix each other are all found."""
+        found = match_issue_to_agent.find_keywords("testing the api endpoints")
+        for keyword in ("test", "testing", "api", "endpoint", "endpoints"):
+            self.assertIn(keyword, found)
+        self.assertNotIn("apis", found)
+
+    def test_required_literal(self):
+        """Prefilter literals are only taken where every match needs them."""
+        required_literal = match_issue_to_agent._required_literal
+        self.assertEqual(required_literal(r'\bgithub\s*pages\b'), 'github')
+        self.assertEqual(required_literal(r'docs/.*\.html'), 'docs/')
+        self.assertEqual(required_literal(r'\bpages?\b'), 'page')
+        self.assertEqual(required_literal(r'\b(test|spec)s?\b'), None)
+        self.assertEqual(required_literal(r'(?:api|rest)docs'), None)
+        # A top-level alternative can match without the leading literal
+        for pattern in (r'docs|readme', r'\bfoo(bar)|baz', r'a[|]b|c'):
+            self.assertIsNone(required_literal(pattern), pattern)
+            match = re.search(pattern, 'baz readme c', re.IGNORECASE)
+            self.assertIsNotNone(match, pattern)
+        self.assertEqual(required_literal(r'a[|]b(c|d)'), 'a')
+
+
+class TestBatchCli(unittest.TestCase):
+    """Test the --batch command-line mode."""
+
+    def _run(self, args, stdin=None):
+        return subprocess.run(
+            [sys.executable, str(SCRIPT)] + args,
+            input=stdin,
+            capture_output=True,
+            text=True,
+            cwd=REPO_ROOT,
+            timeout=60
+        )
+
+    def test_batch_matches_single_issue_path(self):
+        """Batch output equals single-issue output for the same seed."""
+        stdin = "".join(json.dumps(issue) + "\n" for issue in ISSUES)
+        result = self._run(["--batch", "--seed", "42"], stdin=stdin)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        assignments = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertEqual(len(assignments), len(ISSUES))
+
+        for issue, assignment in zip(ISSUES, assignments):
+            single = self._run(["--seed", "42", issue["title"], issue["body"]])
+            self.assertEqual(single.returncode, 0, single.stderr)
+            expected = json.loads(single.stdout)
+
+            self.assertEqual(assignment.pop("number"), issue["number"])
+            self.assertEqual(assignment, expected)
+
+    def test_batch_reports_invalid_lines(self):
+        """Invalid lines produce an error record and a non-zero exit."""
+        stdin = 'not json\n{"title": "Add API docs"}\n'
+        result = self._run(["--batch"], stdin=stdin)
+        self.assertEqual(result.returncode, 1)
+
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["line"], 1)
+        self.assertIn("error", records[0])
+        self.assertIn("agent", records[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
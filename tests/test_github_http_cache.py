@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for the GitHub HTTP response cache.
+
+Checks LRU eviction and keying on their own, and revalidation through
+GitHubAPIClient against a local stub that answers conditional requests
+with 304 Not Modified.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add tools directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tools'))
+
+from github_http_cache import HTTPResponseCache
+from github_integration import GitHubAPIClient, RetryConfig
+
+AUTH = {'Authorization': 'token a', 'Accept': 'application/json'}
+
+
+class StubGitHub(BaseHTTPRequestHandler):
+    """Paginated /items with ETags; /plain has no validators"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    version = 'v1'
+    statuses = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        page = int(query.split('=')[1]) if query.startswith('page=') else 1
+        etag = f'"{path}-{page}-{self.version}"'
+        if path == '/items' and self.headers.get('If-None-Match') == etag:
+            StubGitHub.statuses.append(304)
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        StubGitHub.statuses.append(200)
+        body = json.dumps([f'{self.version}-{page}-{i}' for i in range(2)]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if path == '/items':
+            self.send_header('ETag', etag)
+            if page < 2:
+                self.send_header('Link', f'<http://127.0.0.1:{self.server.server_address[1]}/items?page=2>; rel="next"')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestHTTPResponseCache(unittest.TestCase):
+    """Test storage, keying and eviction"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = HTTPResponseCache(os.path.join(self.temp_dir.name, 'cache.sqlite'), max_bytes=100)
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_needs_validator(self):
+        self.assertFalse(self.cache.store('u', AUTH, {'Content-Type': 'application/json'}, b'[]'))
+        self.assertTrue(self.cache.store('u', AUTH, {'Last-Modified': 'Mon'}, b'[]'))
+        cached = self.cache.lookup('u', AUTH)
+        self.assertEqual(cached.conditional_headers(), {'If-Modified-Since': 'Mon'})
+        self.assertEqual(self.cache.replay(cached), b'[]')
+
+    def test_keyed_by_scope_not_token(self):
+        self.cache.store('u', AUTH, {'ETag': '"1"'}, b'[1]')
+        self.assertIsNotNone(self.cache.lookup('u', {'authorization': 'token a', 'accept': 'application/json'}))
+        self.assertIsNotNone(self.cache.lookup('u', dict(AUTH, Authorization='token b')))
+        self.assertIsNone(self.cache.lookup('u', dict(AUTH, Accept='application/vnd.github.raw')))
+        self.assertIsNone(self.cache.lookup('u?page=2', AUTH))
+
+        other = HTTPResponseCache(self.cache.path, scope='other/repo')
+        self.assertIsNone(other.lookup('u', AUTH))
+        other.close()
+
+    def test_lru_eviction(self):
+        for name in 'abc':
+            self.cache.store(name, AUTH, {'ETag': name}, b'x' * 40)
+        # Storing c evicts a, the least recently used; reading b keeps it over c
+        self.assertIsNone(self.cache.lookup('a', AUTH))
+        self.cache.replay(self.cache.lookup('b', AUTH))
+        self.cache.store('d', AUTH, {'ETag': 'd'}, b'x' * 40)
+        self.assertIsNotNone(self.cache.lookup('b', AUTH))
+        self.assertIsNone(self.cache.lookup('c', AUTH))
+        self.assertFalse(self.cache.store('big', AUTH, {'ETag': 'big'}, b'x' * 101))
+
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['entries'], stats['total_bytes'], stats['evictions']), (2, 80, 2))
+
+
+class TestClientRevalidation(unittest.TestCase):
+    """Test conditional requests through GitHubAPIClient"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubGitHub)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubGitHub.version = 'v1'
+        StubGitHub.statuses = []
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, 'cache.sqlite')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_client(self, cache, token='test_token'):
+        return GitHubAPIClient(
+            token=token,
+            base_url=f'http://127.0.0.1:{self.server.server_address[1]}',
+            retry_config=RetryConfig(max_attempts=1),
+            cache=cache
+        )
+
+    def test_replays_not_modified(self):
+        cache = HTTPResponseCache(self.cache_path)
+        client = self.make_client(cache)
+        first = client.get('/items')
+        self.assertEqual(client.get('/items'), first)
+        self.assertEqual(client.get('/plain'), client.get('/plain'))
+        self.assertEqual(StubGitHub.statuses, [200, 304, 200, 200])
+
+        stats = cache.get_stats()
+        self.assertEqual((stats['lookups'], stats['hits'], stats['not_modified']), (4, 1, 1))
+        self.assertEqual(stats['bytes_saved'], len(json.dumps(first)))
+
+        # A changed resource is downloaded and stored again
+        StubGitHub.version = 'v2'
+        self.assertEqual(client.get('/items'), ['v2-1-0', 'v2-1-1'])
+        self.assertEqual(client.get('/items'), ['v2-1-0', 'v2-1-1'])
+        self.assertEqual(StubGitHub.statuses[-2:], [200, 304])
+        client.close()
+        cache.close()
+
+    def test_persists_between_runs_and_pages(self):
+        for _ in range(2):
+            cache = HTTPResponseCache(self.cache_path)
+            client = self.make_client(cache)
+            self.assertEqual(list(client.paginate('/items')), ['v1-1-0', 'v1-1-1', 'v1-2-0', 'v1-2-1'])
+            client.close()
+            cache.close()
+        # The second run followed the stored Link header through 304s
+        self.assertEqual(StubGitHub.statuses, [200, 200, 304, 304])
+
+    def test_new_token_each_run(self):
+        # Like GITHUB_TOKEN in Actions, each run authenticates differently
+        for run in range(2):
+            cache = HTTPResponseCache(self.cache_path, scope='owner/repo')
+            client = self.make_client(cache, token=f'run-{run}-token')
+            self.assertEqual(client.get('/items'), ['v1-1-0', 'v1-1-1'])
+            client.close()
+            cache.close()
+        self.assertEqual(StubGitHub.statuses, [200, 304])
+
+    def test_cache_from_environment(self):
+        os.environ['GITHUB_API_CACHE'] = self.cache_path
+        os.environ['GITHUB_API_CACHE_SCOPE'] = 'owner/repo'
+        try:
+            client = self.make_client(None)
+        finally:
+            del os.environ['GITHUB_API_CACHE']
+            del os.environ['GITHUB_API_CACHE_SCOPE']
+        client.get('/items')
+        client.get('/items')
+        self.assertEqual(client.cache.scope, 'owner/repo')
+        self.assertEqual(client.cache.get_stats()['not_modified'], 1)
+        client.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,9 +9,12 @@ import unittest
 import json
 import time
 from unittest.mock import Mock, patch, MagicMock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
 import urllib.error
 import sys
 import os
+import threading
 
 # Add tools directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'tools'))
@@ -213,7 +216,7 @@ class TestGitHubAPIClient(unittest.TestCase):
         self.assertIn('X-Custom', headers)
         self.assertEqual(headers['X-Custom'], 'value')
     
-    @patch('urllib.request.urlopen')
+    @patch('urllib.request.OpenerDirector.open')
     def test_successful_get_request(self, mock_urlopen):
         """Test successful GET request"""
         # Mock response
@@ -227,7 +230,7 @@ class TestGitHubAPIClient(unittest.TestCase):
         self.assertEqual(result, {'key': 'value'})
         mock_urlopen.assert_called_once()
     
-    @patch('urllib.request.urlopen')
+    @patch('urllib.request.OpenerDirector.open')
     def test_get_request_with_params(self, mock_urlopen):
         """Test GET request with query parameters"""
         mock_response = MagicMock()
@@ -243,7 +246,7 @@ class TestGitHubAPIClient(unittest.TestCase):
         self.assertIn('state=open', request.full_url)
         self.assertIn('per_page=10', request.full_url)
     
-    @patch('urllib.request.urlopen')
+    @patch('urllib.request.OpenerDirector.open')
     def test_post_request(self, mock_urlopen):
         """Test POST request"""
         mock_response = MagicMock()
@@ -260,7 +263,7 @@ class TestGitHubAPIClient(unittest.TestCase):
         request = call_args[0][0]
         self.assertEqual(request.method, 'POST')
     
-    @patch('urllib.request.urlopen')
+    @patch('urllib.request.OpenerDirector.open')
     def test_http_error_handling(self, mock_urlopen):
         """Test HTTP error handling"""
         # Mock error response
@@ -288,7 +291,7 @@ class TestGitHubAPIClient(unittest.TestCase):
         self.assertEqual(error.status_code, 404)
         self.assertTrue(error.is_not_found)
     
-    @patch('urllib.request.urlopen')
+    @patch('urllib.request.OpenerDirector.open')
     def test_rate_limit_warning(self, mock_urlopen):
         """Test rate limit warning"""
         mock_response = MagicMock()
@@ -301,7 +304,7 @@ class TestGitHubAPIClient(unittest.TestCase):
             result = self.client.get('/test')
             self.assertEqual(result, {'data': 'test'})
     
-    @patch('urllib.request.urlopen')
+    @patch('urllib.request.OpenerDirector.open')
     def test_graphql_query(self, mock_urlopen):
         """Test GraphQL query"""
         mock_response = MagicMock()
@@ -316,7 +319,7 @@ class TestGitHubAPIClient(unittest.TestCase):
         
         self.assertEqual(result, {'repository': {'name': 'test'}})
     
-    @patch('urllib.request.urlopen')
+    @patch('urllib.request.OpenerDirector.open')
     def test_graphql_error_handling(self, mock_urlopen):
         """Test GraphQL error handling"""
         mock_response = MagicMock()
@@ -362,6 +365,113 @@ class TestValidateResponse(unittest.TestCase):
         self.assertIn('Expected dict', str(context.exception))
 
 
+class StubGitHub(BaseHTTPRequestHandler):
+    """Keep-alive stub serving a paginated /items endpoint"""
+    
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    connections = 0
+    requests = 0
+    # Close the connection after the next response without saying so
+    drop_next = False
+    
+    def setup(self):
+        super().setup()
+        StubGitHub.connections += 1
+    
+    def log_message(self, *args):
+        pass
+    
+    def do_GET(self):
+        StubGitHub.requests += 1
+        path, _, query = self.path.partition('?')
+        if path != '/items':
+            return self._send(404, {'message': 'Not Found'})
+        page = int(dict(p.split('=') for p in query.split('&') if p).get('page', 1))
+        headers = {}
+        if page < 3:
+            base = f'http://127.0.0.1:{self.server.server_address[1]}'
+            headers['Link'] = f'<{base}/items?page={page + 1}>; rel="next", <{base}/items?page=3>; rel="last"'
+        self._send(200, [page * 10 + i for i in range(2)], headers)
+    
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        if StubGitHub.drop_next:
+            StubGitHub.drop_next = False
+            self.close_connection = True
+
+
+class TestConnectionPooling(unittest.TestCase):
+    """Test keep-alive connections and pagination against a local stub"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubGitHub)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        StubGitHub.connections = 0
+        StubGitHub.requests = 0
+        self.client = self.make_client()
+    
+    def tearDown(self):
+        self.client.close()
+    
+    def make_client(self, **kwargs):
+        return GitHubAPIClient(
+            token="test_token",
+            base_url=f'http://127.0.0.1:{self.server.server_address[1]}',
+            retry_config=RetryConfig(max_attempts=1),
+            **kwargs
+        )
+    
+    def test_connection_reused(self):
+        """Requests and errors share one connection"""
+        for _ in range(5):
+            self.assertEqual(self.client.get('/items'), [10, 11])
+        with self.assertRaises(GitHubAPIException) as context:
+            self.client.get('/missing')
+        self.assertTrue(context.exception.error.is_not_found)
+        self.assertEqual(self.client.get('/items', params={'page': 2}), [20, 21])
+        self.assertEqual((StubGitHub.requests, StubGitHub.connections), (7, 1))
+    
+    def test_without_pool(self):
+        """pool_size=0 opens a connection per request"""
+        client = self.make_client(pool_size=0)
+        for _ in range(3):
+            client.get('/items')
+        self.assertEqual(StubGitHub.connections, 3)
+    
+    def test_stale_connection_retried(self):
+        """A pooled connection closed by the server is replaced transparently"""
+        StubGitHub.drop_next = True
+        self.client.get('/items')
+        self.assertEqual(self.client.get('/items'), [10, 11])
+        self.assertEqual((StubGitHub.requests, StubGitHub.connections), (2, 2))
+    
+    def test_paginate_follows_links(self):
+        """Pagination yields every page's items, in order"""
+        self.assertEqual(list(self.client.paginate('/items', {'per_page': 2})), [10, 11, 20, 21, 30, 31])
+        self.assertEqual(StubGitHub.connections, 1)
+    
+    def test_paginate_is_lazy(self):
+        """Pages after the last item taken are never requested"""
+        self.assertEqual(list(islice(self.client.paginate('/items'), 3)), [10, 11, 20])
+        self.assertEqual(StubGitHub.requests, 2)
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests (require network access)"""
     
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Tests for knowledge graph analytics.
+
+Checks PageRank against a dense power iteration, sampled betweenness
+against an exhaustive shortest-path count on graphs small enough to be
+exact, label propagation on graphs with obvious communities, and that the
+compiled graph stores the results and KnowledgeGraphQuery exposes them.
+"""
+
+import json
+import random
+import sys
+import tempfile
+import unittest
+from itertools import permutations
+from pathlib import Path
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from knowledge_graph_analytics import (
+    analyze,
+    betweenness,
+    label_propagation,
+    pagerank,
+    symmetrize,
+    transpose,
+)
+from knowledge_graph_store import CompiledGraph
+from knowledge_graph_query import KnowledgeGraphQuery
+
+
+def csr(n, edges):
+    rows = [[] for _ in range(n)]
+    for source, target in edges:
+        rows[source].append(target)
+    ptr = [0]
+    nbr = []
+    for row in rows:
+        nbr += row
+        ptr.append(len(nbr))
+    return ptr, nbr
+
+
+def random_edges(n, m, seed):
+    rng = random.Random(seed)
+    return [(rng.randrange(n), rng.randrange(n)) for _ in range(m)]
+
+
+def reference_pagerank(n, edges, damping=0.85, iterations=200):
+    out = [[] for _ in range(n)]
+    for source, target in edges:
+        out[source].append(target)
+    rank = [1.0 / n] * n
+    for _ in range(iterations):
+        new = [(1.0 - damping) / n] * n
+        for v in range(n):
+            if out[v]:
+                for w in out[v]:
+                    new[w] += damping * rank[v] / len(out[v])
+            else:
+                for w in range(n):
+                    new[w] += damping * rank[v] / n
+        rank = new
+    return rank
+
+
+def reference_betweenness(n, edges):
+    """Betweenness by enumerating all shortest paths (Floyd-Warshall counts)."""
+    inf = float('inf')
+    adjacency = {(s, t) for s, t in edges if s != t}
+    dist = [[0 if i == j else (1 if (i, j) in adjacency else inf) for j in range(n)] for i in range(n)]
+    for k in range(n):
+        for i in range(n):
+            for j in range(n):
+                if dist[i][k] + dist[k][j] < dist[i][j]:
+                    dist[i][j] = dist[i][k] + dist[k][j]
+    paths = [[0] * n for _ in range(n)]
+    for s in range(n):
+        paths[s][s] = 1
+        for t in sorted(range(n), key=lambda t: dist[s][t]):
+            if t != s and dist[s][t] < inf:
+                paths[s][t] = sum(paths[s][u] for u in range(n)
+                                  if (u, t) in adjacency and dist[s][u] + 1 == dist[s][t])
+
+    touched = {v for edge in adjacency for v in edge}
+    scores = [0.0] * n
+    for s, t in permutations(range(n), 2):
+        if dist[s][t] == inf:
+            continue
+        for v in range(n):
+            if v not in (s, t) and dist[s][v] + dist[v][t] == dist[s][t]:
+                scores[v] += paths[s][v] * paths[v][t] / paths[s][t]
+    a = len(touched)
+    return [score / ((a - 1) * (a - 2)) for score in scores]
+
+
+class TestAnalytics(unittest.TestCase):
+    """Test the CSR graph algorithms"""
+
+    def test_transpose_and_symmetrize(self):
+        edges = random_edges(20, 50, seed=1)
+        ptr, nbr = csr(20, edges)
+        t_ptr, t_nbr, _ = transpose(20, ptr, nbr)
+        self.assertEqual(
+            sorted((t_nbr[i], v) for v in range(20) for i in range(t_ptr[v], t_ptr[v + 1])),
+            sorted(edges)
+        )
+        s_ptr, s_nbr, _ = symmetrize(20, ptr, nbr)
+        self.assertEqual(len(s_nbr), 2 * len(edges))
+
+    def test_pagerank_matches_dense_iteration(self):
+        for seed in range(3):
+            edges = random_edges(25, 60, seed)
+            ranks, iterations = pagerank(25, *csr(25, edges))
+            expected = reference_pagerank(25, edges)
+            self.assertLess(iterations, 100)
+            self.assertAlmostEqual(sum(ranks), 1.0)
+            for got, want in zip(ranks, expected):
+                self.assertAlmostEqual(got, want, places=6)
+
+    def test_pagerank_weights(self):
+        # Node 0 links to 1 with ten times the weight of its link to 2
+        ptr, nbr = csr(3, [(0, 1), (0, 2)])
+        ranks, _ = pagerank(3, ptr, nbr, [10.0, 1.0])
+        self.assertGreater(ranks[1], ranks[2])
+
+    def test_betweenness_exact_for_small_graphs(self):
+        for seed in range(3):
+            edges = random_edges(15, 35, seed)
+            scores, sources = betweenness(15, *csr(15, edges), samples=64)
+            expected = reference_betweenness(15, edges)
+            self.assertGreater(sources, 0)
+            for got, want in zip(scores, expected):
+                self.assertAlmostEqual(got, want)
+
+    def test_betweenness_sampled(self):
+        # A chain through node 0 from every other node: 0 is the only bridge
+        n = 200
+        edges = [(v, 0) for v in range(1, 100)] + [(0, v) for v in range(100, n)]
+        scores, sources = betweenness(n, *csr(n, edges), samples=16)
+        self.assertEqual(sources, 16)
+        self.assertEqual(max(range(n), key=scores.__getitem__), 0)
+        self.assertTrue(all(score == 0 for score in scores[1:]))
+
+    def test_label_propagation_finds_cliques(self):
+        # Two 5-cliques joined by a single edge, plus an isolated node
+        edges = [(a, b) for group in (range(5), range(5, 10)) for a in group for b in group if a < b]
+        edges.append((4, 5))
+        ptr, nbr, _ = symmetrize(11, *csr(11, edges))
+        community, count = label_propagation(11, ptr, nbr)
+        self.assertEqual(count, 3)
+        self.assertEqual(len(set(community[:5])), 1)
+        self.assertEqual(len(set(community[5:10])), 1)
+        self.assertNotEqual(community[0], community[9])
+        self.assertEqual(community[10], 2)
+
+    def test_analyze_is_deterministic(self):
+        ptr, nbr = csr(40, random_edges(40, 120, seed=7))
+        first = analyze(40, ptr, nbr, directed=False)
+        second = analyze(40, ptr, nbr, directed=False)
+        self.assertEqual(first, second)
+        self.assertFalse(first['info']['directed'])
+
+
+GRAPH = {
+    'nodes': [
+        {'id': 'core.py', 'type': 'code_file', 'label': 'core.py'},
+        {'id': 'bridge.py', 'type': 'code_file', 'label': 'bridge.py'},
+        {'id': 'a.py', 'type': 'code_file', 'label': 'a.py'},
+        {'id': 'b.py', 'type': 'code_file', 'label': 'b.py'},
+        {'id': 'c.py', 'type': 'code_file', 'label': 'c.py'},
+        {'id': 'test_a.py', 'type': 'test_file', 'label': 'test_a.py'},
+    ],
+    'relationships': [
+        {'source': 'a.py', 'target': 'bridge.py', 'type': 'imports', 'weight': 1},
+        {'source': 'b.py', 'target': 'bridge.py', 'type': 'imports', 'weight': 1},
+        {'source': 'c.py', 'target': 'bridge.py', 'type': 'imports', 'weight': 1},
+        {'source': 'bridge.py', 'target': 'core.py', 'type': 'imports', 'weight': 1},
+        {'source': 'test_a.py', 'target': 'a.py', 'type': 'imports', 'weight': 1},
+        {'source': 'a.py', 'target': 'b.py', 'type': 'changes_with', 'weight': 4},
+        {'source': 'b.py', 'target': 'c.py', 'type': 'changes_with', 'weight': 1},
+    ],
+}
+
+
+class TestStoredAnalytics(unittest.TestCase):
+    """Test analytics stored in the compiled graph and the query methods"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        path = Path(self.temp_dir.name) / 'graph.json'
+        path.write_text(json.dumps(GRAPH))
+        self.kgq = KnowledgeGraphQuery(str(path))
+
+    def tearDown(self):
+        self.kgq.store.close()
+        self.temp_dir.cleanup()
+
+    def test_metrics_stored(self):
+        store = self.kgq.store
+        self.assertEqual(len(store.metric('pagerank')), store.node_count)
+        self.assertIsNotNone(store.metric('community', 'changes_with'))
+        self.assertIsNone(store.metric('pagerank', 'tests'))
+        self.assertIn('imports', store.header['analytics'])
+        with self.assertRaises(KeyError):
+            store.metric('closeness')
+
+    def test_matches_in_memory_graph(self):
+        compiled = CompiledGraph.from_graph(GRAPH)
+        for name in ('pagerank', 'betweenness', 'community'):
+            self.assertEqual(list(compiled.metric(name)), list(self.kgq.store.metric(name)))
+
+    def test_central_and_bottleneck_files(self):
+        central = self.kgq.find_central_files(top_n=2)
+        self.assertEqual([r['file'] for r in central], ['core.py', 'bridge.py'])
+        bottlenecks = self.kgq.find_bottleneck_files()
+        self.assertEqual(bottlenecks[0]['file'], 'bridge.py')
+
+    def test_communities(self):
+        communities = self.kgq.find_communities('changes_with')
+        self.assertEqual(len(communities), 1)
+        self.assertEqual(communities[0]['files'], ['a.py', 'b.py', 'c.py'])
+        self.assertEqual(communities[0]['central_file'], 'b.py')
+
+    def test_graph_metrics_and_query(self):
+        metrics = self.kgq.graph_metrics('b.py')
+        self.assertIn('a.py', metrics['changes_with']['community_peers'])
+        self.assertEqual(self.kgq.query('Show the community of b.py'), metrics)
+        self.assertEqual(self.kgq.query('Which files are bottlenecks?'), self.kgq.find_bottleneck_files())
+        self.assertIn('error', self.kgq.graph_metrics('missing.py'))
+
+
+if __name__ == '__main__':
+    unittest.main()
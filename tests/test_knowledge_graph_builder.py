@@ -5,16 +5,18 @@ Tests for Knowledge Graph Builder
 
 import json
 import os
+import shutil
+import subprocess
 import sys
 import tempfile
 import unittest
 from pathlib import Path
 
 # Add tools directory to path
-sys.path.insert(0, str(Path(__file__).parent / 'tools'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
 
 from knowledge_graph_builder import (
-    CodeAnalyzer, GitAnalyzer, TestCoverageAnalyzer, KnowledgeGraphBuilder
+    CodeAnalyzer, GitAnalyzer, GitHistoryIndex, TestCoverageAnalyzer, KnowledgeGraphBuilder
 )
 
 
@@ -128,6 +130,112 @@ class TestGitAnalyzer(unittest.TestCase):
         )
 
 
+class TestGitHistoryIndex(unittest.TestCase):
+    """Test the single-pass git history index"""
+    
+    def setUp(self):
+        """Create a throwaway repository"""
+        self.test_dir = tempfile.mkdtemp()
+        self.repo = Path(self.test_dir) / 'repo'
+        self.repo.mkdir()
+        self.index_path = Path(self.test_dir) / 'history-index.json'
+        self._git('init', '-q')
+        self._git('config', 'user.name', 'Test User')
+        self._git('config', 'user.email', 'test@example.com')
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def _git(self, *args):
+        return subprocess.run(
+            ['git', '-C', str(self.repo)] + list(args),
+            check=True, capture_output=True, text=True
+        ).stdout
+    
+    def _commit(self, message, files):
+        for name, content in files.items():
+            (self.repo / name).write_text(content)
+        self._git('add', '-A')
+        self._git('commit', '-q', '-m', message)
+    
+    def test_file_history_matches_git_log(self):
+        """Per-file history equals git log for the file"""
+        self._commit('Add a and b', {'a.py': '1', 'b.py': '1'})
+        self._commit('Change a', {'a.py': '2'})
+        self._commit('Change a and c', {'a.py': '3', 'c.md': '1'})
+        
+        analyzer = GitAnalyzer(str(self.repo))
+        for filepath in ('a.py', 'b.py', 'c.md'):
+            expected = self._git('log', '--format=%H', '--', filepath).split()
+            history = analyzer.get_file_history(filepath)
+            self.assertEqual([c['hash'] for c in history], expected)
+        
+        self.assertEqual(analyzer.get_file_history('a.py')[0]['message'], 'Change a and c')
+        self.assertEqual(len(analyzer.get_file_history('a.py', limit=2)), 2)
+    
+    def test_co_change_pairs(self):
+        """Co-change counts cover the whole history and honour the file filter"""
+        for i in range(3):
+            self._commit(f'Change pair {i}', {'a.py': str(i), 'b.py': str(i), 'notes.md': str(i)})
+        self._commit('Change a and c', {'a.py': 'x', 'c.py': 'x'})
+        
+        analyzer = GitAnalyzer(str(self.repo))
+        self.assertEqual(analyzer.find_frequently_changed_together(['a.py', 'b.py', 'c.py']),
+                         [('a.py', 'b.py', 3)])
+        self.assertEqual(analyzer.find_frequently_changed_together(['a.py', 'c.py'], min_count=1),
+                         [('a.py', 'c.py', 1)])
+    
+    def test_incremental_update(self):
+        """A persisted index only scans commits after the last indexed one"""
+        self._commit('First', {'a.py': '1', 'b.py': '1'})
+        self._commit('Second', {'a.py': '2', 'b.py': '2'})
+        
+        index = GitHistoryIndex(self.repo, self.index_path)
+        self.assertEqual(index.update(), 2)
+        self.assertEqual(GitHistoryIndex(self.repo, self.index_path).update(), 0)
+        
+        self._commit('Third', {'a.py': '3', 'b.py': '3'})
+        index = GitHistoryIndex(self.repo, self.index_path)
+        self.assertEqual(index.update(), 1)
+        self.assertEqual(index.co_change_pairs(), [('a.py', 'b.py', 3)])
+        self.assertEqual([c['message'] for c in index.file_history('a.py')],
+                         ['Third', 'Second', 'First'])
+    
+    def test_rewritten_history(self):
+        """Rewritten history is indexed again from scratch"""
+        self._commit('First', {'a.py': '1', 'b.py': '1'})
+        self._commit('Second', {'a.py': '2', 'b.py': '2'})
+        GitHistoryIndex(self.repo, self.index_path).update()
+        
+        self._git('reset', '-q', '--hard', 'HEAD~1')
+        self._commit('Replacement', {'a.py': 'r'})
+        
+        index = GitHistoryIndex(self.repo, self.index_path)
+        self.assertEqual(index.update(), 2)
+        self.assertEqual([c['message'] for c in index.file_history('a.py')],
+                         ['Replacement', 'First'])
+        self.assertEqual(index.co_change_pairs(), [('a.py', 'b.py', 1)])
+
+    
+    def test_failed_scan_not_saved(self):
+        """A failing git log leaves the saved index at the last good commit"""
+        self._commit('First', {'a.py': '1', 'b.py': '1'})
+        first = self._git('rev-parse', 'HEAD').strip()
+        GitHistoryIndex(self.repo, self.index_path).update()
+        
+        self._commit('Second', {'a.py': '2', 'b.py': '2'})
+        tree = self._git('rev-parse', 'HEAD^{tree}').strip()
+        tree_object = self.repo / '.git' / 'objects' / tree[:2] / tree[2:]
+        tree_object.chmod(0o644)
+        tree_object.unlink()
+        
+        index = GitHistoryIndex(self.repo, self.index_path)
+        self.assertEqual(index.update(), 0)
+        self.assertEqual(index.last_commit, first)
+        self.assertEqual([c['message'] for c in index.file_history('a.py')], ['First'])
+        with open(self.index_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['last_commit'], first)
+
 class TestTestCoverageAnalyzer(unittest.TestCase):
     """Test test coverage analysis"""
     
@@ -243,6 +351,75 @@ class TestKnowledgeGraphBuilder(unittest.TestCase):
             self.assertIn('relationships', data)
 
 
+class TestIncrementalRebuild(unittest.TestCase):
+    """Test rebuilding the graph from the per-file analysis cache"""
+    
+    def setUp(self):
+        """Create a small project"""
+        self.test_dir = tempfile.mkdtemp()
+        self.root = Path(self.test_dir)
+        (self.root / 'pkg').mkdir()
+        (self.root / 'pkg' / 'core.py').write_text("def run():\n    return 1\n")
+        (self.root / 'pkg' / 'helpers.py').write_text("import os\n\ndef helper():\n    pass\n")
+        (self.root / 'app.py').write_text("from pkg import core\n\ncore.run()\n")
+        (self.root / 'test_app.py').write_text("import app\n")
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def _build(self):
+        builder = KnowledgeGraphBuilder(str(self.root), history_index_path=None)
+        builder.save_graph('docs/data/codebase-graph.json')
+        return builder
+    
+    def _graph_without_metadata(self, builder):
+        graph = builder.build_graph()
+        graph.pop('metadata')
+        graph['relationships'].sort(key=lambda r: (r['type'], r['source'], r['target']))
+        return graph
+    
+    def test_cache_written_next_to_graph(self):
+        """Saving the graph persists the analysis cache in docs/data"""
+        self._build()
+        cache_path = self.root / 'docs' / 'data' / 'codebase-graph.analysis-cache.json'
+        self.assertTrue(cache_path.exists())
+        with open(cache_path) as f:
+            self.assertEqual(len(json.load(f)['files']), 4)
+    
+    def test_only_changed_files_reanalyzed(self):
+        """A rebuild parses only files whose content changed"""
+        first = self._build()
+        self.assertEqual(len(first.code_analyzer.files_reanalyzed), 4)
+        
+        (self.root / 'pkg' / 'helpers.py').write_text("import app\n\ndef helper():\n    pass\n")
+        second = self._build()
+        self.assertEqual(second.code_analyzer.files_reanalyzed, ['pkg/helpers.py'])
+        self.assertEqual(second.code_analyzer.files_cached, 3)
+        
+        # The patched graph equals a build without any cache
+        uncached = KnowledgeGraphBuilder(str(self.root), history_index_path=None)
+        self.assertEqual(self._graph_without_metadata(second),
+                         self._graph_without_metadata(uncached))
+        
+        imports = {(r['source'], r['target']) for r in second.build_graph()['relationships']
+                   if r['type'] == 'imports'}
+        self.assertIn(('pkg/helpers.py', 'app.py'), imports)
+    
+    def test_added_and_removed_files(self):
+        """Added files are analyzed and removed files leave the cache"""
+        self._build()
+        (self.root / 'pkg' / 'helpers.py').unlink()
+        (self.root / 'pkg' / 'extra.py').write_text("from pkg import core\n")
+        
+        builder = self._build()
+        self.assertEqual(builder.code_analyzer.files_reanalyzed, ['pkg/extra.py'])
+        self.assertNotIn('pkg/helpers.py', builder.analysis_cache.entries)
+        
+        node_ids = {node['id'] for node in builder.build_graph()['nodes']}
+        self.assertIn('pkg/extra.py', node_ids)
+        self.assertNotIn('pkg/helpers.py', node_ids)
+
+
 class TestGraphIntegrity(unittest.TestCase):
     """Test graph integrity and consistency"""
     
@@ -66,6 +66,7 @@ class TestKnowledgeGraphQuery(unittest.TestCase):
     def tearDownClass(cls):
         """Clean up temporary file"""
         Path(cls.temp_file.name).unlink()
+        Path(cls.temp_file.name).with_suffix('.kgc').unlink(missing_ok=True)
     
     def test_load_graph(self):
         """Test that graph loads correctly"""
@@ -149,6 +150,27 @@ class TestKnowledgeGraphQuery(unittest.TestCase):
         
         self.assertIn('utils.py', deps['direct'])
     
+    def test_impact_analysis_unbounded(self):
+        """Test unbounded impact analysis from the reverse-import closure"""
+        impact = self.kgq.impact_analysis('utils.py', depth=None)
+        
+        self.assertEqual(impact['directly_affected'], ['module_a.py', 'module_b.py'])
+        self.assertEqual(impact['indirectly_affected'], [])
+        self.assertEqual(impact['blast_radius'], 2)
+        # test_module_a.py tests module_a.py, which imports utils.py
+        self.assertEqual(impact['tests_to_run'], ['test_module_a.py'])
+        self.assertEqual(impact['agents_to_notify'], ['feature-architect'])
+    
+    def test_rank_tests(self):
+        """Test ranking tests for a change set"""
+        ranking = self.kgq.rank_tests(['utils.py', 'module_a.py', 'missing.py'])
+        
+        self.assertEqual(len(ranking), 1)
+        self.assertEqual(ranking[0]['test_file'], 'test_module_a.py')
+        self.assertEqual(ranking[0]['changed_files'], ['module_a.py', 'utils.py'])
+        self.assertTrue(ranking[0]['direct'])
+        self.assertEqual(self.kgq.rank_tests(['module_b.py']), [])
+    
     def test_find_expert_agents(self):
         """Test finding expert agents"""
         results = self.kgq.find_expert_agents('tooling')
@@ -325,6 +347,7 @@ class TestQueryEdgeCases(unittest.TestCase):
             self.assertEqual(results, [])
         finally:
             Path(temp_path).unlink()
+            Path(temp_path).with_suffix('.kgc').unlink(missing_ok=True)
     
     def test_empty_query(self):
         """Test empty query string"""
@@ -344,6 +367,7 @@ class TestQueryEdgeCases(unittest.TestCase):
             self.assertIn('error', result)
         finally:
             Path(temp_path).unlink()
+            Path(temp_path).with_suffix('.kgc').unlink(missing_ok=True)
 
 
 class TestPredictiveIntelligence(unittest.TestCase):
@@ -413,6 +437,7 @@ class TestPredictiveIntelligence(unittest.TestCase):
     def tearDownClass(cls):
         """Clean up temporary file"""
         Path(cls.temp_file.name).unlink()
+        Path(cls.temp_file.name).with_suffix('.kgc').unlink(missing_ok=True)
     
     def test_predict_bug_likelihood_high_risk(self):
         """Test bug likelihood prediction for high-risk file"""
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Tests for the knowledge graph query server.
+
+Covers JSON-RPC requests and batches against GraphQueryService, hot reload
+when the graph file changes, and GraphQueryClient over a Unix socket and a
+spawned --stdio server.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+import knowledge_graph_server
+from knowledge_graph_server import (
+    INTERNAL_ERROR,
+    INVALID_PARAMS,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    GraphQueryClient,
+    GraphQueryError,
+    GraphQueryServer,
+    GraphQueryService,
+)
+
+
+GRAPH = {
+    'metadata': {'total_files': 3},
+    'nodes': [
+        {'id': 'utils.py', 'type': 'code_file', 'label': 'utils.py', 'functions': 15},
+        {'id': 'module_a.py', 'type': 'code_file', 'label': 'module_a.py', 'functions': 5},
+        {'id': 'test_module_a.py', 'type': 'test_file', 'label': 'test_module_a.py'},
+    ],
+    'relationships': [
+        {'source': 'module_a.py', 'target': 'utils.py', 'type': 'imports', 'weight': 1},
+        {'source': 'test_module_a.py', 'target': 'module_a.py', 'type': 'tests', 'weight': 1},
+    ],
+    'statistics': {'total_nodes': 3},
+}
+
+
+class TestGraphQueryService(unittest.TestCase):
+    """Test JSON-RPC handling and hot reload"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.graph_path = Path(self.temp_dir) / 'graph.json'
+        self._write_graph(GRAPH)
+        self.service = GraphQueryService(str(self.graph_path))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write_graph(self, graph, bump_mtime=False):
+        self.graph_path.write_text(json.dumps(graph))
+        if bump_mtime:
+            # Make sure the change is visible even on coarse mtime filesystems
+            stat = os.stat(self.graph_path)
+            os.utime(self.graph_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def _rpc(self, payload):
+        return json.loads(self.service.handle(json.dumps(payload)))
+
+    def test_single_request(self):
+        """A request returns the same result as the query method"""
+        response = self._rpc({'jsonrpc': '2.0', 'id': 7, 'method': 'what_imports', 'params': ['utils.py']})
+        self.assertEqual(response['id'], 7)
+        self.assertEqual(response['result'], self.service.kgq.what_imports('utils.py'))
+
+        response = self._rpc({'jsonrpc': '2.0', 'id': 8, 'method': 'impact_analysis',
+                              'params': {'filepath': 'utils.py', 'depth': 1}})
+        self.assertEqual(response['result']['directly_affected'], ['module_a.py'])
+
+    def test_batch(self):
+        """A batch answers every request, notifications excluded"""
+        responses = self._rpc([
+            {'jsonrpc': '2.0', 'id': 1, 'method': 'query', 'params': ['What tests cover module_a.py?']},
+            {'jsonrpc': '2.0', 'id': 2, 'method': 'no_such_method'},
+            {'jsonrpc': '2.0', 'method': 'get_statistics'},
+            {'jsonrpc': '2.0', 'id': 3, 'method': 'predict_bug_likelihood', 'params': ['utils.py']},
+        ])
+        self.assertEqual([r['id'] for r in responses], [1, 2, 3])
+        self.assertEqual(responses[0]['result'][0]['test_file'], 'test_module_a.py')
+        self.assertEqual(responses[1]['error']['code'], METHOD_NOT_FOUND)
+        self.assertEqual(responses[2]['result']['likelihood'], 'low')
+
+    def test_errors(self):
+        """Malformed JSON, bad params and private methods are rejected"""
+        self.assertEqual(json.loads(self.service.handle('{oops'))['error']['code'], PARSE_ERROR)
+        response = self._rpc({'jsonrpc': '2.0', 'id': 1, 'method': 'what_imports', 'params': []})
+        self.assertEqual(response['error']['code'], INVALID_PARAMS)
+        response = self._rpc({'jsonrpc': '2.0', 'id': 2, 'method': '_load_graph'})
+        self.assertEqual(response['error']['code'], METHOD_NOT_FOUND)
+        self.assertIsNone(self.service.handle(json.dumps({'jsonrpc': '2.0', 'method': 'status'})))
+
+    def test_internal_errors_do_not_escape(self):
+        """Failures inside a query or its serialization answer INTERNAL_ERROR"""
+        def broken_query(filepath):
+            return None + 1
+
+        with mock.patch.object(self.service.kgq, 'what_imports', broken_query):
+            response = self._rpc({'jsonrpc': '2.0', 'id': 1, 'method': 'what_imports', 'params': ['utils.py']})
+            self.assertEqual(response['error']['code'], INTERNAL_ERROR)
+            response = self._rpc({'jsonrpc': '2.0', 'id': 2, 'method': 'what_imports', 'params': []})
+            self.assertEqual(response['error']['code'], INVALID_PARAMS)
+
+        with mock.patch.object(self.service.kgq, 'get_metadata', lambda: {'at': object()}):
+            responses = self._rpc([
+                {'jsonrpc': '2.0', 'id': 1, 'method': 'get_metadata'},
+                {'jsonrpc': '2.0', 'id': 2, 'method': 'status'},
+            ])
+        self.assertEqual(responses[0], {'jsonrpc': '2.0', 'id': 1, 'error': responses[0]['error']})
+        self.assertEqual(responses[0]['error']['code'], INTERNAL_ERROR)
+        self.assertEqual(responses[1]['result']['nodes'], 3)
+
+    def test_malformed_graph_keeps_serving(self):
+        """Any error while loading a changed graph leaves the previous graph in place"""
+        self._write_graph(GRAPH, bump_mtime=True)
+        with mock.patch.object(knowledge_graph_server, 'KnowledgeGraphQuery', side_effect=KeyError('nodes')):
+            response = self._rpc({'jsonrpc': '2.0', 'id': 1, 'method': 'status'})
+        self.assertEqual(response['result']['nodes'], 3)
+        self.assertIn('KeyError', response['result']['reload_error'])
+
+    def test_hot_reload(self):
+        """A changed graph file is picked up by the next request"""
+        changed = dict(GRAPH, relationships=GRAPH['relationships'] + [
+            {'source': 'test_module_a.py', 'target': 'utils.py', 'type': 'imports', 'weight': 1}
+        ])
+        self._write_graph(changed, bump_mtime=True)
+
+        response = self._rpc({'jsonrpc': '2.0', 'id': 1, 'method': 'what_imports', 'params': ['utils.py']})
+        self.assertEqual([r['file'] for r in response['result']], ['module_a.py', 'test_module_a.py'])
+        self.assertEqual(self.service.loads, 2)
+
+    def test_broken_graph_keeps_serving(self):
+        """A half-written graph file leaves the previous graph in place"""
+        self.graph_path.write_text('{"nodes": [')
+        stat = os.stat(self.graph_path)
+        os.utime(self.graph_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        response = self._rpc({'jsonrpc': '2.0', 'id': 1, 'method': 'status'})
+        self.assertEqual(response['result']['nodes'], 3)
+        self.assertIsNotNone(response['result']['reload_error'])
+
+        self._write_graph(GRAPH, bump_mtime=True)
+        response = self._rpc({'jsonrpc': '2.0', 'id': 2, 'method': 'status'})
+        self.assertIsNone(response['result']['reload_error'])
+
+
+class TestGraphQueryClient(unittest.TestCase):
+    """Test the client against real transports"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.graph_path = Path(self.temp_dir) / 'graph.json'
+        self.graph_path.write_text(json.dumps(GRAPH))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_unix_socket(self):
+        """Calls and batches round-trip over a Unix socket"""
+        socket_path = os.path.join(self.temp_dir, 'kg.sock')
+        server = GraphQueryServer(socket_path, GraphQueryService(str(self.graph_path)))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with GraphQueryClient.connect(socket_path) as client:
+                self.assertEqual(client.call('find_dependencies', 'module_a.py')['direct'], ['utils.py'])
+                results = client.batch([
+                    ('what_does_import', ['module_a.py']),
+                    ('missing', []),
+                    ('find_complex_files', {'min_functions': 10}),
+                ])
+                self.assertEqual(results[0][0]['file'], 'utils.py')
+                self.assertIsInstance(results[1], GraphQueryError)
+                self.assertEqual([f['file'] for f in results[2]], ['utils.py'])
+                with self.assertRaises(GraphQueryError):
+                    client.call('missing')
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertFalse(os.path.exists(socket_path))
+
+    def test_stdio(self):
+        """A spawned --stdio server answers the client"""
+        with GraphQueryClient.spawn(str(self.graph_path)) as client:
+            self.assertEqual(client.call('status')['relationships'], 2)
+            impact = client.call('query', 'Show impact of utils.py')
+            self.assertEqual(impact['directly_affected'], ['module_a.py'])
+
+
+if __name__ == '__main__':
+    unittest.main()
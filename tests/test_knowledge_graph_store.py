@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled knowledge graph store.
+
+Checks that a compiled graph round-trips to the same JSON graph, that id
+lookups and CSR adjacency keep the original relationship order, and that
+KnowledgeGraphQuery reuses, refreshes or skips the compiled file next to
+the JSON graph.
+"""
+
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+import knowledge_graph_store
+from knowledge_graph_store import CompiledGraph, compiled_path_for, write_compiled_graph
+from knowledge_graph_query import KnowledgeGraphQuery
+
+
+GRAPH = {
+    'metadata': {'generated_at': '2025-11-12T00:00:00', 'total_files': 4},
+    'nodes': [
+        {'id': 'utils.py', 'type': 'code_file', 'label': 'utils.py', 'functions': 15},
+        {'id': 'module_a.py', 'type': 'code_file', 'label': 'module_a.py', 'functions': 5},
+        {'id': 'test_module_a.py', 'type': 'test_file', 'label': 'test_module_a.py'},
+        {'id': 'agent:ünïcode', 'type': 'agent', 'label': 'ünïcode', 'expertise': ['testing']},
+    ],
+    'relationships': [
+        {'source': 'module_a.py', 'target': 'utils.py', 'type': 'imports', 'weight': 1},
+        {'source': 'module_a.py', 'target': 'external.py', 'type': 'imports', 'weight': 1},
+        {'source': 'test_module_a.py', 'target': 'utils.py', 'type': 'imports', 'weight': 2},
+        {'source': 'test_module_a.py', 'target': 'module_a.py', 'type': 'tests', 'weight': 1},
+        {'source': 'agent:ünïcode', 'target': 'utils.py', 'type': 'worked_on', 'weight': 1,
+         'since': '2025-01-01'},
+    ],
+    'statistics': {'total_nodes': 4},
+}
+
+
+class TestCompiledGraph(unittest.TestCase):
+    """Test the binary format and its accessors"""
+
+    def setUp(self):
+        self.store = CompiledGraph.from_graph(GRAPH)
+
+    def test_round_trip(self):
+        """to_dict() rebuilds the compiled graph exactly"""
+        self.assertEqual(self.store.to_dict(), GRAPH)
+
+    def test_index_lookup(self):
+        """Ids map to indices; edge-only ids have an index but no node"""
+        for node in GRAPH['nodes']:
+            idx = self.store.index(node['id'])
+            self.assertEqual(self.store.node_id(idx), node['id'])
+            self.assertEqual(self.store.node_at(idx), node)
+
+        external = self.store.index('external.py')
+        self.assertIsNotNone(external)
+        self.assertFalse(self.store.is_node(external))
+        self.assertIsNone(self.store.node('external.py'))
+        self.assertIsNone(self.store.index('missing.py'))
+
+    def test_adjacency_keeps_order(self):
+        """Neighbors follow relationship order within each type and direction"""
+        self.assertEqual(
+            self.store.edges_of('utils.py', 'imports', 'in'),
+            [('module_a.py', 1), ('test_module_a.py', 2)]
+        )
+        self.assertEqual(
+            self.store.edges_of('module_a.py', 'imports', 'out'),
+            [('utils.py', 1), ('external.py', 1)]
+        )
+        self.assertEqual(self.store.edges_of('utils.py', 'changes_with', 'in'), [])
+        self.assertIsNone(self.store.adjacency('changes_with'))
+
+    def test_sections_and_types(self):
+        """JSON sections decode lazily and nodes filter by type"""
+        self.assertEqual(self.store.section('statistics'), {'total_nodes': 4})
+        self.assertEqual(self.store.section('patterns', {}), {})
+        self.assertEqual([n['id'] for n in self.store.nodes_of_type('code_file')],
+                         ['utils.py', 'module_a.py'])
+        self.assertEqual(self.store.nodes_of_type('unknown'), [])
+
+    def test_float_weights_and_empty_graph(self):
+        """Non-integer weights survive and an empty graph compiles"""
+        graph = {'nodes': [], 'relationships': [
+            {'source': 'a', 'target': 'b', 'type': 'changes_with', 'weight': 2.5}
+        ]}
+        self.assertEqual(CompiledGraph.from_graph(graph).to_dict(), graph)
+        self.assertEqual(CompiledGraph.from_graph({}).to_dict(), {})
+
+    def test_missing_weights(self):
+        """Relationships without a weight read as weight 1 but round-trip without one"""
+        graph = {'nodes': [], 'relationships': [
+            {'source': 'a', 'target': 'b', 'type': 'imports'},
+            {'source': 'b', 'target': 'c', 'type': 'imports', 'weight': 3},
+        ]}
+        store = CompiledGraph.from_graph(graph)
+        self.assertEqual(store.to_dict(), graph)
+        self.assertEqual(store.edges_of('b', 'imports', 'in'), [('a', 1)])
+
+    def test_rejects_other_files(self):
+        """Non-store input is rejected with ValueError"""
+        with self.assertRaises(ValueError):
+            CompiledGraph(json.dumps(GRAPH).encode('utf-8'))
+
+
+def reference_reachable(relationships, start, direction):
+    """Plain BFS over imports for comparison."""
+    adjacency = {}
+    for rel in relationships:
+        a, b = rel['source'], rel['target']
+        if direction == 'in':
+            a, b = b, a
+        adjacency.setdefault(a, []).append(b)
+    seen, pending = set(), list(adjacency.get(start, []))
+    while pending:
+        node = pending.pop()
+        if node not in seen:
+            seen.add(node)
+            pending.extend(adjacency.get(node, []))
+    return seen
+
+
+class TestReachability(unittest.TestCase):
+    """Test SCC condensation and the stored closure"""
+
+    def _random_graph(self, seed):
+        rng = random.Random(seed)
+        n = rng.randint(1, 30)
+        return {
+            'nodes': [{'id': f'n{i}.py', 'type': 'code_file', 'label': f'n{i}.py'} for i in range(n)],
+            'relationships': [
+                {'source': f'n{rng.randrange(n)}.py', 'target': f'n{rng.randrange(n)}.py',
+                 'type': 'imports', 'weight': 1}
+                for _ in range(rng.randint(0, 60))
+            ],
+        }
+
+    def _check(self, graph):
+        store = CompiledGraph.from_graph(graph)
+        for node in graph['nodes']:
+            idx = store.index(node['id'])
+            for direction in ('in', 'out'):
+                expected = reference_reachable(graph['relationships'], node['id'], direction)
+                actual = {store.node_id(i) for i in store.reachable(idx, 'imports', direction)}
+                self.assertEqual(actual, expected, (node['id'], direction))
+        return store
+
+    def test_matches_bfs(self):
+        """Closure lookups equal a BFS on random graphs with cycles"""
+        for seed in range(20):
+            self._check(self._random_graph(seed))
+
+    def test_fallback_without_closure(self):
+        """Past the closure size limit the condensed DAG is walked instead"""
+        original = knowledge_graph_store.MAX_CLOSURE_ENTRIES
+        knowledge_graph_store.MAX_CLOSURE_ENTRIES = 2
+        try:
+            for seed in range(5):
+                store = self._check(self._random_graph(seed))
+            self.assertFalse(store.header['reachability']['imports']['closure']['in'])
+        finally:
+            knowledge_graph_store.MAX_CLOSURE_ENTRIES = original
+
+    def test_cycles_share_a_component(self):
+        """Files importing each other form one component and reach themselves"""
+        graph = {'nodes': [], 'relationships': [
+            {'source': 'a.py', 'target': 'b.py', 'type': 'imports', 'weight': 1},
+            {'source': 'b.py', 'target': 'a.py', 'type': 'imports', 'weight': 1},
+            {'source': 'c.py', 'target': 'a.py', 'type': 'imports', 'weight': 1},
+        ]}
+        store = CompiledGraph.from_graph(graph)
+        a, b, c = (store.index(f) for f in ('a.py', 'b.py', 'c.py'))
+        self.assertEqual(store.component(a), store.component(b))
+        self.assertNotEqual(store.component(a), store.component(c))
+        self.assertEqual(sorted(store.reachable(a, 'imports', 'in')), sorted([a, b, c]))
+        self.assertEqual(store.reachable(c, 'imports', 'in'), [])
+        self.assertIsNone(store.component(a, 'tests'))
+
+
+class TestCompiledQuery(unittest.TestCase):
+    """Test KnowledgeGraphQuery with the compiled file"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.graph_path = Path(self.temp_dir) / 'graph.json'
+        self.graph_path.write_text(json.dumps(GRAPH))
+        self.compiled_path = compiled_path_for(self.graph_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_compiled_file_written_and_reused(self):
+        """The first query compiles the graph; the next one maps it without reading JSON"""
+        first = KnowledgeGraphQuery(str(self.graph_path))
+        self.assertTrue(self.compiled_path.exists())
+        self.assertEqual(first.what_imports('utils.py')[1]['file'], 'test_module_a.py')
+
+        second = KnowledgeGraphQuery(str(self.graph_path))
+        self.assertNotIn('graph', vars(second))
+        self.assertEqual(second.what_imports('utils.py'), first.what_imports('utils.py'))
+        self.assertEqual(second.graph, GRAPH)
+
+        direct = KnowledgeGraphQuery(str(self.compiled_path))
+        self.assertEqual(direct.get_statistics(), {'total_nodes': 4})
+
+    def test_stale_compiled_file_is_rebuilt(self):
+        """A changed JSON graph is recompiled"""
+        KnowledgeGraphQuery(str(self.graph_path))
+
+        changed = dict(GRAPH, relationships=GRAPH['relationships'][:1])
+        self.graph_path.write_text(json.dumps(changed))
+        stat = os.stat(self.graph_path)
+        os.utime(self.graph_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        kgq = KnowledgeGraphQuery(str(self.graph_path))
+        self.assertEqual(kgq.what_imports('utils.py'),
+                         [{'file': 'module_a.py', 'type': 'code_file', 'label': 'module_a.py'}])
+        self.assertTrue(CompiledGraph.open(self.compiled_path).matches_source(self.graph_path))
+
+    def test_compiled_disabled(self):
+        """compiled=False neither reads nor writes the compiled file"""
+        write_compiled_graph({'nodes': [], 'relationships': []}, self.compiled_path, self.graph_path)
+        kgq = KnowledgeGraphQuery(str(self.graph_path), compiled=False)
+        self.assertEqual(len(kgq.what_imports('utils.py')), 2)
+
+        self.compiled_path.unlink()
+        KnowledgeGraphQuery(str(self.graph_path), compiled=False)
+        self.assertFalse(self.compiled_path.exists())
+
+    def test_concurrent_writes(self):
+        """Overlapping compiles each publish a complete file and leave no temp files"""
+        other = dict(GRAPH, relationships=GRAPH['relationships'][:1])
+        replace = os.replace
+        nested = []
+
+        def replace_after_other_write(src, dst):
+            if not nested:
+                nested.append(dst)
+                write_compiled_graph(other, self.compiled_path)
+            replace(src, dst)
+
+        with mock.patch.object(knowledge_graph_store.os, 'replace', replace_after_other_write):
+            write_compiled_graph(GRAPH, self.compiled_path)
+        self.assertEqual(CompiledGraph.open(self.compiled_path).to_dict(), GRAPH)
+
+        with mock.patch.object(knowledge_graph_store.os, 'replace', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                write_compiled_graph(other, self.compiled_path)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ['graph.json', self.compiled_path.name])
+        self.assertEqual(CompiledGraph.open(self.compiled_path).to_dict(), GRAPH)
+
+    def test_matches_dict_indices(self):
+        """Legacy dict indices are still available on demand"""
+        kgq = KnowledgeGraphQuery(str(self.graph_path))
+        self.assertIn('module_a.py', kgq.nodes_by_id)
+        self.assertEqual(len(kgq.relationships_by_target['utils.py']), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tests for RegistryManager batches.
+
+Checks that staged agent, config and metadata changes are all written on
+commit and not at all when the block raises, that other writers wait for
+a batch, that an interrupted commit is finished from its journal by the
+next manager, and that legacy mode rewrites registry.json once.
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+import registry_manager
+from registry_manager import REGISTRY_JOURNAL_FILE, RegistryManager
+
+
+def agent(i, status='active'):
+    return {'id': f'agent-{i}', 'name': f'Agent {i}', 'status': status}
+
+
+class TestRegistryBatch(unittest.TestCase):
+    """Test batches in distributed mode"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name) / 'agent-system'
+        (self.base / 'agents').mkdir(parents=True)
+        (self.base / 'config.json').write_text('{}')
+        registry_manager._agent_caches.clear()
+        self.addCleanup(registry_manager._agent_caches.clear)
+        self.registry = RegistryManager(str(self.base))
+        for i in range(3):
+            self.registry.update_agent(agent(i))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_commit_writes_everything(self):
+        with self.registry.batch() as tx:
+            for i in range(3, 20):
+                tx.update_agent(agent(i))
+            self.assertTrue(tx.delete_agent('agent-0'))
+            self.assertFalse(tx.delete_agent('agent-99'))
+            tx.update_config({'max_active_agents': 10})
+            tx.update_metadata_field('last_evaluation', '2025-11-12T00:00:00')
+            tx.update_metadata_field('last_spawn', None)
+            self.assertIsNone(tx.get_agent('agent-0'))
+            self.assertEqual(tx.get_agent('agent-5'), agent(5))
+            # Nothing is written before the block ends
+            self.assertIsNotNone(self.registry.get_agent('agent-0'))
+
+        self.assertEqual(len(self.registry.list_agents()), 19)
+        self.assertIsNone(self.registry.get_agent('agent-0'))
+        self.assertEqual(self.registry.get_config(), {'max_active_agents': 10})
+        metadata = self.registry.get_metadata()
+        self.assertEqual(metadata['last_evaluation'], '2025-11-12T00:00:00')
+        self.assertIsNone(metadata['last_spawn'])
+        self.assertFalse((self.base / REGISTRY_JOURNAL_FILE).exists())
+        self.assertEqual(sorted(p.name for p in (self.base / 'agents').glob('*.json')),
+                         sorted(f'agent-{i}.json' for i in range(1, 20)))
+
+    def test_exception_discards_batch(self):
+        with self.assertRaises(RuntimeError):
+            with self.registry.batch() as tx:
+                tx.update_agent(agent(1, status='inactive'))
+                tx.update_agent(agent(7))
+                raise RuntimeError('abort')
+        self.assertEqual(self.registry.get_agent('agent-1')['status'], 'active')
+        self.assertIsNone(self.registry.get_agent('agent-7'))
+
+    def test_staged_agents_are_copies(self):
+        data = agent(1, status='inactive')
+        with self.registry.batch() as tx:
+            tx.update_agent(data)
+            data['status'] = 'eliminated'
+            tx.get_agent('agent-1')['name'] = 'Changed'
+        self.assertEqual(self.registry.get_agent('agent-1'), agent(1, status='inactive'))
+
+    def test_writers_wait_for_batch(self):
+        # Another manager's update during the batch is not overwritten by it
+        other = RegistryManager(str(self.base))
+        writer = threading.Thread(target=other.update_agent, args=(agent(1, status='eliminated'),))
+        with self.registry.batch() as tx:
+            staged = tx.get_agent('agent-1')
+            writer.start()
+            writer.join(0.2)
+            self.assertTrue(writer.is_alive())
+            staged['name'] = 'Renamed'
+            tx.update_agent(staged)
+            tx.update_agent(agent(2, status='inactive'))
+        writer.join()
+        self.assertEqual(self.registry.get_agent('agent-1'), agent(1, status='eliminated'))
+
+    def test_files_durable_before_journal_removed(self):
+        synced = []
+
+        def record_fsync_dir(path):
+            synced.append((Path(path), (self.base / REGISTRY_JOURNAL_FILE).exists()))
+
+        with mock.patch.object(registry_manager, '_fsync_dir', record_fsync_dir):
+            with self.registry.batch() as tx:
+                tx.update_agent(agent(1, status='inactive'))
+                tx.update_config({'max_active_agents': 5})
+        # The journal's directory entry, then the written files', all while
+        # the journal still exists
+        self.assertEqual(synced[0], (self.base, True))
+        self.assertEqual({path for path, _ in synced[1:]}, {self.base, self.base / 'agents'})
+        self.assertTrue(all(exists for _, exists in synced))
+        self.assertFalse((self.base / REGISTRY_JOURNAL_FILE).exists())
+
+    def test_interrupted_commit_is_replayed(self):
+        real_replace = registry_manager._replace_file
+        calls = []
+
+        def crash_after_journal(path, content, sync=False):
+            calls.append(path)
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            real_replace(path, content, sync)
+
+        with mock.patch.object(registry_manager, '_replace_file', crash_after_journal):
+            with self.assertRaises(KeyboardInterrupt):
+                with self.registry.batch() as tx:
+                    for i in range(3):
+                        tx.update_agent(agent(i, status='inactive'))
+        self.assertTrue((self.base / REGISTRY_JOURNAL_FILE).exists())
+
+        registry = RegistryManager(str(self.base))
+        self.assertFalse((self.base / REGISTRY_JOURNAL_FILE).exists())
+        self.assertEqual([a['status'] for a in registry.list_agents()], ['inactive'] * 3)
+
+
+class TestLegacyBatch(unittest.TestCase):
+    """Test batches against a legacy registry.json"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name) / 'agent-system'
+        self.base.mkdir()
+        (self.base / 'registry.json').write_text(json.dumps({
+            'version': '2.0.0', 'agents': [agent(0)], 'hall_of_fame': [], 'config': {}
+        }))
+        registry_manager._agent_caches.clear()
+        self.addCleanup(registry_manager._agent_caches.clear)
+        self.registry = RegistryManager(str(self.base))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_single_rewrite(self):
+        self.assertEqual(self.registry.get_mode(), 'legacy')
+        with mock.patch.object(registry_manager, '_replace_file',
+                               wraps=registry_manager._replace_file) as replace:
+            with self.registry.batch() as tx:
+                tx.update_agent(agent(0, status='inactive'))
+                tx.update_agent(agent(1))
+                tx.update_hall_of_fame([agent(0)])
+                tx.update_metadata_field('last_spawn', '2025-11-12T00:00:00')
+        self.assertEqual(replace.call_count, 1)
+
+        registry = json.loads((self.base / 'registry.json').read_text())
+        self.assertEqual(registry['agents'], [agent(0, status='inactive'), agent(1)])
+        self.assertEqual(registry['hall_of_fame'], [agent(0)])
+        self.assertEqual(registry['last_spawn'], '2025-11-12T00:00:00')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for the RegistryManager agent cache.
+
+Checks that agents are parsed once and re-read only when their file
+changes, that managers of the same directory share the cache, that the
+persisted status index lets list_agents(status=...) skip other agents
+without parsing them, and that callers get copies.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+import registry_manager
+from registry_manager import AGENT_INDEX_FILE, RegistryManager
+
+
+class TestAgentCache(unittest.TestCase):
+    """Test cached agent reads in distributed mode"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name) / 'agent-system'
+        self.agents_dir = self.base / 'agents'
+        self.agents_dir.mkdir(parents=True)
+        for i, status in enumerate(['active', 'inactive', 'active', 'eliminated']):
+            self._write(f'agent-{i}', {'id': f'agent-{i}', 'name': f'Agent {i}', 'status': status})
+        # Treat every write as settled so signatures are trusted immediately
+        patcher = mock.patch.object(registry_manager, 'RACY_WINDOW_NS', -10**18)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        registry_manager._agent_caches.clear()
+        self.addCleanup(registry_manager._agent_caches.clear)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, agent_id, agent, mtime_ns=None):
+        path = self.agents_dir / f'{agent_id}.json'
+        path.write_text(json.dumps(agent))
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def _count_reads(self):
+        """Patch json.load in the registry module and count agent file parses"""
+        counter = {'reads': 0}
+        real_load = json.load
+
+        def counting_load(f, *args, **kwargs):
+            if Path(f.name).parent == self.agents_dir:
+                counter['reads'] += 1
+            return real_load(f, *args, **kwargs)
+
+        patcher = mock.patch.object(registry_manager.json, 'load', counting_load)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return counter
+
+    def test_list_and_get_match_files(self):
+        registry = RegistryManager(str(self.base))
+        self.assertEqual([a['id'] for a in registry.list_agents()],
+                         ['agent-0', 'agent-1', 'agent-2', 'agent-3'])
+        self.assertEqual([a['id'] for a in registry.list_agents(status='active')],
+                         ['agent-0', 'agent-2'])
+        self.assertEqual(registry.get_agent('agent-1')['status'], 'inactive')
+        self.assertIsNone(registry.get_agent('agent-9'))
+
+    def test_agents_parsed_once_across_managers(self):
+        RegistryManager(str(self.base)).list_agents()
+        reads = self._count_reads()
+        registry = RegistryManager(str(self.base))
+        registry.list_agents()
+        registry.list_agents(status='active')
+        registry.get_agent('agent-0')
+        self.assertEqual(reads['reads'], 0)
+
+    def test_changed_added_and_deleted_files(self):
+        registry = RegistryManager(str(self.base))
+        registry.list_agents()
+        self._write('agent-1', {'id': 'agent-1', 'name': 'Agent 1', 'status': 'active'},
+                    mtime_ns=1_000_000_000)
+        self._write('agent-4', {'id': 'agent-4', 'name': 'Agent 4', 'status': 'active'})
+        (self.agents_dir / 'agent-0.json').unlink()
+        self.assertEqual([a['id'] for a in registry.list_agents(status='active')],
+                         ['agent-1', 'agent-2', 'agent-4'])
+        self.assertIsNone(registry.get_agent('agent-0'))
+
+    def test_status_index_skips_other_statuses(self):
+        RegistryManager(str(self.base)).list_agents()
+        self.assertTrue((self.base / AGENT_INDEX_FILE).exists())
+
+        # A fresh process only has the persisted index
+        registry_manager._agent_caches.clear()
+        reads = self._count_reads()
+        agents = RegistryManager(str(self.base)).list_agents(status='active')
+        self.assertEqual([a['id'] for a in agents], ['agent-0', 'agent-2'])
+        self.assertEqual(reads['reads'], 2)
+
+    def test_updates_and_deletes_go_through_cache(self):
+        registry = RegistryManager(str(self.base))
+        registry.list_agents()
+        reads = self._count_reads()
+        registry.update_agent({'id': 'agent-3', 'name': 'Agent 3', 'status': 'active'})
+        self.assertTrue(registry.delete_agent('agent-0'))
+        self.assertEqual([a['id'] for a in registry.list_agents(status='active')],
+                         ['agent-2', 'agent-3'])
+        self.assertEqual(reads['reads'], 0)
+
+    def test_returned_agents_are_copies(self):
+        registry = RegistryManager(str(self.base))
+        agent = registry.get_agent('agent-0')
+        agent['status'] = 'inactive'
+        registry.list_agents()[0]['name'] = 'Changed'
+        self.assertEqual(registry.get_agent('agent-0'),
+                         {'id': 'agent-0', 'name': 'Agent 0', 'status': 'active'})
+
+    def test_recent_files_are_reread(self):
+        registry_manager.RACY_WINDOW_NS = 10**18
+        registry = RegistryManager(str(self.base))
+        registry.list_agents()
+        reads = self._count_reads()
+        registry.list_agents()
+        self.assertEqual(reads['reads'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
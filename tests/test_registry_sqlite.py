@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite registry backend.
+
+Checks that RegistryManager in SQLite mode serves the same API as the JSON
+layouts, that filtered and score-sorted listings agree across backends,
+that batches commit as one transaction isolated from other writers, and that a registry survives a
+round trip from JSON to SQLite and back.
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+import registry_manager
+from registry_manager import REGISTRY_DB_FILE, RegistryManager
+from registry_sqlite import SQLiteRegistry
+
+
+def agent(i, status='active', specialization='engineer', score=None):
+    data = {'id': f'agent-{i}', 'name': f'Agent {i}', 'status': status,
+            'specialization': specialization}
+    if score is not None:
+        data['metrics'] = {'overall_score': score}
+    return data
+
+
+AGENTS = [
+    agent(0, score=0.4),
+    agent(1, status='inactive', score=0.9),
+    agent(2, score=0.7),
+    agent(3, specialization='tester', score=0.8),
+    agent(4),
+    agent(5, status='hall_of_fame', score=0.95),
+]
+
+
+class TestSQLiteRegistry(unittest.TestCase):
+    """Test RegistryManager in SQLite mode"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name) / 'agent-system'
+        (self.base / 'agents').mkdir(parents=True)
+        (self.base / 'config.json').write_text(json.dumps({'max_active_agents': 7}))
+        (self.base / 'hall_of_fame.json').write_text(json.dumps([agent(5)]))
+        for data in AGENTS:
+            (self.base / 'agents' / f"{data['id']}.json").write_text(json.dumps(data))
+        registry_manager._agent_caches.clear()
+        self.addCleanup(registry_manager._agent_caches.clear)
+        self.json_registry = RegistryManager(str(self.base))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _migrate(self):
+        self.assertTrue(self.json_registry.migrate_to_sqlite())
+        registry = RegistryManager(str(self.base))
+        self.assertEqual(registry.get_mode(), 'sqlite')
+        return registry
+
+    def test_queries_match_json_backend(self):
+        queries = [
+            {},
+            {'status': 'active'},
+            {'status': 'active', 'specialization': 'engineer', 'sort_by_score': True},
+            {'sort_by_score': True, 'limit': 3},
+            {'specialization': 'tester'},
+        ]
+        expected = [self.json_registry.list_agents(**query) for query in queries]
+        registry = self._migrate()
+        for query, agents in zip(queries, expected):
+            self.assertEqual(registry.list_agents(**query), agents, query)
+        self.assertEqual(
+            [a['id'] for a in registry.list_agents(status='active', sort_by_score=True)],
+            ['agent-3', 'agent-2', 'agent-0', 'agent-4']
+        )
+
+    def test_same_api(self):
+        registry = self._migrate()
+        self.assertEqual(registry.get_agent('agent-2'), agent(2, score=0.7))
+        self.assertIsNone(registry.get_agent('agent-99'))
+        self.assertEqual(registry.get_config(), {'max_active_agents': 7})
+        self.assertEqual(registry.get_hall_of_fame(), [agent(5)])
+
+        self.assertTrue(registry.update_agent(agent(2, status='inactive', score=0.1)))
+        self.assertTrue(registry.delete_agent('agent-0'))
+        self.assertFalse(registry.delete_agent('agent-0'))
+        self.assertTrue(registry.update_hall_of_fame([agent(5), agent(1)]))
+        self.assertTrue(registry.update_metadata_field('last_spawn', '2025-11-12T00:00:00'))
+
+        registry = RegistryManager(str(self.base))
+        self.assertEqual([a['id'] for a in registry.list_agents(status='active')], ['agent-3', 'agent-4'])
+        self.assertEqual(len(registry.get_hall_of_fame()), 2)
+        self.assertEqual(registry.get_metadata()['last_spawn'], '2025-11-12T00:00:00')
+
+    def test_batch_is_one_transaction(self):
+        registry = self._migrate()
+        with self.assertRaises(RuntimeError):
+            with registry.batch() as tx:
+                tx.update_agent(agent(9))
+                raise RuntimeError('abort')
+        self.assertIsNone(registry.get_agent('agent-9'))
+
+        with registry.batch() as tx:
+            for i in range(10, 40):
+                tx.update_agent(agent(i, score=i / 100))
+            tx.delete_agent('agent-1')
+            tx.update_metadata_field('last_evaluation', 'now')
+            tx.update_config({'max_active_agents': 40})
+        self.assertEqual(len(registry.list_agents()), 35)
+        self.assertEqual(registry.list_agents(sort_by_score=True, limit=1)[0]['id'], 'agent-5')
+        self.assertEqual(registry.get_metadata()['last_evaluation'], 'now')
+        self.assertEqual(registry.get_config(), {'max_active_agents': 40})
+
+    def test_batch_excludes_other_writers(self):
+        registry = self._migrate()
+        other = RegistryManager(str(self.base))
+        writer = threading.Thread(target=other.update_agent, args=(agent(2, status='eliminated'),))
+        with registry.batch() as tx:
+            staged = tx.get_agent('agent-2')
+            writer.start()
+            writer.join(0.2)
+            self.assertTrue(writer.is_alive())
+            staged['name'] = 'Renamed'
+            tx.update_agent(staged)
+        writer.join()
+        self.assertEqual(registry.get_agent('agent-2')['status'], 'eliminated')
+
+    def test_round_trip_to_distributed(self):
+        registry = self._migrate()
+        registry.delete_agent('agent-4')
+        registry.update_agent(agent(6, score=0.5))
+        self.assertTrue(registry.export_from_sqlite('distributed'))
+        self.assertFalse((self.base / REGISTRY_DB_FILE).exists())
+        self.assertTrue((self.base / 'registry.db.backup').exists())
+
+        registry = RegistryManager(str(self.base))
+        self.assertEqual(registry.get_mode(), 'distributed')
+        self.assertEqual([a['id'] for a in registry.list_agents()],
+                         ['agent-0', 'agent-1', 'agent-2', 'agent-3', 'agent-5', 'agent-6'])
+        self.assertEqual(registry.get_config(), {'max_active_agents': 7})
+        self.assertEqual(registry.get_hall_of_fame(), [agent(5)])
+
+    def test_legacy_import(self):
+        legacy = Path(self.temp_dir.name) / 'legacy'
+        legacy.mkdir()
+        (legacy / 'registry.json').write_text(json.dumps({
+            'version': '2.0.0', 'agents': AGENTS, 'hall_of_fame': [],
+            'config': {'spawn_mode': 'mixed'}, 'last_spawn': '2025-11-01T00:00:00'
+        }))
+        registry = RegistryManager(str(legacy))
+        self.assertEqual(registry.get_mode(), 'legacy')
+        self.assertTrue(registry.migrate_to_sqlite())
+        self.assertEqual(registry.get_mode(), 'sqlite')
+        self.assertEqual(registry.list_agents(), sorted(AGENTS, key=lambda a: a['id']))
+        self.assertEqual(registry.get_metadata()['last_spawn'], '2025-11-01T00:00:00')
+
+    def test_indexes_used(self):
+        self._migrate()
+        database = SQLiteRegistry(self.base / REGISTRY_DB_FILE)
+        plan = database._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT data FROM agents WHERE status = ? AND specialization = ? "
+            "ORDER BY score IS NULL, score DESC, id", ('active', 'engineer')
+        ).fetchall()
+        database.close()
+        self.assertIn('agents_status', ' '.join(str(row) for row in plan))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for single-pass git history ingestion in the repetition detector.
+
+Builds a small throwaway repository and checks that the streamed git log
+parser finds the same files per commit as git diff-tree, and that the
+commit cache lets a second run ingest only new commits and drops commits
+that left the window.
+"""
+
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+SCRIPT = REPO_ROOT / "tools" / "repetition-detector.py"
+
+spec = importlib.util.spec_from_file_location("repetition_detector", SCRIPT)
+repetition_detector = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(repetition_detector)
+
+AGENT = ("copilot-swe-agent[bot]", "198982749+Copilot@users.noreply.github.com")
+HUMAN = ("Human Dev", "human@example.com")
+
+
+class TestRepetitionDetectorIngestion(unittest.TestCase):
+    """Test streamed ingestion and the commit cache."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.repo = Path(self.temp_dir) / "repo"
+        self.repo.mkdir()
+        self.cache_path = Path(self.temp_dir) / "commits.json"
+        self._git("init", "-q")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _git(self, *args, date=None):
+        env = dict(os.environ, GIT_COMMITTER_NAME="c", GIT_COMMITTER_EMAIL="c@example.com")
+        if date:
+            env.update(GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+        return subprocess.run(
+            ["git", "-C", str(self.repo)] + list(args),
+            check=True, capture_output=True, text=True, env=env
+        ).stdout
+
+    def _commit(self, author, message, files, date=None):
+        for name, content in files.items():
+            path = self.repo / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        self._git("add", "-A")
+        self._git("-c", f"user.name={author[0]}", "-c", f"user.email={author[1]}",
+                  "commit", "-q", "-m", message, date=date)
+
+    def _detector(self, since_days=30):
+        return repetition_detector.RepetitionDetector(
+            str(self.repo), since_days=since_days, cache_path=str(self.cache_path)
+        )
+
+    def test_files_match_diff_tree(self):
+        """Files parsed from the streamed log equal git diff-tree output."""
+        self._commit(AGENT, "Initial", {"README.md": "a"})
+        self._commit(AGENT, "Add tools | with pipe", {"tools/a.py": "x = 1", "docs/b c.md": "b"})
+        self._commit(HUMAN, "Human change", {"tools/a.py": "x = 2"})
+        self._commit(AGENT, "Update tool", {"tools/a.py": "x = 3", "tools/c.py": "y = 1"})
+
+        detector = self._detector()
+        detector.collect_contributions()
+
+        contributions = detector.contributions["copilot-swe-agent"]
+        self.assertEqual(len(contributions), 3)
+        self.assertNotIn("Human Dev", [c["author_name"] for c in contributions])
+        self.assertEqual(contributions[1]["message"], "Add tools | with pipe")
+
+        for contribution in contributions[:2]:
+            expected = self._git("diff-tree", "--no-commit-id", "--name-only", "-r",
+                                 contribution["commit_hash"]).splitlines()
+            self.assertEqual(sorted(contribution["files"]), sorted(expected))
+
+    def test_cache_ingests_only_new_commits(self):
+        """A second run reads only commits that are not cached yet."""
+        self._commit(AGENT, "First", {"a.py": "a = 1"})
+        self._commit(AGENT, "Second", {"b.py": "b = 1"})
+
+        first = self._detector()
+        first.collect_contributions()
+        with open(self.cache_path) as f:
+            self.assertEqual(len(json.load(f)["commits"]), 2)
+
+        self._commit(AGENT, "Third", {"c.py": "c = 1"})
+
+        requested = []
+        second = self._detector()
+        original = second._stream_commits
+
+        def recording_stream(hashes):
+            requested.extend(hashes)
+            return original(hashes)
+
+        second._stream_commits = recording_stream
+        second.collect_contributions()
+
+        head = self._git("rev-parse", "HEAD").strip()
+        self.assertEqual(requested, [head])
+        self.assertEqual(
+            [c["message"] for c in second.contributions["copilot-swe-agent"]],
+            ["Third", "Second", "First"]
+        )
+
+    def test_cache_pruned_to_window(self):
+        """Cached commits older than the analysed window are dropped."""
+        old = (datetime.now(timezone.utc) - timedelta(days=60)).isoformat()
+        self._commit(AGENT, "Old", {"a.py": "a = 1"}, date=old)
+        self._commit(AGENT, "Recent", {"b.py": "b = 1"})
+
+        self._detector(since_days=90).collect_contributions()
+        with open(self.cache_path) as f:
+            self.assertEqual(len(json.load(f)["commits"]), 2)
+
+        self._detector(since_days=30).collect_contributions()
+        with open(self.cache_path) as f:
+            commits = json.load(f)["commits"]
+        self.assertEqual([c["message"] for c in commits.values()], ["Recent"])
+
+    def test_no_cache(self):
+        """Disabling the cache writes no cache file."""
+        self._commit(AGENT, "First", {"a.py": "a = 1"})
+
+        detector = repetition_detector.RepetitionDetector(
+            str(self.repo), since_days=30, cache_path=str(self.cache_path), use_cache=False
+        )
+        detector.collect_contributions()
+
+        self.assertEqual(len(detector.contributions["copilot-swe-agent"]), 1)
+        self.assertFalse(self.cache_path.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
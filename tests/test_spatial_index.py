@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the world spatial index.
+
+Checks nearest and radius queries against a brute-force scan, including
+points added after the tree was built and positions across the date
+line, and that the navigator plans paths and picks ideas by distance.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+# Add world directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'world'))
+
+from spatial_index import RegionIndex, SpatialIndex, distance_km, plan_route
+from agent_navigator import assign_idea_to_agent, build_navigation_path, select_next_idea_for_agent
+
+
+def random_points(count, seed):
+    rng = random.Random(seed)
+    return [(rng.uniform(-90, 90), rng.uniform(-180, 180), i) for i in range(count)]
+
+
+def brute_force(points, lat, lng):
+    return sorted((distance_km(lat, lng, p_lat, p_lng), item) for p_lat, p_lng, item in points)
+
+
+REGIONS = [
+    {'id': 'US:Charlotte', 'lat': 35.2271, 'lng': -80.8431},
+    {'id': 'US:Seattle', 'lat': 47.6062, 'lng': -122.3321},
+    {'id': 'US:Redmond', 'lat': 47.674, 'lng': -122.1215},
+    {'id': 'US:San Francisco', 'lat': 37.7749, 'lng': -122.4194},
+    {'id': 'GB:London', 'lat': 51.5074, 'lng': -0.1278},
+    {'id': 'US:Los Angeles', 'lat': 34.0522, 'lng': -118.2437},
+    {'id': 'XX:Nowhere'},
+]
+
+
+class TestSpatialIndex(unittest.TestCase):
+    """Test queries against a brute-force scan"""
+
+    def test_matches_brute_force(self):
+        points = random_points(2000, seed=1)
+        index = SpatialIndex(points[:1500])
+        # The rest arrive after the tree was built
+        for lat, lng, item in points[1500:]:
+            index.add(lat, lng, item)
+        self.assertEqual(len(index), 2000)
+
+        rng = random.Random(2)
+        for _ in range(100):
+            lat, lng = rng.uniform(-90, 90), rng.uniform(-180, 180)
+            expected = brute_force(points, lat, lng)
+            self.assertEqual([item for _, item in index.nearest(lat, lng, k=5)],
+                             [item for _, item in expected[:5]])
+            self.assertEqual([item for _, item in index.within(lat, lng, 2000)],
+                             [item for distance, item in expected if distance <= 2000])
+
+    def test_distances(self):
+        index = SpatialIndex([(0.0, 179.9, 'east'), (0.0, 0.0, 'origin')])
+        (distance, item), = index.nearest(0.0, -179.9)
+        self.assertEqual(item, 'east')
+        self.assertAlmostEqual(distance, 22.24, places=2)
+        self.assertEqual(index.within(0.0, -179.9, 10), [])
+        self.assertEqual(SpatialIndex().nearest(0.0, 0.0), [])
+
+    def test_region_index(self):
+        regions = RegionIndex(REGIONS)
+        self.assertEqual(regions.get('XX:Nowhere'), REGIONS[-1])
+        self.assertIsNone(regions.coordinates('XX:Nowhere'))
+        self.assertFalse(regions.add_region({'id': 'US:Seattle', 'lat': 0, 'lng': 0}))
+
+        seattle = regions.coordinates('US:Seattle')
+        self.assertEqual(regions.nearest_region(*seattle)['id'], 'US:Seattle')
+        self.assertEqual(regions.nearest_region(*seattle, exclude='US:Seattle')['id'], 'US:Redmond')
+        self.assertEqual([r['id'] for r in regions.regions_within(*seattle, 1200)],
+                         ['US:Seattle', 'US:Redmond', 'US:San Francisco'])
+
+    def test_plan_route(self):
+        stops = [(r['lat'], r['lng'], r['id']) for r in REGIONS[1:5]]
+        self.assertEqual(plan_route((51.0, 0.0), stops),
+                         ['GB:London', 'US:Redmond', 'US:Seattle', 'US:San Francisco'])
+
+
+class TestNavigator(unittest.TestCase):
+    """Test path planning and idea selection by distance"""
+
+    def setUp(self):
+        self.regions = RegionIndex(REGIONS)
+        self.ideas = [
+            {'id': 'idea:1', 'inspiration_regions': [
+                {'region_id': 'GB:London', 'lat': 51.5074, 'lng': -0.1278, 'weight': 0.2},
+                {'region_id': 'US:Seattle', 'lat': 47.6062, 'lng': -122.3321, 'weight': 0.5},
+                {'region_id': 'XX:Nowhere', 'weight': 0.3},
+            ]},
+            {'id': 'idea:2', 'inspiration_regions': [
+                {'region_id': 'US:San Francisco', 'lat': 37.7749, 'lng': -122.4194, 'weight': 1.0},
+            ]},
+        ]
+
+    def test_navigation_path(self):
+        regions = self.ideas[0]['inspiration_regions']
+        self.assertEqual(build_navigation_path(regions), ['US:Seattle', 'XX:Nowhere', 'GB:London'])
+        self.assertEqual(build_navigation_path(regions, start=(51.0, 0.0)),
+                         ['GB:London', 'US:Seattle', 'XX:Nowhere'])
+
+        agent = {'id': 'agent-1', 'location_region_id': 'US:Charlotte'}
+        assign_idea_to_agent(agent, self.ideas[0], self.regions)
+        self.assertEqual(agent['path'], ['US:Seattle', 'GB:London', 'XX:Nowhere'])
+
+    def test_nearest_idea(self):
+        agent = {'id': 'agent-1', 'location_region_id': 'US:Redmond'}
+        self.assertEqual(select_next_idea_for_agent(agent, self.ideas, 'nearest', self.regions)['id'], 'idea:1')
+        agent['location_region_id'] = 'US:Los Angeles'
+        self.assertEqual(select_next_idea_for_agent(agent, self.ideas, 'nearest', self.regions)['id'], 'idea:2')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for WorldState indexes.
+
+Checks that indexed lookups agree with the linear scans they replace,
+including after the agent and region lists are edited directly, and that
+a WorldState saves exactly like the plain dict.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add world directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'world'))
+
+import world_state_manager
+from world_state_manager import (
+    WorldState,
+    add_or_update_region,
+    get_agent_by_id,
+    get_region_by_id,
+    load_world_state,
+    save_world_state,
+    update_agent_mission,
+)
+
+
+def world():
+    return {
+        'tick': 1,
+        'agents': [{'id': f'agent-{i}', 'specialization': f'spec-{i}'} for i in range(5)],
+        'regions': [{'id': 'US:Charlotte'}, {'id': 'US:Seattle'}],
+        'metrics': {'total_regions': 2},
+    }
+
+
+class TestWorldStateIndex(unittest.TestCase):
+    """Test indexed lookups against plain dict scans"""
+
+    def setUp(self):
+        self.state = WorldState(world())
+        self.plain = world()
+
+    def assertSameLookups(self):
+        for agent_id in ('agent-0', 'agent-3', 'agent-9', 'spec-2', 'renamed'):
+            self.assertEqual(get_agent_by_id(self.state, agent_id), get_agent_by_id(self.plain, agent_id))
+        for region_id in ('US:Charlotte', 'US:Seattle', 'GB:London'):
+            self.assertEqual(get_region_by_id(self.state, region_id), get_region_by_id(self.plain, region_id))
+
+    def test_lookups_follow_direct_edits(self):
+        self.assertSameLookups()
+        for state in (self.state, self.plain):
+            state['agents'][3]['id'] = 'renamed'
+            state['agents'].append({'id': 'agent-9'})
+            del state['agents'][0]
+            state['regions'] = [{'id': 'GB:London'}]
+        self.assertSameLookups()
+        self.assertIsNone(get_agent_by_id(self.state, 'agent-3'))
+
+    def test_misses_follow_reindex(self):
+        self.assertSameLookups()
+        for state in (self.state, self.plain):
+            # Same length and last item, so the index cannot notice
+            state['agents'][1]['id'] = 'q'
+            state['agents'][2] = {'id': 'renamed'}
+        self.state.reindex()
+        self.assertIs(get_agent_by_id(self.state, 'q'), self.state['agents'][1])
+        self.assertSameLookups()
+
+    def test_miss_keeps_index(self):
+        get_agent_by_id(self.state, 'agent-0')
+        get_region_by_id(self.state, 'US:Seattle')
+        indexes = dict(self.state._indexes)
+        # Unknown ids, and agents found by specialization after an id miss
+        self.assertIsNone(get_agent_by_id(self.state, 'agent-9'))
+        self.assertIsNone(get_region_by_id(self.state, 'GB:London'))
+        self.assertTrue(update_agent_mission(self.state, 'spec-2', 'mission-1', 'US:Seattle'))
+        for key, index in indexes.items():
+            self.assertIs(self.state._indexes[key], index, key)
+
+    def test_first_duplicate_wins(self):
+        duplicate = {'id': 'agent-1', 'specialization': 'other'}
+        self.state['agents'].append(duplicate)
+        self.assertIsNot(get_agent_by_id(self.state, 'agent-1'), duplicate)
+
+    def test_mutators_keep_indexes(self):
+        add_or_update_region(self.state, {'id': 'GB:London', 'idea_count': 1})
+        add_or_update_region(self.state, {'id': 'US:Seattle', 'idea_count': 4})
+        self.assertEqual(get_region_by_id(self.state, 'GB:London')['idea_count'], 1)
+        self.assertEqual(get_region_by_id(self.state, 'US:Seattle')['idea_count'], 4)
+        self.assertEqual(self.state['metrics']['total_regions'], 3)
+
+        # Agents are found by specialization when the id does not match
+        self.assertTrue(update_agent_mission(self.state, 'spec-2', 'mission-1', 'GB:London'))
+        self.assertEqual(get_agent_by_id(self.state, 'agent-2')['current_mission']['mission_id'], 'mission-1')
+
+    def test_serializes_as_plain_dict(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = os.path.join(temp_dir, 'world_state.json')
+            with mock.patch.object(world_state_manager, 'WORLD_STATE_FILE', state_file), \
+                    mock.patch.object(world_state_manager, 'WORLD_JOURNAL_FILE', state_file + '.journal'), \
+                    mock.patch.object(world_state_manager, '_persisted', {}):
+                get_agent_by_id(self.state, 'agent-0')
+                save_world_state(self.state)
+                with open(state_file, encoding='utf-8') as f:
+                    self.assertEqual(json.load(f), self.state)
+                loaded = load_world_state()
+        self.assertIsInstance(loaded, WorldState)
+        self.assertEqual(loaded, self.state)
+        self.assertEqual(set(loaded), set(world()) | {'time'})
+
+
+if __name__ == '__main__':
+    unittest.main()
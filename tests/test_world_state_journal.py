@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for world state delta persistence.
+
+Checks that saves append small journal entries that replay to the saved
+state, that compaction folds the journal into world_state.json, and that
+a stale journal or a torn final line does not corrupt the loaded state.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add world directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'world'))
+
+import world_state_manager
+from world_state_manager import (
+    compact_world_state,
+    increment_tick,
+    load_world_state,
+    save_world_state,
+    update_agent_location,
+)
+
+
+def world(agent_count=50):
+    return {
+        'tick': 1,
+        'time': '2025-11-12T00:00:00Z',
+        'agents': [
+            {'id': f'agent-{i}', 'label': f'Agent {i}', 'location_region_id': 'US:Charlotte',
+             'path': ['US:Seattle'], 'metrics': {'overall_score': 0.5}}
+            for i in range(agent_count)
+        ],
+        'regions': [{'id': 'US:Charlotte', 'idea_count': 0}, {'id': 'US:Seattle', 'idea_count': 3}],
+        'metrics': {'total_ideas': 3},
+    }
+
+
+class TestWorldStateJournal(unittest.TestCase):
+    """Test journaled saves, replay and compaction"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.temp_dir.name, 'world_state.json')
+        self.journal_file = os.path.join(self.temp_dir.name, 'world_state.journal.jsonl')
+        for name, value in (('WORLD_STATE_FILE', self.state_file),
+                            ('WORLD_JOURNAL_FILE', self.journal_file),
+                            ('_persisted', {})):
+            patcher = mock.patch.object(world_state_manager, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(world(), f, indent=2)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def reload(self):
+        world_state_manager._persisted.clear()
+        return load_world_state()
+
+    def test_save_appends_deltas(self):
+        snapshot = os.path.getsize(self.state_file)
+        state = load_world_state()
+        for i in range(50):
+            update_agent_location(state, f'agent-{i}', 'US:Seattle')
+        increment_tick(state)
+        save_world_state(state)
+
+        # The snapshot is untouched and the journal is far smaller
+        self.assertEqual(os.path.getsize(self.state_file), snapshot)
+        self.assertLess(os.path.getsize(self.journal_file), snapshot / 2)
+        self.assertEqual(self.reload(), state)
+
+        state['regions'].append({'id': 'GB:London', 'idea_count': 1})
+        state['regions'][0]['idea_count'] = 2
+        del state['agents'][3]
+        state['agents'][7]['path'].append('GB:London')
+        del state['metrics']['total_ideas']
+        save_world_state(state)
+        with open(self.journal_file, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 3)
+        self.assertEqual(self.reload(), state)
+
+    def test_unchanged_state_writes_nothing(self):
+        with mock.patch.object(world_state_manager, 'datetime') as clock:
+            clock.utcnow.return_value.strftime.return_value = '2025-11-12T00:00:00Z'
+            save_world_state(load_world_state())
+        self.assertFalse(os.path.exists(self.journal_file))
+
+    def test_duplicate_ids_diff_by_position(self):
+        state = load_world_state()
+        state['agents'].append(dict(state['agents'][0]))
+        save_world_state(state)
+        state['agents'][-1]['location_region_id'] = 'GB:London'
+        save_world_state(state)
+        self.assertEqual(self.reload(), state)
+
+    def test_compaction(self):
+        state = load_world_state()
+        update_agent_location(state, 'agent-0', 'US:Seattle')
+        save_world_state(state)
+        compact_world_state()
+        self.assertFalse(os.path.exists(self.journal_file))
+        with open(self.state_file, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), state)
+
+        # Large journals are compacted by save_world_state itself
+        with mock.patch.object(world_state_manager, 'JOURNAL_COMPACT_BYTES', 0):
+            update_agent_location(state, 'agent-1', 'US:Seattle')
+            save_world_state(state)
+        self.assertFalse(os.path.exists(self.journal_file))
+        self.assertEqual(self.reload(), state)
+
+    def test_stale_journal_ignored(self):
+        state = load_world_state()
+        update_agent_location(state, 'agent-0', 'US:Seattle')
+        save_world_state(state)
+
+        # A plain rewrite of the snapshot supersedes the old journal
+        fresh = world(agent_count=2)
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(fresh, f)
+        self.assertEqual(self.reload(), fresh)
+
+        update_agent_location(fresh, 'agent-1', 'GB:London')
+        save_world_state(fresh)
+        self.assertEqual(self.reload(), fresh)
+
+    def test_torn_last_line_dropped(self):
+        state = load_world_state()
+        update_agent_location(state, 'agent-0', 'US:Seattle')
+        save_world_state(state)
+        saved = self.reload()
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write('{"tick": 2, "ops": [{"op": "set", "pa')
+        self.assertEqual(self.reload(), saved)
+
+
+if __name__ == '__main__':
+    unittest.main()
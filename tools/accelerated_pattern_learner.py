@@ -26,6 +26,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from unsupervised_pattern_learner import (
     CodeFeatures, DiscoveredPattern, UnsupervisedPatternLearner
 )
+from clustering_engine import kmeans
 
 
 class AcceleratedPatternLearner(UnsupervisedPatternLearner):
@@ -257,7 +258,8 @@ class AcceleratedPatternLearner(UnsupervisedPatternLearner):
         docstring = ast.get_docstring(node)
         features.has_docstring = docstring is not None
     
-    def discover_patterns(self, n_clusters: int = 10, min_samples: int = 3) -> List[DiscoveredPattern]:
+    def discover_patterns(self, n_clusters: int = 10, min_samples: int = 3,
+                          batch_size: Optional[int] = None) -> List[DiscoveredPattern]:
         """
         Optimized pattern discovery.
         
@@ -281,7 +283,7 @@ class AcceleratedPatternLearner(UnsupervisedPatternLearner):
             vectors = self._normalized_cache
         
         # Optimized K-means clustering
-        clusters, centroids = self._kmeans_clustering_accelerated(vectors, n_clusters)
+        clusters, centroids = self._kmeans_clustering_accelerated(vectors, n_clusters, batch_size=batch_size)
         
         # Create pattern objects (same as base)
         patterns = []
@@ -306,74 +308,16 @@ class AcceleratedPatternLearner(UnsupervisedPatternLearner):
         return patterns
     
     def _kmeans_clustering_accelerated(self, vectors: List[List[float]], k: int, 
-                                      max_iterations: int = 100) -> Tuple[List[int], List[List[float]]]:
+                                      max_iterations: int = 100,
+                                      batch_size: Optional[int] = None) -> Tuple[List[int], List[List[float]]]:
         """
         Accelerated K-means with early termination.
         
         Optimization 11: Assignment comparison (not expensive inertia)
-        Optimization 12: Pre-allocated centroids
+        Optimization 12: Shared engine with incremental k-means++ seeding,
+        single-pass centroid updates and a NumPy path when available
         """
-        import random
-        
-        if not vectors or k <= 0:
-            return [], []
-        
-        n = len(vectors)
-        n_features = len(vectors[0])
-        
-        # Initialize centroids using k-means++ (already optimal)
-        centroids = []
-        centroids.append(vectors[random.randint(0, n-1)][:])
-        
-        for _ in range(k - 1):
-            distances = []
-            for vector in vectors:
-                min_dist = min(self._euclidean_distance(vector, c) for c in centroids)
-                distances.append(min_dist)
-            
-            total = sum(d**2 for d in distances)
-            if total == 0:
-                centroids.append(vectors[random.randint(0, n-1)][:])
-            else:
-                r = random.uniform(0, total)
-                cumsum = 0
-                for i, d in enumerate(distances):
-                    cumsum += d**2
-                    if cumsum >= r:
-                        centroids.append(vectors[i][:])
-                        break
-        
-        clusters = [0] * n
-        
-        for iteration in range(max_iterations):
-            # Assign points to nearest centroid
-            new_clusters = []
-            for vector in vectors:
-                distances = [self._euclidean_distance(vector, centroid) for centroid in centroids]
-                new_clusters.append(distances.index(min(distances)))
-            
-            # Early termination: check if assignments changed
-            if new_clusters == clusters:
-                break
-            
-            clusters = new_clusters
-            
-            # Update centroids efficiently
-            for cluster_id in range(k):
-                cluster_points = [vectors[i] for i, c in enumerate(clusters) if c == cluster_id]
-                if cluster_points:
-                    # Pre-allocated centroid update
-                    new_centroid = [0.0] * n_features
-                    for point in cluster_points:
-                        for i in range(n_features):
-                            new_centroid[i] += point[i]
-                    
-                    for i in range(n_features):
-                        new_centroid[i] /= len(cluster_points)
-                    
-                    centroids[cluster_id] = new_centroid
-        
-        return clusters, centroids
+        return kmeans(vectors, k, max_iterations=max_iterations, batch_size=batch_size)
     
     def get_performance_stats(self) -> Dict[str, any]:
         """Get performance statistics"""
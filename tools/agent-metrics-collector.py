@@ -47,6 +47,21 @@ try:
 except ImportError:
     REGISTRY_MANAGER_AVAILABLE = False
 
+# Import GraphQL read coalescing
+try:
+    from api_call_batcher import APIRequest
+    from github_graphql_coalescer import GraphQLCoalescingExecutor
+    GRAPHQL_COALESCER_AVAILABLE = True
+except ImportError:
+    GRAPHQL_COALESCER_AVAILABLE = False
+
+# Import conditional-request response cache (used by the fallback client)
+try:
+    from github_http_cache import HTTPResponseCache
+    HTTP_CACHE_AVAILABLE = True
+except ImportError:
+    HTTP_CACHE_AVAILABLE = False
+
 # Import GitHub integration utilities
 try:
     from github_integration import (
@@ -61,6 +76,10 @@ except ImportError:
     class GitHubAPIClient:
         def __init__(self, token=None):
             self.token = token or os.environ.get('GITHUB_TOKEN', os.environ.get('GH_TOKEN'))
+            self.cache = None
+            if HTTP_CACHE_AVAILABLE and os.environ.get('GITHUB_API_CACHE'):
+                self.cache = HTTPResponseCache(os.environ['GITHUB_API_CACHE'],
+                                               scope=os.environ.get('GITHUB_API_CACHE_SCOPE', ''))
         
         def get(self, endpoint, params=None, headers=None):
             """Minimal fallback implementation with support for custom headers"""
@@ -84,10 +103,22 @@ except ImportError:
                 for key, value in headers.items():
                     req.add_header(key, value)
             
+            # Revalidate a cached response instead of downloading it again
+            request_headers = dict(req.header_items())
+            cached = self.cache.lookup(url, request_headers) if self.cache else None
+            if cached:
+                for key, value in cached.conditional_headers().items():
+                    req.add_header(key, value)
+            
             try:
                 with urllib.request.urlopen(req, timeout=10) as response:
-                    return json.loads(response.read().decode('utf-8'))
+                    body = response.read()
+                    if self.cache:
+                        self.cache.store(url, request_headers, response.headers, body)
+                    return json.loads(body.decode('utf-8'))
             except urllib.error.HTTPError as e:
+                if e.code == 304 and cached:
+                    return json.loads(self.cache.replay(cached).decode('utf-8'))
                 # Log HTTP errors with details for debugging
                 print(f"⚠️  GitHub API HTTP {e.code}: {e.reason} for {endpoint}", file=sys.stderr)
                 if e.code == 403:
@@ -269,12 +300,16 @@ class MetricsCollector:
         Returns:
             Dictionary with API usage stats
         """
-        return {
+        stats = {
             'api_calls': self._api_call_count,
             'cached_issues': len(self._issue_cache),
             'cached_prs': len(self._pr_cache),
             'cached_timelines': len(self._timeline_cache)
         }
+        http_cache = getattr(self.github, 'cache', None)
+        if http_cache is not None:
+            stats['http_cache'] = http_cache.get_stats()
+        return stats
     
     def _load_scoring_weights(self) -> Dict[str, float]:
         """Load scoring weights from registry configuration"""
@@ -322,6 +357,35 @@ class MetricsCollector:
         
         return None
     
+    def _prefetch_issues(self, issue_numbers: List[int]):
+        """
+        Fetch uncached issues into the issue cache with as few API calls as
+        possible, by coalescing the reads into GraphQL queries.
+        
+        Issues that fail here are left uncached and fetched individually later.
+        
+        Args:
+            issue_numbers: Issue numbers to fetch
+        """
+        missing = [n for n in dict.fromkeys(issue_numbers) if n not in self._issue_cache]
+        if not missing or not GRAPHQL_COALESCER_AVAILABLE or not GITHUB_INTEGRATION_AVAILABLE:
+            return
+        
+        executor = GraphQLCoalescingExecutor(self.github)
+        try:
+            outcomes = executor.execute([
+                APIRequest('GET', f'/repos/{self.repo}/issues/{n}') for n in missing
+            ])
+        finally:
+            executor.shutdown()
+        self._api_call_count += executor.get_stats()['api_requests']
+        
+        for issue_number, (issue_details, error) in zip(missing, outcomes):
+            if error is None and issue_details:
+                self._issue_cache[issue_number] = issue_details
+        print(f"📦 Prefetched {len(missing)} issues in {executor.get_stats()['api_requests']} API calls",
+              file=sys.stderr)
+    
     def _batch_fetch_all_agent_issues(self, since_days: int) -> Dict[str, List[Dict]]:
         """
         Pre-fetch ALL agent-work issues once and distribute to agents.
@@ -370,6 +434,12 @@ class MetricsCollector:
             
             print(f"📋 Found {len(all_issues)} total agent-work issues")
             
+            # Fetch the truncated issues together instead of one request each
+            self._prefetch_issues([
+                issue.get('number') for issue in all_issues
+                if issue.get('number') and len(issue.get('body') or '') < 50
+            ])
+            
             # OPTIMIZATION: Search results already include body, use it directly
             # Only fetch full details if body is missing
             for issue in all_issues:
@@ -1008,6 +1078,9 @@ class MetricsCollector:
         query = f"repo:{self.repo} " + " ".join(filters)
         
         try:
+            if GITHUB_INTEGRATION_AVAILABLE:
+                # Every page, over the client's keep-alive connection
+                return list(self.github.paginate('/search/issues', {'q': query, 'per_page': 100}))
             results = self.github.get('/search/issues', {'q': query, 'per_page': 100})
             if results and 'items' in results:
                 return results['items']
@@ -1061,10 +1134,11 @@ class MetricsCollector:
             since_date = (datetime.now(timezone.utc) - timedelta(days=since_days)).isoformat()
             
             # Search for comments (issues and PRs)
-            result = self.github.get(
-                f'/repos/{self.repo}/issues/comments',
-                {'since': since_date, 'per_page': 100}
-            )
+            params = {'since': since_date, 'per_page': 100}
+            if GITHUB_INTEGRATION_AVAILABLE:
+                result = self.github.paginate(f'/repos/{self.repo}/issues/comments', params)
+            else:
+                result = self.github.get(f'/repos/{self.repo}/issues/comments', params)
             
             if result:
                 comments = [c for c in result if c.get('user', {}).get('login') == agent_user]
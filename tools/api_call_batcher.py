@@ -12,6 +12,8 @@ Features:
 - Priority queuing: Ensure critical requests are processed first
 - Automatic flushing: Configurable batch size and time windows
 - Thread-safe operations: Safe for concurrent use
+- Concurrent execution: A batch's requests run on a bounded worker pool,
+  each resolving its futures as soon as it finishes
 - Integration with APICoordinationHub: Unified API management
 
 Created by: @accelerate-specialist
@@ -40,6 +42,7 @@ import time
 import threading
 import hashlib
 import json
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Dict, Optional, Callable, Any, List, Tuple
 from enum import Enum
@@ -63,6 +66,7 @@ class BatchConfig:
     enable_deduplication: bool = True       # Deduplicate identical requests
     dedup_window: float = 60.0              # Deduplication window in seconds
     max_queue_size: int = 1000              # Maximum queued requests
+    max_workers: int = 8                    # Concurrent requests (default executor)
     strategy: BatchStrategy = BatchStrategy.ADAPTIVE
 
 
@@ -138,6 +142,82 @@ class RequestFuture:
         return self.completed.is_set()
 
 
+class ConcurrentBatchExecutor:
+    """
+    Runs each request of a batch on a bounded worker pool.
+    
+    Wraps a per-request function. BatchedAPIClient hands it batches through
+    submit(), and each request's futures resolve as soon as that request
+    finishes, so one slow endpoint only delays its own callers. Called with
+    a batch, it works as a plain batch executor returning results in order.
+    """
+    
+    def __init__(self, request_executor: Callable[[APIRequest], Any], max_workers: int = 8):
+        """
+        Args:
+            request_executor: Function executing one request.
+                     Signature: request_executor(request: APIRequest) -> Any
+            max_workers: Maximum requests running at once
+        """
+        self.request_executor = request_executor
+        self.max_workers = max_workers
+        # Started on first use, so the executor can be reused after shutdown()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+    
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='api-batcher')
+            return self._pool
+    
+    def submit(
+        self,
+        requests: List[APIRequest],
+        on_done: Callable[[APIRequest, Any, Optional[BaseException]], None]
+    ) -> List[Future]:
+        """
+        Start every request; on_done(request, result, error) runs as each
+        finishes, before its returned future completes
+        """
+        pool = self._get_pool()
+        return [pool.submit(self._run_request, request, on_done) for request in requests]
+    
+    def _run_request(self, request: APIRequest, on_done: Callable) -> None:
+        try:
+            result = self.request_executor(request)
+        except Exception as e:
+            on_done(request, None, e)
+            return
+        on_done(request, result, None)
+    
+    def execute(self, requests: List[APIRequest]) -> List[Tuple[Any, Optional[BaseException]]]:
+        """Run a batch and wait for it; (result, error) per request, in order"""
+        outcomes: Dict[int, Tuple[Any, Optional[BaseException]]] = {}
+        
+        def record(request, result, error):
+            outcomes[id(request)] = (result, error)
+        
+        for future in self.submit(requests, record):
+            future.result()
+        return [outcomes[id(request)] for request in requests]
+    
+    def __call__(self, requests: List[APIRequest]) -> List[Any]:
+        results = []
+        for result, error in self.execute(requests):
+            if error is not None:
+                raise error
+            results.append(result)
+        return results
+    
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool; a later submit starts a new one"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
 class BatchedAPIClient:
     """
     Intelligent API client that batches requests to reduce rate limit usage.
@@ -161,9 +241,14 @@ class BatchedAPIClient:
             config: Batch configuration (uses defaults if None)
             executor: Optional function to execute batched requests.
                      Signature: executor(requests: List[APIRequest]) -> List[Any]
+                     A ConcurrentBatchExecutor resolves each request on its
+                     own; the default is one running _default_request on
+                     config.max_workers threads.
         """
         self.config = config or BatchConfig()
-        self.executor = executor or self._default_executor
+        # The default executor's pool is shut down by stop()
+        self._owns_executor = executor is None
+        self.executor = executor or ConcurrentBatchExecutor(self._default_request, self.config.max_workers)
         
         # Request queue and deduplication
         self.request_queue = PriorityQueue(maxsize=self.config.max_queue_size)
@@ -176,6 +261,9 @@ class BatchedAPIClient:
         
         # Thread management
         self.lock = threading.RLock()
+        # Requests handed to the executor and not yet resolved
+        self.in_flight = 0
+        self.idle = threading.Condition(self.lock)
         self.running = False
         self.worker_thread = None
         
@@ -202,17 +290,20 @@ class BatchedAPIClient:
         Args:
             timeout: Maximum time to wait for shutdown
         """
+        deadline = time.monotonic() + timeout
         # Flush any pending requests before stopping
-        self.flush()
+        self.flush(timeout)
         
         with self.lock:
-            if not self.running:
-                return
-            
+            was_running = self.running
             self.running = False
         
-        if self.worker_thread:
-            self.worker_thread.join(timeout)
+        if was_running and self.worker_thread:
+            self.worker_thread.join(max(0.0, deadline - time.monotonic()))
+        
+        if self._owns_executor:
+            # Requests still running past the timeout finish on the pool's threads
+            self.executor.shutdown(wait=False)
     
     def add_request(
         self,
@@ -261,7 +352,8 @@ class BatchedAPIClient:
                 future.set_result(cached_result)
                 return future
         
-        # Check if identical request is already pending
+        # Check if identical request is already pending (in the same lock as
+        # queueing it, so concurrent duplicates share one pending entry)
         with self.lock:
             if request.request_id in self.pending_requests:
                 existing_request, futures = self.pending_requests[request.request_id]
@@ -270,11 +362,10 @@ class BatchedAPIClient:
                 futures.append(future)
                 self.deduplicated_requests += 1
                 return future
-        
-        # Create new future and queue the request
-        future = RequestFuture()
-        
-        with self.lock:
+            
+            # Create new future and queue the request
+            future = RequestFuture()
+            
             # Add to pending requests
             self.pending_requests[request.request_id] = (request, [future])
             
@@ -288,8 +379,17 @@ class BatchedAPIClient:
         
         return future
     
-    def flush(self):
-        """Force flush of current batch"""
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Force flush of current batch and wait for all requests in flight
+        
+        Args:
+            timeout: Maximum time to wait for requests in flight (None waits
+                     for all of them)
+            
+        Returns:
+            True if no requests were left in flight
+        """
         # Process any remaining items in the queue before flushing
         while not self.request_queue.empty():
             try:
@@ -301,14 +401,16 @@ class BatchedAPIClient:
                 break
         
         with self.lock:
-            if not self.current_batch:
-                return
-            
-            self._execute_batch()
+            batch = self._take_batch()
+        self._run_batch(batch)
+        
+        with self.idle:
+            return self.idle.wait_for(lambda: self.in_flight == 0, timeout)
     
     def _worker(self):
         """Background worker that processes batched requests"""
         while self.running:
+            batch = None
             try:
                 # Check if we should flush based on time
                 time_since_last_flush = time.time() - self.last_flush_time
@@ -326,66 +428,86 @@ class BatchedAPIClient:
                         should_flush_size = len(self.current_batch) >= self.config.batch_size
                         
                         if should_flush_size or should_flush_time:
-                            self._execute_batch()
+                            batch = self._take_batch()
                 
                 except:
                     # Queue timeout or empty
                     if should_flush_time:
                         with self.lock:
-                            self._execute_batch()
+                            batch = self._take_batch()
+                
+                # Executed outside the lock, so add_request never waits on a batch
+                self._run_batch(batch)
             
             except Exception as e:
                 # Worker error handling
                 print(f"Worker error: {e}", file=sys.stderr)
                 time.sleep(0.1)
     
-    def _execute_batch(self):
-        """Execute the current batch of requests"""
-        if not self.current_batch:
-            return
-        
+    def _take_batch(self) -> List[Tuple[APIRequest, RequestFuture]]:
+        """Detach the current batch for execution (call with the lock held)"""
         batch = self.current_batch
+        if not batch:
+            return batch
+        
         self.current_batch = []
         self.last_flush_time = time.time()
         self.batches_flushed += 1
+        self.in_flight += len(batch)
+        
+        # Clean up old entries from dedup cache
+        self._cleanup_dedup_cache()
+        return batch
+    
+    def _run_batch(self, batch: Optional[List[Tuple[APIRequest, RequestFuture]]]):
+        """Execute a detached batch (call without the lock held)"""
+        if not batch:
+            return
         
-        # Extract requests and futures
         requests = [req for req, _ in batch]
-        futures = [fut for _, fut in batch]
+        
+        if isinstance(self.executor, ConcurrentBatchExecutor):
+            # Each request completes on its own
+            self.executor.submit(requests, self._complete_request)
+            return
         
         try:
             # Execute batch
-            results = self.executor(requests)
-            
-            # Set results and update dedup cache
-            for request, future, result in zip(requests, futures, results):
-                future.set_result(result)
-                
-                # Update deduplication cache
-                if self.config.enable_deduplication:
-                    self.dedup_cache[request.request_id] = (result, time.time())
-                
-                # Remove from pending
-                if request.request_id in self.pending_requests:
-                    # Set result for all futures waiting on this request
-                    _, all_futures = self.pending_requests[request.request_id]
-                    for f in all_futures:
-                        if not f.is_done():
-                            f.set_result(result)
-                    del self.pending_requests[request.request_id]
-        
+            results = list(self.executor(requests))
         except Exception as e:
             # Batch execution failed, set error for all futures
-            for future in futures:
-                future.set_error(e)
-            
-            # Clean up pending requests
-            for request, _ in batch:
-                if request.request_id in self.pending_requests:
-                    del self.pending_requests[request.request_id]
+            for request in requests:
+                self._complete_request(request, None, e)
+            return
         
-        # Clean up old entries from dedup cache
-        self._cleanup_dedup_cache()
+        for index, request in enumerate(requests):
+            if index < len(results):
+                self._complete_request(request, results[index], None)
+            else:
+                self._complete_request(request, None, Exception("Executor returned no result for request"))
+    
+    def _complete_request(self, request: APIRequest, result: Any, error: Optional[BaseException]):
+        """Resolve every future waiting on a request"""
+        with self.lock:
+            # Update deduplication cache
+            if error is None and self.config.enable_deduplication:
+                self.dedup_cache[request.request_id] = (result, time.time())
+            
+            # Remove from pending
+            _, futures = self.pending_requests.pop(request.request_id, (request, []))
+            
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self.idle.notify_all()
+        
+        # Set result for all futures waiting on this request
+        for future in futures:
+            if future.is_done():
+                continue
+            if error is not None:
+                future.set_error(error)
+            else:
+                future.set_result(result)
     
     def _check_dedup_cache(self, request: APIRequest) -> Optional[Any]:
         """Check if request result is in deduplication cache"""
@@ -412,23 +534,20 @@ class BatchedAPIClient:
         for key in expired_keys:
             del self.dedup_cache[key]
     
-    def _default_executor(self, requests: List[APIRequest]) -> List[Any]:
+    def _default_request(self, request: APIRequest) -> Any:
         """
-        Default executor that processes requests individually.
+        Default executor for a single request.
         
         Override this or provide custom executor for actual API calls.
         """
-        results = []
-        for request in requests:
-            # Simulate API call
-            time.sleep(0.01)
-            results.append({
-                'method': request.method,
-                'endpoint': request.endpoint,
-                'status': 'success',
-                'timestamp': time.time()
-            })
-        return results
+        # Simulate API call
+        time.sleep(0.01)
+        return {
+            'method': request.method,
+            'endpoint': request.endpoint,
+            'status': 'success',
+            'timestamp': time.time()
+        }
     
     def get_stats(self) -> Dict[str, Any]:
         """Get batcher statistics"""
@@ -440,6 +559,7 @@ class BatchedAPIClient:
                 'batches_flushed': self.batches_flushed,
                 'current_batch_size': len(self.current_batch),
                 'pending_requests': len(self.pending_requests),
+                'in_flight_requests': self.in_flight,
                 'cache_size': len(self.dedup_cache),
                 'reduction_rate': (
                     self.deduplicated_requests / self.total_requests
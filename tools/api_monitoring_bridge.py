@@ -20,13 +20,15 @@ Usage:
 """
 
 import time
-import statistics
 import json
-from typing import Dict, List, Any, Optional
-from collections import defaultdict
+import heapq
+import itertools
+from typing import Deque, Dict, List, Any, Optional, Tuple
+from collections import defaultdict, deque
 from dataclasses import dataclass, asdict
 from datetime import datetime
-import math
+
+from metrics_sketch import RequestStats
 
 
 @dataclass
@@ -74,12 +76,28 @@ class APIMonitoringBridge:
     
     Built by @bridge-master to ensure our API bridges stay healthy and fast.
     Tracks response times, error rates, and SLA compliance in real-time.
+    
+    Statistics live in constant-memory sketches (percentiles are estimates
+    within 1%); only the most recent requests and errors and the slowest
+    requests are kept individually.
     """
     
-    def __init__(self):
-        """Initialize the monitoring bridge"""
-        self.metrics: Dict[str, List[RequestMetric]] = defaultdict(list)
-        self.errors: Dict[str, List[Dict]] = defaultdict(list)
+    def __init__(self, history_size: int = 1000, error_history: int = 100, slowest_size: int = 100):
+        """
+        Initialize the monitoring bridge
+        
+        Args:
+            history_size: Recent requests kept per endpoint for export
+            error_history: Recent errors kept per endpoint
+            slowest_size: Slowest requests kept per endpoint
+        """
+        self.stats: Dict[str, RequestStats] = {}
+        self.metrics: Dict[str, Deque[RequestMetric]] = defaultdict(lambda: deque(maxlen=history_size))
+        self.errors: Dict[str, Deque[Dict]] = defaultdict(lambda: deque(maxlen=error_history))
+        self.slowest_size = slowest_size
+        # Per endpoint, a min-heap of (duration_ms, sequence, metric) for the slowest requests
+        self._slowest: Dict[str, List[Tuple[float, int, RequestMetric]]] = defaultdict(list)
+        self._sequence = itertools.count()
         self.start_time = time.time()
         self.endpoint_count: Dict[str, int] = defaultdict(int)
     
@@ -115,9 +133,19 @@ class APIMonitoringBridge:
             error=error
         )
         
+        if key not in self.stats:
+            self.stats[key] = RequestStats()
+        self.stats[key].record(duration_ms, status_code, metric.timestamp, error=not metric.success)
         self.metrics[key].append(metric)
         self.endpoint_count[key] += 1
         
+        slowest = self._slowest[key]
+        entry = (duration_ms, next(self._sequence), metric)
+        if len(slowest) < self.slowest_size:
+            heapq.heappush(slowest, entry)
+        elif duration_ms > slowest[0][0]:
+            heapq.heapreplace(slowest, entry)
+        
         # Record errors separately for easy access
         if error or status_code >= 400:
             self.errors[key].append({
@@ -139,39 +167,45 @@ class APIMonitoringBridge:
             EndpointStats object with all metrics, or None if no data
         """
         key = self._make_key(endpoint, method)
-        metrics = self.metrics.get(key, [])
+        stats = self.stats.get(key)
         
-        if not metrics:
+        if not stats or not stats.total_requests:
             return None
         
-        durations = [m.duration_ms for m in metrics]
-        successes = [m for m in metrics if m.success]
-        
-        # Calculate percentiles
-        sorted_durations = sorted(durations)
+        total = stats.total_requests
+        successes = total - stats.error_count
+        latency = stats.latency
         
         # Calculate requests per second
         elapsed_time = time.time() - self.start_time
-        rps = len(metrics) / elapsed_time if elapsed_time > 0 else 0
+        rps = total / elapsed_time if elapsed_time > 0 else 0
         
         return EndpointStats(
             endpoint=endpoint,
             method=method,
-            total_requests=len(metrics),
-            success_count=len(successes),
-            error_count=len(metrics) - len(successes),
-            success_rate=len(successes) / len(metrics) if metrics else 0,
-            error_rate=1 - (len(successes) / len(metrics)) if metrics else 0,
-            avg_duration_ms=statistics.mean(durations),
-            median_duration_ms=statistics.median(durations),
-            p50_duration_ms=self._percentile(sorted_durations, 50),
-            p95_duration_ms=self._percentile(sorted_durations, 95),
-            p99_duration_ms=self._percentile(sorted_durations, 99),
-            min_duration_ms=min(durations),
-            max_duration_ms=max(durations),
+            total_requests=total,
+            success_count=successes,
+            error_count=stats.error_count,
+            success_rate=successes / total,
+            error_rate=stats.error_count / total,
+            avg_duration_ms=latency.mean,
+            median_duration_ms=latency.quantile(0.5),
+            p50_duration_ms=latency.percentile(50),
+            p95_duration_ms=latency.percentile(95),
+            p99_duration_ms=latency.percentile(99),
+            min_duration_ms=latency.min,
+            max_duration_ms=latency.max,
             requests_per_second=rps
         )
     
+    def get_recent_error_rate(self, endpoint: str, method: str) -> float:
+        """
+        Error rate over the last five minutes, unlike EndpointStats.error_rate
+        which covers every request since the start
+        """
+        stats = self.stats.get(self._make_key(endpoint, method))
+        return stats.window.error_rate() if stats else 0.0
+    
     def check_sla(
         self,
         endpoint: str,
@@ -270,7 +304,7 @@ class APIMonitoringBridge:
         """
         if endpoint and method:
             key = self._make_key(endpoint, method)
-            errors = self.errors.get(key, [])
+            errors = list(self.errors.get(key, []))
         else:
             # Get all errors
             errors = []
@@ -301,18 +335,18 @@ class APIMonitoringBridge:
         """
         if endpoint and method:
             key = self._make_key(endpoint, method)
-            metrics = self.metrics.get(key, [])
+            entries = list(self._slowest.get(key, []))
         else:
             # Get all metrics
-            metrics = []
-            for metric_list in self.metrics.values():
-                metrics.extend(metric_list)
+            entries = []
+            for slowest in self._slowest.values():
+                entries.extend(slowest)
         
         # Sort by duration (slowest first)
-        metrics.sort(key=lambda m: m.duration_ms, reverse=True)
+        entries = heapq.nlargest(limit, entries)
         
         # Convert to dicts for easier consumption
-        return [asdict(m) for m in metrics[:limit]]
+        return [asdict(metric) for _, _, metric in entries]
     
     def generate_report(
         self,
@@ -344,17 +378,17 @@ class APIMonitoringBridge:
         
         # Overall stats
         elapsed = time.time() - self.start_time
-        total_requests = sum(len(metrics) for metrics in self.metrics.values())
+        total_requests = sum(stats.total_requests for stats in self.stats.values())
         
         report.append(f"**Monitoring Duration:** {elapsed:.2f}s")
         report.append(f"**Total Requests:** {total_requests:,}")
-        report.append(f"**Endpoints Monitored:** {len(self.metrics)}")
+        report.append(f"**Endpoints Monitored:** {len(self.stats)}")
         report.append("")
         
         # Per-endpoint stats
         report.append("## 📊 Endpoint Statistics\n")
         
-        for key in sorted(self.metrics.keys()):
+        for key in sorted(self.stats.keys()):
             endpoint, method = self._split_key(key)
             stats = self.get_endpoint_stats(endpoint, method)
             
@@ -428,20 +462,19 @@ class APIMonitoringBridge:
         report.append("")
         
         # Overall success rate
-        all_metrics = []
-        for metrics in self.metrics.values():
-            all_metrics.extend(metrics)
+        overall = RequestStats()
+        for stats in self.stats.values():
+            overall.merge(stats)
         
-        if all_metrics:
-            total_success = sum(1 for m in all_metrics if m.success)
-            overall_success_rate = total_success / len(all_metrics)
+        if overall.total_requests:
+            total_success = overall.total_requests - overall.error_count
+            overall_success_rate = total_success / overall.total_requests
             
             report.append(f"- **Overall Success Rate:** {overall_success_rate:.2%}")
-            report.append(f"- **Total Errors:** {len(all_metrics) - total_success}")
+            report.append(f"- **Total Errors:** {overall.error_count}")
             
-            all_durations = [m.duration_ms for m in all_metrics]
-            report.append(f"- **Average Response Time:** {statistics.mean(all_durations):.0f}ms")
-            report.append(f"- **Median Response Time:** {statistics.median(all_durations):.0f}ms")
+            report.append(f"- **Average Response Time:** {overall.latency.mean:.0f}ms")
+            report.append(f"- **Median Response Time:** {overall.latency.quantile(0.5):.0f}ms")
         
         report.append("")
         report.append("---")
@@ -455,13 +488,13 @@ class APIMonitoringBridge:
             'metadata': {
                 'generated_at': datetime.now().isoformat(),
                 'monitoring_duration_s': time.time() - self.start_time,
-                'total_requests': sum(len(m) for m in self.metrics.values()),
-                'endpoints_monitored': len(self.metrics)
+                'total_requests': sum(stats.total_requests for stats in self.stats.values()),
+                'endpoints_monitored': len(self.stats)
             },
             'endpoints': []
         }
         
-        for key in self.metrics.keys():
+        for key in self.stats.keys():
             endpoint, method = self._split_key(key)
             stats = self.get_endpoint_stats(endpoint, method)
             
@@ -491,14 +524,14 @@ class APIMonitoringBridge:
         report.append("")
         
         elapsed = time.time() - self.start_time
-        total_requests = sum(len(metrics) for metrics in self.metrics.values())
+        total_requests = sum(stats.total_requests for stats in self.stats.values())
         
         report.append(f"Monitoring Duration: {elapsed:.2f}s")
         report.append(f"Total Requests: {total_requests}")
-        report.append(f"Endpoints Monitored: {len(self.metrics)}")
+        report.append(f"Endpoints Monitored: {len(self.stats)}")
         report.append("")
         
-        for key in sorted(self.metrics.keys()):
+        for key in sorted(self.stats.keys()):
             endpoint, method = self._split_key(key)
             stats = self.get_endpoint_stats(endpoint, method)
             
@@ -529,7 +562,10 @@ class APIMonitoringBridge:
     
     def export_metrics(self, filepath: str, format: str = 'json'):
         """
-        Export all metrics to a file
+        Export the recent requests of every endpoint to a file
+        
+        JSON exports also hold each endpoint's statistics as snapshots,
+        which merge_snapshots can load into another monitor.
         
         Args:
             filepath: Path to save metrics
@@ -547,7 +583,8 @@ class APIMonitoringBridge:
         data = {
             'start_time': self.start_time,
             'end_time': time.time(),
-            'metrics': {}
+            'metrics': {},
+            'snapshots': {key: stats.snapshot() for key, stats in self.stats.items()}
         }
         
         for key, metrics in self.metrics.items():
@@ -584,26 +621,27 @@ class APIMonitoringBridge:
         method, endpoint = key.split(':', 1)
         return endpoint, method
     
-    def _percentile(self, sorted_data: List[float], percentile: int) -> float:
-        """Calculate percentile from sorted data"""
-        if not sorted_data:
-            return 0.0
-        
-        index = (percentile / 100.0) * (len(sorted_data) - 1)
-        lower = math.floor(index)
-        upper = math.ceil(index)
-        
-        if lower == upper:
-            return sorted_data[int(index)]
+    def merge_snapshots(self, snapshots: Dict[str, Dict[str, Any]]):
+        """
+        Merge endpoint statistics exported by another monitor
         
-        # Interpolate between values
-        weight = index - lower
-        return sorted_data[lower] * (1 - weight) + sorted_data[upper] * weight
+        Args:
+            snapshots: The 'snapshots' of a JSON export, by endpoint key
+        """
+        for key, snapshot in snapshots.items():
+            stats = RequestStats.from_snapshot(snapshot)
+            if key in self.stats:
+                self.stats[key].merge(stats)
+            else:
+                self.stats[key] = stats
+            self.endpoint_count[key] += stats.total_requests
     
     def reset(self):
         """Reset all metrics"""
+        self.stats.clear()
         self.metrics.clear()
         self.errors.clear()
+        self._slowest.clear()
         self.endpoint_count.clear()
         self.start_time = time.time()
 
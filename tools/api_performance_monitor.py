@@ -12,26 +12,29 @@ Date: 2025-11-16
 
 import time
 import json
-import statistics
-from typing import List, Dict, Optional, Callable
-from dataclasses import dataclass, field, asdict
+from typing import Any, List, Dict, Optional, Callable
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict
 import sys
 
+from metrics_sketch import RequestStats
+
 
 @dataclass
 class APIMetrics:
-    """Store API performance metrics for an endpoint."""
+    """
+    Store API performance metrics for an endpoint.
+    
+    Response times go into a constant-memory histogram, so percentiles are
+    estimates within 1% and memory does not grow with traffic.
+    """
     
     endpoint: str
     method: str
-    response_times: List[float] = field(default_factory=list)
-    status_codes: List[int] = field(default_factory=list)
     error_count: int = 0
     total_requests: int = 0
-    timestamps: List[float] = field(default_factory=list)
+    stats: RequestStats = field(default_factory=RequestStats)
     
     def add_request(self, response_time: float, status_code: int, timestamp: Optional[float] = None):
         """
@@ -42,9 +45,7 @@ class APIMetrics:
             status_code: HTTP status code
             timestamp: Request timestamp (defaults to now)
         """
-        self.response_times.append(response_time)
-        self.status_codes.append(status_code)
-        self.timestamps.append(timestamp or time.time())
+        self.stats.record(response_time, status_code, timestamp or time.time(), error=status_code >= 400)
         self.total_requests += 1
         
         if status_code >= 400:
@@ -52,7 +53,8 @@ class APIMetrics:
     
     def get_stats(self) -> Dict:
         """Calculate comprehensive statistics."""
-        if not self.response_times:
+        latency = self.stats.latency
+        if not latency.count:
             return {
                 'endpoint': self.endpoint,
                 'method': self.method,
@@ -60,6 +62,7 @@ class APIMetrics:
                 'error_count': 0
             }
         
+        first, last = self.stats.first_timestamp, self.stats.last_timestamp
         stats = {
             'endpoint': self.endpoint,
             'method': self.method,
@@ -67,26 +70,27 @@ class APIMetrics:
             'error_count': self.error_count,
             'error_rate': self.error_count / self.total_requests,
             'success_rate': (self.total_requests - self.error_count) / self.total_requests,
+            'recent_error_rate': self.stats.window.error_rate(),
             
             # Response time statistics
-            'avg_response_time': statistics.mean(self.response_times),
-            'median_response_time': statistics.median(self.response_times),
-            'p50_response_time': self._percentile(self.response_times, 50),
-            'p75_response_time': self._percentile(self.response_times, 75),
-            'p90_response_time': self._percentile(self.response_times, 90),
-            'p95_response_time': self._percentile(self.response_times, 95),
-            'p99_response_time': self._percentile(self.response_times, 99),
-            'max_response_time': max(self.response_times),
-            'min_response_time': min(self.response_times),
-            'stddev_response_time': statistics.stdev(self.response_times) if len(self.response_times) > 1 else 0,
+            'avg_response_time': latency.mean,
+            'median_response_time': latency.quantile(0.5),
+            'p50_response_time': latency.percentile(50),
+            'p75_response_time': latency.percentile(75),
+            'p90_response_time': latency.percentile(90),
+            'p95_response_time': latency.percentile(95),
+            'p99_response_time': latency.percentile(99),
+            'max_response_time': latency.max,
+            'min_response_time': latency.min,
+            'stddev_response_time': latency.stddev,
             
             # Status code breakdown
             'status_codes': self._status_code_breakdown(),
             
             # Time range
-            'first_request': datetime.fromtimestamp(min(self.timestamps)).isoformat() if self.timestamps else None,
-            'last_request': datetime.fromtimestamp(max(self.timestamps)).isoformat() if self.timestamps else None,
-            'duration_seconds': max(self.timestamps) - min(self.timestamps) if self.timestamps else 0,
+            'first_request': datetime.fromtimestamp(first).isoformat(),
+            'last_request': datetime.fromtimestamp(last).isoformat(),
+            'duration_seconds': last - first,
         }
         
         # Calculate requests per second
@@ -97,20 +101,24 @@ class APIMetrics:
         
         return stats
     
-    def _percentile(self, data: List[float], percentile: int) -> float:
-        """Calculate percentile value."""
-        if not data:
-            return 0.0
-        sorted_data = sorted(data)
-        index = int(len(sorted_data) * percentile / 100)
-        return sorted_data[min(index, len(sorted_data) - 1)]
-    
     def _status_code_breakdown(self) -> Dict[str, int]:
         """Get count of each status code."""
-        breakdown = defaultdict(int)
-        for code in self.status_codes:
-            breakdown[str(code)] += 1
-        return dict(breakdown)
+        return {str(code): count for code, count in self.stats.status_codes.items()}
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable metrics, restorable and mergeable with from_snapshot"""
+        return {'endpoint': self.endpoint, 'method': self.method, 'stats': self.stats.snapshot()}
+    
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> 'APIMetrics':
+        stats = RequestStats.from_snapshot(data['stats'])
+        return cls(data['endpoint'], data['method'], stats.error_count, stats.total_requests, stats)
+    
+    def merge(self, other: 'APIMetrics'):
+        """Add another set of metrics for this endpoint (e.g. from an earlier run)"""
+        self.stats.merge(other.stats)
+        self.total_requests += other.total_requests
+        self.error_count += other.error_count
     
     def check_sla(self, sla_config: Dict) -> Dict:
         """
@@ -208,6 +216,21 @@ class APIMonitor:
         
         self.metrics[key].add_request(response_time, status_code, timestamp)
     
+    def merge_snapshots(self, snapshots: List[Dict[str, Any]]):
+        """
+        Merge metrics saved by export_json (its 'snapshots') into this monitor.
+        
+        Args:
+            snapshots: APIMetrics snapshots, e.g. from another process or run
+        """
+        for snapshot in snapshots:
+            metrics = APIMetrics.from_snapshot(snapshot)
+            key = f"{metrics.method}:{metrics.endpoint}"
+            if key in self.metrics:
+                self.metrics[key].merge(metrics)
+            else:
+                self.metrics[key] = metrics
+    
     def get_all_stats(self) -> List[Dict]:
         """Get statistics for all endpoints."""
         return [m.get_stats() for m in self.metrics.values()]
@@ -321,7 +344,8 @@ class APIMonitor:
                 'total_endpoints': len(self.metrics),
                 'total_requests': sum(m.total_requests for m in self.metrics.values()),
                 'total_errors': sum(m.error_count for m in self.metrics.values()),
-            }
+            },
+            'snapshots': [m.snapshot() for m in self.metrics.values()]
         }
         
         with open(output_path, 'w') as f:
@@ -438,11 +462,10 @@ def main():
             with open(args.input) as f:
                 data = json.load(f)
             
-            # Reconstruct metrics from saved data
-            for endpoint_stats in data.get('endpoints', []):
-                # This is a simplified reconstruction
-                # In production, you'd want to save and restore full metric objects
-                print(f"Loaded stats for {endpoint_stats['method']} {endpoint_stats['endpoint']}")
+            # Restore metrics from their saved snapshots
+            monitor.merge_snapshots(data.get('snapshots', []))
+            for key in monitor.metrics:
+                print(f"Loaded stats for {key}")
             
             print(f"✅ Loaded metrics from {args.input}")
         except Exception as e:
@@ -45,24 +45,22 @@ def main():
         success_count = 0
         fail_count = 0
         
-        for agent_id, agent_updates in updates.items():
-            # Get current agent data
-            agent = registry.get_agent(agent_id)
-            if not agent:
-                print(f"⚠️  Agent {agent_id} not found, skipping")
-                fail_count += 1
-                continue
-            
-            # Merge updates
-            agent.update(agent_updates)
-            
-            # Update registry
-            if registry.update_agent(agent):
+        # All updates are written together, so a failure part way leaves
+        # the registry unchanged
+        with registry.batch() as tx:
+            for agent_id, agent_updates in updates.items():
+                # Get current agent data
+                agent = tx.get_agent(agent_id)
+                if not agent:
+                    print(f"⚠️  Agent {agent_id} not found, skipping")
+                    fail_count += 1
+                    continue
+                
+                # Merge updates
+                agent.update(agent_updates)
+                tx.update_agent(agent)
                 print(f"✓ Updated agent {agent_id}")
                 success_count += 1
-            else:
-                print(f"✗ Failed to update agent {agent_id}")
-                fail_count += 1
         
         print(f"\n✅ Updated {success_count} agent(s)")
         if fail_count > 0:
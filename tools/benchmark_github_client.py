@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Performance Benchmark for GitHubAPIClient Connections
+
+Measures requests/sec against a local keep-alive HTTP stub, with a new
+connection per request (pool_size=0, the old urlopen behaviour) and with
+pooled keep-alive connections, for single GETs and for a paginated read.
+
+The stub is plain HTTP on loopback, so this only measures the TCP setup
+saved per request; against api.github.com each new connection also costs
+a TLS handshake and a network round trip, and the gap is much larger.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add tools directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from github_integration import GitHubAPIClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves /items?page=N with a Link header to the next page"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, Nagle and
+    # delayed ACKs stall every response on a kept-alive connection
+    disable_nagle_algorithm = True
+    pages = 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        params = dict(p.split('=', 1) for p in query.split('&') if '=' in p)
+        page = int(params.get('page', 1))
+        body = json.dumps([{'number': page * 100 + i} for i in range(30)]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if page < self.pages:
+            base = f'http://127.0.0.1:{self.server.server_address[1]}'
+            self.send_header('Link', f'<{base}{path}?page={page + 1}>; rel="next"')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def run_gets(client: GitHubAPIClient, count: int) -> float:
+    """Requests/sec for `count` single GETs"""
+    start = time.perf_counter()
+    for _ in range(count):
+        client.get('/items')
+    return count / (time.perf_counter() - start)
+
+
+def run_paginated(client: GitHubAPIClient, pages: int) -> float:
+    """Requests/sec reading `pages` pages through paginate()"""
+    StubHandler.pages = pages
+    start = time.perf_counter()
+    for _ in client.paginate('/items'):
+        pass
+    elapsed = time.perf_counter() - start
+    StubHandler.pages = 1
+    return pages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark GitHubAPIClient connection pooling')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--pages', type=int, default=500)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    print("=" * 70)
+    print(f"GitHubAPIClient Connection Benchmark ({args.requests} GETs, {args.pages} pages)")
+    print("=" * 70)
+
+    results = {}
+    for label, pool_size in (('New connection each', 0), ('Pooled keep-alive', 10)):
+        client = GitHubAPIClient(token='benchmark', base_url=base_url, pool_size=pool_size)
+        results[label] = (run_gets(client, args.requests), run_paginated(client, args.pages))
+        client.close()
+        print(f"{label + ':':22} {results[label][0]:8.0f} req/s GET   {results[label][1]:8.0f} req/s paginated")
+
+    before, after = results['New connection each'], results['Pooled keep-alive']
+    print(f"\nSpeedup: {after[0] / before[0]:.1f}x GET, {after[1] / before[1]:.1f}x paginated")
+
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == '__main__':
+    main()
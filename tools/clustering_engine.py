@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+"""
+Shared K-means Clustering Engine
+Author: @engineer-master
+
+One k-means implementation used by the issue clustering system and the
+unsupervised pattern learners, so seeding and convergence behave the same
+everywhere.
+
+Features:
+- K-means++ seeding that keeps a running nearest-centroid distance per point,
+  so each seeding round costs O(n·d) instead of O(n·k·d)
+- Lloyd iterations with single-pass centroid updates
+- Mini-batch k-means for large corpora
+- NumPy-backed vectorized path (numpy is in requirements.txt), pure-Python
+  fallback when it is missing (both draw from the same random source in the
+  same order)
+- Silhouette scoring: exact, sampled (with a confidence interval) or
+  simplified against centroids, with reusable distance rows for k sweeps
+"""
+
+import math
+import random
+import statistics
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+def squared_euclidean(v1: Sequence[float], v2: Sequence[float]) -> float:
+    """Calculate the squared Euclidean distance between two vectors."""
+    return sum((a - b) ** 2 for a, b in zip(v1, v2))
+
+
+def euclidean_distance(v1: Sequence[float], v2: Sequence[float]) -> float:
+    """Calculate the Euclidean distance between two vectors."""
+    return math.sqrt(squared_euclidean(v1, v2))
+
+
+def _pick_weighted(weights: Sequence[float], total: float, rng) -> int:
+    """Pick an index with probability proportional to its weight."""
+    r = rng.uniform(0, total)
+    cumsum = 0.0
+    for i, weight in enumerate(weights):
+        cumsum += weight
+        if cumsum >= r:
+            return i
+    # Floating point rounding can leave cumsum just below r
+    return len(weights) - 1
+
+
+def kmeans_plus_plus(
+    vectors: Sequence[Sequence[float]],
+    k: int,
+    rng=None
+) -> List[List[float]]:
+    """
+    Choose initial centroids with k-means++.
+
+    The first centroid is a uniformly random point; each following centroid is
+    a point drawn with probability proportional to its squared distance to the
+    nearest centroid chosen so far. When all points coincide with existing
+    centroids, a uniformly random point is used instead.
+
+    Args:
+        vectors: Feature vectors
+        k: Number of centroids
+        rng: Random source with randint/uniform (defaults to the random module)
+
+    Returns:
+        List of k centroids
+    """
+    rng = rng or random
+    n = len(vectors)
+    if n == 0 or k <= 0:
+        return []
+
+    if NUMPY_AVAILABLE and isinstance(vectors, np.ndarray):
+        return _kmeans_plus_plus_numpy(vectors, k, rng)
+
+    first = vectors[rng.randint(0, n - 1)]
+    centroids = [list(first)]
+    min_sq = [squared_euclidean(vector, first) for vector in vectors]
+
+    for _ in range(k - 1):
+        total = sum(min_sq)
+        if total == 0:
+            index = rng.randint(0, n - 1)
+        else:
+            index = _pick_weighted(min_sq, total, rng)
+
+        centroid = list(vectors[index])
+        centroids.append(centroid)
+        # Only the new centroid can lower a point's nearest distance
+        for i, vector in enumerate(vectors):
+            dist = squared_euclidean(vector, centroid)
+            if dist < min_sq[i]:
+                min_sq[i] = dist
+
+    return centroids
+
+
+def _kmeans_plus_plus_numpy(X, k: int, rng) -> List[List[float]]:
+    """Vectorized k-means++ seeding over a NumPy matrix."""
+    n = X.shape[0]
+    indices = [rng.randint(0, n - 1)]
+    min_sq = ((X - X[indices[0]]) ** 2).sum(axis=1)
+
+    for _ in range(k - 1):
+        total = float(min_sq.sum())
+        if total == 0:
+            index = rng.randint(0, n - 1)
+        else:
+            r = rng.uniform(0, total)
+            index = int(np.searchsorted(np.cumsum(min_sq), r, side='left'))
+            index = min(index, n - 1)
+        indices.append(index)
+        np.minimum(min_sq, ((X - X[index]) ** 2).sum(axis=1), out=min_sq)
+
+    return [X[i].tolist() for i in indices]
+
+
+def assign_to_centroids(
+    vectors: Sequence[Sequence[float]],
+    centroids: Sequence[Sequence[float]]
+) -> List[int]:
+    """
+    Assign each vector to its nearest centroid (first one wins ties).
+
+    Args:
+        vectors: Feature vectors
+        centroids: Cluster centroids
+
+    Returns:
+        Cluster index for every vector
+    """
+    assignments = []
+    for vector in vectors:
+        best_index = 0
+        best_dist = float('inf')
+        for index, centroid in enumerate(centroids):
+            dist = squared_euclidean(vector, centroid)
+            if dist < best_dist:
+                best_dist = dist
+                best_index = index
+        assignments.append(best_index)
+    return assignments
+
+
+def _assign_numpy(X, C):
+    """Vectorized nearest-centroid assignment."""
+    # ||x - c||^2 = ||x||^2 - 2 x·c + ||c||^2; ||x||^2 is constant per row
+    scores = (C ** 2).sum(axis=1)[None, :] - 2.0 * (X @ C.T)
+    return scores.argmin(axis=1)
+
+
+def _cluster_sums(X, labels, k: int):
+    """Sum the rows of X per cluster with one matrix product against a one-hot matrix."""
+    one_hot = np.zeros((k, X.shape[0]))
+    one_hot[labels, np.arange(X.shape[0])] = 1.0
+    return one_hot @ X
+
+
+def _lloyd_python(
+    vectors: Sequence[Sequence[float]],
+    centroids: List[List[float]],
+    max_iterations: int
+) -> Tuple[List[int], List[List[float]], Optional[int]]:
+    """
+    Run Lloyd iterations in pure Python.
+
+    Returns:
+        Tuple of (assignments, centroids, iterations until convergence or
+        None if max_iterations was reached first)
+    """
+    n = len(vectors)
+    k = len(centroids)
+    n_features = len(vectors[0])
+    clusters = [0] * n
+
+    for iteration in range(max_iterations):
+        new_clusters = assign_to_centroids(vectors, centroids)
+        if new_clusters == clusters:
+            return clusters, centroids, iteration + 1
+        clusters = new_clusters
+
+        # One pass over the points accumulates every cluster's sum
+        sums = [[0.0] * n_features for _ in range(k)]
+        counts = [0] * k
+        for vector, cluster_id in zip(vectors, clusters):
+            counts[cluster_id] += 1
+            acc = sums[cluster_id]
+            for i, value in enumerate(vector):
+                acc[i] += value
+
+        for cluster_id in range(k):
+            # Empty clusters keep their previous centroid
+            if counts[cluster_id]:
+                centroids[cluster_id] = [value / counts[cluster_id] for value in sums[cluster_id]]
+
+    return clusters, centroids, None
+
+
+def _lloyd_numpy(X, centroids: List[List[float]], max_iterations: int):
+    """Run vectorized Lloyd iterations (same return value as _lloyd_python)."""
+    n = X.shape[0]
+    k = len(centroids)
+    C = np.asarray(centroids, dtype=float)
+    clusters = np.zeros(n, dtype=np.intp)
+
+    for iteration in range(max_iterations):
+        new_clusters = _assign_numpy(X, C)
+        if np.array_equal(new_clusters, clusters):
+            return clusters.tolist(), C.tolist(), iteration + 1
+        clusters = new_clusters
+
+        counts = np.bincount(clusters, minlength=k)
+        nonempty = counts > 0
+        sums = _cluster_sums(X, clusters, k)
+        C[nonempty] = sums[nonempty] / counts[nonempty][:, None]
+
+    return clusters.tolist(), C.tolist(), None
+
+
+def _minibatch(
+    vectors,
+    centroids: List[List[float]],
+    batch_size: int,
+    max_iterations: int,
+    tol: float,
+    rng
+) -> Tuple[List[int], List[List[float]], Optional[int]]:
+    """
+    Run mini-batch k-means (Sculley, 2010).
+
+    Each iteration samples batch_size points and assigns them to their nearest
+    centroid. Each centroid then moves towards its new points with a learning
+    rate of 1 / points_seen, which makes it the running mean of every point
+    assigned to it so far. Stops once the squared centroid movement of an
+    iteration is at most tol.
+    """
+    n = len(vectors)
+    k = len(centroids)
+    use_numpy = NUMPY_AVAILABLE and isinstance(vectors, np.ndarray)
+
+    if use_numpy:
+        C = np.asarray(centroids, dtype=float)
+        seen = np.zeros(k)
+        for iteration in range(1, max_iterations + 1):
+            batch = np.asarray(rng.sample(range(n), batch_size))
+            points = vectors[batch]
+            labels = _assign_numpy(points, C)
+
+            batch_counts = np.bincount(labels, minlength=k)
+            touched = batch_counts > 0
+            sums = _cluster_sums(points, labels, k)[touched]
+
+            new_seen = seen[touched] + batch_counts[touched]
+            updated = (C[touched] * seen[touched][:, None] + sums) / new_seen[:, None]
+            shift = float(((updated - C[touched]) ** 2).sum())
+            C[touched] = updated
+            seen[touched] = new_seen
+
+            if shift <= tol:
+                return _assign_numpy(vectors, C).tolist(), C.tolist(), iteration
+        return _assign_numpy(vectors, C).tolist(), C.tolist(), None
+
+    n_features = len(vectors[0])
+    seen = [0] * k
+    for iteration in range(1, max_iterations + 1):
+        batch = rng.sample(range(n), batch_size)
+        labels = assign_to_centroids([vectors[i] for i in batch], centroids)
+
+        sums = [[0.0] * n_features for _ in range(k)]
+        batch_counts = [0] * k
+        for index, cluster_id in zip(batch, labels):
+            batch_counts[cluster_id] += 1
+            acc = sums[cluster_id]
+            for i, value in enumerate(vectors[index]):
+                acc[i] += value
+
+        shift = 0.0
+        for cluster_id in range(k):
+            if not batch_counts[cluster_id]:
+                continue
+            old = centroids[cluster_id]
+            total = seen[cluster_id] + batch_counts[cluster_id]
+            updated = [
+                (value * seen[cluster_id] + batch_sum) / total
+                for value, batch_sum in zip(old, sums[cluster_id])
+            ]
+            shift += squared_euclidean(updated, old)
+            centroids[cluster_id] = updated
+            seen[cluster_id] = total
+
+        if shift <= tol:
+            return assign_to_centroids(vectors, centroids), centroids, iteration
+    return assign_to_centroids(vectors, centroids), centroids, None
+
+
+def kmeans(
+    vectors: Sequence[Sequence[float]],
+    k: int,
+    max_iterations: int = 100,
+    batch_size: Optional[int] = None,
+    tol: float = 1e-4,
+    rng=None,
+    use_numpy: Optional[bool] = None,
+    verbose: bool = False
+) -> Tuple[List[int], List[List[float]]]:
+    """
+    Cluster vectors with k-means and k-means++ seeding.
+
+    Args:
+        vectors: Feature vectors (all of the same length)
+        k: Number of clusters
+        max_iterations: Maximum Lloyd or mini-batch iterations
+        batch_size: Use mini-batch k-means with this many points per
+            iteration when smaller than the number of vectors
+        tol: Mini-batch stopping threshold on the squared centroid movement
+            of one iteration
+        rng: Random source with randint/uniform/sample (defaults to the
+            random module, so random.seed() controls the result)
+        use_numpy: Force (True) or disable (False) the NumPy path; by default
+            it is used whenever NumPy is installed
+        verbose: Print the iteration count on convergence
+
+    Returns:
+        Tuple of (cluster assignments, centroids)
+    """
+    if not len(vectors) or k <= 0:
+        return [], []
+
+    rng = rng or random
+    if use_numpy is None:
+        use_numpy = NUMPY_AVAILABLE
+    elif use_numpy and not NUMPY_AVAILABLE:
+        raise ImportError("NumPy is required for use_numpy=True: pip install numpy")
+
+    if use_numpy:
+        data = np.asarray(vectors, dtype=float)
+    else:
+        data = vectors.tolist() if NUMPY_AVAILABLE and isinstance(vectors, np.ndarray) else vectors
+
+    centroids = kmeans_plus_plus(data, k, rng)
+
+    if batch_size and batch_size < len(data):
+        clusters, centroids, iterations = _minibatch(data, centroids, batch_size, max_iterations, tol, rng)
+    elif use_numpy:
+        clusters, centroids, iterations = _lloyd_numpy(data, centroids, max_iterations)
+    else:
+        clusters, centroids, iterations = _lloyd_python(data, centroids, max_iterations)
+
+    if verbose and iterations is not None:
+        print(f"K-means converged in {iterations} iterations")
+
+    return clusters, centroids
+
+
+SILHOUETTE_MODES = ('exact', 'sampled', 'centroid', 'auto')
+# Distance rows computed and scored per block of this many, bounding the
+# NumPy temporaries
+ROW_BLOCK = 256
+
+
+@dataclass
+class SilhouetteEstimate:
+    """Silhouette score with its confidence interval"""
+    score: float
+    ci_low: float
+    ci_high: float
+    sample_size: int
+    mode: str
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def distance_rows(
+    vectors: Sequence[Sequence[float]],
+    row_indices: Sequence[int]
+) -> List[List[float]]:
+    """
+    Compute Euclidean distances from selected points to every point.
+
+    The rows do not depend on cluster assignments, so they can be computed
+    once and reused to score clusterings for several values of k.
+
+    Args:
+        vectors: Feature vectors
+        row_indices: Indices of the points whose distance rows are needed
+
+    Returns:
+        A (len(row_indices), n) array when NumPy is installed, otherwise one
+        list of n distances per requested index
+    """
+    if NUMPY_AVAILABLE and len(row_indices) and len(vectors):
+        X = np.asarray(vectors, dtype=float)
+        indices = np.asarray(row_indices)
+        norms = (X ** 2).sum(axis=1)
+        D = np.empty((len(indices), X.shape[0]))
+        for start in range(0, len(indices), ROW_BLOCK):
+            block_indices = indices[start:start + ROW_BLOCK]
+            block = D[start:start + len(block_indices)]
+            np.matmul(X[block_indices], X.T, out=block)
+            block *= -2.0
+            block += norms[block_indices][:, None]
+            block += norms[None, :]
+            np.sqrt(np.maximum(block, 0.0, out=block), out=block)
+            # Cancellation can leave a tiny non-zero distance from a point to itself
+            block[np.arange(len(block_indices)), block_indices] = 0.0
+        return D
+    return [[euclidean_distance(vectors[i], vector) for vector in vectors] for i in row_indices]
+
+
+def _silhouette_values(
+    rows: Sequence[Sequence[float]],
+    row_indices: Sequence[int],
+    labels: Sequence[int]
+) -> List[float]:
+    """
+    Silhouette value of each selected point from its precomputed distance row.
+
+    Points alone in their cluster are skipped.
+    """
+    if NUMPY_AVAILABLE and isinstance(rows, np.ndarray):
+        return _silhouette_values_numpy(rows, row_indices, labels)
+
+    cluster_sizes: Dict[int, int] = {}
+    for label in labels:
+        cluster_sizes[label] = cluster_sizes.get(label, 0) + 1
+
+    values = []
+    for i, row in zip(row_indices, rows):
+        own = labels[i]
+        if cluster_sizes[own] < 2:
+            continue
+
+        totals: Dict[int, float] = {}
+        for label, dist in zip(labels, row):
+            totals[label] = totals.get(label, 0.0) + dist
+
+        # The point's distance to itself is zero, so only the count changes
+        a = totals[own] / (cluster_sizes[own] - 1)
+        b = min(totals[label] / cluster_sizes[label] for label in totals if label != own)
+
+        values.append((b - a) / max(a, b) if max(a, b) > 0 else 0)
+    return values
+
+
+def _silhouette_values_numpy(D, row_indices: Sequence[int], labels: Sequence[int]) -> List[float]:
+    """_silhouette_values for an array of distance rows, a block of rows at a time"""
+    clusters = np.unique(np.asarray(labels), return_inverse=True)[1].ravel()
+    sizes = np.bincount(clusters).astype(float)
+    one_hot = np.zeros((len(clusters), len(sizes)))
+    one_hot[np.arange(len(clusters)), clusters] = 1.0
+    own_clusters = clusters[np.asarray(row_indices)]
+
+    values = []
+    for start in range(0, len(own_clusters), ROW_BLOCK):
+        own = own_clusters[start:start + ROW_BLOCK]
+        own_sizes = sizes[own]
+        keep = own_sizes >= 2
+        if not keep.any():
+            continue
+        # Sum of distances from each point to each cluster
+        totals = D[start:start + len(own)] @ one_hot
+        rows = np.arange(len(own))
+        # The point's distance to itself is zero, so only the count changes
+        a = totals[rows, own] / np.maximum(own_sizes - 1, 1)
+        means = totals / sizes
+        means[rows, own] = np.inf
+        b = means.min(axis=1)
+        scale = np.maximum(a, b)
+        block_values = np.divide(b - a, scale, out=np.zeros_like(scale), where=scale > 0)
+        values.extend(block_values[keep].tolist())
+    return values
+
+
+def _centroid_silhouette_values(
+    vectors: Sequence[Sequence[float]],
+    labels: Sequence[int],
+    centroids: Sequence[Sequence[float]]
+) -> List[float]:
+    """Simplified silhouette: distances to the own and nearest other centroid."""
+    present = sorted(set(labels))
+    values = []
+    for vector, own in zip(vectors, labels):
+        a = euclidean_distance(vector, centroids[own])
+        b = min(euclidean_distance(vector, centroids[label]) for label in present if label != own)
+        values.append((b - a) / max(a, b) if max(a, b) > 0 else 0)
+    return values
+
+
+def _confidence_interval(
+    values: Sequence[float],
+    population: int,
+    confidence: float
+) -> Tuple[float, float, float]:
+    """Mean with a normal-approximation interval and finite population correction."""
+    mean = sum(values) / len(values)
+    if len(values) < 2 or len(values) >= population:
+        return mean, mean, mean
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    fpc = math.sqrt((population - len(values)) / (population - 1))
+    margin = z * statistics.stdev(values) / math.sqrt(len(values)) * fpc
+    return mean, mean - margin, mean + margin
+
+
+def silhouette_score(
+    vectors: Sequence[Sequence[float]],
+    labels: Sequence[int],
+    mode: str = 'auto',
+    sample_size: int = 1000,
+    confidence: float = 0.95,
+    rng=None,
+    centroids: Optional[Sequence[Sequence[float]]] = None,
+    sample_indices: Optional[Sequence[int]] = None,
+    rows: Optional[Sequence[Sequence[float]]] = None
+) -> SilhouetteEstimate:
+    """
+    Calculate the average silhouette score of a clustering.
+
+    Modes:
+        exact: every point against every point, O(n²)
+        sampled: sample_size random points against every point, O(s·n), with
+            a confidence interval for the full-data score
+        centroid: simplified silhouette against centroids, O(n·k)
+        auto: exact when n <= sample_size, sampled otherwise
+
+    Args:
+        vectors: Feature vectors
+        labels: Cluster assignment of each vector
+        mode: One of SILHOUETTE_MODES
+        sample_size: Points scored in sampled mode
+        confidence: Confidence level of the interval
+        rng: Random source for sampling (defaults to the random module)
+        centroids: Cluster centroids (required for centroid mode)
+        sample_indices: Points to score, overriding sampling
+        rows: Precomputed distance_rows() for sample_indices
+
+    Returns:
+        SilhouetteEstimate (score 0.0 when there are fewer than 2 clusters)
+    """
+    if mode not in SILHOUETTE_MODES:
+        raise ValueError(f"Unknown silhouette mode: {mode}")
+
+    n = len(labels)
+    if mode == 'auto':
+        mode = 'exact' if n <= sample_size and sample_indices is None else 'sampled'
+
+    if len(set(labels)) < 2:
+        return SilhouetteEstimate(0.0, 0.0, 0.0, 0, mode)
+
+    if mode == 'centroid':
+        if centroids is None:
+            raise ValueError("centroid silhouette requires centroids")
+        values = _centroid_silhouette_values(vectors, labels, centroids)
+        mean = sum(values) / len(values)
+        return SilhouetteEstimate(mean, mean, mean, len(values), mode)
+
+    if sample_indices is None:
+        if mode == 'exact' or sample_size >= n:
+            sample_indices = list(range(n))
+        else:
+            sample_indices = sorted((rng or random).sample(range(n), sample_size))
+    if rows is None:
+        rows = distance_rows(vectors, sample_indices)
+
+    values = _silhouette_values(rows, sample_indices, labels)
+    if not values:
+        return SilhouetteEstimate(0.0, 0.0, 0.0, 0, mode)
+
+    if len(sample_indices) >= n:
+        mean = sum(values) / len(values)
+        return SilhouetteEstimate(mean, mean, mean, len(values), mode)
+
+    mean, low, high = _confidence_interval(values, n, confidence)
+    return SilhouetteEstimate(mean, low, high, len(values), mode)
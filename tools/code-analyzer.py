@@ -17,6 +17,9 @@ from typing import Dict, List, Any, Optional, Set
 from collections import defaultdict
 from functools import lru_cache
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from repo_scanner import discover_files, scan_files
+
 
 class CodeAnalyzer:
     """Analyzes code and learns from merge outcomes"""
@@ -283,13 +286,14 @@ class CodeAnalyzer:
         
         return max_depth
     
-    def analyze_directory(self, directory: str, extensions: List[str] = ['.py']) -> Dict:
+    def analyze_directory(self, directory: str, extensions: List[str] = ['.py'], jobs: int = 1) -> Dict:
         """
         Analyze all files in a directory with proper error handling.
         
         Args:
             directory: Path to the directory to analyze
             extensions: List of file extensions to analyze (default: ['.py'])
+            jobs: Worker processes for parsing (1 = serial, 0 = all CPUs)
             
         Returns:
             Dictionary containing analysis results
@@ -328,38 +332,33 @@ class CodeAnalyzer:
         }
         
         try:
-            for root, dirs, files in os.walk(directory):
-                # Skip hidden directories and common excludes
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv']]
-                
-                for file in files:
-                    if any(file.endswith(ext) for ext in extensions):
-                        filepath = os.path.join(root, file)
-                        
-                        try:
-                            if file.endswith('.py'):
-                                analysis = self.analyze_python_file(filepath)
-                                results["files_analyzed"].append(analysis)
-                                
-                                # Update summary
-                                results["summary"]["total_files"] += 1
-                                results["summary"]["total_good_patterns"] += len(analysis["patterns_found"]["good"])
-                                results["summary"]["total_bad_patterns"] += len(analysis["patterns_found"]["bad"])
-                                
-                                for pattern in analysis["patterns_found"]["good"]:
-                                    results["summary"]["pattern_breakdown"][f"good:{pattern['type']}"] += 1
-                                
-                                for pattern in analysis["patterns_found"]["bad"]:
-                                    results["summary"]["pattern_breakdown"][f"bad:{pattern['type']}"] += 1
-                        except Exception as e:
-                            # Log error but continue processing other files
-                            results["errors"].append({
-                                "file": filepath,
-                                "error": str(e)
-                            })
+            filepaths = [f for f in discover_files(directory, extensions) if f.endswith('.py')]
         except OSError as e:
             raise IOError(f"Error walking directory '{directory}': {e}")
         
+        for scanned in scan_files(filepaths, self.analyze_python_file, jobs):
+            if scanned.error is not None:
+                # Log error but continue processing other files
+                results["errors"].append({
+                    "file": scanned.path,
+                    "error": scanned.error
+                })
+                continue
+            
+            analysis = scanned.value
+            results["files_analyzed"].append(analysis)
+            
+            # Update summary
+            results["summary"]["total_files"] += 1
+            results["summary"]["total_good_patterns"] += len(analysis["patterns_found"]["good"])
+            results["summary"]["total_bad_patterns"] += len(analysis["patterns_found"]["bad"])
+            
+            for pattern in analysis["patterns_found"]["good"]:
+                results["summary"]["pattern_breakdown"][f"good:{pattern['type']}"] += 1
+            
+            for pattern in analysis["patterns_found"]["bad"]:
+                results["summary"]["pattern_breakdown"][f"bad:{pattern['type']}"] += 1
+        
         return results
     
     def learn_from_merge(self, analysis_results: Dict, merge_successful: bool = True):
@@ -486,6 +485,8 @@ def main():
     parser.add_argument('--learn', action='store_true', help='Learn from this merge (update patterns)')
     parser.add_argument('--success', action='store_true', default=True, help='Merge was successful (default: true)')
     parser.add_argument('--failure', action='store_true', help='Merge had issues (overrides --success)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Worker processes for parsing (default: 1, 0 = all CPUs)')
     
     args = parser.parse_args()
     
@@ -501,7 +502,7 @@ def main():
             sys.exit(1)
     else:
         # Analyze directory
-        results = analyzer.analyze_directory(args.directory)
+        results = analyzer.analyze_directory(args.directory, jobs=args.jobs)
         
         # Generate report
         report = analyzer.generate_report(results)
@@ -11,6 +11,7 @@ Inspired by Margaret Hamilton's approach: methodical, precise, and thorough.
 Architecture:
 - CommitStrategyAnalyzer: Core analysis engine
 - CommitPatternDatabase: Structured pattern storage
+- CommitMetricsStore: Per-commit metrics cache keyed by commit hash
 - StrategyRecommender: Recommendation generation
 - Integration with existing Chained learning systems
 
@@ -32,6 +33,8 @@ import os
 import sys
 import re
 import subprocess
+import tempfile
+import threading
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple, Set
@@ -46,6 +49,15 @@ LEARNINGS_DIR = Path("learnings")
 COMMIT_STRATEGIES_FILE = LEARNINGS_DIR / "commit_strategies.json"
 ANALYSIS_DIR = Path("analysis")
 COMMIT_PATTERNS_FILE = ANALYSIS_DIR / "commit_patterns.json"
+COMMIT_METRICS_STORE_FILE = ANALYSIS_DIR / "commit_metrics.jsonl"
+
+# Version of the records in the commit metrics store; bump when fields change
+COMMIT_METRICS_STORE_VERSION = 1
+
+# Field and record separators for streamed git log output
+_FIELD_SEP = '\x1f'
+_RECORD_SEP = '\x1e'
+_LOG_FORMAT = _RECORD_SEP + _FIELD_SEP.join(['%H', '%an', '%at', '%s', '%b']) + _FIELD_SEP
 
 # Commit quality thresholds
 MIN_MESSAGE_LENGTH = 10
@@ -120,6 +132,95 @@ class StrategyRecommendation:
         return asdict(self)
 
 
+class CommitMetricsStore:
+    """
+    JSONL store of per-commit metrics keyed by commit hash.
+    
+    Commit metadata and diff statistics never change for a given hash, so
+    records are appended once and reused by every later analysis; retain()
+    then compacts the file to the commits in the analysis window, keeping
+    it bounded. Merge status depends on branch state and is not stored.
+    """
+    
+    def __init__(self, path: Path = COMMIT_METRICS_STORE_FILE):
+        self.path = Path(path)
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+        # Lines in the file, including duplicate, stale and torn ones
+        self._lines = 0
+    
+    @property
+    def records(self) -> Dict[str, Dict[str, Any]]:
+        """All stored records, loaded on first access"""
+        if self._records is None:
+            self._records = self._load()
+        return self._records
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the store, skipping malformed lines and stale record versions"""
+        records = {}
+        self._lines = 0
+        if not self.path.exists():
+            return records
+        with open(self.path, 'r') as f:
+            for line in f:
+                self._lines += 1
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A partially written last line is ignored
+                    continue
+                if record.get("version") == COMMIT_METRICS_STORE_VERSION:
+                    records[record["commit_hash"]] = record
+        return records
+    
+    def __contains__(self, commit_hash: str) -> bool:
+        return commit_hash in self.records
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def get(self, commit_hash: str) -> Optional[Dict[str, Any]]:
+        """Get the stored record for a commit"""
+        return self.records.get(commit_hash)
+    
+    def add(self, records: List[Dict[str, Any]]):
+        """Append new records to the store"""
+        if not records:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as f:
+            for record in records:
+                record = dict(record, version=COMMIT_METRICS_STORE_VERSION)
+                f.write(json.dumps(record) + '\n')
+                self.records[record["commit_hash"]] = record
+                self._lines += 1
+    
+    def retain(self, commit_hashes: List[str]):
+        """
+        Keep only the records of the given commits, rewriting the file
+        atomically when it holds anything else
+        """
+        keep = set(commit_hashes)
+        records = {h: r for h, r in self.records.items() if h in keep}
+        if len(records) == self._lines:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                for record in records.values():
+                    f.write(json.dumps(record) + '\n')
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._records = records
+        self._lines = len(records)
+
+
 class CommitStrategyLearner:
     """
     Main class for git commit strategy learning system.
@@ -128,11 +229,16 @@ class CommitStrategyLearner:
     patterns and learning optimal strategies from successful merges.
     """
     
-    def __init__(self, repo_path: str = ".", verbose: bool = False):
+    def __init__(self, repo_path: str = ".", verbose: bool = False,
+                 store_path: Optional[str] = None):
         self.repo_path = Path(repo_path)
         self.verbose = verbose
         self.strategies_data = self._load_strategies()
         self.patterns_data = self._load_patterns()
+        self.metrics_store = CommitMetricsStore(
+            Path(store_path) if store_path else COMMIT_METRICS_STORE_FILE
+        )
+        self._mainline_commits: Optional[Set[str]] = None
         
     def _log(self, message: str, level: str = "INFO"):
         """Log message if verbose mode enabled"""
@@ -263,80 +369,166 @@ class CommitStrategyLearner:
             "starts_with_verb": bool(re.match(r'^[A-Z][a-z]+', first_line))
         }
     
+    def _parse_commit_record(self, chunk: str) -> Optional[Dict[str, Any]]:
+        """Parse one commit from streamed `git log --numstat` output"""
+        fields = chunk.split(_FIELD_SEP)
+        if len(fields) != 6:
+            return None
+        
+        commit_hash, author, author_time, subject, body, numstat = fields
+        message = f"{subject}\n{body.strip()}".strip()
+        
+        files_changed = 0
+        lines_added = 0
+        lines_deleted = 0
+        file_types = set()
+        
+        for line in numstat.split('\n'):
+            parts = line.split('\t', 2)
+            if len(parts) != 3:
+                continue
+            added, deleted, filename = parts
+            files_changed += 1
+            # Binary files report '-' for both counts
+            if added.isdigit():
+                lines_added += int(added)
+            if deleted.isdigit():
+                lines_deleted += int(deleted)
+            # Extract file extension
+            if '.' in filename:
+                file_types.add(filename.split('.')[-1])
+        
+        pr_match = re.search(r'#(\d+)', message)
+        
+        return {
+            "commit_hash": commit_hash,
+            "author": author,
+            "timestamp": datetime.fromtimestamp(int(author_time), tz=timezone.utc).isoformat(),
+            "message": message,
+            "files_changed": files_changed,
+            "lines_added": lines_added,
+            "lines_deleted": lines_deleted,
+            "file_types": sorted(file_types),
+            "pr_number": int(pr_match.group(1)) if pr_match else None
+        }
+    
+    def _stream_commit_records(self, commit_hashes: List[str]):
+        """
+        Read metrics for many commits from a single streamed git log.
+        
+        The hashes are fed to one `git log --stdin --no-walk --numstat`
+        process and its output is parsed record by record.
+        
+        Yields:
+            Commit records ready for the metrics store
+        """
+        if not commit_hashes:
+            return
+        
+        proc = subprocess.Popen(
+            ['git', 'log', '--stdin', '--no-walk=unsorted', '--numstat',
+             f'--format={_LOG_FORMAT}'],
+            cwd=self.repo_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        
+        # Feed hashes from a thread so a full stdout pipe cannot deadlock us
+        def feed():
+            try:
+                proc.stdin.write('\n'.join(commit_hashes) + '\n')
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        
+        chunk: List[str] = []
+        for line in proc.stdout:
+            if line.startswith(_RECORD_SEP) and chunk:
+                record = self._parse_commit_record(''.join(chunk)[1:])
+                if record:
+                    yield record
+                chunk = []
+            chunk.append(line)
+        if chunk:
+            record = self._parse_commit_record(''.join(chunk)[1:])
+            if record:
+                yield record
+        
+        feeder.join()
+        stderr = proc.stderr.read()
+        if proc.wait() != 0:
+            self._log(f"Git command failed: {stderr.strip()}", "ERROR")
+    
+    def _ensure_commit_records(self, commit_hashes: List[str]) -> int:
+        """
+        Make sure the metrics store has a record for every given commit.
+        
+        Returns:
+            Number of commits that had to be read from git
+        """
+        missing = [h for h in commit_hashes if h not in self.metrics_store]
+        if missing:
+            self.metrics_store.add(list(self._stream_commit_records(missing)))
+        return len(missing)
+    
+    def _metrics_from_record(self, record: Dict[str, Any]) -> CommitMetrics:
+        """Build CommitMetrics from a stored commit record"""
+        msg_analysis = self._analyze_commit_message(record["message"])
+        
+        return CommitMetrics(
+            commit_hash=record["commit_hash"],
+            author=record["author"],
+            timestamp=record["timestamp"],
+            message=record["message"],
+            message_length=msg_analysis["length"],
+            has_body=msg_analysis["has_body"],
+            follows_conventional=msg_analysis["follows_conventional"],
+            conventional_type=msg_analysis["conventional_type"],
+            files_changed=record["files_changed"],
+            lines_added=record["lines_added"],
+            lines_deleted=record["lines_deleted"],
+            total_lines_changed=record["lines_added"] + record["lines_deleted"],
+            file_types=list(record["file_types"])
+        )
+    
     def _get_commit_metrics(self, commit_hash: str) -> Optional[CommitMetrics]:
         """Extract comprehensive metrics from a commit"""
         try:
-            # Get commit info
-            commit_info = self._run_git_command([
-                'show', '--format=%H%n%an%n%at%n%s%n%b', '--no-patch', commit_hash
-            ])
-            
-            if not commit_info:
-                return None
-            
-            lines = commit_info.split('\n')
-            if len(lines) < 4:
-                return None
-            
-            commit_hash = lines[0]
-            author = lines[1]
-            timestamp = datetime.fromtimestamp(int(lines[2]), tz=timezone.utc).isoformat()
-            subject = lines[3]
-            body = '\n'.join(lines[4:]).strip() if len(lines) > 4 else ""
-            message = f"{subject}\n{body}".strip()
-            
-            # Analyze message
-            msg_analysis = self._analyze_commit_message(message)
-            
-            # Get file changes
-            stats = self._run_git_command([
-                'show', '--stat', '--format=', commit_hash
-            ])
-            
-            files_changed = 0
-            lines_added = 0
-            lines_deleted = 0
-            file_types = set()
-            
-            if stats:
-                for line in stats.split('\n'):
-                    if '|' in line:
-                        files_changed += 1
-                        # Extract file extension
-                        filename = line.split('|')[0].strip()
-                        if '.' in filename:
-                            ext = filename.split('.')[-1]
-                            file_types.add(ext)
-                    
-                    # Parse summary line (e.g., "3 files changed, 100 insertions(+), 50 deletions(-)")
-                    if 'changed' in line:
-                        match = re.search(r'(\d+) insertion', line)
-                        if match:
-                            lines_added = int(match.group(1))
-                        match = re.search(r'(\d+) deletion', line)
-                        if match:
-                            lines_deleted = int(match.group(1))
-            
-            return CommitMetrics(
-                commit_hash=commit_hash,
-                author=author,
-                timestamp=timestamp,
-                message=message,
-                message_length=msg_analysis["length"],
-                has_body=msg_analysis["has_body"],
-                follows_conventional=msg_analysis["follows_conventional"],
-                conventional_type=msg_analysis["conventional_type"],
-                files_changed=files_changed,
-                lines_added=lines_added,
-                lines_deleted=lines_deleted,
-                total_lines_changed=lines_added + lines_deleted,
-                file_types=list(file_types)
-            )
+            self._ensure_commit_records([commit_hash])
+            record = self.metrics_store.get(commit_hash)
+            if not record:
+                # Abbreviated or symbolic names are stored under the full hash
+                full_hash = self._run_git_command(['rev-parse', '--verify', '-q', commit_hash])
+                if full_hash:
+                    self._ensure_commit_records([full_hash])
+                    record = self.metrics_store.get(full_hash)
+            return self._metrics_from_record(record) if record else None
             
         except Exception as e:
             self._log(f"Error analyzing commit {commit_hash}: {e}", "ERROR")
             return None
     
+    def _get_mainline_commits(self) -> Set[str]:
+        """
+        Get every commit contained in a main or master branch.
+        
+        One rev-list over those branches replaces a `git branch --contains`
+        call per commit.
+        """
+        if self._mainline_commits is None:
+            branches = self._run_git_command([
+                'for-each-ref', '--format=%(refname:short)', 'refs/heads/'
+            ]).split('\n')
+            mainline = [b for b in branches if 'main' in b or 'master' in b]
+            commits = self._run_git_command(['rev-list'] + mainline) if mainline else ""
+            self._mainline_commits = set(commits.split())
+        return self._mainline_commits
+    
     def _get_merge_info(self, commit_hash: str) -> Tuple[str, Optional[int], Optional[float]]:
         """
         Get merge status for a commit.
@@ -344,19 +536,12 @@ class CommitStrategyLearner:
         Returns (status, pr_number, merge_time_hours)
         """
         # Check if commit is in a merged PR by looking at commit message
-        commit_msg = self._run_git_command(['log', '-1', '--format=%B', commit_hash])
-        
-        # Look for PR merge patterns
-        pr_match = re.search(r'#(\d+)', commit_msg)
-        pr_number = int(pr_match.group(1)) if pr_match else None
-        
-        # Check if this is a merge commit
-        parents = self._run_git_command(['log', '-1', '--format=%P', commit_hash])
-        is_merge = len(parents.split()) > 1
+        self._ensure_commit_records([commit_hash])
+        record = self.metrics_store.get(commit_hash)
+        pr_number = record["pr_number"] if record else None
         
         # For now, assume commits in main branch are successful
-        branches = self._run_git_command(['branch', '--contains', commit_hash])
-        if 'main' in branches or 'master' in branches:
+        if commit_hash in self._get_mainline_commits():
             status = "success"
         else:
             status = "pending"
@@ -388,18 +573,26 @@ class CommitStrategyLearner:
         commit_hashes = [h for h in commit_hashes if h.strip()]
         self._log(f"Found {len(commit_hashes)} commits to analyze")
         
+        # Read metrics for commits not yet in the store in one git pass
+        new_count = self._ensure_commit_records(commit_hashes)
+        self._log(f"Computed metrics for {new_count} new commits "
+                  f"({len(commit_hashes) - new_count} from {self.metrics_store.path})")
+        # Commits that left the window are dropped, so the store stays bounded
+        self.metrics_store.retain(commit_hashes)
+        
+        # Branch membership may have changed since the last analysis
+        self._mainline_commits = None
+        
         # Analyze each commit
         analyzed_commits = []
         successful_commits = []
         failed_commits = []
         
-        for i, commit_hash in enumerate(commit_hashes):
-            if i % 10 == 0:
-                self._log(f"Progress: {i}/{len(commit_hashes)} commits analyzed")
-            
-            metrics = self._get_commit_metrics(commit_hash)
-            if not metrics:
+        for commit_hash in commit_hashes:
+            record = self.metrics_store.get(commit_hash)
+            if not record:
                 continue
+            metrics = self._metrics_from_record(record)
             
             # Get merge info
             status, pr_number, merge_time = self._get_merge_info(commit_hash)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+GitHub GraphQL Coalescer - Merge REST reads into aliased GraphQL queries
+
+A batch executor for BatchedAPIClient that turns compatible REST reads in
+a batch into one GraphQL query per chunk, with one alias per read, and
+resolves each request's futures from its alias. A batch of 50 issue
+lookups costs one API request instead of 50.
+
+Coalesced reads:
+- GET /repos/{owner}/{repo}/issues/{number}
+- GET /repos/{owner}/{repo}/pulls/{number}
+- GET /users/{login}
+
+Results are shaped like the REST responses, limited to the fields the
+GraphQL fragments below select. Reads GraphQL cannot answer (missing
+objects, organizations looked up as users, a failed query) and every
+other request go through the REST API as usual.
+
+Example:
+    from api_call_batcher import BatchedAPIClient, BatchConfig
+    from github_integration import GitHubAPIClient
+    from github_graphql_coalescer import GraphQLCoalescingExecutor
+
+    batcher = BatchedAPIClient(
+        BatchConfig(batch_size=50, flush_interval=0.5),
+        executor=GraphQLCoalescingExecutor(GitHubAPIClient())
+    )
+    futures = [batcher.add_request('GET', f'/repos/owner/repo/issues/{n}') for n in numbers]
+    issues = [future.result() for future in futures]
+"""
+
+import json
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api_call_batcher import APIRequest, ConcurrentBatchExecutor
+
+# Reads per GraphQL query; keeps queries well under GitHub's node limits
+MAX_READS_PER_QUERY = 50
+
+ISSUE_PATH = re.compile(r'^/?repos/([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+)/(issues|pulls)/(\d+)/?$')
+USER_PATH = re.compile(r'^/?users/([A-Za-z0-9-]+)/?$')
+
+# Issue.state (IssueState) and PullRequest.state (PullRequestState) differ
+# in type, so both cannot be selected as `state` under issueOrPullRequest;
+# pull requests select theirs as prState
+FRAGMENTS = """
+fragment IssueFields on Issue {
+  number title body state url createdAt updatedAt closedAt
+  author { login }
+  labels(first: 100) { nodes { name } }
+  comments { totalCount }
+}
+fragment PullRequestFields on PullRequest {
+  number title body prState: state url createdAt updatedAt closedAt mergedAt merged isDraft
+  additions deletions changedFiles headRefName baseRefName
+  author { login }
+  labels(first: 100) { nodes { name } }
+  comments { totalCount }
+}
+fragment UserFields on User {
+  login name company location bio url createdAt
+  followers { totalCount }
+  following { totalCount }
+  repositories(privacy: PUBLIC) { totalCount }
+}
+"""
+
+# A coalescable read: ('issue' | 'pull', owner, repo, number) or ('user', login)
+Read = Tuple[Any, ...]
+
+
+def parse_read(request: APIRequest) -> Optional[Read]:
+    """The GraphQL-answerable read a request makes, or None"""
+    if request.method.upper() != 'GET' or request.params or request.body:
+        return None
+    match = ISSUE_PATH.match(request.endpoint)
+    if match:
+        owner, repo, kind, number = match.groups()
+        return ('issue' if kind == 'issues' else 'pull', owner, repo, int(number))
+    match = USER_PATH.match(request.endpoint)
+    if match:
+        return ('user', match.group(1))
+    return None
+
+
+def build_query(reads: List[Read]) -> Tuple[str, List[Tuple[str, ...]]]:
+    """
+    One aliased query for all reads. Returns the query and, per read, the
+    alias path of its result in the response data.
+    """
+    repositories: Dict[Tuple[str, str], Tuple[str, List[str]]] = {}
+    users: Dict[str, str] = {}
+    paths = []
+    for read in reads:
+        if read[0] == 'user':
+            alias = users.setdefault(read[1], f'u{len(users)}')
+            paths.append((alias,))
+            continue
+        kind, owner, repo, number = read
+        alias, fields = repositories.setdefault((owner, repo), (f'r{len(repositories)}', []))
+        field = f"{'i' if kind == 'issue' else 'p'}{number}"
+        if kind == 'issue':
+            line = f'    {field}: issueOrPullRequest(number: {number}) {{ __typename ...IssueFields ...PullRequestFields }}'
+        else:
+            line = f'    {field}: pullRequest(number: {number}) {{ __typename ...PullRequestFields }}'
+        if line not in fields:
+            fields.append(line)
+        paths.append((alias, field))
+
+    lines = ['query {']
+    for (owner, repo), (alias, fields) in repositories.items():
+        lines.append(f'  {alias}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) {{')
+        lines.extend(fields)
+        lines.append('  }')
+    for login, alias in users.items():
+        lines.append(f'  {alias}: user(login: {json.dumps(login)}) {{ ...UserFields }}')
+    lines.append('}')
+    return '\n'.join(lines) + FRAGMENTS, paths
+
+
+def _login(actor: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    return {'login': actor['login']} if actor else None
+
+
+def _issue_fields(node: Dict[str, Any]) -> Dict[str, Any]:
+    """REST fields shared by issues and pull requests"""
+    return {
+        'number': node['number'],
+        'title': node['title'],
+        'body': node['body'],
+        'state': 'open' if node.get('prState', node.get('state')) == 'OPEN' else 'closed',
+        'html_url': node['url'],
+        'created_at': node['createdAt'],
+        'updated_at': node['updatedAt'],
+        'closed_at': node['closedAt'],
+        'user': _login(node.get('author')),
+        'labels': [{'name': label['name']} for label in node['labels']['nodes']],
+        'comments': node['comments']['totalCount'],
+    }
+
+
+def issue_from_graphql(node: Dict[str, Any]) -> Dict[str, Any]:
+    """REST /issues/{number} shape of an Issue or PullRequest node"""
+    issue = _issue_fields(node)
+    if node.get('__typename') == 'PullRequest':
+        issue['pull_request'] = {'html_url': node['url'], 'merged_at': node['mergedAt']}
+    return issue
+
+
+def pull_from_graphql(node: Dict[str, Any]) -> Dict[str, Any]:
+    """REST /pulls/{number} shape of a PullRequest node"""
+    pull = _issue_fields(node)
+    pull.update({
+        'merged': node['merged'],
+        'merged_at': node['mergedAt'],
+        'draft': node['isDraft'],
+        'additions': node['additions'],
+        'deletions': node['deletions'],
+        'changed_files': node['changedFiles'],
+        'head': {'ref': node['headRefName']},
+        'base': {'ref': node['baseRefName']},
+    })
+    return pull
+
+
+def user_from_graphql(node: Dict[str, Any]) -> Dict[str, Any]:
+    """REST /users/{login} shape of a User node"""
+    return {
+        'login': node['login'],
+        'type': 'User',
+        'name': node['name'],
+        'company': node['company'],
+        'location': node['location'],
+        'bio': node['bio'],
+        'html_url': node['url'],
+        'created_at': node['createdAt'],
+        'followers': node['followers']['totalCount'],
+        'following': node['following']['totalCount'],
+        'public_repos': node['repositories']['totalCount'],
+    }
+
+
+CONVERTERS = {'issue': issue_from_graphql, 'pull': pull_from_graphql, 'user': user_from_graphql}
+
+
+class GraphQLCoalescingExecutor(ConcurrentBatchExecutor):
+    """
+    Batch executor answering REST reads from aliased GraphQL queries.
+
+    Coalesced chunks and all other requests run on the worker pool, and
+    each request's futures resolve as soon as its own answer arrives.
+    """
+
+    def __init__(self, client, max_workers: int = 8, max_reads_per_query: int = MAX_READS_PER_QUERY):
+        """
+        Args:
+            client: GitHubAPIClient used for GraphQL queries and REST requests
+            max_workers: Maximum queries and requests running at once
+            max_reads_per_query: Reads merged into one GraphQL query
+        """
+        super().__init__(self._rest_request, max_workers)
+        self.client = client
+        self.max_reads_per_query = max_reads_per_query
+        self._stats_lock = threading.Lock()
+        self.graphql_queries = 0
+        self.coalesced_reads = 0
+        self.rest_requests = 0
+
+    def submit(self, requests: List[APIRequest], on_done: Callable) -> list:
+        reads = []
+        others = []
+        for request in requests:
+            read = parse_read(request)
+            if read is None:
+                others.append(request)
+            else:
+                reads.append((request, read))
+
+        futures = super().submit(others, on_done)
+        for start in range(0, len(reads), self.max_reads_per_query):
+            chunk = reads[start:start + self.max_reads_per_query]
+            futures.append(self._get_pool().submit(self._run_query, chunk, on_done))
+        return futures
+
+    def _run_query(self, chunk: List[Tuple[APIRequest, Read]], on_done: Callable) -> None:
+        """One GraphQL query for a chunk of reads, fanned out per request"""
+        query, paths = build_query([read for _, read in chunk])
+        with self._stats_lock:
+            self.graphql_queries += 1
+        try:
+            data, _ = self.client.graphql_with_errors(query)
+        except Exception:
+            data = None
+
+        for (request, read), path in zip(chunk, paths):
+            node = data
+            for alias in path:
+                node = node.get(alias) if isinstance(node, dict) else None
+            if node is None:
+                # Not found through GraphQL; REST gives the exact answer or error
+                self._run_request(request, on_done)
+                continue
+            with self._stats_lock:
+                self.coalesced_reads += 1
+            try:
+                result = CONVERTERS[read[0]](node)
+            except (KeyError, TypeError) as e:
+                on_done(request, None, e)
+                continue
+            on_done(request, result, None)
+
+    def _rest_request(self, request: APIRequest) -> Any:
+        """Execute a request through the REST API"""
+        with self._stats_lock:
+            self.rest_requests += 1
+        method = request.method.upper()
+        if method == 'GET':
+            return self.client.get(request.endpoint, request.params or None)
+        if method == 'DELETE':
+            return self.client.delete(request.endpoint)
+        data = json.loads(request.body) if request.body else {}
+        if method == 'POST':
+            return self.client.post(request.endpoint, data)
+        if method == 'PATCH':
+            return self.client.patch(request.endpoint, data)
+        raise ValueError(f"Unsupported method: {request.method}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Counts of API requests made and reads answered by GraphQL"""
+        with self._stats_lock:
+            return {
+                'graphql_queries': self.graphql_queries,
+                'coalesced_reads': self.coalesced_reads,
+                'rest_requests': self.rest_requests,
+                'api_requests': self.graphql_queries + self.rest_requests,
+            }
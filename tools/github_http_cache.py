@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+GitHub HTTP Cache - Conditional-request response cache for API reads
+
+Stores GET response bodies with their ETag and Last-Modified headers in a
+local SQLite file, so a later run can revalidate them with If-None-Match /
+If-Modified-Since instead of downloading them again. GitHub answers an
+unchanged resource with 304 Not Modified, which does not count against
+the rate limit, and the stored body is replayed.
+
+Entries are keyed by URL (including query parameters), Accept header and
+a scope naming whose view of the API they hold, e.g. the repository or
+app installation the token acts for. Not the token itself: tokens such
+as Actions' GITHUB_TOKEN change every run, and every revalidation is
+sent with the current token anyway, so the server checks access before
+answering 304. The cache is bounded by total body size, evicting the
+least recently used entries first.
+
+Example:
+    from github_http_cache import HTTPResponseCache
+    from github_integration import GitHubAPIClient
+
+    cache = HTTPResponseCache('.cache/github-api/cache.sqlite', scope='owner/repo')
+    client = GitHubAPIClient(cache=cache)
+    issues = client.get('/repos/owner/repo/issues')  # 200, stored
+    issues = client.get('/repos/owner/repo/issues')  # 304, replayed
+    print(client.cache.get_stats())
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Default bound on stored response bodies
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Response headers kept with an entry and replayed on 304
+STORED_HEADERS = ('ETag', 'Last-Modified', 'Link', 'Content-Type')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body and the headers needed to revalidate it"""
+    key: str
+    body: bytes
+    headers: Dict[str, str]
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get('Last-Modified')
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers asking the server to revalidate this response"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def cache_key(url: str, headers: Dict[str, str], scope: str = '') -> str:
+    """Key of a GET request: URL, Accept header and the cache scope"""
+    lowered = {name.lower(): value for name, value in headers.items()}
+    return hashlib.sha256(f"{url}\n{lowered.get('accept', '')}\n{scope}".encode()).hexdigest()
+
+
+class HTTPResponseCache:
+    """Size-bounded LRU cache of revalidatable GET responses in SQLite"""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, scope: str = ''):
+        """
+        Args:
+            path: SQLite file to store responses in (created if missing)
+            max_bytes: Bound on the total size of stored bodies
+            scope: Identity the responses are for (e.g. 'owner/repo'); use
+                   distinct scopes for tokens that see the API differently
+        """
+        self.path = Path(path)
+        self.scope = scope
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        with self._lock:
+            self._conn.executescript(SCHEMA)
+        self._last_used = 0.0
+        self.stats = {
+            'lookups': 0,
+            'hits': 0,
+            'not_modified': 0,
+            'bytes_saved': 0,
+            'stores': 0,
+            'evictions': 0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _now(self) -> float:
+        """Strictly increasing timestamp, so LRU order has no ties"""
+        self._last_used = max(time.time(), self._last_used + 1e-6)
+        return self._last_used
+
+    def lookup(self, url: str, headers: Dict[str, str]) -> Optional[CachedResponse]:
+        """The stored response for a GET request, if any"""
+        key = cache_key(url, headers, self.scope)
+        with self._lock:
+            self.stats['lookups'] += 1
+            row = self._conn.execute(
+                "SELECT headers, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.stats['hits'] += 1
+        return CachedResponse(key, bytes(row[1]), json.loads(row[0]))
+
+    def replay(self, cached: CachedResponse) -> bytes:
+        """Body of a response the server confirmed with 304 Not Modified"""
+        with self._lock:
+            self.stats['not_modified'] += 1
+            self.stats['bytes_saved'] += len(cached.body)
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (self._now(), cached.key))
+        return cached.body
+
+    def store(self, url: str, request_headers: Dict[str, str], response_headers: Any, body: bytes) -> bool:
+        """
+        Store a 200 response if it can be revalidated later.
+
+        Returns:
+            True if stored (it has an ETag or Last-Modified and fits the cache)
+        """
+        headers = {name: response_headers.get(name) for name in STORED_HEADERS if response_headers.get(name)}
+        if not ('ETag' in headers or 'Last-Modified' in headers) or len(body) > self.max_bytes:
+            return False
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, url, headers, body, size, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (cache_key(url, request_headers, self.scope), url, json.dumps(headers), body, len(body), self._now())
+                )
+                self._evict()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.stats['stores'] += 1
+        return True
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits max_bytes"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self.stats['evictions'] += len(evicted)
+
+    def clear(self):
+        """Delete every stored response"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters for this session plus the current size of the cache"""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            stats = dict(self.stats)
+        stats['hit_rate'] = stats['not_modified'] / stats['lookups'] if stats['lookups'] else 0.0
+        stats['entries'] = entries
+        stats['total_bytes'] = total
+        return stats
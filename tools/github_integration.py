@@ -11,21 +11,37 @@ Features:
 - Rate limit detection and handling
 - Comprehensive error handling with meaningful messages
 - Request timeout management
+- Keep-alive connection pooling
+- Optional on-disk ETag/Last-Modified cache for GET responses
+- Lazy pagination following Link headers
 - Response validation
 - Logging for debugging
 """
 
+import http.client
+import io
 import json
 import os
+import re
 import sys
+import threading
 import time
+import urllib.parse
 import urllib.request
 import urllib.error
-from typing import Dict, Optional, Any, Callable
+import urllib.response
+from typing import Dict, Iterator, List, Optional, Any, Callable, Tuple
 from functools import wraps
 from dataclasses import dataclass
 from enum import Enum
 
+# Import conditional-request response cache
+try:
+    from github_http_cache import HTTPResponseCache
+    HTTP_CACHE_AVAILABLE = True
+except ImportError:
+    HTTP_CACHE_AVAILABLE = False
+
 
 class RetryStrategy(Enum):
     """Retry strategy types"""
@@ -144,6 +160,114 @@ def retry_with_backoff(retry_config: Optional[RetryConfig] = None):
     return decorator
 
 
+class ConnectionPool:
+    """
+    Idle keep-alive connections per (scheme, host), at most `size` of each.
+    
+    Connections are checked out for one request at a time, so the pool is
+    safe to share between threads.
+    """
+    
+    def __init__(self, size: int = 10):
+        self.size = size
+        self._idle: Dict[Tuple, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, key: Tuple) -> Optional[http.client.HTTPConnection]:
+        """An idle connection for key, or None if there is none"""
+        with self._lock:
+            idle = self._idle.get(key)
+            return idle.pop() if idle else None
+    
+    def release(self, key: Tuple, connection: http.client.HTTPConnection):
+        """Return a connection after a complete response; closed if the pool is full"""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.size:
+                idle.append(connection)
+                return
+        connection.close()
+    
+    def close(self):
+        """Close every idle connection"""
+        with self._lock:
+            connections = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+
+class KeepAliveHandler(urllib.request.HTTPHandler, urllib.request.HTTPSHandler):
+    """
+    urllib handler sending requests over pooled keep-alive connections.
+    
+    Drop-in for the default HTTP(S) handlers: responses are read in full so
+    the connection can go straight back to the pool, and errors, redirects
+    and proxies are still handled by the rest of the opener.
+    """
+    
+    # Raised when the server closed an idle connection before we reused it
+    STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+    
+    def __init__(self, pool: ConnectionPool):
+        urllib.request.HTTPHandler.__init__(self)
+        urllib.request.HTTPSHandler.__init__(self)
+        self.pool = pool
+    
+    def http_open(self, req):
+        return self._open(http.client.HTTPConnection, req)
+    
+    def https_open(self, req):
+        return self._open(http.client.HTTPSConnection, req, context=self._context)
+    
+    def _open(self, connection_class, req, **connection_args):
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items() if k not in headers})
+        headers = {name.title(): value for name, value in headers.items()}
+        tunnel_headers = {}
+        if req._tunnel_host and 'Proxy-Authorization' in headers:
+            tunnel_headers['Proxy-Authorization'] = headers.pop('Proxy-Authorization')
+        key = (connection_class, req.host, req._tunnel_host)
+        
+        connection = self.pool.acquire(key)
+        while True:
+            reused = connection is not None
+            if not reused:
+                connection = connection_class(req.host, timeout=req.timeout, **connection_args)
+                if req._tunnel_host:
+                    connection.set_tunnel(req._tunnel_host, headers=tunnel_headers)
+            elif connection.sock is not None:
+                connection.sock.settimeout(req.timeout)
+            try:
+                connection.request(req.get_method(), req.selector, req.data, headers)
+                response = connection.getresponse()
+                body = response.read()
+                break
+            except self.STALE_CONNECTION_ERRORS as e:
+                connection.close()
+                if not reused:
+                    raise urllib.error.URLError(e)
+                connection = None
+            except TimeoutError:
+                connection.close()
+                raise
+            except OSError as e:
+                connection.close()
+                raise urllib.error.URLError(e)
+            except BaseException:
+                connection.close()
+                raise
+        
+        if response.will_close:
+            connection.close()
+        else:
+            self.pool.release(key, connection)
+        
+        result = urllib.response.addinfourl(io.BytesIO(body), response.msg, req.get_full_url(), response.status)
+        result.msg = response.reason
+        return result
+
+
 class GitHubAPIClient:
     """
     Robust GitHub API client with error handling and retry logic.
@@ -154,11 +278,14 @@ class GitHubAPIClient:
     - Retry with exponential backoff
     - Comprehensive error handling
     - Request timeout management
+    - Keep-alive connections shared by every request of the client
     
     Example:
         client = GitHubAPIClient(token="your_token")
         repo = client.get("/repos/owner/repo")
         issues = client.get("/repos/owner/repo/issues", params={"state": "open"})
+        for issue in client.paginate("/repos/owner/repo/issues", params={"state": "all"}):
+            print(issue["number"])
     """
     
     def __init__(
@@ -167,7 +294,9 @@ class GitHubAPIClient:
         base_url: str = "https://api.github.com",
         timeout: int = 30,
         retry_config: Optional[RetryConfig] = None,
-        user_agent: str = "Chained-GitHub-Integration/1.0"
+        user_agent: str = "Chained-GitHub-Integration/1.0",
+        pool_size: int = 10,
+        cache: Optional['HTTPResponseCache'] = None
     ):
         """
         Initialize GitHub API client.
@@ -178,12 +307,28 @@ class GitHubAPIClient:
             timeout: Request timeout in seconds
             retry_config: Configuration for retry behavior
             user_agent: User agent string for requests
+            pool_size: Idle keep-alive connections kept per host
+                      (0 opens a new connection for every request)
+            cache: Response cache for conditional GET requests (defaults to
+                   one at the GITHUB_API_CACHE path, if that env var is set,
+                   scoped by GITHUB_API_CACHE_SCOPE)
         """
         self.token = token or os.environ.get('GITHUB_TOKEN') or os.environ.get('GH_TOKEN')
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.retry_config = retry_config or RetryConfig()
         self.user_agent = user_agent
+        self.pool = ConnectionPool(pool_size) if pool_size > 0 else None
+        if self.pool:
+            self._opener = urllib.request.build_opener(KeepAliveHandler(self.pool))
+        else:
+            self._opener = urllib.request.build_opener()
+        
+        self._owns_cache = cache is None and HTTP_CACHE_AVAILABLE and bool(os.environ.get('GITHUB_API_CACHE'))
+        if self._owns_cache:
+            cache = HTTPResponseCache(os.environ['GITHUB_API_CACHE'],
+                                      scope=os.environ.get('GITHUB_API_CACHE_SCOPE', ''))
+        self.cache = cache
         
         if not self.token:
             print("Warning: No GitHub token provided. API requests will be rate-limited.", file=sys.stderr)
@@ -235,7 +380,8 @@ class GitHubAPIClient:
         method: str,
         path: str,
         data: Optional[Dict] = None,
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        return_headers: bool = False
     ) -> Any:
         """
         Make HTTP request to GitHub API with retry logic.
@@ -245,6 +391,7 @@ class GitHubAPIClient:
             path: API endpoint path
             data: Request body data
             headers: Additional headers
+            return_headers: Return (response, headers) instead of the response
             
         Returns:
             Parsed JSON response
@@ -255,24 +402,30 @@ class GitHubAPIClient:
         url = f"{self.base_url}/{path.lstrip('/')}"
         request_headers = self._build_headers(headers)
         
+        # Revalidate a cached response instead of downloading it again
+        cacheable = self.cache is not None and method == 'GET'
+        cached = self.cache.lookup(url, request_headers) if cacheable else None
+        send_headers = dict(request_headers, **cached.conditional_headers()) if cached else request_headers
+        
         # Prepare request
         request_data = json.dumps(data).encode() if data else None
-        req = urllib.request.Request(url, data=request_data, headers=request_headers, method=method)
+        req = urllib.request.Request(url, data=request_data, headers=send_headers, method=method)
         
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            with self._opener.open(req, timeout=self.timeout) as response:
                 # Check rate limit headers
                 rate_limit_remaining = response.headers.get('X-RateLimit-Remaining')
                 if rate_limit_remaining and int(rate_limit_remaining) < 10:
                     print(f"Warning: Only {rate_limit_remaining} API requests remaining", file=sys.stderr)
                 
-                # Parse response
-                response_data = response.read().decode()
-                if response_data:
-                    return json.loads(response_data)
-                return None
+                body = response.read()
+                if cacheable:
+                    self.cache.store(url, request_headers, response.headers, body)
+                return self._parse_body(body, response.headers, return_headers)
                 
         except urllib.error.HTTPError as e:
+            if e.code == 304 and cached is not None:
+                return self._parse_body(self.cache.replay(cached), cached.headers, return_headers)
             error = self._parse_error_response(e)
             raise GitHubAPIException(error)
         except urllib.error.URLError as e:
@@ -280,6 +433,14 @@ class GitHubAPIClient:
         except TimeoutError:
             raise Exception(f"Request timed out after {self.timeout} seconds")
     
+    def _parse_body(self, body: bytes, headers: Any, return_headers: bool) -> Any:
+        """Parse a JSON response body"""
+        response_data = body.decode()
+        result = json.loads(response_data) if response_data else None
+        if return_headers:
+            return result, headers
+        return result
+    
     def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
         """
         Make GET request to GitHub API.
@@ -291,16 +452,48 @@ class GitHubAPIClient:
         Returns:
             Parsed JSON response
         """
-        if params:
-            # Build query string
-            query_parts = []
-            for key, value in params.items():
-                if isinstance(value, bool):
-                    value = str(value).lower()
-                query_parts.append(f"{key}={urllib.parse.quote(str(value))}")
-            path = f"{path}?{'&'.join(query_parts)}"
+        return self._make_request('GET', self._with_params(path, params))
+    
+    def paginate(self, path: str, params: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+        """
+        Iterate over every item of a paginated GET endpoint.
         
-        return self._make_request('GET', path)
+        Pages are fetched lazily by following the Link header's "next" URL,
+        so stopping early skips the remaining pages. Search endpoints, which
+        wrap results in {"items": [...]}, yield their items.
+        
+        Args:
+            path: API endpoint path
+            params: Query parameters for the first page (e.g. per_page)
+            
+        Yields:
+            Items of each page, in order
+        """
+        path = self._with_params(path, params)
+        while path:
+            page, headers = self._make_request('GET', path, return_headers=True)
+            if isinstance(page, dict):
+                page = page.get('items', [])
+            yield from page or []
+            path = self._next_page(headers)
+    
+    def _with_params(self, path: str, params: Optional[Dict[str, Any]]) -> str:
+        """Append query parameters to a path"""
+        if not params:
+            return path
+        query_parts = []
+        for key, value in params.items():
+            if isinstance(value, bool):
+                value = str(value).lower()
+            query_parts.append(f"{key}={urllib.parse.quote(str(value))}")
+        return f"{path}?{'&'.join(query_parts)}"
+    
+    def _next_page(self, headers) -> Optional[str]:
+        """Path of the Link header's next page, if it is on this API"""
+        for url, rel in re.findall(r'<([^>]+)>;\s*rel="([^"]+)"', headers.get('Link') or ''):
+            if rel == 'next' and url.startswith(self.base_url + '/'):
+                return url[len(self.base_url):]
+        return None
     
     def post(self, path: str, data: Dict) -> Any:
         """
@@ -340,6 +533,13 @@ class GitHubAPIClient:
         """
         return self._make_request('DELETE', path)
     
+    def close(self):
+        """Close the pooled keep-alive connections, and the response cache if the client opened it"""
+        if self.pool:
+            self.pool.close()
+        if self._owns_cache:
+            self.cache.close()
+    
     def graphql(self, query: str, variables: Optional[Dict] = None) -> Any:
         """
         Execute GraphQL query.
@@ -354,18 +554,36 @@ class GitHubAPIClient:
         Raises:
             GitHubAPIException: On API or query errors
         """
-        data = {'query': query}
-        if variables:
-            data['variables'] = variables
-        
-        result = self.post('/graphql', data)
+        data, errors = self.graphql_with_errors(query, variables)
         
         # Check for GraphQL errors
-        if 'errors' in result:
-            error_messages = [err.get('message', 'Unknown error') for err in result['errors']]
+        if errors:
+            error_messages = [err.get('message', 'Unknown error') for err in errors]
             raise Exception(f"GraphQL errors: {', '.join(error_messages)}")
         
-        return result.get('data')
+        return data
+    
+    def graphql_with_errors(self, query: str, variables: Optional[Dict] = None) -> Tuple[Any, List[Dict]]:
+        """
+        Execute GraphQL query, keeping partial data when some fields fail.
+        
+        Args:
+            query: GraphQL query string
+            variables: Query variables
+            
+        Returns:
+            (data, errors): fields that failed are null in data, and each
+            error's 'path' names the field it belongs to
+            
+        Raises:
+            GitHubAPIException: On API errors
+        """
+        data = {'query': query}
+        if variables:
+            data['variables'] = variables
+        
+        result = self.post('/graphql', data) or {}
+        return result.get('data'), result.get('errors') or []
 
 
 def validate_response(response: Any, expected_fields: list) -> bool:
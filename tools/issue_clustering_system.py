@@ -28,6 +28,13 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Set, Any
 import re
 
+from clustering_engine import (
+    SilhouetteEstimate,
+    distance_rows,
+    kmeans,
+    silhouette_score,
+)
+
 
 @dataclass
 class IssueData:
@@ -76,6 +83,21 @@ class ClusteringMetrics:
     avg_cluster_size: float
     cluster_sizes: List[int]
     label_distribution: Dict[str, int]
+    silhouette_mode: str = 'exact'
+    silhouette_ci: Optional[List[float]] = None
+    
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class KSweepResult:
+    """Clustering quality for one candidate number of clusters"""
+    k: int
+    silhouette_score: float
+    silhouette_ci: List[float]
+    inertia: float
+    cluster_sizes: List[int]
     
     def to_dict(self):
         return asdict(self)
@@ -128,6 +150,10 @@ class IssueClusteringSystem:
         self.tfidf_vectors: List[Dict[str, float]] = []
         self.metrics: Optional[ClusteringMetrics] = None
         
+        # Normalized vectors are reused across clustering runs on the same issues
+        self._prepared_issues: List[IssueData] = []
+        self._normalized_vectors: List[List[float]] = []
+        
     def load_issues_from_github(self, issues_data: List[Dict[str, Any]]):
         """
         Load issues from GitHub API response format.
@@ -334,88 +360,46 @@ class IssueClusteringSystem:
         if magnitude1 == 0 or magnitude2 == 0:
             return 0.0
         
-        return dot_product / (magnitude1 * magnitude2)
+        # Clamp rounding error so identical vectors never exceed 1.0
+        return max(-1.0, min(1.0, dot_product / (magnitude1 * magnitude2)))
     
     def _kmeans_clustering(
         self, 
         vectors: List[List[float]], 
         k: int, 
-        max_iterations: int = 100
+        max_iterations: int = 100,
+        batch_size: Optional[int] = None
     ) -> Tuple[List[int], List[List[float]]]:
         """
-        K-means clustering implementation with K-means++ initialization.
+        K-means clustering with K-means++ initialization.
+        
+        Delegates to the shared clustering engine, which uses NumPy when
+        available and a pure-Python fallback otherwise.
         
         Args:
             vectors: List of feature vectors
             k: Number of clusters
             max_iterations: Maximum iterations
+            batch_size: Use mini-batch k-means with this batch size
             
         Returns:
             Tuple of (cluster assignments, centroids)
         """
-        import random
-        
-        if not vectors or k <= 0:
-            return [], []
-        
-        n = len(vectors)
-        n_features = len(vectors[0])
-        
-        # K-means++ initialization
-        centroids = []
-        centroids.append(vectors[random.randint(0, n-1)][:])
-        
-        for _ in range(k - 1):
-            distances = []
-            for vector in vectors:
-                min_dist = min(self._euclidean_distance(vector, c) for c in centroids)
-                distances.append(min_dist)
-            
-            # Select next centroid proportional to distance squared
-            total = sum(d**2 for d in distances)
-            if total == 0:
-                centroids.append(vectors[random.randint(0, n-1)][:])
-            else:
-                r = random.uniform(0, total)
-                cumsum = 0
-                for i, d in enumerate(distances):
-                    cumsum += d**2
-                    if cumsum >= r:
-                        centroids.append(vectors[i][:])
-                        break
-        
-        clusters = [0] * n
-        
-        # K-means iterations
-        for iteration in range(max_iterations):
-            # Assign to nearest centroid
-            new_clusters = []
-            for vector in vectors:
-                distances = [self._euclidean_distance(vector, centroid) for centroid in centroids]
-                new_clusters.append(distances.index(min(distances)))
-            
-            # Check convergence
-            if new_clusters == clusters:
-                print(f"K-means converged in {iteration + 1} iterations")
-                break
-            
-            clusters = new_clusters
-            
-            # Update centroids
-            for cluster_id in range(k):
-                cluster_points = [vectors[i] for i, c in enumerate(clusters) if c == cluster_id]
-                if cluster_points:
-                    centroids[cluster_id] = [
-                        sum(p[i] for p in cluster_points) / len(cluster_points)
-                        for i in range(n_features)
-                    ]
-        
-        return clusters, centroids
+        return kmeans(
+            vectors,
+            k,
+            max_iterations=max_iterations,
+            batch_size=batch_size,
+            verbose=True
+        )
     
     def _calculate_silhouette_score(
         self, 
         vectors: List[List[float]], 
-        clusters: List[int]
+        clusters: List[int],
+        mode: str = 'exact',
+        sample_size: int = 1000,
+        centroids: Optional[List[List[float]]] = None
     ) -> float:
         """
         Calculate average silhouette score for clustering quality.
@@ -423,46 +407,47 @@ class IssueClusteringSystem:
         Args:
             vectors: List of feature vectors
             clusters: Cluster assignments
+            mode: 'exact', 'sampled', 'centroid' or 'auto'
+            sample_size: Points scored in sampled mode
+            centroids: Cluster centroids (required for centroid mode)
             
         Returns:
             Average silhouette score (-1 to 1, higher is better)
         """
-        if len(set(clusters)) < 2:
-            return 0.0
+        return self._estimate_silhouette(vectors, clusters, mode, sample_size, centroids).score
+    
+    def _estimate_silhouette(
+        self,
+        vectors: List[List[float]],
+        clusters: List[int],
+        mode: str = 'auto',
+        sample_size: int = 1000,
+        centroids: Optional[List[List[float]]] = None
+    ) -> SilhouetteEstimate:
+        """
+        Estimate the silhouette score with a confidence interval.
         
-        n = len(vectors)
-        silhouette_scores = []
+        Exact scoring compares every pair of issues, which is quadratic. Sampled
+        scoring compares sample_size issues against all issues, and centroid
+        scoring compares every issue against the cluster centroids only.
         
-        for i in range(n):
-            cluster_i = clusters[i]
-            
-            # Calculate average distance to points in same cluster (a)
-            same_cluster = [j for j in range(n) if clusters[j] == cluster_i and j != i]
-            if not same_cluster:
-                continue
-            
-            a = sum(self._euclidean_distance(vectors[i], vectors[j]) for j in same_cluster) / len(same_cluster)
-            
-            # Calculate average distance to nearest other cluster (b)
-            other_clusters = set(clusters) - {cluster_i}
-            b_scores = []
-            
-            for other_cluster in other_clusters:
-                other_points = [j for j in range(n) if clusters[j] == other_cluster]
-                if other_points:
-                    b_other = sum(self._euclidean_distance(vectors[i], vectors[j]) for j in other_points) / len(other_points)
-                    b_scores.append(b_other)
-            
-            if not b_scores:
-                continue
-            
-            b = min(b_scores)
+        Args:
+            vectors: List of feature vectors
+            clusters: Cluster assignments
+            mode: 'exact', 'sampled', 'centroid' or 'auto'
+            sample_size: Points scored in sampled mode
+            centroids: Cluster centroids (required for centroid mode)
             
-            # Calculate silhouette score
-            s = (b - a) / max(a, b) if max(a, b) > 0 else 0
-            silhouette_scores.append(s)
-        
-        return sum(silhouette_scores) / len(silhouette_scores) if silhouette_scores else 0.0
+        Returns:
+            SilhouetteEstimate with score and confidence interval
+        """
+        return silhouette_score(
+            vectors,
+            clusters,
+            mode=mode,
+            sample_size=sample_size,
+            centroids=centroids
+        )
     
     def _generate_cluster_name(
         self, 
@@ -539,10 +524,117 @@ class IssueClusteringSystem:
         else:
             return 'general'
     
+    def _prepare_vectors(self) -> List[List[float]]:
+        """
+        Build the TF-IDF index and normalized dense vectors for the loaded issues.
+        
+        The result is cached and reused until a different set of issues is loaded.
+        
+        Returns:
+            Normalized dense vectors, one per issue
+        """
+        cached = self._prepared_issues
+        if (cached and len(cached) == len(self.issues)
+                and all(a is b for a, b in zip(cached, self.issues))):
+            return self._normalized_vectors
+        
+        self._build_tfidf_index()
+        self._normalized_vectors = self._normalize_vectors(self.tfidf_vectors)
+        self._prepared_issues = list(self.issues)
+        return self._normalized_vectors
+    
+    def _calculate_inertia(
+        self,
+        vectors: List[List[float]],
+        clusters: List[int],
+        centroids: List[List[float]]
+    ) -> float:
+        """Calculate inertia (sum of squared distances to centroids)."""
+        inertia = 0.0
+        for vector, cluster_id in zip(vectors, clusters):
+            inertia += self._euclidean_distance(vector, centroids[cluster_id]) ** 2
+        return inertia
+    
+    def sweep_k(
+        self,
+        k_values: List[int],
+        silhouette_mode: str = 'auto',
+        silhouette_sample_size: int = 1000,
+        batch_size: Optional[int] = None
+    ) -> List[KSweepResult]:
+        """
+        Cluster the loaded issues for several candidate k and score each.
+        
+        The TF-IDF vectors are built once, and for exact or sampled silhouette
+        the distance rows of the scored issues are computed once, since they
+        do not depend on the cluster assignments. Each k then only costs one
+        k-means run plus an O(s·n) pass over the cached rows.
+        
+        Args:
+            k_values: Candidate numbers of clusters
+            silhouette_mode: 'exact', 'sampled', 'centroid' or 'auto'
+            silhouette_sample_size: Issues scored by sampled silhouette
+            batch_size: Use mini-batch k-means with this batch size
+            
+        Returns:
+            One KSweepResult per usable k, in the order given
+        """
+        if not self.issues:
+            print("No issues loaded. Use load_issues_from_file() first.", file=sys.stderr)
+            return []
+        
+        vectors = self._prepare_vectors()
+        n = len(vectors)
+        
+        mode = silhouette_mode
+        if mode == 'auto':
+            mode = 'exact' if n <= silhouette_sample_size else 'sampled'
+        
+        sample_indices = None
+        rows = None
+        if mode in ('exact', 'sampled'):
+            if mode == 'exact' or silhouette_sample_size >= n:
+                sample_indices = list(range(n))
+            else:
+                import random
+                sample_indices = sorted(random.sample(range(n), silhouette_sample_size))
+            rows = distance_rows(vectors, sample_indices)
+        
+        results = []
+        for k in k_values:
+            if k < 2 or k > n:
+                print(f"Skipping k={k}: needs 2 <= k <= {n}", file=sys.stderr)
+                continue
+            
+            clusters, centroids = self._kmeans_clustering(vectors, k, batch_size=batch_size)
+            estimate = silhouette_score(
+                vectors,
+                clusters,
+                mode=mode,
+                centroids=centroids,
+                sample_indices=sample_indices,
+                rows=rows
+            )
+            sizes = [clusters.count(cluster_id) for cluster_id in range(k)]
+            
+            results.append(KSweepResult(
+                k=k,
+                silhouette_score=estimate.score,
+                silhouette_ci=[estimate.ci_low, estimate.ci_high],
+                inertia=self._calculate_inertia(vectors, clusters, centroids),
+                cluster_sizes=sizes
+            ))
+            print(f"k={k}: silhouette {estimate.score:.3f}")
+        
+        return results
+    
     def perform_clustering(
         self, 
         n_clusters: int = 5, 
-        min_cluster_size: int = 2
+        min_cluster_size: int = 2,
+        batch_size: Optional[int] = None,
+        silhouette_mode: str = 'auto',
+        silhouette_sample_size: int = 1000
     ) -> List[IssueCluster]:
         """
         Perform K-means clustering on issues.
@@ -550,6 +642,11 @@ class IssueClusteringSystem:
         Args:
             n_clusters: Target number of clusters
             min_cluster_size: Minimum issues per cluster
+            batch_size: Use mini-batch k-means with this batch size (for
+                large issue sets)
+            silhouette_mode: 'exact', 'sampled', 'centroid' or 'auto' (exact
+                up to silhouette_sample_size issues, sampled above)
+            silhouette_sample_size: Issues scored by sampled silhouette
             
         Returns:
             List of issue clusters
@@ -562,25 +659,33 @@ class IssueClusteringSystem:
             print(f"Warning: Only {len(self.issues)} issues, using {len(self.issues)} clusters")
             n_clusters = len(self.issues)
         
-        # Build TF-IDF index
-        self._build_tfidf_index()
+        # Build TF-IDF index and normalized vectors (reused if already built)
+        normalized_vectors = self._prepare_vectors()
         
-        # Convert to normalized vectors
         print(f"Clustering {len(self.issues)} issues into {n_clusters} clusters...")
-        normalized_vectors = self._normalize_vectors(self.tfidf_vectors)
         
         # Perform K-means clustering
-        cluster_assignments, centroids = self._kmeans_clustering(normalized_vectors, n_clusters)
+        cluster_assignments, centroids = self._kmeans_clustering(
+            normalized_vectors, n_clusters, batch_size=batch_size
+        )
         
         # Calculate quality metrics
-        silhouette = self._calculate_silhouette_score(normalized_vectors, cluster_assignments)
+        estimate = self._estimate_silhouette(
+            normalized_vectors,
+            cluster_assignments,
+            mode=silhouette_mode,
+            sample_size=silhouette_sample_size,
+            centroids=centroids
+        )
+        silhouette = estimate.score
         
-        # Calculate inertia (sum of squared distances to centroids)
-        inertia = 0.0
-        for i, (vector, cluster_id) in enumerate(zip(normalized_vectors, cluster_assignments)):
-            inertia += self._euclidean_distance(vector, centroids[cluster_id]) ** 2
+        inertia = self._calculate_inertia(normalized_vectors, cluster_assignments, centroids)
         
-        print(f"Silhouette score: {silhouette:.3f}")
+        if estimate.ci_low != estimate.ci_high:
+            print(f"Silhouette score: {silhouette:.3f} "
+                  f"(95% CI {estimate.ci_low:.3f}-{estimate.ci_high:.3f}, {estimate.mode})")
+        else:
+            print(f"Silhouette score: {silhouette:.3f}")
         print(f"Inertia: {inertia:.3f}")
         
         # Create cluster objects
@@ -656,7 +761,9 @@ class IssueClusteringSystem:
             num_issues=len(self.issues),
             avg_cluster_size=sum(cluster_sizes) / len(cluster_sizes) if cluster_sizes else 0,
             cluster_sizes=cluster_sizes,
-            label_distribution=label_distribution
+            label_distribution=label_distribution,
+            silhouette_mode=estimate.mode,
+            silhouette_ci=[estimate.ci_low, estimate.ci_high]
         )
         
         print(f"\nCreated {len(self.clusters)} clusters")
@@ -854,6 +961,27 @@ Examples:
     cluster_parser.add_argument('--min-size', type=int, default=2, help='Min cluster size')
     cluster_parser.add_argument('--output', help='Output JSON file')
     cluster_parser.add_argument('--report', help='Generate markdown report to file')
+    cluster_parser.add_argument('--batch-size', type=int,
+                                help='Use mini-batch k-means with this batch size')
+    cluster_parser.add_argument('--silhouette', default='auto',
+                                choices=['auto', 'exact', 'sampled', 'centroid'],
+                                help='Silhouette scoring mode')
+    cluster_parser.add_argument('--silhouette-sample-size', type=int, default=1000,
+                                help='Issues scored by sampled silhouette')
+    
+    # Sweep command
+    sweep_parser = subparsers.add_parser('sweep', help='Compare several numbers of clusters')
+    sweep_parser.add_argument('--input', required=True, help='Input JSON file with issues')
+    sweep_parser.add_argument('--k-values', type=int, nargs='+', default=[2, 3, 4, 5, 6, 8, 10],
+                              help='Numbers of clusters to try')
+    sweep_parser.add_argument('--batch-size', type=int,
+                              help='Use mini-batch k-means with this batch size')
+    sweep_parser.add_argument('--silhouette', default='auto',
+                              choices=['auto', 'exact', 'sampled', 'centroid'],
+                              help='Silhouette scoring mode')
+    sweep_parser.add_argument('--silhouette-sample-size', type=int, default=1000,
+                              help='Issues scored by sampled silhouette')
+    sweep_parser.add_argument('--output', help='Output JSON file')
     
     # Predict command
     predict_parser = subparsers.add_parser('predict', help='Predict cluster for new issue')
@@ -881,7 +1009,10 @@ Examples:
         # Perform clustering
         clusters = system.perform_clustering(
             n_clusters=args.clusters,
-            min_cluster_size=args.min_size
+            min_cluster_size=args.min_size,
+            batch_size=args.batch_size,
+            silhouette_mode=args.silhouette,
+            silhouette_sample_size=args.silhouette_sample_size
         )
         
         # Save results
@@ -897,6 +1028,29 @@ Examples:
         else:
             print("\n" + system.generate_report())
     
+    elif args.command == 'sweep':
+        system.load_issues_from_file(args.input)
+        
+        if len(system.issues) == 0:
+            print("No issues loaded. Exiting.", file=sys.stderr)
+            sys.exit(1)
+        
+        results = system.sweep_k(
+            args.k_values,
+            silhouette_mode=args.silhouette,
+            silhouette_sample_size=args.silhouette_sample_size,
+            batch_size=args.batch_size
+        )
+        
+        if results:
+            best = max(results, key=lambda r: r.silhouette_score)
+            print(f"\nBest k by silhouette: {best.k} ({best.silhouette_score:.3f})")
+        
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump([r.to_dict() for r in results], f, indent=2)
+            print(f"Sweep results saved to: {args.output}")
+    
     elif args.command == 'predict':
         # Load previous clustering results
         system.load_issues_from_file(args.input)
@@ -9,22 +9,112 @@ Analyzes the codebase to extract:
 """
 
 import ast
+import hashlib
 import json
 import os
 import subprocess
 import re
+import tempfile
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Any
+from typing import Dict, List, Set, Tuple, Any, Optional
 from datetime import datetime
 
+from repo_scanner import discover_files, scan_files
+
+
+# Version of the persisted git history index; bump when its layout changes
+HISTORY_INDEX_VERSION = 1
+
+# Version of the per-file analysis cache; bump when analyze_file output changes
+ANALYSIS_CACHE_VERSION = 1
+
+# Only these files take part in the co-change matrix
+CO_CHANGE_SUFFIXES = ('.py',)
+
+# Commits touching more tracked files than this (bulk imports, mass
+# reformatting) say nothing about coupling and are left out of the matrix
+MAX_CO_CHANGE_FILES = 50
+
+# Field and record separators for streamed git log output
+_FIELD_SEP = '\x1f'
+_RECORD_SEP = '\x1e'
+
+
+class AnalysisCache:
+    """
+    Per-file analysis results keyed by file content hash.
+    
+    Each entry holds the SHA-256 of the file, its analyze_file() result and
+    its internal import dependencies. Dependencies also depend on the set of
+    files in the repository, so they are only reused while that set is
+    unchanged (tracked by module_fingerprint).
+    """
+    
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.module_fingerprint: Optional[str] = None
+        self._load()
+    
+    def _load(self):
+        """Load cached entries, if any"""
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Ignoring unreadable analysis cache {self.path}: {e}")
+            return
+        if data.get('version') != ANALYSIS_CACHE_VERSION:
+            return
+        self.entries = data.get('files', {})
+        self.module_fingerprint = data.get('module_fingerprint')
+    
+    def save(self):
+        """Persist the cache atomically"""
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': ANALYSIS_CACHE_VERSION,
+                'module_fingerprint': self.module_fingerprint,
+                'files': self.entries
+            }, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp_path, self.path)
+    
+    def lookup(self, filepath: str, digest: str) -> Optional[Dict[str, Any]]:
+        """Get the cache entry for a file if its content is unchanged"""
+        entry = self.entries.get(filepath)
+        if entry and entry.get('sha256') == digest:
+            return entry
+        return None
+    
+    def store(self, filepath: str, digest: str, analysis: Optional[Dict[str, Any]]):
+        """Record a fresh analysis, dropping any stale dependencies"""
+        self.entries[filepath] = {'sha256': digest, 'analysis': analysis}
+    
+    def prune(self, filepaths: Set[str]):
+        """Drop entries for files that no longer exist"""
+        for filepath in set(self.entries) - filepaths:
+            del self.entries[filepath]
+
 
 class CodeAnalyzer:
     """Analyzes Python files to extract code relationships"""
     
-    def __init__(self, repo_path: str):
+    def __init__(self, repo_path: str, cache: Optional[AnalysisCache] = None, jobs: int = 1):
         self.repo_path = Path(repo_path)
         self.files_analyzed = []
+        self.cache = cache
+        # Worker processes for parsing (1 = serial, 0 = all CPUs)
+        self.jobs = jobs
+        # Files whose analysis was recomputed or reused by the last analyze_repository()
+        self.files_reanalyzed: List[str] = []
+        self.files_cached = 0
         
     def analyze_file(self, filepath: Path) -> Dict[str, Any]:
         """Analyze a single Python file"""
@@ -111,57 +201,298 @@ class CodeAnalyzer:
         return self._get_name(node)
     
     def analyze_repository(self) -> List[Dict[str, Any]]:
-        """Analyze all Python files in repository"""
-        results = []
+        """
+        Analyze all Python files in repository.
         
-        for py_file in self.repo_path.rglob('*.py'):
-            # Skip virtual environments and build directories
-            if any(part in py_file.parts for part in ['.venv', 'venv', '__pycache__', 'build', 'dist', '.git']):
-                continue
+        With a cache, files whose content hash is unchanged reuse their
+        previous analysis and only new or modified files are parsed. Files
+        that need parsing are spread over self.jobs worker processes and
+        merged back in discovery order.
+        """
+        # relative path -> analysis, or None until parsed
+        analyses: Dict[str, Optional[Dict[str, Any]]] = {}
+        digests = {}
+        self.files_reanalyzed = []
+        self.files_cached = 0
+        
+        for path in discover_files(str(self.repo_path)):
+            py_file = Path(path)
+            relative = str(py_file.relative_to(self.repo_path))
+            
+            if self.cache is not None:
+                try:
+                    digest = hashlib.sha256(py_file.read_bytes()).hexdigest()
+                except OSError as e:
+                    print(f"Warning: Could not read {py_file}: {e}")
+                    continue
+                
+                entry = self.cache.lookup(relative, digest)
+                if entry is not None:
+                    analyses[relative] = entry['analysis']
+                    self.files_cached += 1
+                    continue
+                digests[relative] = digest
             
-            result = self.analyze_file(py_file)
+            analyses[relative] = None
+            self.files_reanalyzed.append(relative)
+        
+        pending = [self.repo_path / relative for relative in self.files_reanalyzed]
+        for relative, scanned in zip(self.files_reanalyzed, scan_files(pending, self.analyze_file, self.jobs)):
+            if scanned.error is not None:
+                print(f"Warning: Could not analyze {scanned.path}: {scanned.error}")
+            analyses[relative] = scanned.value
+            if self.cache is not None:
+                self.cache.store(relative, digests[relative], scanned.value)
+        
+        results = []
+        for relative, result in analyses.items():
             if result:
                 results.append(result)
-                self.files_analyzed.append(str(py_file.relative_to(self.repo_path)))
+                self.files_analyzed.append(relative)
+        
+        if self.cache is not None:
+            self.cache.prune(set(analyses))
         
         return results
 
 
+class GitHistoryIndex:
+    """
+    Per-file commit lists and a sparse co-change matrix for the history of HEAD.
+    
+    The whole history is read with one streamed `git log --name-only` scan.
+    When a persisted index exists and its last indexed commit is an ancestor
+    of HEAD, only the commits after it are scanned.
+    """
+    
+    def __init__(self, repo_path: str, index_path: Optional[str] = None):
+        self.repo_path = Path(repo_path)
+        self.index_path = Path(index_path) if index_path else None
+        self._reset()
+    
+    def _reset(self):
+        """Forget all indexed history"""
+        # Commits in chronological order as [hash, author, email, date, subject]
+        self.commits: List[List[str]] = []
+        # File path -> indices into self.commits, oldest first
+        self.file_commits: Dict[str, List[int]] = {}
+        # Sparse upper triangle: co_changes[a][b] with a < b
+        self.co_changes: Dict[str, Dict[str, int]] = {}
+        self.last_commit: Optional[str] = None
+    
+    def _git(self, args: List[str]) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            ['git', '-C', str(self.repo_path)] + args,
+            capture_output=True, text=True
+        )
+    
+    def _load(self):
+        """Load the persisted index, if any"""
+        self._reset()
+        if not self.index_path or not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Ignoring unreadable history index {self.index_path}: {e}")
+            return
+        if data.get('version') != HISTORY_INDEX_VERSION:
+            return
+        self.commits = data['commits']
+        self.file_commits = data['file_commits']
+        self.co_changes = data['co_changes']
+        self.last_commit = data['last_commit']
+    
+    def _save(self):
+        """Persist the index atomically"""
+        if not self.index_path:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(self.index_path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': HISTORY_INDEX_VERSION,
+                'last_commit': self.last_commit,
+                'commits': self.commits,
+                'file_commits': self.file_commits,
+                'co_changes': self.co_changes
+            }, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+    
+    def _add_commit(self, fields: List[str], files: List[str]):
+        """Record one commit and the files it changed"""
+        commit_index = len(self.commits)
+        self.commits.append(fields)
+        
+        for filepath in files:
+            self.file_commits.setdefault(filepath, []).append(commit_index)
+        
+        tracked = sorted({f for f in files if f.endswith(CO_CHANGE_SUFFIXES)})
+        if len(tracked) > MAX_CO_CHANGE_FILES:
+            return
+        for i, f1 in enumerate(tracked):
+            row = self.co_changes.setdefault(f1, {})
+            for f2 in tracked[i + 1:]:
+                row[f2] = row.get(f2, 0) + 1
+    
+    def _scan(self, revision_range: str) -> int:
+        """
+        Stream `git log` over a revision range, oldest commit first.
+        
+        Raises:
+            subprocess.CalledProcessError: git log failed part way; commits
+                read before the failure have already been added
+        """
+        # A file rather than a pipe, so git never blocks on unread stderr
+        stderr = tempfile.TemporaryFile(mode='w+', encoding='utf-8', errors='replace')
+        proc = subprocess.Popen(
+            [
+                'git', '-C', str(self.repo_path), '-c', 'core.quotePath=false',
+                'log', '--reverse', '--name-only', '--no-renames',
+                '--format=' + _RECORD_SEP + _FIELD_SEP.join(['%H', '%an', '%ae', '%aI', '%s']),
+                revision_range
+            ],
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        )
+        
+        scanned = 0
+        fields = None
+        files: List[str] = []
+        for line in proc.stdout:
+            line = line.rstrip('\n')
+            if line.startswith(_RECORD_SEP):
+                if fields:
+                    self._add_commit(fields, files)
+                    scanned += 1
+                parts = line[1:].split(_FIELD_SEP)
+                fields = parts if len(parts) == 5 else None
+                files = []
+            elif line and fields:
+                files.append(line)
+        if fields:
+            self._add_commit(fields, files)
+            scanned += 1
+        
+        proc.stdout.close()
+        with stderr:
+            if proc.wait() != 0:
+                stderr.seek(0)
+                raise subprocess.CalledProcessError(proc.returncode, proc.args, stderr=stderr.read())
+        return scanned
+    
+    def update(self) -> int:
+        """
+        Bring the index up to date with HEAD.
+        
+        Returns:
+            Number of commits scanned
+        """
+        self._load()
+        
+        head = self._git(['rev-parse', '--verify', '-q', 'HEAD'])
+        if head.returncode != 0:
+            self._reset()
+            return 0
+        head = head.stdout.strip()
+        
+        if head == self.last_commit:
+            return 0
+        
+        revision_range = 'HEAD'
+        if self.last_commit:
+            is_ancestor = self._git(['merge-base', '--is-ancestor', self.last_commit, head])
+            if is_ancestor.returncode == 0:
+                revision_range = f'{self.last_commit}..{head}'
+            else:
+                # History was rewritten; index it again from scratch
+                self._reset()
+        
+        try:
+            scanned = self._scan(revision_range)
+        except subprocess.CalledProcessError as e:
+            print(f"Warning: Could not index git history of {self.repo_path}: {e.stderr.strip()}")
+            # Drop the partial scan; the next update retries from the saved index
+            self._load()
+            return 0
+        self.last_commit = head
+        self._save()
+        return scanned
+    
+    def file_history(self, filepath: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Get the most recent commits that changed a file, newest first"""
+        indices = self.file_commits.get(filepath, [])
+        history = []
+        for commit_index in reversed(indices[-limit:] if limit else indices):
+            commit_hash, author, email, date, message = self.commits[commit_index]
+            history.append({
+                'hash': commit_hash,
+                'author': author,
+                'email': email,
+                'date': date,
+                'message': message
+            })
+        return history
+    
+    def co_change_pairs(self, files: Optional[List[str]] = None,
+                        min_count: int = 1) -> List[Tuple[str, str, int]]:
+        """
+        Get file pairs changed together at least min_count times.
+        
+        Args:
+            files: Only report pairs where both files are in this list
+            min_count: Minimum number of shared commits
+            
+        Returns:
+            (file1, file2, count) tuples sorted by count, highest first
+        """
+        wanted = set(files) if files is not None else None
+        pairs = []
+        for f1, row in self.co_changes.items():
+            if wanted is not None and f1 not in wanted:
+                continue
+            for f2, count in row.items():
+                if count >= min_count and (wanted is None or f2 in wanted):
+                    pairs.append((f1, f2, count))
+        pairs.sort(key=lambda x: (-x[2], x[0], x[1]))
+        return pairs
+
+
 class GitAnalyzer:
     """Analyzes git history to extract agent and collaboration patterns"""
     
-    def __init__(self, repo_path: str):
+    def __init__(self, repo_path: str, history_index: Optional[GitHistoryIndex] = None):
         self.repo_path = Path(repo_path)
+        self._history_index = history_index
+        self._history_indexed = False
+    
+    def refresh_history(self) -> int:
+        """
+        Bring the history index up to date with HEAD.
+        
+        Returns:
+            Number of newly indexed commits
+        """
+        if self._history_index is None:
+            self._history_index = GitHistoryIndex(self.repo_path)
+        self._history_indexed = True
+        return self._history_index.update()
+    
+    @property
+    def history_index(self) -> GitHistoryIndex:
+        """History index, brought up to date with HEAD on first use"""
+        if not self._history_indexed:
+            self.refresh_history()
+        return self._history_index
     
     def get_file_history(self, filepath: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get git history for a specific file"""
         try:
-            cmd = [
-                'git', '-C', str(self.repo_path), 'log',
-                f'--max-count={limit}',
-                '--format=%H|%an|%ae|%aI|%s',
-                '--', filepath
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            
-            if result.returncode != 0:
-                return []
-            
-            commits = []
-            for line in result.stdout.strip().split('\n'):
-                if not line:
-                    continue
-                parts = line.split('|')
-                if len(parts) >= 5:
-                    commits.append({
-                        'hash': parts[0],
-                        'author': parts[1],
-                        'email': parts[2],
-                        'date': parts[3],
-                        'message': parts[4]
-                    })
-            
-            return commits
+            return self.history_index.file_history(filepath, limit)
         
         except Exception as e:
             print(f"Warning: Could not get git history for {filepath}: {e}")
@@ -218,42 +549,7 @@ class GitAnalyzer:
     def find_frequently_changed_together(self, files: List[str], min_count: int = 3) -> List[Tuple[str, str, int]]:
         """Find files that frequently change together"""
         try:
-            # Get all commits
-            cmd = ['git', '-C', str(self.repo_path), 'log', '--format=%H', '--all']
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            
-            if result.returncode != 0:
-                return []
-            
-            commits = result.stdout.strip().split('\n')[:200]  # Limit to recent commits
-            
-            # Track file pairs in commits
-            file_pairs = defaultdict(int)
-            
-            for commit_hash in commits:
-                if not commit_hash:
-                    continue
-                
-                # Get files in this commit
-                cmd = ['git', '-C', str(self.repo_path), 'diff-tree', '--no-commit-id', '--name-only', '-r', commit_hash]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-                
-                if result.returncode != 0:
-                    continue
-                
-                commit_files = [f for f in result.stdout.strip().split('\n') if f.endswith('.py')]
-                
-                # Count pairs
-                for i, f1 in enumerate(commit_files):
-                    for f2 in commit_files[i+1:]:
-                        pair = tuple(sorted([f1, f2]))
-                        file_pairs[pair] += 1
-            
-            # Filter by minimum count
-            frequent_pairs = [(f1, f2, count) for (f1, f2), count in file_pairs.items() if count >= min_count]
-            frequent_pairs.sort(key=lambda x: x[2], reverse=True)
-            
-            return frequent_pairs
+            return self.history_index.co_change_pairs(files, min_count)
         
         except Exception as e:
             print(f"Warning: Could not analyze file change patterns: {e}")
@@ -263,15 +559,15 @@ class GitAnalyzer:
 class PatternAnalyzer:
     """Analyzes code patterns, quality metrics, and error patterns"""
     
-    def __init__(self, repo_path: str):
+    def __init__(self, repo_path: str, git_analyzer: Optional[GitAnalyzer] = None):
         self.repo_path = Path(repo_path)
-        self.git_analyzer = GitAnalyzer(repo_path)
+        self.git_analyzer = git_analyzer or GitAnalyzer(repo_path)
     
     def analyze_error_fix_patterns(self, files: List[str]) -> Dict[str, List[Dict[str, Any]]]:
         """Analyze patterns in error fixes from git history"""
         error_patterns = defaultdict(list)
         
-        for filepath in files[:20]:  # Limit to avoid long processing
+        for filepath in files:
             try:
                 history = self.git_analyzer.get_file_history(filepath, limit=30)
                 
@@ -313,7 +609,7 @@ class PatternAnalyzer:
         """Track refactoring patterns across files"""
         refactoring_counts = defaultdict(int)
         
-        for filepath in files[:20]:  # Limit for performance
+        for filepath in files:
             try:
                 history = self.git_analyzer.get_file_history(filepath, limit=30)
                 
@@ -436,17 +732,35 @@ class TestCoverageAnalyzer:
 class KnowledgeGraphBuilder:
     """Main builder that coordinates all analysis"""
     
-    def __init__(self, repo_path: str = '.'):
+    def __init__(self, repo_path: str = '.',
+                 history_index_path: str = 'docs/data/codebase-history-index.json',
+                 analysis_cache_path: Optional[str] = None,
+                 jobs: int = 1):
         self.repo_path = Path(repo_path).resolve()
-        self.code_analyzer = CodeAnalyzer(self.repo_path)
-        self.git_analyzer = GitAnalyzer(self.repo_path)
+        self.history_index = GitHistoryIndex(
+            self.repo_path,
+            self.repo_path / history_index_path if history_index_path else None
+        )
+        # Without an explicit path the cache lives next to the saved graph
+        self._analysis_cache_fixed = analysis_cache_path is not None
+        self.analysis_cache = AnalysisCache(
+            self.repo_path / analysis_cache_path if analysis_cache_path else None
+        )
+        self.code_analyzer = CodeAnalyzer(self.repo_path, self.analysis_cache, jobs)
+        self.git_analyzer = GitAnalyzer(self.repo_path, self.history_index)
         self.test_analyzer = TestCoverageAnalyzer(self.repo_path)
-        self.pattern_analyzer = PatternAnalyzer(self.repo_path)
+        self.pattern_analyzer = PatternAnalyzer(self.repo_path, self.git_analyzer)
     
     def build_graph(self) -> Dict[str, Any]:
         """Build complete knowledge graph"""
+        print("📚 Indexing git history...")
+        scanned = self.git_analyzer.refresh_history()
+        print(f"   {scanned} new commits indexed ({len(self.history_index.commits)} total)")
+        
         print("🔍 Analyzing codebase structure...")
         code_analysis = self.code_analyzer.analyze_repository()
+        print(f"   {len(self.code_analyzer.files_reanalyzed)} files analyzed, "
+              f"{self.code_analyzer.files_cached} reused from cache")
         
         print("📊 Analyzing git history...")
         files = [item['filepath'] for item in code_analysis]
@@ -506,8 +820,13 @@ class KnowledgeGraphBuilder:
         return graph
     
     def _build_dependency_graph(self, code_analysis: List[Dict]) -> Dict[str, Set[str]]:
-        """Build file dependency graph based on imports"""
-        dependencies = defaultdict(set)
+        """
+        Build file dependency graph based on imports.
+        
+        While the set of files is unchanged, files whose analysis came from
+        the cache keep their cached dependencies; only re-analyzed files are
+        matched against the module list again.
+        """
         file_to_modules = {}
         
         # Map file paths to their module names
@@ -516,20 +835,47 @@ class KnowledgeGraphBuilder:
             module_name = filepath.replace('/', '.').replace('.py', '')
             file_to_modules[module_name] = filepath
         
+        fingerprint = hashlib.sha256(
+            '\n'.join(sorted(file_to_modules.values())).encode('utf-8')
+        ).hexdigest()
+        cache = self.analysis_cache
+        reuse = cache.module_fingerprint == fingerprint
+        reanalyzed = set(self.code_analyzer.files_reanalyzed)
+        
         # Build dependency relationships
+        dependencies = {}
         for item in code_analysis:
             filepath = item['filepath']
+            entry = cache.entries.get(filepath)
             
-            for imp in item['imports']:
-                module = imp.get('module', '')
-                
-                # Check if this is an internal import
-                for internal_module, internal_path in file_to_modules.items():
-                    if module.startswith(internal_module.replace('.', '/')) or module in internal_module:
-                        if internal_path != filepath:
-                            dependencies[filepath].add(internal_path)
+            if reuse and filepath not in reanalyzed and entry and 'dependencies' in entry:
+                targets = entry['dependencies']
+            else:
+                targets = self._file_dependencies(item, file_to_modules)
+                if entry is not None:
+                    entry['dependencies'] = targets
+            
+            if targets:
+                dependencies[filepath] = targets
         
-        return {k: list(v) for k, v in dependencies.items()}
+        cache.module_fingerprint = fingerprint
+        return dependencies
+    
+    def _file_dependencies(self, item: Dict, file_to_modules: Dict[str, str]) -> List[str]:
+        """Find the internal files imported by one analyzed file"""
+        filepath = item['filepath']
+        targets = set()
+        
+        for imp in item['imports']:
+            module = imp.get('module', '')
+            
+            # Check if this is an internal import
+            for internal_module, internal_path in file_to_modules.items():
+                if module.startswith(internal_module.replace('.', '/')) or module in internal_module:
+                    if internal_path != filepath:
+                        targets.add(internal_path)
+        
+        return sorted(targets)
     
     def _create_nodes(self, code_analysis: List[Dict], test_files: List[str], 
                      contributor_analysis: Dict, complexity_metrics: Dict = None,
@@ -683,9 +1029,17 @@ class KnowledgeGraphBuilder:
     
     def save_graph(self, output_path: str = 'docs/data/codebase-graph.json'):
         """Build and save the knowledge graph"""
+        output_file = self.repo_path / output_path
+        
+        if not self._analysis_cache_fixed:
+            cache_path = output_file.with_name(output_file.stem + '.analysis-cache.json')
+            if self.analysis_cache.path != cache_path:
+                self.analysis_cache = AnalysisCache(cache_path)
+                self.code_analyzer.cache = self.analysis_cache
+        
         graph = self.build_graph()
+        self.analysis_cache.save()
         
-        output_file = self.repo_path / output_path
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -712,10 +1066,18 @@ def main():
     parser = argparse.ArgumentParser(description='Build knowledge graph from codebase')
     parser.add_argument('--repo-path', default='.', help='Path to repository')
     parser.add_argument('--output', default='docs/data/codebase-graph.json', help='Output file path')
+    parser.add_argument('--history-index', default='docs/data/codebase-history-index.json',
+                        help='Git history index file, relative to the repository')
+    parser.add_argument('--analysis-cache',
+                        help='Per-file analysis cache, relative to the repository '
+                             '(default: <output stem>.analysis-cache.json next to the graph)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Worker processes for parsing files (default: 1, 0 = all CPUs)')
     
     args = parser.parse_args()
     
-    builder = KnowledgeGraphBuilder(args.repo_path)
+    builder = KnowledgeGraphBuilder(args.repo_path, args.history_index, args.analysis_cache,
+                                    args.jobs)
     builder.save_graph(args.output)
 
 
@@ -8,6 +8,11 @@ Provides simple queries:
 - "What tests cover Z?"
 - "Show files that frequently change together"
 - Impact analysis and blast radius estimation
+- Graph analytics: PageRank, bottlenecks (betweenness) and communities
+
+Queries run against a compiled graph (see knowledge_graph_store.py). The
+compiled file is kept next to the JSON graph and memory-mapped, so later
+queries start without parsing or indexing the JSON.
 """
 
 import json
@@ -15,14 +20,63 @@ from pathlib import Path
 from typing import List, Dict, Set, Any, Optional
 from collections import defaultdict
 
+from knowledge_graph_store import (
+    COMPILED_SUFFIX,
+    CompiledGraph,
+    compiled_path_for,
+    write_compiled_graph,
+)
+
+# Dict-of-list indices kept for callers of the JSON-era attributes; built on first access
+_LEGACY_INDICES = (
+    'nodes_by_id', 'nodes_by_type',
+    'relationships_by_source', 'relationships_by_target', 'relationships_by_type',
+)
+
+# A file is a dependency hub when its import PageRank is this many times the
+# average, and a bottleneck when this share of shortest import paths run through it
+HUB_PAGERANK_RATIO = 3.0
+BOTTLENECK_BETWEENNESS = 0.05
+
 
 class KnowledgeGraphQuery:
     """Query interface for knowledge graph"""
     
-    def __init__(self, graph_path: str = 'docs/data/codebase-graph.json'):
+    def __init__(self, graph_path: str = 'docs/data/codebase-graph.json', compiled: bool = True):
+        """
+        Args:
+            graph_path: JSON graph, or a compiled graph ending in .kgc
+            compiled: Reuse (and refresh) the compiled graph next to the JSON;
+                False always parses the JSON and writes nothing
+        """
         self.graph_path = Path(graph_path)
+        self.store = self._load_store(compiled)
+    
+    def _load_store(self, compiled: bool) -> CompiledGraph:
+        """Open the compiled graph, compiling the JSON graph when needed"""
+        if self.graph_path.suffix == COMPILED_SUFFIX:
+            if not self.graph_path.exists():
+                raise FileNotFoundError(f"Knowledge graph not found at {self.graph_path}")
+            return CompiledGraph.open(self.graph_path)
+        
+        compiled_path = compiled_path_for(self.graph_path)
+        if compiled and compiled_path.exists():
+            try:
+                store = CompiledGraph.open(compiled_path)
+                if not self.graph_path.exists() or store.matches_source(self.graph_path):
+                    return store
+                store.close()
+            except (OSError, ValueError):
+                pass
+        
         self.graph = self._load_graph()
-        self._build_indices()
+        if compiled:
+            try:
+                write_compiled_graph(self.graph, compiled_path, self.graph_path)
+                return CompiledGraph.open(compiled_path)
+            except OSError:
+                pass
+        return CompiledGraph.from_graph(self.graph)
     
     def _load_graph(self) -> Dict[str, Any]:
         """Load knowledge graph from file"""
@@ -32,8 +86,19 @@ class KnowledgeGraphQuery:
         with open(self.graph_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     
+    def __getattr__(self, name: str) -> Any:
+        # The full graph dict and the dict-of-list indices are only
+        # materialized when something asks for them
+        if name == 'graph':
+            self.graph = self.store.to_dict()
+            return self.graph
+        if name in _LEGACY_INDICES:
+            self._build_indices()
+            return getattr(self, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+    
     def _build_indices(self):
-        """Build indices for fast queries"""
+        """Build dict-of-list indices over the full graph"""
         self.nodes_by_id = {node['id']: node for node in self.graph['nodes']}
         self.nodes_by_type = defaultdict(list)
         
@@ -54,33 +119,27 @@ class KnowledgeGraphQuery:
     
     def what_imports(self, filepath: str) -> List[Dict[str, Any]]:
         """Find all files that import the specified file"""
-        results = []
-        
-        for rel in self.relationships_by_target.get(filepath, []):
-            if rel['type'] == 'imports':
-                source_node = self.nodes_by_id.get(rel['source'])
-                if source_node:
-                    results.append({
-                        'file': rel['source'],
-                        'type': source_node['type'],
-                        'label': source_node['label']
-                    })
-        
-        return results
+        return self._linked_files(filepath, 'imports', 'in')
     
     def what_does_import(self, filepath: str) -> List[Dict[str, Any]]:
         """Find all files that this file imports"""
-        results = []
+        return self._linked_files(filepath, 'imports', 'out')
+    
+    def _linked_files(self, node_id: str, rel_type: str, direction: str) -> List[Dict[str, Any]]:
+        """Neighbors over one relationship type with their type and label"""
+        store = self.store
+        idx = store.index(node_id)
+        if idx is None:
+            return []
         
-        for rel in self.relationships_by_source.get(filepath, []):
-            if rel['type'] == 'imports':
-                target_node = self.nodes_by_id.get(rel['target'])
-                if target_node:
-                    results.append({
-                        'file': rel['target'],
-                        'type': target_node['type'],
-                        'label': target_node['label']
-                    })
+        results = []
+        for other in store.neighbors(idx, rel_type, direction):
+            if store.is_node(other):
+                results.append({
+                    'file': store.node_id(other),
+                    'type': store.node_type(other),
+                    'label': store.node_label(other)
+                })
         
         return results
     
@@ -88,9 +147,9 @@ class KnowledgeGraphQuery:
         """Find agents that worked on the specified file"""
         results = []
         
-        for rel in self.relationships_by_target.get(filepath, []):
-            if rel['type'] == 'worked_on' and rel['source'].startswith('agent:'):
-                agent_node = self.nodes_by_id.get(rel['source'])
+        for source, _ in self.store.edges_of(filepath, 'worked_on', 'in'):
+            if source.startswith('agent:'):
+                agent_node = self.store.node(source)
                 if agent_node:
                     results.append({
                         'agent': agent_node['label'],
@@ -105,17 +164,16 @@ class KnowledgeGraphQuery:
         agent_id = f'agent:{agent_name}'
         results = []
         
-        for rel in self.relationships_by_source.get(agent_id, []):
-            if rel['type'] == 'worked_on':
-                file_node = self.nodes_by_id.get(rel['target'])
-                if file_node:
-                    results.append({
-                        'file': rel['target'],
-                        'type': file_node['type'],
-                        'label': file_node['label'],
-                        'functions': file_node.get('functions', 0),
-                        'classes': file_node.get('classes', 0)
-                    })
+        for target, _ in self.store.edges_of(agent_id, 'worked_on', 'out'):
+            file_node = self.store.node(target)
+            if file_node:
+                results.append({
+                    'file': target,
+                    'type': file_node['type'],
+                    'label': file_node['label'],
+                    'functions': file_node.get('functions', 0),
+                    'classes': file_node.get('classes', 0)
+                })
         
         return results
     
@@ -123,58 +181,37 @@ class KnowledgeGraphQuery:
         """Find tests that cover the specified file"""
         results = []
         
-        for rel in self.relationships_by_target.get(filepath, []):
-            if rel['type'] == 'tests':
-                test_node = self.nodes_by_id.get(rel['source'])
-                if test_node:
-                    results.append({
-                        'test_file': rel['source'],
-                        'label': test_node['label'],
-                        'functions': test_node.get('functions', 0)
-                    })
+        for source, _ in self.store.edges_of(filepath, 'tests', 'in'):
+            test_node = self.store.node(source)
+            if test_node:
+                results.append({
+                    'test_file': source,
+                    'label': test_node['label'],
+                    'functions': test_node.get('functions', 0)
+                })
         
         return results
     
     def what_does_test_cover(self, test_filepath: str) -> List[Dict[str, Any]]:
         """Find what code a test file covers"""
-        results = []
-        
-        for rel in self.relationships_by_source.get(test_filepath, []):
-            if rel['type'] == 'tests':
-                code_node = self.nodes_by_id.get(rel['target'])
-                if code_node:
-                    results.append({
-                        'file': rel['target'],
-                        'type': code_node['type'],
-                        'label': code_node['label']
-                    })
-        
-        return results
+        return self._linked_files(test_filepath, 'tests', 'out')
     
     def files_changed_together(self, filepath: str, min_weight: int = 3) -> List[Dict[str, Any]]:
         """Find files that frequently change with the specified file"""
+        store = self.store
         results = []
         
         # Check both directions
-        for rel in self.relationships_by_source.get(filepath, []):
-            if rel['type'] == 'changes_with' and rel['weight'] >= min_weight:
-                target_node = self.nodes_by_id.get(rel['target'])
-                if target_node:
-                    results.append({
-                        'file': rel['target'],
-                        'label': target_node['label'],
-                        'change_frequency': rel['weight']
-                    })
-        
-        for rel in self.relationships_by_target.get(filepath, []):
-            if rel['type'] == 'changes_with' and rel['weight'] >= min_weight:
-                source_node = self.nodes_by_id.get(rel['source'])
-                if source_node:
-                    results.append({
-                        'file': rel['source'],
-                        'label': source_node['label'],
-                        'change_frequency': rel['weight']
-                    })
+        for direction in ('out', 'in'):
+            for other, weight in store.edges_of(filepath, 'changes_with', direction):
+                if weight >= min_weight:
+                    idx = store.index(other)
+                    if store.is_node(idx):
+                        results.append({
+                            'file': other,
+                            'label': store.node_label(idx),
+                            'change_frequency': weight
+                        })
         
         # Sort by frequency
         results.sort(key=lambda x: x['change_frequency'], reverse=True)
@@ -182,8 +219,17 @@ class KnowledgeGraphQuery:
     
     # === Impact Analysis ===
     
-    def impact_analysis(self, filepath: str, depth: int = 2) -> Dict[str, Any]:
-        """Analyze the impact of changes to a file"""
+    def impact_analysis(self, filepath: str, depth: Optional[int] = 2) -> Dict[str, Any]:
+        """
+        Analyze the impact of changes to a file.
+        
+        With depth=None every transitive importer is counted, read from the
+        reverse-import closure stored with the compiled graph.
+        """
+        if depth is None:
+            return self._full_impact(filepath)
+        
+        store = self.store
         visited = set()
         impact = {
             'directly_affected': [],
@@ -193,37 +239,34 @@ class KnowledgeGraphQuery:
             'blast_radius': 0
         }
         
-        def traverse(current_file: str, current_depth: int):
-            if current_file in visited or current_depth > depth:
+        def traverse(current: int, current_depth: int):
+            if current in visited or current_depth > depth:
                 return
             
-            visited.add(current_file)
+            visited.add(current)
             
             # Find files that import this one
-            for rel in self.relationships_by_target.get(current_file, []):
-                if rel['type'] == 'imports':
-                    affected_file = rel['source']
-                    
-                    if current_depth == 1:
-                        impact['directly_affected'].append(affected_file)
-                    else:
-                        impact['indirectly_affected'].append(affected_file)
-                    
-                    traverse(affected_file, current_depth + 1)
+            for affected in store.neighbors(current, 'imports', 'in'):
+                if current_depth == 1:
+                    impact['directly_affected'].append(store.node_id(affected))
+                else:
+                    impact['indirectly_affected'].append(store.node_id(affected))
+                
+                traverse(affected, current_depth + 1)
             
             # Find tests
-            for rel in self.relationships_by_target.get(current_file, []):
-                if rel['type'] == 'tests':
-                    impact['tests_to_run'].append(rel['source'])
+            for test in store.neighbors(current, 'tests', 'in'):
+                impact['tests_to_run'].append(store.node_id(test))
             
             # Find agents
-            for rel in self.relationships_by_target.get(current_file, []):
-                if rel['type'] == 'worked_on':
-                    agent_name = rel['source'].replace('agent:', '')
-                    if agent_name not in impact['agents_to_notify']:
-                        impact['agents_to_notify'].append(agent_name)
+            for agent in store.neighbors(current, 'worked_on', 'in'):
+                agent_name = store.node_id(agent).replace('agent:', '')
+                if agent_name not in impact['agents_to_notify']:
+                    impact['agents_to_notify'].append(agent_name)
         
-        traverse(filepath, 1)
+        start = store.index(filepath)
+        if start is not None:
+            traverse(start, 1)
         
         # Calculate blast radius
         impact['blast_radius'] = len(impact['directly_affected']) + len(impact['indirectly_affected'])
@@ -235,35 +278,106 @@ class KnowledgeGraphQuery:
         
         return impact
     
+    def _full_impact(self, filepath: str) -> Dict[str, Any]:
+        """Unbounded impact analysis from the reverse-import closure"""
+        store = self.store
+        impact = {
+            'directly_affected': [],
+            'indirectly_affected': [],
+            'tests_to_run': [],
+            'agents_to_notify': [],
+            'blast_radius': 0
+        }
+        start = store.index(filepath)
+        if start is None:
+            return impact
+        
+        direct = set(store.neighbors(start, 'imports', 'in'))
+        affected = set(store.reachable(start, 'imports', 'in'))
+        direct.discard(start)
+        affected.discard(start)
+        
+        tests = set()
+        agents = set()
+        for idx in affected | {start}:
+            if store.node_type(idx) == 'test_file' and idx != start:
+                tests.add(idx)
+            tests.update(store.neighbors(idx, 'tests', 'in'))
+            agents.update(store.neighbors(idx, 'worked_on', 'in'))
+        
+        impact['directly_affected'] = sorted(store.node_id(i) for i in direct)
+        impact['indirectly_affected'] = sorted(store.node_id(i) for i in affected - direct)
+        impact['tests_to_run'] = sorted(store.node_id(i) for i in tests)
+        impact['agents_to_notify'] = sorted(store.node_id(i).replace('agent:', '') for i in agents)
+        impact['blast_radius'] = len(affected)
+        
+        return impact
+    
+    def rank_tests(self, changed_files: List[str]) -> List[Dict[str, Any]]:
+        """
+        Rank the tests to run for a set of changed files.
+        
+        A test is selected when it imports a changed file (directly or
+        transitively), is itself changed, or has a tests relationship to a
+        changed or affected file. Tests reaching more changed files come
+        first, then tests that touch a changed file directly.
+        """
+        store = self.store
+        reached = defaultdict(set)
+        direct = set()
+        
+        for filepath in dict.fromkeys(changed_files):
+            start = store.index(filepath)
+            if start is None:
+                continue
+            
+            for test in store.neighbors(start, 'tests', 'in'):
+                direct.add(test)
+                reached[test].add(filepath)
+            for importer in store.neighbors(start, 'imports', 'in'):
+                if store.node_type(importer) == 'test_file':
+                    direct.add(importer)
+            
+            for idx in [start] + store.reachable(start, 'imports', 'in'):
+                if store.node_type(idx) == 'test_file':
+                    reached[idx].add(filepath)
+                    if idx == start:
+                        direct.add(idx)
+                for test in store.neighbors(idx, 'tests', 'in'):
+                    reached[test].add(filepath)
+        
+        ranking = [
+            {
+                'test_file': store.node_id(test),
+                'changed_files': sorted(files),
+                'direct': test in direct,
+                'score': len(files)
+            }
+            for test, files in reached.items()
+        ]
+        ranking.sort(key=lambda x: (-x['score'], not x['direct'], x['test_file']))
+        return ranking
+    
     def find_dependencies(self, filepath: str) -> Dict[str, List[str]]:
         """Find all dependencies of a file (imports tree)"""
+        store = self.store
         dependencies = {
             'direct': [],
             'transitive': []
         }
-        visited = set()
+        start = store.index(filepath)
+        if start is None:
+            return dependencies
         
-        def traverse(current_file: str, depth: int = 0):
-            if current_file in visited:
-                return
-            
-            visited.add(current_file)
-            
-            for rel in self.relationships_by_source.get(current_file, []):
-                if rel['type'] == 'imports':
-                    dep = rel['target']
-                    
-                    if depth == 0:
-                        dependencies['direct'].append(dep)
-                    else:
-                        dependencies['transitive'].append(dep)
-                    
-                    traverse(dep, depth + 1)
-        
-        traverse(filepath)
-        
-        dependencies['direct'] = sorted(list(set(dependencies['direct'])))
-        dependencies['transitive'] = sorted(list(set(dependencies['transitive'])))
+        # Transitive dependencies are the imports of every file reachable
+        # from this one (read from the stored closure)
+        transitive = set()
+        for idx in store.reachable(start, 'imports', 'out'):
+            if idx != start:
+                transitive.update(store.neighbors(idx, 'imports', 'out'))
+        
+        dependencies['direct'] = sorted(set(store.node_id(i) for i in store.neighbors(start, 'imports', 'out')))
+        dependencies['transitive'] = sorted(store.node_id(i) for i in transitive)
         
         return dependencies
     
@@ -273,7 +387,7 @@ class KnowledgeGraphQuery:
         """Find agents with expertise in a specific topic"""
         results = []
         
-        for node in self.nodes_by_type['agent']:
+        for node in self.store.nodes_of_type('agent'):
             expertise = node.get('expertise', [])
             if topic.lower() in [e.lower() for e in expertise]:
                 results.append({
@@ -289,7 +403,7 @@ class KnowledgeGraphQuery:
         """Find complex files with many functions"""
         results = []
         
-        for node in self.nodes_by_type['code_file']:
+        for node in self.store.nodes_of_type('code_file'):
             if node.get('functions', 0) >= min_functions:
                 results.append({
                     'file': node['id'],
@@ -303,43 +417,129 @@ class KnowledgeGraphQuery:
         return results
     
     def find_central_files(self, top_n: int = 10) -> List[Dict[str, Any]]:
-        """Find most central files (most connections)"""
+        """
+        Find most central files: highest import PageRank (files that many
+        widely used files depend on), then most connections
+        """
+        store = self.store
         file_connections = defaultdict(int)
         
-        for rel in self.graph['relationships']:
-            if rel['type'] in ['imports', 'tests', 'changes_with']:
-                file_connections[rel['source']] += 1
-                file_connections[rel['target']] += 1
+        for source, target, rel_type, _ in store.edges():
+            if rel_type in ['imports', 'tests', 'changes_with']:
+                file_connections[source] += 1
+                file_connections[target] += 1
         
+        pagerank = store.metric('pagerank')
+        betweenness = store.metric('betweenness')
         results = []
-        for file_id, connections in file_connections.items():
-            node = self.nodes_by_id.get(file_id)
-            if node and node['type'] in ['code_file', 'test_file']:
+        for idx, connections in file_connections.items():
+            node_type = store.node_type(idx)
+            if store.is_node(idx) and node_type in ['code_file', 'test_file']:
                 results.append({
-                    'file': file_id,
+                    'file': store.node_id(idx),
                     'connections': connections,
-                    'label': node['label'],
-                    'type': node['type']
+                    'pagerank': pagerank[idx] if pagerank is not None else 0.0,
+                    'betweenness': betweenness[idx] if betweenness is not None else 0.0,
+                    'label': store.node_label(idx),
+                    'type': node_type
                 })
         
-        results.sort(key=lambda x: x['connections'], reverse=True)
+        results.sort(key=lambda x: (x['pagerank'], x['connections']), reverse=True)
         return results[:top_n]
     
+    def find_bottleneck_files(self, top_n: int = 10, rel_type: str = 'imports') -> List[Dict[str, Any]]:
+        """Find files on the most shortest paths between other files (approximate betweenness)"""
+        store = self.store
+        betweenness = store.metric('betweenness', rel_type)
+        if betweenness is None:
+            return []
+        
+        results = []
+        for idx, score in enumerate(betweenness):
+            if score > 0 and store.is_node(idx):
+                results.append({
+                    'file': store.node_id(idx),
+                    'betweenness': score,
+                    'label': store.node_label(idx),
+                    'type': store.node_type(idx)
+                })
+        
+        results.sort(key=lambda x: (-x['betweenness'], x['file']))
+        return results[:top_n]
+    
+    def find_communities(self, rel_type: str = 'imports', min_size: int = 2) -> List[Dict[str, Any]]:
+        """
+        Find groups of files more connected to each other than to the rest
+        of the codebase (label propagation over imports or changes_with),
+        largest first
+        """
+        store = self.store
+        community = store.metric('community', rel_type)
+        if community is None:
+            return []
+        pagerank = store.metric('pagerank', rel_type)
+        
+        members = defaultdict(list)
+        for idx, number in enumerate(community):
+            if store.is_node(idx):
+                members[number].append(idx)
+        
+        results = []
+        for number in sorted(members):
+            group = members[number]
+            if len(group) < min_size:
+                continue
+            results.append({
+                'community': number,
+                'size': len(group),
+                'central_file': store.node_id(max(group, key=pagerank.__getitem__)),
+                'files': sorted(store.node_id(idx) for idx in group)
+            })
+        return results
+    
+    def graph_metrics(self, filepath: str) -> Dict[str, Any]:
+        """PageRank, betweenness and community of a file over imports and co-changes"""
+        store = self.store
+        idx = store.index(filepath)
+        if idx is None:
+            return {'error': f'File not found: {filepath}'}
+        
+        result = {'file': filepath}
+        for rel_type in ('imports', 'changes_with'):
+            community = store.metric('community', rel_type)
+            if community is None:
+                continue
+            peers = [i for i, c in enumerate(community)
+                     if c == community[idx] and i != idx and store.is_node(i)]
+            result[rel_type] = {
+                'pagerank': store.metric('pagerank', rel_type)[idx],
+                'betweenness': store.metric('betweenness', rel_type)[idx],
+                'community': community[idx],
+                'community_peers': sorted(store.node_id(i) for i in peers)
+            }
+        return result
+    
+    def _is_dependency_hub(self, idx: int) -> bool:
+        """Import PageRank well above the average file"""
+        pagerank = self.store.metric('pagerank')
+        return pagerank is not None and pagerank[idx] * len(pagerank) >= HUB_PAGERANK_RATIO
+    
     def find_orphan_files(self) -> List[Dict[str, Any]]:
         """Find files with no relationships"""
+        store = self.store
         files_with_relationships = set()
         
-        for rel in self.graph['relationships']:
-            files_with_relationships.add(rel['source'])
-            files_with_relationships.add(rel['target'])
+        for source, target, _, _ in store.edges():
+            files_with_relationships.add(source)
+            files_with_relationships.add(target)
         
         results = []
-        for node in self.nodes_by_type['code_file'] + self.nodes_by_type.get('test_file', []):
-            if node['id'] not in files_with_relationships:
+        for idx in store.indices_of_type('code_file') + store.indices_of_type('test_file'):
+            if idx not in files_with_relationships:
                 results.append({
-                    'file': node['id'],
-                    'label': node['label'],
-                    'type': node['type']
+                    'file': store.node_id(idx),
+                    'label': store.node_label(idx),
+                    'type': store.node_type(idx)
                 })
         
         return results
@@ -348,25 +548,25 @@ class KnowledgeGraphQuery:
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get graph statistics"""
-        return self.graph.get('statistics', {})
+        return self.store.section('statistics', {})
     
     def get_metadata(self) -> Dict[str, Any]:
         """Get graph metadata"""
-        return self.graph.get('metadata', {})
+        return self.store.section('metadata', {})
     
     def get_patterns(self) -> Dict[str, Any]:
         """Get identified patterns"""
-        return self.graph.get('patterns', {})
+        return self.store.section('patterns', {})
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get calculated metrics"""
-        return self.graph.get('metrics', {})
+        return self.store.section('metrics', {})
     
     # === Predictive Intelligence ===
     
     def predict_bug_likelihood(self, filepath: str) -> Dict[str, Any]:
         """Predict likelihood of bugs in a file based on patterns"""
-        node = self.nodes_by_id.get(filepath)
+        node = self.store.node(filepath)
         if not node:
             return {"error": "File not found"}
         
@@ -441,7 +641,7 @@ class KnowledgeGraphQuery:
     
     def suggest_expert_agent(self, filepath: str) -> Dict[str, Any]:
         """Suggest which agent should handle work on this file"""
-        node = self.nodes_by_id.get(filepath)
+        node = self.store.node(filepath)
         if not node:
             return {"error": "File not found"}
         
@@ -494,7 +694,7 @@ class KnowledgeGraphQuery:
         """Identify files with technical debt"""
         debt_files = []
         
-        for node in self.nodes_by_type.get('code_file', []):
+        for node in self.store.nodes_of_type('code_file'):
             debt_score = 0
             debt_indicators = []
             
@@ -521,6 +721,11 @@ class KnowledgeGraphQuery:
                 debt_score += 2
                 debt_indicators.append('no_test_coverage')
             
+            # Many files depend on it, directly or transitively
+            if self._is_dependency_hub(self.store.index(node['id'])):
+                debt_score += 2
+                debt_indicators.append('dependency_hub')
+            
             # Frequent errors
             patterns = self.get_patterns()
             error_fixes = patterns.get('error_fixes', {})
@@ -548,9 +753,10 @@ class KnowledgeGraphQuery:
         
         metrics = self.get_metrics()
         complexity_data = metrics.get('complexity', {})
+        betweenness = self.store.metric('betweenness')
         
         for filepath, complexity in complexity_data.items():
-            node = self.nodes_by_id.get(filepath)
+            node = self.store.node(filepath)
             if not node:
                 continue
             
@@ -573,6 +779,13 @@ class KnowledgeGraphQuery:
             if len(changes_with) > 3:
                 opportunity_reasons.append(f'High coupling with {len(changes_with)} files')
             
+            # Many dependency paths run through it
+            idx = self.store.index(filepath)
+            if betweenness is not None and betweenness[idx] >= BOTTLENECK_BETWEENNESS:
+                opportunity_reasons.append(
+                    f'Dependency bottleneck on {betweenness[idx]:.0%} of import paths'
+                )
+            
             if opportunity_reasons:
                 opportunities.append({
                     'file': filepath,
@@ -606,7 +819,13 @@ class KnowledgeGraphQuery:
         
         if not potential_file:
             # Check for general queries
-            if 'central' in query_lower or 'important' in query_lower:
+            if 'bottleneck' in query_lower or 'betweenness' in query_lower:
+                return self.find_bottleneck_files()
+            elif 'communit' in query_lower:
+                if 'change' in query_lower:
+                    return self.find_communities('changes_with')
+                return self.find_communities()
+            elif 'central' in query_lower or 'important' in query_lower or 'pagerank' in query_lower:
                 return self.find_central_files()
             elif 'complex' in query_lower:
                 return self.find_complex_files()
@@ -622,6 +841,10 @@ class KnowledgeGraphQuery:
         elif 'expert' in query_lower or 'suggest agent' in query_lower or 'who should' in query_lower:
             return self.suggest_expert_agent(potential_file)
         
+        elif ('communit' in query_lower or 'centrality' in query_lower
+              or 'pagerank' in query_lower or 'bottleneck' in query_lower):
+            return self.graph_metrics(potential_file)
+        
         elif 'import' in query_lower and 'what' in query_lower:
             if 'imports' in query_lower or 'does' in query_lower:
                 return self.what_does_import(potential_file)
@@ -639,6 +862,8 @@ class KnowledgeGraphQuery:
                 return self.what_tests_cover(potential_file)
             elif 'does' in query_lower:
                 return self.what_does_test_cover(potential_file)
+            elif 'run' in query_lower:
+                return self.rank_tests([potential_file])
         
         elif 'impact' in query_lower or 'affect' in query_lower:
             return self.impact_analysis(potential_file)
@@ -664,11 +889,15 @@ def main():
     parser.add_argument('--agent', help='Agent to query about')
     parser.add_argument('--stats', action='store_true', help='Show statistics')
     parser.add_argument('--interactive', action='store_true', help='Interactive mode')
+    parser.add_argument('--tests-for', nargs='+', metavar='FILE',
+                        help='Rank the tests to run for these changed files')
+    parser.add_argument('--no-compiled', action='store_true',
+                        help=f'Parse the JSON graph instead of using the compiled {COMPILED_SUFFIX} file')
     
     args = parser.parse_args()
     
     try:
-        kgq = KnowledgeGraphQuery(args.graph)
+        kgq = KnowledgeGraphQuery(args.graph, compiled=not args.no_compiled)
     except FileNotFoundError as e:
         print(f"❌ {e}")
         print("💡 Run 'python tools/knowledge-graph-builder.py' first to generate the graph")
@@ -689,10 +918,21 @@ def main():
         
         print("\n🏆 Top Central Files:")
         for i, file in enumerate(kgq.find_central_files(5), 1):
-            print(f"  {i}. {file['label']} ({file['connections']} connections)")
+            print(f"  {i}. {file['label']} ({file['connections']} connections, "
+                  f"PageRank {file['pagerank']:.4f})")
         
         return 0
     
+    # Test selection for a change set
+    if args.tests_for:
+        ranking = kgq.rank_tests(args.tests_for)
+        print(f"🧪 Tests to run for {len(args.tests_for)} changed file(s): {len(ranking)}")
+        print("=" * 60)
+        for i, test in enumerate(ranking, 1):
+            marker = " (direct)" if test['direct'] else ""
+            print(f"  {i}. {test['test_file']} - reaches {test['score']} changed file(s){marker}")
+        return 0
+    
     # Natural language query
     if args.query:
         print(f"🔍 Query: {args.query}")
@@ -739,8 +979,8 @@ def main():
             print("  No agents tracked")
         
         print("\n💥 Impact Analysis:")
-        impact = kgq.impact_analysis(args.file)
-        print(f"  Blast radius: {impact['blast_radius']} files")
+        impact = kgq.impact_analysis(args.file, depth=None)
+        print(f"  Blast radius: {impact['blast_radius']} files (all transitive importers)")
         print(f"  Directly affected: {len(impact['directly_affected'])} files")
         print(f"  Tests to run: {len(impact['tests_to_run'])} tests")
         
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Knowledge Graph Query Server - Long-running JSON-RPC daemon
+
+Keeps the knowledge graph loaded and answers queries, so agent workflows
+asking several questions per issue do not reload the graph for each one.
+
+Features:
+- JSON-RPC 2.0, one message per line, over stdin/stdout or a Unix socket
+- Batches: send a JSON array of requests, get an array of responses back
+- Every public KnowledgeGraphQuery method is callable (positional or named
+  params), plus "status" and "reload"
+- Hot reload: the graph file is checked before each request or batch and
+  reloaded when its size or mtime changes; if the new file cannot be read
+  the previous graph keeps serving
+- GraphQueryClient for scripts and tests, over a socket or a spawned
+  --stdio server
+
+Usage:
+    python3 tools/knowledge_graph_server.py --socket /tmp/kg.sock
+    python3 tools/knowledge_graph_server.py --stdio
+
+    python3 tools/knowledge_graph_server.py --connect /tmp/kg.sock \\
+        --query "Show impact of tools/code-analyzer.py"
+    python3 tools/knowledge_graph_server.py --connect /tmp/kg.sock \\
+        --call predict_bug_likelihood --params '["tools/code-analyzer.py"]'
+"""
+
+import argparse
+import inspect
+import json
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, IO, List, Optional, Sequence, Tuple, Union
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from knowledge_graph_query import KnowledgeGraphQuery
+
+JSONRPC_VERSION = '2.0'
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+# KnowledgeGraphQuery methods exposed over RPC
+QUERY_METHODS = frozenset({
+    'query',
+    'what_imports', 'what_does_import',
+    'which_agent_worked_on', 'what_agent_worked_on',
+    'what_tests_cover', 'what_does_test_cover',
+    'files_changed_together',
+    'impact_analysis', 'find_dependencies', 'rank_tests',
+    'find_expert_agents', 'find_complex_files', 'find_central_files', 'find_orphan_files',
+    'find_bottleneck_files', 'find_communities', 'graph_metrics',
+    'get_statistics', 'get_metadata', 'get_patterns', 'get_metrics',
+    'predict_bug_likelihood', 'suggest_expert_agent',
+    'identify_technical_debt', 'find_optimization_opportunities',
+})
+
+
+class RPCError(Exception):
+    """JSON-RPC error returned to the caller"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class GraphQueryService:
+    """
+    Holds a loaded graph and answers JSON-RPC messages.
+
+    Thread-safe: requests are served one at a time under a lock, which also
+    covers reloading.
+    """
+
+    def __init__(self, graph_path: str = 'docs/data/codebase-graph.json', compiled: bool = True):
+        self.graph_path = Path(graph_path)
+        self.compiled = compiled
+        self.lock = threading.Lock()
+        self.kgq: Optional[KnowledgeGraphQuery] = None
+        self.loads = 0
+        self.loaded_at: Optional[str] = None
+        self.reload_error: Optional[str] = None
+        self.requests_served = 0
+        self._stamp: Optional[Tuple[int, int]] = None
+
+        # The first load must succeed; later failures keep the old graph
+        self._load(self._current_stamp())
+
+    def _current_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.graph_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _load(self, stamp: Optional[Tuple[int, int]]):
+        previous = self.kgq
+        self.kgq = KnowledgeGraphQuery(str(self.graph_path), compiled=self.compiled)
+        self._stamp = stamp
+        self.loads += 1
+        self.loaded_at = datetime.now(timezone.utc).isoformat()
+        self.reload_error = None
+        if previous is not None:
+            previous.store.close()
+
+    def reload_if_changed(self, force: bool = False) -> bool:
+        """Reload the graph if its file changed. Returns True if reloaded."""
+        stamp = self._current_stamp()
+        if not force and (stamp is None or stamp == self._stamp):
+            return False
+        try:
+            self._load(stamp)
+        except Exception as e:
+            # Half-written, malformed or removed file: keep serving the
+            # previous graph and try again on the next request
+            self.reload_error = f'{type(e).__name__}: {e}'
+            return False
+        return True
+
+    # === JSON-RPC ===
+
+    def handle(self, message: str) -> Optional[str]:
+        """
+        Answer one JSON-RPC message (a request or a batch).
+
+        Returns:
+            The response line, or None when nothing is to be sent back
+            (notifications only)
+        """
+        try:
+            payload = json.loads(message)
+        except ValueError as e:
+            return json.dumps(self._error(None, RPCError(PARSE_ERROR, f'Parse error: {e}')))
+
+        with self.lock:
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                return json.dumps(self._error(None, RPCError(INTERNAL_ERROR, f'Reload failed: {e}')))
+
+            if isinstance(payload, list):
+                if not payload:
+                    return json.dumps(self._error(None, RPCError(INVALID_REQUEST, 'Empty batch')))
+                responses = [r for r in (self._dispatch(item) for item in payload) if r is not None]
+                return '[' + ', '.join(self._encode(r) for r in responses) + ']' if responses else None
+
+            response = self._dispatch(payload)
+            return self._encode(response) if response is not None else None
+
+    def _encode(self, response: Dict[str, Any]) -> str:
+        """Serialize a response; a result that is not JSON becomes an error"""
+        try:
+            return json.dumps(response)
+        except (TypeError, ValueError) as e:
+            error = RPCError(INTERNAL_ERROR, f'Result is not JSON serializable: {e}')
+            return json.dumps(self._error(response.get('id'), error))
+
+    def _dispatch(self, request: Any) -> Optional[Dict[str, Any]]:
+        """Run one request; notifications (no id) get no response"""
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return self._error(None, RPCError(INVALID_REQUEST, 'Invalid request'))
+
+        request_id = request.get('id')
+        is_notification = 'id' not in request
+        try:
+            result = self._call(request['method'], request.get('params', []))
+        except RPCError as e:
+            return None if is_notification else self._error(request_id, e)
+        except Exception as e:
+            return None if is_notification else self._error(request_id, RPCError(INTERNAL_ERROR, str(e)))
+
+        self.requests_served += 1
+        if is_notification:
+            return None
+        return {'jsonrpc': JSONRPC_VERSION, 'id': request_id, 'result': result}
+
+    def _call(self, method: str, params: Union[List[Any], Dict[str, Any]]) -> Any:
+        if method == 'status':
+            return self.status()
+        if method == 'reload':
+            return {'reloaded': self.reload_if_changed(force=True), 'error': self.reload_error}
+        if method not in QUERY_METHODS:
+            raise RPCError(METHOD_NOT_FOUND, f'Method not found: {method}')
+
+        function = getattr(self.kgq, method)
+        if isinstance(params, list):
+            args, kwargs = params, {}
+        elif isinstance(params, dict):
+            args, kwargs = [], params
+        else:
+            raise RPCError(INVALID_PARAMS, 'Params must be an array or an object')
+        # Only a TypeError from binding the params is the caller's fault;
+        # one raised inside the query is an internal error
+        try:
+            inspect.signature(function).bind(*args, **kwargs)
+        except TypeError as e:
+            raise RPCError(INVALID_PARAMS, f'Invalid params: {e}')
+        return function(*args, **kwargs)
+
+    def _error(self, request_id: Any, error: RPCError) -> Dict[str, Any]:
+        return {
+            'jsonrpc': JSONRPC_VERSION,
+            'id': request_id,
+            'error': {'code': error.code, 'message': error.message}
+        }
+
+    def status(self) -> Dict[str, Any]:
+        """Server and graph state"""
+        store = self.kgq.store
+        return {
+            'graph_path': str(self.graph_path),
+            'nodes': store.node_count,
+            'relationships': store.edge_count,
+            'loads': self.loads,
+            'loaded_at': self.loaded_at,
+            'reload_error': self.reload_error,
+            'requests_served': self.requests_served,
+        }
+
+
+# === Transports ===
+
+def serve_stdio(service: GraphQueryService, stdin: IO[str] = None, stdout: IO[str] = None):
+    """Answer line-delimited JSON-RPC messages until stdin closes."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    for line in stdin:
+        if not line.strip():
+            continue
+        response = service.handle(line)
+        if response is not None:
+            stdout.write(response + '\n')
+            stdout.flush()
+
+
+class _StreamHandler(socketserver.StreamRequestHandler):
+    """One socket connection: line-delimited JSON-RPC messages"""
+
+    def handle(self):
+        for raw in self.rfile:
+            line = raw.decode('utf-8').strip()
+            if not line:
+                continue
+            response = self.server.service.handle(line)
+            if response is not None:
+                self.wfile.write((response + '\n').encode('utf-8'))
+                self.wfile.flush()
+
+
+class GraphQueryServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server; each connection may send any number of messages"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, service: GraphQueryService):
+        self.socket_path = socket_path
+        self.service = service
+        if os.path.exists(socket_path):
+            # Stale socket left by a previous server
+            os.unlink(socket_path)
+        super().__init__(socket_path, _StreamHandler)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+
+# === Client ===
+
+class GraphQueryError(Exception):
+    """Error response from the query server"""
+
+    def __init__(self, error: Dict[str, Any]):
+        super().__init__(error.get('message', 'Unknown error'))
+        self.code = error.get('code')
+
+
+class GraphQueryClient:
+    """
+    Client for the query server.
+
+    Use connect() for a running --socket server or spawn() to start a
+    private --stdio server process.
+    """
+
+    def __init__(self, reader: IO[str], writer: IO[str], closer=None):
+        self._reader = reader
+        self._writer = writer
+        self._closer = closer
+        self._next_id = 0
+
+    @classmethod
+    def connect(cls, socket_path: str) -> 'GraphQueryClient':
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(socket_path)
+        stream = sock.makefile('rw', encoding='utf-8')
+
+        def close():
+            stream.close()
+            sock.close()
+
+        return cls(stream, stream, close)
+
+    @classmethod
+    def spawn(cls, graph_path: str = 'docs/data/codebase-graph.json') -> 'GraphQueryClient':
+        process = subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), '--stdio', '--graph', graph_path],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+
+        def close():
+            process.stdin.close()
+            process.wait(timeout=10)
+            process.stdout.close()
+
+        return cls(process.stdout, process.stdin, close)
+
+    def _request(self, method: str, params: Union[Sequence[Any], Dict[str, Any]]) -> Dict[str, Any]:
+        self._next_id += 1
+        return {'jsonrpc': JSONRPC_VERSION, 'id': self._next_id, 'method': method,
+                'params': params if isinstance(params, dict) else list(params)}
+
+    def _exchange(self, payload: Any) -> Any:
+        self._writer.write(json.dumps(payload) + '\n')
+        self._writer.flush()
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError('Query server closed the connection')
+        return json.loads(line)
+
+    def call(self, method: str, *args, **kwargs) -> Any:
+        """Call one method; raises GraphQueryError on an error response."""
+        response = self._exchange(self._request(method, kwargs or args))
+        if 'error' in response:
+            raise GraphQueryError(response['error'])
+        return response['result']
+
+    def batch(self, calls: Sequence[Tuple[str, Union[Sequence[Any], Dict[str, Any]]]]) -> List[Any]:
+        """
+        Send (method, params) pairs in one request.
+
+        Returns:
+            Results in call order; failed calls are GraphQueryError instances
+        """
+        requests = [self._request(method, params) for method, params in calls]
+        if not requests:
+            return []
+        by_id = {r['id']: r for r in self._exchange(requests)}
+        return [
+            GraphQueryError(by_id[r['id']]['error']) if 'error' in by_id[r['id']] else by_id[r['id']]['result']
+            for r in requests
+        ]
+
+    def close(self):
+        if self._closer:
+            self._closer()
+            self._closer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    """Run the query server or send a query to one"""
+    parser = argparse.ArgumentParser(description='Knowledge graph query server (JSON-RPC)')
+    parser.add_argument('--graph', default='docs/data/codebase-graph.json', help='Path to knowledge graph')
+    parser.add_argument('--no-compiled', action='store_true',
+                        help='Parse the JSON graph instead of using the compiled file')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--socket', help='Serve on this Unix socket path')
+    mode.add_argument('--stdio', action='store_true', help='Serve on stdin/stdout')
+    mode.add_argument('--connect', help='Send a query to the server on this socket')
+    parser.add_argument('--query', help='Natural language query (with --connect)')
+    parser.add_argument('--call', help='Method to call (with --connect)')
+    parser.add_argument('--params', default='[]', help='JSON array or object of params for --call')
+
+    args = parser.parse_args()
+
+    if args.connect:
+        if not args.query and not args.call:
+            parser.error('--connect needs --query or --call')
+        with GraphQueryClient.connect(args.connect) as client:
+            try:
+                if args.query:
+                    result = client.call('query', args.query)
+                else:
+                    params = json.loads(args.params)
+                    result = client.call(args.call, **params) if isinstance(params, dict) else client.call(args.call, *params)
+            except GraphQueryError as e:
+                print(f"❌ {e}", file=sys.stderr)
+                return 1
+        print(json.dumps(result, indent=2))
+        return 0
+
+    try:
+        service = GraphQueryService(args.graph, compiled=not args.no_compiled)
+    except FileNotFoundError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    if args.stdio:
+        serve_stdio(service)
+        return 0
+
+    server = GraphQueryServer(args.socket, service)
+    # Shut down cleanly (and remove the socket) when stopped by a supervisor
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"🧠 Serving {args.graph} on {args.socket}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down", file=sys.stderr)
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
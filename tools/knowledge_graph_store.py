@@ -0,0 +1,794 @@
+#!/usr/bin/env python3
+"""
+Compiled Knowledge Graph Store - Binary graph format with an mmap loader
+
+The JSON knowledge graph has to be parsed in full and re-indexed by every
+process that queries it. This module compiles it once into a flat binary
+file that is opened with mmap and queried in place:
+
+- Interned node ids: every node (and every id only referenced by an edge)
+  gets an integer index; ids, types and labels live in one string table
+- CSR adjacency per relationship type, outgoing and incoming, pointing at
+  neighbor indices and at edge ids (for weights)
+- The edge list in its original order, so iteration order matches the JSON
+- Reachability over imports: strongly connected components, the condensed
+  DAG, and its transitive closure in both directions (dependencies and
+  reverse dependencies), so unbounded impact analysis is a lookup
+- Graph analytics over imports and co-changes: PageRank, approximate
+  betweenness and communities (see knowledge_graph_analytics.py)
+- Node attributes and the metadata/statistics/patterns/metrics sections as
+  JSON blobs, decoded only when a query needs them
+
+Opening a compiled graph reads only its small header; arrays are memoryview
+casts over the mapped file.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from knowledge_graph_analytics import analyze
+
+MAGIC = b'KGSTORE\x00'
+STORE_VERSION = 4
+COMPILED_SUFFIX = '.kgc'
+
+# Relationship types with precomputed reachability
+REACHABILITY_TYPES = ('imports',)
+# Closure entries (component pairs) stored per direction; larger closures
+# fall back to walking the condensed DAG at query time
+MAX_CLOSURE_ENTRIES = 10_000_000
+# Relationship types with stored analytics, and whether edges are directed
+ANALYTICS_TYPES = {'imports': True, 'changes_with': False}
+# Per-node analytics arrays: name -> array type code
+ANALYTICS_METRICS = {'pagerank': 'd', 'betweenness': 'd', 'community': 'I'}
+
+# Missing string / type reference
+NONE = 0xFFFFFFFF
+
+_ALIGN = 8
+_HEADER_LENGTH = struct.Struct('<I')
+
+# Relationship keys stored in the edge arrays; anything else is kept as JSON
+_EDGE_KEYS = ('source', 'target', 'type', 'weight')
+# Node keys stored in the string table; anything else is kept as JSON
+_NODE_KEYS = ('id', 'type', 'label')
+
+
+def compiled_path_for(graph_path: Union[str, Path]) -> Path:
+    """Path of the compiled store kept next to a JSON graph."""
+    return Path(graph_path).with_suffix(COMPILED_SUFFIX)
+
+
+def _source_stamp(source_path: Optional[Union[str, Path]]) -> Optional[Dict[str, int]]:
+    if source_path is None:
+        return None
+    stat = os.stat(source_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+class _StringTable:
+    """Interns strings and lays them out as offsets plus a UTF-8 blob"""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.encoded: List[bytes] = []
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE
+        idx = self.index.get(value)
+        if idx is None:
+            idx = self.index[value] = len(self.encoded)
+            self.encoded.append(value.encode('utf-8'))
+        return idx
+
+    def sections(self) -> List[Tuple[str, str, bytes]]:
+        offsets = array('Q', [0])
+        for data in self.encoded:
+            offsets.append(offsets[-1] + len(data))
+        return [
+            ('str_off', 'Q', offsets.tobytes()),
+            ('str_blob', 'B', b''.join(self.encoded)),
+        ]
+
+
+def _strongly_connected(n: int, ptr: array, nbr: array) -> Tuple[List[int], int]:
+    """
+    Iterative Tarjan SCC.
+
+    Components are numbered in the order Tarjan completes them, so every
+    edge between components points from a higher to a lower number.
+    """
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack: List[int] = []
+    component = [-1] * n
+    counter = 0
+    count = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, ptr[root])]
+
+        while work:
+            v, i = work[-1]
+            if i < ptr[v + 1]:
+                work[-1] = (v, i + 1)
+                w = nbr[i]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, ptr[w]))
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+
+            work.pop()
+            if work:
+                u = work[-1][0]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+            if low[v] == index[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = count
+                    if w == v:
+                        break
+                count += 1
+
+    return component, count
+
+
+def _csr(lists: List[List[int]]) -> Tuple[bytes, bytes]:
+    ptr = array('I', [0])
+    flat = array('I')
+    for items in lists:
+        flat.extend(items)
+        ptr.append(len(flat))
+    return ptr.tobytes(), flat.tobytes()
+
+
+def _closure(successors: List[List[int]], order: range) -> Optional[List[List[int]]]:
+    """Components reachable from each component, or None past MAX_CLOSURE_ENTRIES."""
+    reach: List[Optional[set]] = [None] * len(successors)
+    total = 0
+    for c in order:
+        reached = set(successors[c])
+        for d in successors[c]:
+            reached |= reach[d]
+        reach[c] = reached
+        total += len(reached)
+        if total > MAX_CLOSURE_ENTRIES:
+            return None
+    return [sorted(r) for r in reach]
+
+
+def _reachability(n: int, t: int, ptr: array, nbr: array,
+                  edge_src: array, edge_dst: array, edge_type: array) -> Tuple[Dict[str, Any], List[Tuple[str, str, bytes]]]:
+    """SCC condensation and closure sections for relationship type index t."""
+    component, count = _strongly_connected(n, ptr, nbr)
+
+    members: List[List[int]] = [[] for _ in range(count)]
+    for v in range(n):
+        members[component[v]].append(v)
+    cyclic = array('B', [1 if len(m) > 1 else 0 for m in members])
+
+    out_sets = [set() for _ in range(count)]
+    in_sets = [set() for _ in range(count)]
+    for e in range(len(edge_type)):
+        if edge_type[e] != t:
+            continue
+        a, b = component[edge_src[e]], component[edge_dst[e]]
+        if a == b:
+            cyclic[a] = 1
+        else:
+            out_sets[a].add(b)
+            in_sets[b].add(a)
+    dag_out = [sorted(x) for x in out_sets]
+    dag_in = [sorted(x) for x in in_sets]
+
+    # Successors have lower component numbers, predecessors higher ones
+    closures = {
+        'out': _closure(dag_out, range(count)),
+        'in': _closure(dag_in, range(count - 1, -1, -1)),
+    }
+
+    sections = [
+        (f'scc.{t}', 'I', array('I', component).tobytes()),
+        (f'scc_cyclic.{t}', 'B', cyclic.tobytes()),
+    ]
+    for name, lists in (('scc_members', members), ('dag_out', dag_out), ('dag_in', dag_in)):
+        ptr_bytes, flat = _csr(lists)
+        sections += [(f'{name}_ptr.{t}', 'I', ptr_bytes), (f'{name}.{t}', 'I', flat)]
+    for direction, lists in closures.items():
+        if lists is not None:
+            ptr_bytes, flat = _csr(lists)
+            sections += [(f'reach_{direction}_ptr.{t}', 'I', ptr_bytes),
+                         (f'reach_{direction}.{t}', 'I', flat)]
+
+    info = {
+        'components': count,
+        'closure': {direction: lists is not None for direction, lists in closures.items()},
+    }
+    return info, sections
+
+
+def compile_graph(graph: Dict[str, Any],
+                  source_path: Optional[Union[str, Path]] = None) -> bytes:
+    """
+    Compile a knowledge graph dict into the binary store format.
+
+    Args:
+        graph: Graph as produced by KnowledgeGraphBuilder
+        source_path: JSON file the graph was read from; its size and mtime
+            are recorded so stale compiled files can be detected
+
+    Returns:
+        The compiled graph as bytes
+    """
+    strings = _StringTable()
+    node_index: Dict[str, int] = {}
+    node_ids = array('I')
+    node_types = array('I')
+    node_labels = array('I')
+    node_real = array('B')
+    node_attrs: List[bytes] = []
+
+    def add_node(node_id: str) -> int:
+        idx = node_index.get(node_id)
+        if idx is None:
+            idx = node_index[node_id] = len(node_ids)
+            node_ids.append(strings.intern(node_id))
+            node_types.append(NONE)
+            node_labels.append(NONE)
+            node_real.append(0)
+            node_attrs.append(b'')
+        return idx
+
+    for node in graph.get('nodes', []):
+        idx = add_node(node['id'])
+        node_types[idx] = strings.intern(node.get('type'))
+        node_labels[idx] = strings.intern(node.get('label'))
+        node_real[idx] = 1
+        attrs = {k: v for k, v in node.items() if k not in _NODE_KEYS}
+        node_attrs[idx] = json.dumps(attrs, separators=(',', ':')).encode('utf-8')
+
+    rel_types: List[str] = []
+    rel_type_index: Dict[str, int] = {}
+    edge_src = array('I')
+    edge_dst = array('I')
+    edge_type = array('I')
+    weights = []
+    # Edges whose relationship had no weight (stored as 1)
+    unweighted = []
+    edge_extras = {}
+
+    for eid, rel in enumerate(graph.get('relationships', [])):
+        edge_src.append(add_node(rel['source']))
+        edge_dst.append(add_node(rel['target']))
+        rel_type = rel['type']
+        if rel_type not in rel_type_index:
+            rel_type_index[rel_type] = len(rel_types)
+            rel_types.append(rel_type)
+        edge_type.append(rel_type_index[rel_type])
+        if 'weight' not in rel:
+            unweighted.append(eid)
+        weights.append(rel.get('weight', 1))
+        extras = {k: v for k, v in rel.items() if k not in _EDGE_KEYS}
+        if extras:
+            edge_extras[str(eid)] = extras
+
+    n = len(node_ids)
+    integral = all(isinstance(w, int) and not isinstance(w, bool) for w in weights)
+    weight_code = 'q' if integral else 'd'
+
+    attr_off = array('Q', [0])
+    for data in node_attrs:
+        attr_off.append(attr_off[-1] + len(data))
+
+    # Node indices ordered by id bytes, for binary search without a dict
+    node_sorted = array('I', sorted(range(n), key=lambda i: strings.encoded[node_ids[i]]))
+
+    sections = strings.sections() + [
+        ('node_id', 'I', node_ids.tobytes()),
+        ('node_type', 'I', node_types.tobytes()),
+        ('node_label', 'I', node_labels.tobytes()),
+        ('node_real', 'B', node_real.tobytes()),
+        ('node_sorted', 'I', node_sorted.tobytes()),
+        ('node_attr_off', 'Q', attr_off.tobytes()),
+        ('node_attr_blob', 'B', b''.join(node_attrs)),
+        ('edge_src', 'I', edge_src.tobytes()),
+        ('edge_dst', 'I', edge_dst.tobytes()),
+        ('edge_type', 'I', edge_type.tobytes()),
+        ('edge_weight', weight_code, array(weight_code, weights).tobytes()),
+    ]
+
+    # CSR adjacency per relationship type; a stable counting sort keeps
+    # each node's edges in their original order
+    out_csr = {}
+    out_eids = {}
+    for t in range(len(rel_types)):
+        eids = [e for e in range(len(edge_type)) if edge_type[e] == t]
+        for direction, keys, others in (('out', edge_src, edge_dst), ('in', edge_dst, edge_src)):
+            ptr = array('I', [0]) * (n + 1)
+            for e in eids:
+                ptr[keys[e] + 1] += 1
+            for i in range(n):
+                ptr[i + 1] += ptr[i]
+            fill = array('I', ptr[:n])
+            nbr = array('I', [0]) * len(eids)
+            eid_arr = array('I', [0]) * len(eids)
+            for e in eids:
+                pos = fill[keys[e]]
+                nbr[pos] = others[e]
+                eid_arr[pos] = e
+                fill[keys[e]] += 1
+            sections += [
+                (f'{direction}_ptr.{t}', 'I', ptr.tobytes()),
+                (f'{direction}_nbr.{t}', 'I', nbr.tobytes()),
+                (f'{direction}_eid.{t}', 'I', eid_arr.tobytes()),
+            ]
+            if direction == 'out':
+                out_csr[t] = (ptr, nbr)
+                out_eids[t] = eid_arr
+
+    reachability = {}
+    for rel_type in REACHABILITY_TYPES:
+        t = rel_type_index.get(rel_type)
+        if t is not None:
+            reachability[rel_type], extra = _reachability(
+                n, t, *out_csr[t], edge_src, edge_dst, edge_type
+            )
+            sections += extra
+
+    analytics = {}
+    for rel_type, directed in ANALYTICS_TYPES.items():
+        t = rel_type_index.get(rel_type)
+        if t is None:
+            continue
+        edge_weights = [weights[e] for e in out_eids[t]]
+        if all(w == 1 for w in edge_weights):
+            edge_weights = None
+        result = analyze(n, *out_csr[t], edge_weights, directed)
+        analytics[rel_type] = result['info']
+        for metric, code in ANALYTICS_METRICS.items():
+            sections.append((f'{metric}.{t}', code, array(code, result[metric]).tobytes()))
+
+    keys = list(graph.keys())
+    for key in keys:
+        if key not in ('nodes', 'relationships'):
+            sections.append((f'json:{key}', 'B', json.dumps(graph[key]).encode('utf-8')))
+    if edge_extras:
+        sections.append(('edge_extras', 'B', json.dumps(edge_extras).encode('utf-8')))
+    if unweighted:
+        sections.append(('edge_unweighted', 'B', json.dumps(unweighted).encode('utf-8')))
+
+    header = {
+        'version': STORE_VERSION,
+        'byteorder': sys.byteorder,
+        'nodes': n,
+        'edges': len(edge_src),
+        'rel_types': rel_types,
+        'keys': keys,
+        'reachability': reachability,
+        'analytics': analytics,
+        'source': _source_stamp(source_path),
+        'sections': {},
+    }
+
+    # Offsets depend on the header length, so lay out sections relative to
+    # the end of the header and shift them once the header is encoded
+    layout = {}
+    position = 0
+    for name, code, data in sections:
+        layout[name] = (position, len(data), code)
+        position += len(data) + (-len(data) % _ALIGN)
+
+    base = 0
+    while True:
+        header['sections'] = {name: [base + off, length, code] for name, (off, length, code) in layout.items()}
+        encoded = json.dumps(header, separators=(',', ':')).encode('utf-8')
+        prefix = len(MAGIC) + _HEADER_LENGTH.size + len(encoded)
+        needed = prefix + (-prefix % _ALIGN)
+        if needed == base:
+            break
+        base = needed
+
+    out = bytearray(MAGIC)
+    out += _HEADER_LENGTH.pack(len(encoded))
+    out += encoded
+    out += b'\x00' * (base - len(out))
+    for name, code, data in sections:
+        out += data
+        out += b'\x00' * (-len(data) % _ALIGN)
+    return bytes(out)
+
+
+def write_compiled_graph(graph: Dict[str, Any], path: Union[str, Path],
+                         source_path: Optional[Union[str, Path]] = None) -> Path:
+    """Compile a graph and write it atomically (temp file + rename).
+
+    Each writer gets its own temp file, so concurrent compiles (the server
+    reloading while the CLI rebuilds) never publish each other's partial
+    output.
+    """
+    path = Path(path)
+    data = compile_graph(graph, source_path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+class CompiledGraph:
+    """
+    Read-only view of a compiled knowledge graph.
+
+    Nodes are addressed by integer index; index() maps an id to its index
+    with a binary search over the sorted id table. Indices of ids that only
+    appear in relationships exist but have no node (node() returns None).
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], path: Optional[Path] = None):
+        self.path = path
+        self._buf = buffer
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError('Not a compiled knowledge graph')
+
+        start = len(MAGIC)
+        (length,) = _HEADER_LENGTH.unpack(buffer[start:start + _HEADER_LENGTH.size])
+        start += _HEADER_LENGTH.size
+        self.header = json.loads(buffer[start:start + length].decode('utf-8'))
+        if self.header.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported compiled graph version {self.header.get('version')}")
+        if self.header.get('byteorder') != sys.byteorder:
+            raise ValueError('Compiled graph was written with a different byte order')
+
+        self._view = memoryview(buffer)
+        self.node_count: int = self.header['nodes']
+        self.edge_count: int = self.header['edges']
+        self.rel_types: List[str] = self.header['rel_types']
+        self._rel_type_index = {t: i for i, t in enumerate(self.rel_types)}
+
+        self._str_off = self._array('str_off')
+        self._str_base = self.header['sections']['str_blob'][0]
+        self._node_id = self._array('node_id')
+        self._node_type = self._array('node_type')
+        self._node_label = self._array('node_label')
+        self._node_real = self._array('node_real')
+        self._node_sorted = self._array('node_sorted')
+        self._attr_off = self._array('node_attr_off')
+        self._attr_base = self.header['sections']['node_attr_blob'][0]
+        self.edge_src = self._array('edge_src')
+        self.edge_dst = self._array('edge_dst')
+        self.edge_type = self._array('edge_type')
+        self.edge_weight = self._array('edge_weight')
+
+        self._strings: Dict[int, str] = {}
+        self._indices: Dict[str, Optional[int]] = {}
+        self._sections: Dict[str, Any] = {}
+        self._csr: Dict[Tuple[str, str], Tuple[memoryview, memoryview, memoryview]] = {}
+        self._typed: Dict[str, memoryview] = {}
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'CompiledGraph':
+        """Map a compiled graph file into memory."""
+        path = Path(path)
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, path)
+
+    @classmethod
+    def from_graph(cls, graph: Dict[str, Any]) -> 'CompiledGraph':
+        """Compile a graph dict in memory."""
+        return cls(compile_graph(graph))
+
+    def matches_source(self, source_path: Union[str, Path]) -> bool:
+        """Check whether this store was compiled from the current source file."""
+        stamp = self.header.get('source')
+        try:
+            return stamp is not None and stamp == _source_stamp(source_path)
+        except OSError:
+            return False
+
+    # === Raw access ===
+
+    def _array(self, name: str) -> memoryview:
+        offset, length, code = self.header['sections'][name]
+        return self._view[offset:offset + length].cast(code)
+
+    def string(self, idx: int) -> Optional[str]:
+        """Decode an entry of the string table."""
+        if idx == NONE:
+            return None
+        value = self._strings.get(idx)
+        if value is None:
+            start = self._str_base + self._str_off[idx]
+            end = self._str_base + self._str_off[idx + 1]
+            value = self._strings[idx] = self._buf[start:end].decode('utf-8')
+        return value
+
+    def adjacency(self, rel_type: str, direction: str = 'out') -> Optional[Tuple[memoryview, memoryview, memoryview]]:
+        """
+        CSR arrays (indptr, neighbors, edge ids) for one relationship type.
+
+        Neighbors of node i are neighbors[indptr[i]:indptr[i + 1]]. Returns
+        None when the graph has no relationship of that type.
+        """
+        key = (rel_type, direction)
+        if key not in self._csr:
+            t = self._rel_type_index.get(rel_type)
+            if t is None:
+                return None
+            self._csr[key] = (self._array(f'{direction}_ptr.{t}'),
+                              self._array(f'{direction}_nbr.{t}'),
+                              self._array(f'{direction}_eid.{t}'))
+        return self._csr[key]
+
+    # === Nodes ===
+
+    def index(self, node_id: str) -> Optional[int]:
+        """Index of a node id, or None if the graph never mentions it."""
+        if node_id in self._indices:
+            return self._indices[node_id]
+        key = node_id.encode('utf-8')
+        lo, hi = 0, self.node_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            s = self._node_id[self._node_sorted[mid]]
+            start = self._str_base + self._str_off[s]
+            if self._buf[start:self._str_base + self._str_off[s + 1]] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = None
+        if lo < self.node_count:
+            candidate = self._node_sorted[lo]
+            if self.node_id(candidate) == node_id:
+                found = candidate
+        self._indices[node_id] = found
+        return found
+
+    def node_id(self, idx: int) -> str:
+        return self.string(self._node_id[idx])
+
+    def is_node(self, idx: int) -> bool:
+        """True if the index is a node rather than an id only seen in relationships."""
+        return bool(self._node_real[idx])
+
+    def node_type(self, idx: int) -> Optional[str]:
+        return self.string(self._node_type[idx])
+
+    def node_label(self, idx: int) -> Optional[str]:
+        return self.string(self._node_label[idx])
+
+    def node_at(self, idx: int) -> Optional[Dict[str, Any]]:
+        """Full node dict for an index (attributes are decoded on demand)."""
+        if not self._node_real[idx]:
+            return None
+        node = {'id': self.node_id(idx)}
+        for key, value in (('type', self._node_type[idx]), ('label', self._node_label[idx])):
+            if value != NONE:
+                node[key] = self.string(value)
+        start = self._attr_base + self._attr_off[idx]
+        end = self._attr_base + self._attr_off[idx + 1]
+        node.update(json.loads(self._buf[start:end].decode('utf-8')))
+        return node
+
+    def node(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """Full node dict for an id, or None."""
+        idx = self.index(node_id)
+        return None if idx is None else self.node_at(idx)
+
+    def nodes_of_type(self, node_type: str) -> List[Dict[str, Any]]:
+        """Nodes of one type, in their original order."""
+        return [self.node_at(idx) for idx in self.indices_of_type(node_type)]
+
+    def indices_of_type(self, node_type: str) -> List[int]:
+        """Indices of the nodes of one type, in their original order."""
+        # Types are interned, so compare string table indices, not strings
+        type_idx = next((s for s in set(self._node_type) if self.string(s) == node_type), None)
+        if type_idx is None:
+            return []
+        return [idx for idx in range(self.node_count) if self._node_type[idx] == type_idx]
+
+    # === Reachability ===
+
+    def _typed_array(self, name: str, rel_type: str) -> Optional[memoryview]:
+        t = self._rel_type_index.get(rel_type)
+        key = f'{name}.{t}'
+        if t is None or key not in self.header['sections']:
+            return None
+        if key not in self._typed:
+            self._typed[key] = self._array(key)
+        return self._typed[key]
+
+    def component(self, idx: int, rel_type: str = 'imports') -> Optional[int]:
+        """Strongly connected component of a node over one relationship type."""
+        scc = self._typed_array('scc', rel_type)
+        return None if scc is None else scc[idx]
+
+    def reachable_components(self, comp: int, rel_type: str = 'imports', direction: str = 'out') -> List[int]:
+        """
+        Components reachable from a component in the condensed DAG.
+
+        'out' follows relationships forward (what a file depends on), 'in'
+        backward (what depends on it). Uses the stored closure, or walks the
+        DAG when the closure was too large to store.
+        """
+        ptr = self._typed_array(f'reach_{direction}_ptr', rel_type)
+        if ptr is not None:
+            return self._typed_array(f'reach_{direction}', rel_type)[ptr[comp]:ptr[comp + 1]].tolist()
+
+        dag_ptr = self._typed_array(f'dag_{direction}_ptr', rel_type)
+        if dag_ptr is None:
+            return []
+        dag = self._typed_array(f'dag_{direction}', rel_type)
+        seen = set()
+        pending = [comp]
+        while pending:
+            c = pending.pop()
+            for d in dag[dag_ptr[c]:dag_ptr[c + 1]]:
+                if d not in seen:
+                    seen.add(d)
+                    pending.append(d)
+        return sorted(seen)
+
+    def component_members(self, comp: int, rel_type: str = 'imports') -> List[int]:
+        ptr = self._typed_array('scc_members_ptr', rel_type)
+        return self._typed_array('scc_members', rel_type)[ptr[comp]:ptr[comp + 1]].tolist()
+
+    def reachable(self, idx: int, rel_type: str = 'imports', direction: str = 'out') -> List[int]:
+        """
+        Nodes reachable from a node over one or more relationships.
+
+        The node itself is included only when it lies on a cycle.
+        """
+        comp = self.component(idx, rel_type)
+        if comp is None:
+            return []
+        nodes = []
+        if self._typed_array('scc_cyclic', rel_type)[comp]:
+            nodes.extend(self.component_members(comp, rel_type))
+        for c in self.reachable_components(comp, rel_type, direction):
+            nodes.extend(self.component_members(c, rel_type))
+        return nodes
+
+    # === Analytics ===
+
+    def metric(self, name: str, rel_type: str = 'imports') -> Optional[memoryview]:
+        """
+        Per-node analytics array ('pagerank', 'betweenness' or 'community')
+        over one relationship type, indexed by node index. None when the
+        graph has no relationships of that type.
+        """
+        if name not in ANALYTICS_METRICS:
+            raise KeyError(f"Unknown graph metric '{name}'")
+        return self._typed_array(name, rel_type)
+
+    # === Relationships ===
+
+    def neighbors(self, idx: int, rel_type: str, direction: str = 'out') -> List[int]:
+        """Neighbor indices of a node over one relationship type."""
+        csr = self.adjacency(rel_type, direction)
+        if csr is None:
+            return []
+        ptr, nbr, _ = csr
+        return nbr[ptr[idx]:ptr[idx + 1]].tolist()
+
+    def edges_of(self, node_id: str, rel_type: str, direction: str = 'out') -> List[Tuple[str, Any]]:
+        """(neighbor id, weight) pairs of a node over one relationship type."""
+        idx = self.index(node_id)
+        csr = self.adjacency(rel_type, direction) if idx is not None else None
+        if csr is None:
+            return []
+        ptr, nbr, eids = csr
+        start, end = ptr[idx], ptr[idx + 1]
+        return [(self.node_id(nbr[i]), self.edge_weight[eids[i]]) for i in range(start, end)]
+
+    def edges(self) -> Iterator[Tuple[int, int, str, Any]]:
+        """All relationships as (source index, target index, type, weight), in original order."""
+        for e in range(self.edge_count):
+            yield self.edge_src[e], self.edge_dst[e], self.rel_types[self.edge_type[e]], self.edge_weight[e]
+
+    # === Sections ===
+
+    def section(self, key: str, default: Any = None) -> Any:
+        """Top-level JSON section such as 'statistics' or 'metrics'."""
+        if key not in self._sections:
+            if f'json:{key}' not in self.header['sections']:
+                return default
+            self._sections[key] = self._json_section(f'json:{key}')
+        return self._sections[key]
+
+    def _json_section(self, name: str) -> Any:
+        if name not in self.header['sections']:
+            return None
+        offset, length, _ = self.header['sections'][name]
+        return json.loads(self._buf[offset:offset + length].decode('utf-8'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Rebuild the full graph dict (equal to the compiled JSON graph)."""
+        extras = self._json_section('edge_extras') or {}
+        unweighted = set(self._json_section('edge_unweighted') or ())
+        graph = {}
+        for key in self.header['keys']:
+            if key == 'nodes':
+                graph[key] = [self.node_at(i) for i in range(self.node_count) if self._node_real[i]]
+            elif key == 'relationships':
+                relationships = []
+                for e, (src, dst, rel_type, weight) in enumerate(self.edges()):
+                    rel = {'source': self.node_id(src), 'target': self.node_id(dst), 'type': rel_type}
+                    if e not in unweighted:
+                        rel['weight'] = weight
+                    rel.update(extras.get(str(e), {}))
+                    relationships.append(rel)
+                graph[key] = relationships
+            else:
+                graph[key] = self.section(key)
+        return graph
+
+    def close(self):
+        """Release the mapping; arrays obtained from this graph become invalid."""
+        views = [v for v in vars(self).values() if isinstance(v, memoryview)]
+        views += [v for csr in self._csr.values() for v in csr]
+        views += list(self._typed.values())
+        self._csr.clear()
+        self._typed.clear()
+        for view in views:
+            if view is not self._view:
+                view.release()
+        self._view.release()
+        if isinstance(self._buf, mmap.mmap):
+            try:
+                self._buf.close()
+            except BufferError:
+                # A caller still holds an exported view; the mapping is freed with it
+                pass
+
+
+def main():
+    """Compile a JSON knowledge graph"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compile knowledge graph for fast queries')
+    parser.add_argument('graph', nargs='?', default='docs/data/codebase-graph.json',
+                        help='JSON knowledge graph')
+    parser.add_argument('-o', '--output', help=f'Compiled output (default: <graph>{COMPILED_SUFFIX})')
+
+    args = parser.parse_args()
+
+    with open(args.graph, 'r', encoding='utf-8') as f:
+        graph = json.load(f)
+    output = write_compiled_graph(graph, args.output or compiled_path_for(args.graph), args.graph)
+    print(f"✅ Compiled {len(graph.get('nodes', []))} nodes and "
+          f"{len(graph.get('relationships', []))} relationships to {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
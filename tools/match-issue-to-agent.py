@@ -7,6 +7,9 @@ Performance optimizations:
 - Pre-compiled regex patterns for faster matching
 - LRU cache for agent info to reduce file I/O
 - Memoization for text normalization
+- One keyword automaton shared by all agents, and each distinct pattern
+  searched once per issue behind a literal-substring prefilter
+- Batch mode (--batch) that matches JSONL issues from stdin in one process
 """
 
 import sys
@@ -790,6 +793,114 @@ for agent_name, patterns_dict in AGENT_PATTERNS.items():
         for pattern in patterns_dict['patterns']
     ]
 
+# Many agents share patterns, so each distinct pattern is compiled once
+_DISTINCT_PATTERNS = {
+    pattern: re.compile(pattern, re.IGNORECASE)
+    for patterns_dict in AGENT_PATTERNS.values()
+    for pattern in patterns_dict['patterns']
+}
+
+def _has_top_level_alternation(pattern):
+    """Whether a pattern has a `|` outside every group and character class."""
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 1
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+            # A ']' right after '[' or '[^' is a literal
+            if pattern.startswith('^', i + 1):
+                i += 1
+            if pattern.startswith(']', i + 1):
+                i += 1
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+        i += 1
+    return False
+
+def _required_literal(pattern):
+    """Return the literal text every match of a pattern must start with.
+    
+    Reads plain characters after an optional leading word boundary and stops
+    at the first metacharacter, dropping a character made optional by a
+    following quantifier. Returns None when there is no such text, including
+    for any pattern with a top-level alternation, which can match without it.
+    """
+    if _has_top_level_alternation(pattern):
+        return None
+    if pattern.startswith(r'\b'):
+        pattern = pattern[2:]
+    
+    literal = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                break  # Character class such as \s or \b
+            char = pattern[i + 1]
+            i += 2
+        elif char in '.^$*+?{}[]|()':
+            break
+        else:
+            i += 1
+        if i < len(pattern) and pattern[i] in '?*{':
+            break
+        literal.append(char)
+    return ''.join(literal).lower() or None
+
+_PATTERN_LITERALS = {pattern: _required_literal(pattern) for pattern in _DISTINCT_PATTERNS}
+
+def _build_keyword_trie_pattern(keywords):
+    """Build a regex that walks a trie of all keywords (Aho-Corasick style).
+    
+    At every text position the regex returns the longest keyword starting
+    there; optional groups are greedy, so longer continuations are tried
+    before stopping at a shorter keyword on the same trie path.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True  # End-of-keyword marker
+    
+    def render(node):
+        children = sorted(key for key in node if key)
+        if not children:
+            return ''
+        alternatives = [re.escape(char) + render(node[char]) for char in children]
+        body = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        if '' in node:
+            body = f'(?:{body})?'
+        return body
+    
+    return render(trie)
+
+_ALL_KEYWORDS = sorted({
+    keyword
+    for patterns_dict in AGENT_PATTERNS.values()
+    for keyword in patterns_dict['keywords']
+})
+
+# Zero-width lookahead so overlapping keyword occurrences are all reported
+_KEYWORD_AUTOMATON = re.compile(f'(?=({_build_keyword_trie_pattern(_ALL_KEYWORDS)}))')
+
+# Every keyword that starts at the same position as a longer one is its prefix
+_KEYWORD_PREFIXES = {
+    keyword: frozenset(other for other in _ALL_KEYWORDS if keyword.startswith(other))
+    for keyword in _ALL_KEYWORDS
+}
+
 # Pre-compile whitespace normalization pattern
 _WHITESPACE_PATTERN = re.compile(r'\s+')
 
@@ -847,6 +958,61 @@ def calculate_match_score(text, agent_name):
     
     return score
 
+def find_keywords(normalized_text):
+    """Find every agent keyword that occurs as a substring of the text.
+    
+    Equivalent to testing `keyword in normalized_text` for all keywords,
+    but scans the text once with the combined keyword automaton.
+    """
+    found = set()
+    for match in _KEYWORD_AUTOMATON.finditer(normalized_text):
+        found.update(_KEYWORD_PREFIXES[match.group(1)])
+    return found
+
+def _pattern_matches(pattern, normalized_text, is_ascii):
+    """Search one distinct pattern, skipping the regex when its literal is absent.
+    
+    The substring shortcut is only taken for ASCII text, where lowercasing
+    and IGNORECASE agree on every character.
+    """
+    literal = _PATTERN_LITERALS[pattern]
+    if is_ascii and literal and literal not in normalized_text:
+        return False
+    return _DISTINCT_PATTERNS[pattern].search(normalized_text) is not None
+
+def calculate_match_scores(text, agent_names):
+    """Calculate match scores of one text for many agents at once.
+    
+    Produces the same scores as calling calculate_match_score per agent,
+    while normalizing and scanning the text for keywords only once.
+    """
+    normalized_text = normalize_text(text)
+    found_keywords = find_keywords(normalized_text)
+    is_ascii = normalized_text.isascii()
+    pattern_hits = {}
+    
+    scores = {}
+    for agent_name in agent_names:
+        if agent_name not in AGENT_PATTERNS:
+            scores[agent_name] = 0
+            continue
+        
+        patterns = AGENT_PATTERNS[agent_name]
+        
+        # Keyword matches (1 point each)
+        score = sum(1 for keyword in patterns['keywords'] if keyword in found_keywords)
+        
+        # Pattern matches (2 points each); shared patterns are searched once
+        for pattern in patterns['patterns']:
+            if pattern not in pattern_hits:
+                pattern_hits[pattern] = _pattern_matches(pattern, normalized_text, is_ascii)
+            if pattern_hits[pattern]:
+                score += 2
+        
+        scores[agent_name] = score
+    
+    return scores
+
 def match_issue_to_agent(title, body="", exclude_tech_leads=True):
     """
     Match an issue to the most appropriate agent based on content.
@@ -867,14 +1033,11 @@ def match_issue_to_agent(title, body="", exclude_tech_leads=True):
     available_agents = list_agents()
     
     # Calculate scores for each agent, excluding tech leads if requested
-    scores = {}
-    for agent_name in available_agents:
-        # Skip tech leads for initial issue assignment if requested
-        if exclude_tech_leads and is_tech_lead(agent_name):
-            continue
-            
-        score = calculate_match_score(combined_text, agent_name)
-        scores[agent_name] = score
+    candidate_agents = [
+        agent_name for agent_name in available_agents
+        if not (exclude_tech_leads and is_tech_lead(agent_name))
+    ]
+    scores = calculate_match_scores(combined_text, candidate_agents)
     
     # Find the best match from available agents
     if not scores or max(scores.values()) == 0:
@@ -957,22 +1120,90 @@ def match_issue_to_agent(title, body="", exclude_tech_leads=True):
         'reason': f'Matched based on issue content analysis'
     }
 
+def match_issues_batch(input_stream, output_stream, seed=None):
+    """Match a stream of JSONL issues and write one JSONL assignment per line.
+    
+    Each input line is an object with "title" and optional "body"; "number"
+    and "id" are copied to the output. When a seed is given, the random
+    generator is reseeded before every issue, so each assignment equals the
+    single-issue result for the same seed.
+    
+    Returns:
+        Number of lines that could not be processed
+    """
+    errors = 0
+    for line_number, line in enumerate(input_stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        
+        try:
+            issue = json.loads(line)
+            if not isinstance(issue, dict):
+                raise ValueError("issue must be a JSON object")
+            
+            record = {key: issue[key] for key in ('number', 'id') if key in issue}
+            title = sanitize_input(str(issue.get('title') or ''))
+            body = sanitize_input(str(issue.get('body') or ''))
+            
+            if seed is not None:
+                random.seed(seed)
+            record.update(match_issue_to_agent(title, body))
+        except (ValueError, TypeError) as e:
+            errors += 1
+            record = {
+                'line': line_number,
+                'error': str(e),
+                'agent': 'create-guru',
+                'score': 0,
+                'confidence': 'low',
+                'reason': 'Error processing input, using default agent'
+            }
+        
+        output_stream.write(json.dumps(record) + '\n')
+    
+    output_stream.flush()
+    return errors
+
 def main():
     """Command-line interface."""
-    if len(sys.argv) < 2:
-        print("Usage: match-issue-to-agent.py <title> [body]", file=sys.stderr)
+    args = sys.argv[1:]
+    batch = False
+    seed = None
+    
+    # Leading options; everything after them is <title> [body]
+    try:
+        while args and args[0] in ('--batch', '--seed'):
+            option = args.pop(0)
+            if option == '--batch':
+                batch = True
+            else:
+                seed = int(args.pop(0))
+    except (IndexError, ValueError):
+        print("Error: --seed requires an integer value", file=sys.stderr)
+        sys.exit(1)
+    
+    if batch:
+        errors = match_issues_batch(sys.stdin, sys.stdout, seed=seed)
+        sys.exit(1 if errors else 0)
+    
+    if len(args) < 1:
+        print("Usage: match-issue-to-agent.py [--seed N] <title> [body]", file=sys.stderr)
+        print("       match-issue-to-agent.py --batch [--seed N] < issues.jsonl", file=sys.stderr)
         print("", file=sys.stderr)
         print("Analyzes issue content and suggests the best agent specialization.", file=sys.stderr)
         sys.exit(1)
     
     try:
-        title = sys.argv[1]
-        body = sys.argv[2] if len(sys.argv) > 2 else ""
+        title = args[0]
+        body = args[1] if len(args) > 1 else ""
         
         # Sanitize inputs to prevent issues with special characters
         title = sanitize_input(title)
         body = sanitize_input(body)
         
+        if seed is not None:
+            random.seed(seed)
         result = match_issue_to_agent(title, body)
         print(json.dumps(result, indent=2))
     except Exception as e:
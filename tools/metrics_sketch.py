@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Metrics Sketch - Constant-memory request statistics
+
+Backend for APIMonitor and APIMonitoringBridge: per-endpoint statistics
+that take the same memory after a million requests as after ten.
+
+- LatencyHistogram: log-bucketed histogram (the DDSketch / HDR idea).
+  Every value lands in the bucket [gamma^(i-1), gamma^i), so any quantile
+  is estimated within `relative_accuracy` of a true sample value. Count,
+  mean, standard deviation, min and max are exact.
+- SlidingWindowCounter: request and error counts over the last N seconds
+  in a fixed ring of time buckets.
+- RequestStats: both of the above plus status code counts and the first
+  and last request time.
+
+All three merge with another instance (e.g. from another process or run)
+and round-trip through JSON-serializable snapshots.
+
+Example:
+    stats = RequestStats()
+    stats.record(0.245, 200)
+    stats.record(1.3, 500, error=True)
+    stats.latency.quantile(0.95)
+    merged = RequestStats.from_snapshot(json.loads(saved)).merge(stats)
+"""
+
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+# Values at or below this are counted as zero
+MIN_VALUE = 1e-9
+
+
+class LatencyHistogram:
+    """Mergeable log-bucketed histogram with relative-error quantiles"""
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        """
+        Args:
+            relative_accuracy: Bound on the relative error of quantiles
+            max_buckets: Bound on memory; past it the lowest buckets are
+                         merged, so only the smallest values lose accuracy
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Record one value"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= MIN_VALUE:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        if len(self._buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        """Fold the lowest buckets into one until within max_buckets"""
+        indexes = sorted(self._buckets)
+        excess = len(indexes) - self.max_buckets
+        folded = sum(self._buckets.pop(i) for i in indexes[:excess])
+        self._buckets[indexes[excess]] += folded
+
+    @property
+    def total(self) -> float:
+        return self.mean * self.count
+
+    @property
+    def stddev(self) -> float:
+        """Sample standard deviation (as statistics.stdev)"""
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimated value at quantile q (0.0-1.0), rank q * (count - 1)
+
+        Returns 0.0 when empty; q <= 0 and q >= 1 give the exact min and max.
+        """
+        if self.count == 0:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return max(self.min, 0.0)
+        seen = self.zero_count
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen > rank:
+                # Midpoint of the bucket, in relative terms
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def percentile(self, percentile: float) -> float:
+        """Estimated value at a percentile (0-100)"""
+        return self.quantile(percentile / 100)
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """Add another histogram's values to this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge histograms with different relative accuracy")
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.zero_count += other.zero_count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for index, bucket_count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + bucket_count
+        if len(self._buckets) > self.max_buckets:
+            self._collapse()
+        return self
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'count': self.count,
+            'zero_count': self.zero_count,
+            'mean': self.mean,
+            'm2': self._m2,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'buckets': {str(index): count for index, count in self._buckets.items()},
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any], max_buckets: int = 2048) -> 'LatencyHistogram':
+        histogram = cls(data['relative_accuracy'], max_buckets)
+        histogram.count = data['count']
+        histogram.zero_count = data['zero_count']
+        histogram.mean = data['mean']
+        histogram._m2 = data['m2']
+        if histogram.count:
+            histogram.min = data['min']
+            histogram.max = data['max']
+        histogram._buckets = {int(index): count for index, count in data['buckets'].items()}
+        return histogram
+
+
+class SlidingWindowCounter:
+    """Request and error counts over the last `window_seconds`"""
+
+    def __init__(self, window_seconds: float = 300, buckets: int = 30):
+        """
+        Args:
+            window_seconds: Length of the window
+            buckets: Time buckets the window is split into; counts expire
+                     one bucket (window_seconds / buckets) at a time
+        """
+        self.window_seconds = window_seconds
+        self.bucket_seconds = window_seconds / buckets
+        # Per slot: [bucket number, requests, errors]
+        self._slots: List[List[int]] = [[-1, 0, 0] for _ in range(buckets)]
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def add(self, timestamp: float, error: bool = False) -> None:
+        """Count a request; ignored if older than the window"""
+        self._add(self._bucket(timestamp), 1, int(error))
+
+    def _add(self, bucket: int, requests: int, errors: int) -> None:
+        slot = self._slots[bucket % len(self._slots)]
+        if slot[0] > bucket:
+            return
+        if slot[0] < bucket:
+            slot[:] = [bucket, 0, 0]
+        slot[1] += requests
+        slot[2] += errors
+
+    def counts(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Requests and errors in the window ending at `now` (default: current time)"""
+        current = self._bucket(time.time() if now is None else now)
+        oldest = current - len(self._slots) + 1
+        requests = errors = 0
+        for bucket, slot_requests, slot_errors in self._slots:
+            if oldest <= bucket <= current:
+                requests += slot_requests
+                errors += slot_errors
+        return {'requests': requests, 'errors': errors}
+
+    def error_rate(self, now: Optional[float] = None) -> float:
+        counts = self.counts(now)
+        return counts['errors'] / counts['requests'] if counts['requests'] else 0.0
+
+    def merge(self, other: 'SlidingWindowCounter') -> 'SlidingWindowCounter':
+        if (other.window_seconds, len(other._slots)) != (self.window_seconds, len(self._slots)):
+            raise ValueError("Cannot merge windows with different sizes")
+        for bucket, requests, errors in other._slots:
+            if bucket >= 0:
+                self._add(bucket, requests, errors)
+        return self
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'window_seconds': self.window_seconds,
+            'slots': [list(slot) for slot in self._slots],
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> 'SlidingWindowCounter':
+        window = cls(data['window_seconds'], len(data['slots']))
+        window._slots = [list(slot) for slot in data['slots']]
+        return window
+
+
+class RequestStats:
+    """Constant-memory statistics for one endpoint's requests"""
+
+    def __init__(self, relative_accuracy: float = 0.01, window_seconds: float = 300):
+        self.latency = LatencyHistogram(relative_accuracy)
+        self.window = SlidingWindowCounter(window_seconds)
+        self.status_codes: Dict[int, int] = {}
+        self.error_count = 0
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+
+    @property
+    def total_requests(self) -> int:
+        return self.latency.count
+
+    def record(self, duration: float, status_code: int, timestamp: Optional[float] = None, error: bool = False):
+        """
+        Record one request.
+
+        Args:
+            duration: Response time, in whatever unit the caller reports
+            status_code: HTTP status code
+            timestamp: Request time (defaults to now)
+            error: Whether the request counts as an error
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        self.latency.add(duration)
+        self.window.add(timestamp, error)
+        self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+        if error:
+            self.error_count += 1
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp = timestamp
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+
+    def merge(self, other: 'RequestStats') -> 'RequestStats':
+        """Add another endpoint's statistics (e.g. from another run) to these"""
+        self.latency.merge(other.latency)
+        self.window.merge(other.window)
+        for code, count in other.status_codes.items():
+            self.status_codes[code] = self.status_codes.get(code, 0) + count
+        self.error_count += other.error_count
+        timestamps = [t for t in (self.first_timestamp, other.first_timestamp) if t is not None]
+        self.first_timestamp = min(timestamps) if timestamps else None
+        timestamps = [t for t in (self.last_timestamp, other.last_timestamp) if t is not None]
+        self.last_timestamp = max(timestamps) if timestamps else None
+        return self
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable state, restorable with from_snapshot"""
+        return {
+            'latency': self.latency.snapshot(),
+            'window': self.window.snapshot(),
+            'status_codes': {str(code): count for code, count in self.status_codes.items()},
+            'error_count': self.error_count,
+            'first_timestamp': self.first_timestamp,
+            'last_timestamp': self.last_timestamp,
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> 'RequestStats':
+        stats = cls()
+        stats.latency = LatencyHistogram.from_snapshot(data['latency'])
+        stats.window = SlidingWindowCounter.from_snapshot(data['window'])
+        stats.status_codes = {int(code): count for code, count in data['status_codes'].items()}
+        stats.error_count = data['error_count']
+        stats.first_timestamp = data['first_timestamp']
+        stats.last_timestamp = data['last_timestamp']
+        return stats
@@ -16,6 +16,9 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from repo_scanner import discover_files, scan_files
+
 
 class ReadabilityScorer:
     """Analyzes code readability and generates improvement suggestions"""
@@ -652,13 +655,14 @@ class ReadabilityScorer:
         s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
         return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
     
-    def analyze_directory(self, directory: str, extensions: List[str] = ['.py']) -> Dict:
+    def analyze_directory(self, directory: str, extensions: List[str] = ['.py'], jobs: int = 1) -> Dict:
         """
         Analyze all files in a directory.
         
         Args:
             directory: Path to the directory to analyze
             extensions: List of file extensions to analyze
+            jobs: Worker processes for scoring (1 = serial, 0 = all CPUs)
             
         Returns:
             Dictionary containing analysis results
@@ -694,33 +698,28 @@ class ReadabilityScorer:
         }
         
         try:
-            for root, dirs, files in os.walk(directory):
-                # Skip hidden directories and common excludes
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv']]
-                
-                for file in files:
-                    if any(file.endswith(ext) for ext in extensions):
-                        filepath = os.path.join(root, file)
-                        
-                        try:
-                            analysis = self.analyze_file(filepath)
-                            results["files_analyzed"].append(analysis)
-                            results["summary"]["total_files"] += 1
-                            results["summary"]["total_suggestions"] += len(analysis["suggestions"])
-                            
-                            # Count suggestions by priority
-                            for suggestion in analysis["suggestions"]:
-                                priority = suggestion.get("priority", "low")
-                                results["summary"]["suggestions_by_priority"][priority] += 1
-                            
-                        except Exception as e:
-                            results["errors"].append({
-                                "file": filepath,
-                                "error": str(e)
-                            })
+            filepaths = discover_files(directory, extensions)
         except OSError as e:
             raise IOError(f"Error walking directory '{directory}': {e}")
         
+        for scanned in scan_files(filepaths, self.analyze_file, jobs):
+            if scanned.error is not None:
+                results["errors"].append({
+                    "file": scanned.path,
+                    "error": scanned.error
+                })
+                continue
+            
+            analysis = scanned.value
+            results["files_analyzed"].append(analysis)
+            results["summary"]["total_files"] += 1
+            results["summary"]["total_suggestions"] += len(analysis["suggestions"])
+            
+            # Count suggestions by priority
+            for suggestion in analysis["suggestions"]:
+                priority = suggestion.get("priority", "low")
+                results["summary"]["suggestions_by_priority"][priority] += 1
+        
         # Calculate averages
         if results["files_analyzed"]:
             overall_scores = [f["scores"]["overall"] for f in results["files_analyzed"] if "overall" in f.get("scores", {})]
@@ -908,6 +907,8 @@ Examples:
     parser.add_argument('--format', choices=['json', 'markdown'], default='markdown',
                        help='Output format (default: markdown)')
     parser.add_argument('--min-score', type=float, help='Minimum acceptable score (exit 1 if below)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                       help='Worker processes for directory scans (default: 1, 0 = all CPUs)')
     
     args = parser.parse_args()
     
@@ -919,10 +920,10 @@ Examples:
             results = scorer.analyze_file(args.file)
         elif args.directory:
             # Analyze directory
-            results = scorer.analyze_directory(args.directory)
+            results = scorer.analyze_directory(args.directory, jobs=args.jobs)
         else:
             # Default to current directory
-            results = scorer.analyze_directory('.')
+            results = scorer.analyze_directory('.', jobs=args.jobs)
         
         # Generate output
         if args.format == 'json':
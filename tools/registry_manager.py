@@ -3,14 +3,16 @@
 Registry Manager - Distributed Agent Registry System
 
 This module provides a unified interface for managing agent registry data,
-supporting both legacy single-file format and new distributed file format.
+supporting the legacy single-file format, the distributed file format and
+an indexed SQLite database (see registry_sqlite.py).
 
 Architecture:
 - Abstracts registry operations behind a clean API
-- Supports atomic updates to individual agents
+- Supports atomic updates to individual agents, and batches of changes
 - Handles migration between formats transparently
 - Provides thread-safe operations
 - Maintains backward compatibility
+- Caches parsed agent files in process, revalidated by file mtime/size
 
 Usage:
     from registry_manager import RegistryManager
@@ -19,18 +21,43 @@ Usage:
     agent = registry.get_agent("agent-123")
     registry.update_agent(agent_data)
     all_agents = registry.list_agents()
+    
+    with registry.batch() as tx:
+        for agent in all_agents:
+            tx.update_agent(agent)
 """
 
 import json
 import os
+import tempfile
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 import shutil
+import sqlite3
 import fcntl
 from contextlib import contextmanager
 
+from registry_sqlite import SQLiteRegistry, agent_score
+
+# SQLite backend database; its presence selects the "sqlite" mode
+REGISTRY_DB_FILE = "registry.db"
+# Status of each agent file by (mtime, size), kept next to the agents
+# directory so a new process can filter by status without parsing
+AGENT_INDEX_FILE = ".agent-index.json"
+AGENT_INDEX_VERSION = 1
+# Staged batch writes, replayed if a commit is interrupted
+REGISTRY_JOURNAL_FILE = ".registry-journal.json"
+# Lock held by every registry write and for the whole of a batch (see
+# RegistryManager.batch)
+REGISTRY_LOCK_NAME = "registry"
+# Files modified this recently may change again within the same mtime
+# tick, so their signatures are not trusted (as in git's racy-clean check)
+RACY_WINDOW_NS = 2_000_000_000
+
 
 @dataclass
 class RegistryConfig:
@@ -52,9 +79,401 @@ class RegistryConfig:
     strict_pr_attribution: bool = True
 
 
+def _copy_json(value: Any) -> Any:
+    """Copy a parsed JSON value (cheaper than copy.deepcopy or re-parsing)"""
+    if isinstance(value, dict):
+        return {k: _copy_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(v) for v in value]
+    return value
+
+
+class AgentCache:
+    """
+    Parsed agent files of one agents directory, shared by every
+    RegistryManager in the process.
+    
+    Each file is revalidated with one stat: it is re-read only when its
+    mtime or size changed. The file list is re-read only when the
+    directory mtime changed. Statuses are also persisted to a small index
+    file, so list_agents(status=...) skips agents with another status
+    without opening them, even in a fresh process. Callers always get
+    copies, so mutating a returned agent never changes the cache.
+    """
+    
+    def __init__(self, agents_dir: Path, index_file: Path):
+        self.agents_dir = agents_dir
+        self.index_file = index_file
+        self._lock = threading.RLock()
+        self._dir_signature: Optional[int] = None
+        self._names: List[str] = []
+        # file name -> (signature, status, parsed agent or None if not read yet)
+        self._entries: Dict[str, Tuple[Optional[Tuple[int, int]], Optional[str], Optional[Dict[str, Any]]]] = {}
+        self._index_dirty = False
+        self._load_index()
+    
+    @staticmethod
+    def _signature(stat: os.stat_result) -> Optional[Tuple[int, int]]:
+        """(mtime, size), or None while the file is too recent to trust"""
+        if stat.st_mtime_ns >= time.time_ns() - RACY_WINDOW_NS:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _load_index(self):
+        try:
+            with open(self.index_file, 'r') as f:
+                index = json.load(f)
+            if index.get("version") != AGENT_INDEX_VERSION:
+                return
+            for name, (mtime_ns, size, status) in index.get("agents", {}).items():
+                self._entries[name] = ((mtime_ns, size), status, None)
+        except (OSError, json.JSONDecodeError, ValueError, TypeError, AttributeError):
+            self._entries.clear()
+    
+    def _save_index(self):
+        """Write the status index atomically; failures only cost a re-parse later"""
+        if not self._index_dirty:
+            return
+        agents = {
+            name: [signature[0], signature[1], status]
+            for name, (signature, status, _) in self._entries.items()
+            if signature is not None
+        }
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.index_file.parent, prefix=self.index_file.name)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"version": AGENT_INDEX_VERSION, "agents": agents}, f)
+            os.replace(tmp_path, self.index_file)
+            self._index_dirty = False
+        except OSError:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+    
+    def _read(self, name: str, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Parse one agent file and record it"""
+        try:
+            with open(self.agents_dir / name, 'r') as f:
+                agent = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            agent = None
+        status = agent.get("status") if isinstance(agent, dict) else None
+        self._entries[name] = (self._signature(stat), status, agent)
+        self._index_dirty = True
+        return agent
+    
+    def _lookup(self, name: str, status: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Cached or freshly read agent, or None if missing, invalid or filtered out"""
+        try:
+            stat = os.stat(self.agents_dir / name)
+        except OSError:
+            if self._entries.pop(name, None) is not None:
+                self._index_dirty = True
+            return None
+        
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] is not None and entry[0] == (stat.st_mtime_ns, stat.st_size):
+            if status is not None and entry[1] != status:
+                return None
+            if entry[2] is not None:
+                return entry[2]
+        agent = self._read(name, stat)
+        if status is not None and self._entries[name][1] != status:
+            return None
+        return agent
+    
+    def _refresh_names(self):
+        """Re-list the directory when its mtime changed"""
+        try:
+            mtime_ns = os.stat(self.agents_dir).st_mtime_ns
+        except OSError:
+            self._names = []
+            self._dir_signature = None
+            return
+        if mtime_ns == self._dir_signature:
+            return
+        self._names = sorted(name for name in os.listdir(self.agents_dir) if name.endswith(".json"))
+        # A directory changed in this mtime tick may change again unnoticed
+        racy = mtime_ns >= time.time_ns() - RACY_WINDOW_NS
+        self._dir_signature = None if racy else mtime_ns
+        names = set(self._names)
+        for name in [name for name in self._entries if name not in names]:
+            del self._entries[name]
+            self._index_dirty = True
+    
+    def get(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            agent = self._lookup(f"{agent_id}.json")
+            return _copy_json(agent) if isinstance(agent, dict) else None
+    
+    def list(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._refresh_names()
+            agents = []
+            for name in self._names:
+                agent = self._lookup(name, status)
+                if isinstance(agent, dict):
+                    agents.append(_copy_json(agent))
+            self._save_index()
+            return agents
+    
+    def store(self, agent_id: str, agent_data: Dict[str, Any]):
+        """Record an agent just written to its file"""
+        name = f"{agent_id}.json"
+        with self._lock:
+            try:
+                stat = os.stat(self.agents_dir / name)
+            except OSError:
+                self._entries.pop(name, None)
+                return
+            self._entries[name] = (self._signature(stat), agent_data.get("status"), _copy_json(agent_data))
+            self._index_dirty = True
+    
+    def discard(self, agent_id: str):
+        """Forget an agent whose file was deleted"""
+        with self._lock:
+            if self._entries.pop(f"{agent_id}.json", None) is not None:
+                self._index_dirty = True
+
+
+def _replace_file(path: Path, content: Optional[str], sync: bool = False):
+    """Write a file through a temporary file and rename, or delete it (content None)"""
+    if content is None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        return
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _fsync_dir(path: Path):
+    """Make the renames and deletions in a directory durable"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class RegistryTransaction:
+    """
+    Agent, config, metadata and hall of fame changes staged in memory and
+    written together by RegistryManager.batch().
+    
+    Methods mirror the RegistryManager write methods. Nothing touches the
+    disk until the batch commits; get_agent sees staged changes.
+    """
+    
+    def __init__(self, registry: 'RegistryManager'):
+        self.registry = registry
+        # path -> JSON value, text (str) or None to delete
+        self._files: Dict[Path, Any] = {}
+        self._legacy: Optional[Dict[str, Any]] = None
+        # SQLite mode: agent id -> agent or None to delete, document name -> value
+        self._rows: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._documents: Dict[str, Any] = {}
+    
+    def _legacy_registry(self) -> Dict[str, Any]:
+        """Legacy registry, parsed once and written once at commit"""
+        if self._legacy is None:
+            self._legacy = self.registry._read_legacy_registry()
+        return self._legacy
+    
+    def _agent_file(self, agent_id: str) -> Path:
+        return self.registry.agents_dir / f"{agent_id}.json"
+    
+    def get_agent(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """Agent data including changes staged in this batch"""
+        if self.registry._mode == "sqlite":
+            if agent_id in self._rows:
+                agent = self._rows[agent_id]
+                return _copy_json(agent) if agent is not None else None
+            return self.registry.get_agent(agent_id)
+        if self.registry._mode == "distributed":
+            path = self._agent_file(agent_id)
+            if path in self._files:
+                agent = self._files[path]
+                return _copy_json(agent) if agent is not None else None
+            return self.registry.get_agent(agent_id)
+        for agent in self._legacy_registry().get("agents", []):
+            if agent.get("id") == agent_id:
+                return _copy_json(agent)
+        return None
+    
+    def update_agent(self, agent_data: Dict[str, Any]):
+        """Stage an agent update or creation"""
+        agent_id = agent_data.get("id")
+        if not agent_id:
+            raise ValueError("Agent data must include 'id' field")
+        
+        agent_data = _copy_json(agent_data)
+        if self.registry._mode == "sqlite":
+            self._rows[agent_id] = agent_data
+            return
+        if self.registry._mode == "distributed":
+            self._files[self._agent_file(agent_id)] = agent_data
+            return
+        agents = self._legacy_registry().setdefault("agents", [])
+        for i, agent in enumerate(agents):
+            if agent.get("id") == agent_id:
+                agents[i] = agent_data
+                return
+        agents.append(agent_data)
+    
+    def delete_agent(self, agent_id: str) -> bool:
+        """Stage an agent deletion; False if there is no such agent"""
+        if self.get_agent(agent_id) is None:
+            return False
+        if self.registry._mode == "sqlite":
+            self._rows[agent_id] = None
+        elif self.registry._mode == "distributed":
+            self._files[self._agent_file(agent_id)] = None
+        else:
+            registry = self._legacy_registry()
+            registry["agents"] = [a for a in registry["agents"] if a.get("id") != agent_id]
+        return True
+    
+    def update_config(self, config_data: Dict[str, Any]):
+        if self.registry._mode == "sqlite":
+            self._documents["config"] = _copy_json(config_data)
+        elif self.registry._mode == "distributed":
+            self._files[self.registry.config_file] = _copy_json(config_data)
+        else:
+            self._legacy_registry()["config"] = _copy_json(config_data)
+    
+    def update_hall_of_fame(self, hall_of_fame: List[Dict[str, Any]]):
+        if self.registry._mode == "sqlite":
+            self._documents["hall_of_fame"] = _copy_json(hall_of_fame)
+        elif self.registry._mode == "distributed":
+            self._files[self.registry.hall_of_fame_file] = _copy_json(hall_of_fame)
+        else:
+            self._legacy_registry()["hall_of_fame"] = _copy_json(hall_of_fame)
+    
+    def update_metadata(self, metadata: Dict[str, Any]):
+        registry = self.registry
+        if registry._mode == "sqlite":
+            self._documents["metadata"] = _copy_json(metadata)
+        elif registry._mode == "distributed":
+            if registry._metadata_mode == "distributed":
+                for field, value in metadata.items():
+                    self._files[registry.metadata_dir / f"{field}.txt"] = "null" if value is None else str(value)
+            else:
+                self._files[registry.metadata_file] = _copy_json(metadata)
+        else:
+            self._legacy_registry().update(_copy_json(metadata))
+    
+    def update_metadata_field(self, field: str, value: Any):
+        registry = self.registry
+        if registry._mode == "sqlite":
+            metadata = self._documents.get("metadata") or registry.get_metadata()
+            metadata[field] = value
+            self._documents["metadata"] = metadata
+            return
+        if registry._metadata_mode == "distributed":
+            self._files[registry.metadata_dir / f"{field}.txt"] = "null" if value is None else str(value)
+            return
+        if registry._mode == "distributed":
+            if registry.metadata_file in self._files:
+                metadata = _copy_json(self._files[registry.metadata_file])
+            else:
+                metadata = registry.get_metadata()
+        else:
+            legacy = self._legacy_registry()
+            metadata = {key: legacy.get(key) for key in
+                        ("version", "last_spawn", "last_evaluation", "system_lead", "specializations_note")}
+        metadata[field] = value
+        self.update_metadata(metadata)
+    
+    def rendered_files(self) -> Dict[Path, Optional[str]]:
+        """Final content of every file the batch writes (None to delete)"""
+        files = dict(self._files)
+        if self._legacy is not None:
+            files[self.registry.legacy_registry_file] = self._legacy
+        return {
+            path: value if value is None or isinstance(value, str) else json.dumps(value, indent=2)
+            for path, value in files.items()
+        }
+
+
+_agent_caches: Dict[Path, AgentCache] = {}
+_agent_caches_lock = threading.Lock()
+
+
+def _agent_cache_for(base_path: Path) -> AgentCache:
+    """The process-wide cache for one agent system directory"""
+    key = base_path.resolve()
+    with _agent_caches_lock:
+        if key not in _agent_caches:
+            _agent_caches[key] = AgentCache(key / "agents", key / AGENT_INDEX_FILE)
+        return _agent_caches[key]
+
+
+class RegistryLock:
+    """
+    The registry lock of one agent system directory: an flock on
+    .registry.lock, reentrant within a thread.
+    
+    flock locks belong to an open file, so a second flock from the same
+    process would wait for itself; one instance per directory is shared by
+    every RegistryManager in the process instead.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+    
+    @contextmanager
+    def hold(self):
+        with self._thread_lock:
+            if self._depth == 0:
+                self._file = open(self.path, 'w')
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+                    self._file.close()
+                    self._file = None
+
+
+_registry_locks: Dict[Path, RegistryLock] = {}
+_registry_locks_lock = threading.Lock()
+
+
+def _registry_lock_for(base_path: Path) -> RegistryLock:
+    """The process-wide registry lock for one agent system directory"""
+    key = base_path.resolve()
+    with _registry_locks_lock:
+        if key not in _registry_locks:
+            _registry_locks[key] = RegistryLock(key / f".{REGISTRY_LOCK_NAME}.lock")
+        return _registry_locks[key]
+
+
 class RegistryManager:
     """
-    Unified registry manager that supports both single-file and distributed formats.
+    Unified registry manager that supports single-file, distributed and SQLite formats.
     
     File Structure (Distributed Mode):
     .github/agent-system/
@@ -66,6 +485,8 @@ class RegistryManager:
     ├── hall_of_fame.json
     ├── metadata.json
     └── registry.json (legacy, optional)
+    
+    SQLite mode keeps everything in .github/agent-system/registry.db.
     """
     
     def __init__(self, base_path: str = ".github/agent-system"):
@@ -82,24 +503,39 @@ class RegistryManager:
         self.metadata_file = self.base_path / "metadata.json"
         self.metadata_dir = self.base_path / "metadata"
         self.legacy_registry_file = self.base_path / "registry.json"
+        self.db_file = self.base_path / REGISTRY_DB_FILE
         
         # Create distributed directory structure if needed
         self.agents_dir.mkdir(parents=True, exist_ok=True)
         self.metadata_dir.mkdir(parents=True, exist_ok=True)
         
+        # Parsed agent files, shared with other managers of this directory
+        self._agent_cache = _agent_cache_for(self.base_path)
+        self._registry_lock = _registry_lock_for(self.base_path)
+        
         # Detect which mode we're in
         self._mode = self._detect_mode()
         self._metadata_mode = self._detect_metadata_mode()
+        self._sqlite = SQLiteRegistry(self.db_file) if self._mode == "sqlite" else None
+        
+        # Finish a batch commit that was interrupted
+        self.journal_file = self.base_path / REGISTRY_JOURNAL_FILE
+        if self.journal_file.exists():
+            with self._registry_lock.hold():
+                self._replay_journal()
         
     def _detect_mode(self) -> str:
         """
-        Detect whether we're using distributed or legacy mode.
+        Detect whether we're using SQLite, distributed or legacy mode.
         
         Returns:
-            "distributed" if distributed files exist, "legacy" otherwise
+            "sqlite" if the registry database exists, "distributed" if
+            distributed files exist, "legacy" otherwise
         """
+        if self.db_file.exists():
+            return "sqlite"
         # If distributed files exist, use distributed mode
-        if self.config_file.exists() or len(list(self.agents_dir.glob("*.json"))) > 0:
+        if self.config_file.exists() or next(self.agents_dir.glob("*.json"), None) is not None:
             return "distributed"
         # Otherwise use legacy mode
         return "legacy"
@@ -155,6 +591,99 @@ class RegistryManager:
             finally:
                 fcntl.flock(f.fileno(), fcntl.LOCK_UN)
     
+    @contextmanager
+    def _write_lock(self, filepath: Optional[Path] = None):
+        """The registry lock, which excludes batches, then the file's own lock"""
+        with self._registry_lock.hold():
+            if filepath is None:
+                yield
+            else:
+                with self._lock_file(filepath):
+                    yield
+    
+    @contextmanager
+    def batch(self):
+        """
+        Stage many changes and commit them together.
+        
+        Usage:
+            with registry.batch() as tx:
+                for agent in agents:
+                    tx.update_agent(agent)
+                tx.update_metadata_field("last_evaluation", now)
+        
+        The registry lock (in SQLite mode, an IMMEDIATE write transaction)
+        is held from the start of the block to the end of the commit, so
+        the batch reads and writes without other registry writers in
+        between; keep the block short.
+        
+        Each file is written through a temporary file and rename. When
+        several files change, their contents are first written to one
+        journal file, which is replayed if the commit is interrupted, so
+        readers never see half a batch after a crash. If the block raises,
+        nothing is written.
+        """
+        tx = RegistryTransaction(self)
+        if self._mode == "sqlite":
+            # Reads through tx use the same connection, inside the transaction
+            with self._sqlite.transaction() as conn:
+                yield tx
+                self._sqlite.put_agents([a for a in tx._rows.values() if a is not None], conn)
+                self._sqlite.delete_agents([i for i, a in tx._rows.items() if a is None], conn)
+                self._sqlite.put_documents(tx._documents, conn)
+            return
+        with self._registry_lock.hold():
+            self._replay_journal()
+            yield tx
+            self._commit(tx)
+    
+    def _commit(self, tx: RegistryTransaction):
+        files = tx.rendered_files()
+        if not files:
+            return
+        if len(files) == 1:
+            (path, content), = files.items()
+            _replace_file(path, content)
+        else:
+            journal = {
+                "files": [[os.path.relpath(path, self.base_path), content]
+                          for path, content in files.items()]
+            }
+            _replace_file(self.journal_file, json.dumps(journal), sync=True)
+            _fsync_dir(self.base_path)
+            self._write_journaled(files)
+        
+        for path, agent in tx._files.items():
+            if path.parent == self.agents_dir:
+                if agent is None:
+                    self._agent_cache.discard(path.stem)
+                else:
+                    self._agent_cache.store(path.stem, agent)
+    
+    def _replay_journal(self):
+        """Apply the writes of an interrupted batch commit (lock must be held)"""
+        try:
+            with open(self.journal_file, 'r') as f:
+                journal = json.load(f)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, IOError) as e:
+            # The journal is renamed into place only once complete, so an
+            # unreadable one was never committed
+            print(f"Warning: Discarding unreadable registry journal: {e}")
+            self.journal_file.unlink()
+            return
+        self._write_journaled({self.base_path / relative_path: content
+                               for relative_path, content in journal.get("files", [])})
+    
+    def _write_journaled(self, files: Dict[Path, Optional[str]]):
+        """Write the files of the journal durably, then drop the journal"""
+        for path, content in files.items():
+            _replace_file(path, content, sync=True)
+        for directory in {path.parent for path in files}:
+            _fsync_dir(directory)
+        self.journal_file.unlink()
+    
     def get_agent(self, agent_id: str) -> Optional[Dict[str, Any]]:
         """
         Get agent data by ID.
@@ -165,16 +694,10 @@ class RegistryManager:
         Returns:
             Agent data dict or None if not found
         """
-        if self._mode == "distributed":
-            agent_file = self.agents_dir / f"{agent_id}.json"
-            if not agent_file.exists():
-                return None
-            
-            try:
-                with open(agent_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return None
+        if self._mode == "sqlite":
+            return self._sqlite.get_agent(agent_id)
+        elif self._mode == "distributed":
+            return self._agent_cache.get(agent_id)
         else:
             # Legacy mode
             registry = self._read_legacy_registry()
@@ -183,34 +706,44 @@ class RegistryManager:
                     return agent
             return None
     
-    def list_agents(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+    def list_agents(self, status: Optional[str] = None, specialization: Optional[str] = None,
+                    sort_by_score: bool = False, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        List all agents, optionally filtered by status.
+        List all agents, optionally filtered by status and specialization.
         
         Args:
             status: Optional status filter ("active", "inactive", etc.)
+            specialization: Optional specialization filter
+            sort_by_score: Highest metrics.overall_score first (agents
+                without a score last) instead of file/registry order
+            limit: Maximum number of agents to return
             
         Returns:
             List of agent data dictionaries
         """
+        if self._mode == "sqlite":
+            # Filtering, ordering and the limit run on the database indexes
+            return self._sqlite.list_agents(status, specialization, sort_by_score, limit)
+        
         if self._mode == "distributed":
-            agents = []
-            for agent_file in sorted(self.agents_dir.glob("*.json")):
-                try:
-                    with open(agent_file, 'r') as f:
-                        agent = json.load(f)
-                        if status is None or agent.get("status") == status:
-                            agents.append(agent)
-                except (json.JSONDecodeError, IOError):
-                    continue
-            return agents
+            # Agents with another status are skipped without being parsed
+            # whenever their status is already known
+            agents = self._agent_cache.list(status)
         else:
             # Legacy mode
             registry = self._read_legacy_registry()
             agents = registry.get("agents", [])
             if status:
                 agents = [a for a in agents if a.get("status") == status]
-            return agents
+        
+        if specialization is not None:
+            agents = [a for a in agents if a.get("specialization") == specialization]
+        if sort_by_score:
+            scores = {id(a): agent_score(a) for a in agents}
+            agents = sorted(agents, key=lambda a: (scores[id(a)] is None, -(scores[id(a)] or 0.0)))
+        if limit is not None:
+            agents = agents[:limit]
+        return agents
     
     def update_agent(self, agent_data: Dict[str, Any]) -> bool:
         """
@@ -226,12 +759,20 @@ class RegistryManager:
         if not agent_id:
             raise ValueError("Agent data must include 'id' field")
         
-        if self._mode == "distributed":
+        if self._mode == "sqlite":
+            try:
+                self._sqlite.put_agents([agent_data])
+                return True
+            except sqlite3.Error as e:
+                print(f"Error updating agent {agent_id}: {e}")
+                return False
+        elif self._mode == "distributed":
             agent_file = self.agents_dir / f"{agent_id}.json"
             try:
-                with self._lock_file(agent_file):
+                with self._write_lock(agent_file):
                     with open(agent_file, 'w') as f:
                         json.dump(agent_data, f, indent=2)
+                    self._agent_cache.store(agent_id, agent_data)
                 return True
             except IOError as e:
                 print(f"Error updating agent {agent_id}: {e}")
@@ -239,7 +780,7 @@ class RegistryManager:
         else:
             # Legacy mode - update registry.json
             try:
-                with self._lock_file(self.legacy_registry_file):
+                with self._write_lock(self.legacy_registry_file):
                     registry = self._read_legacy_registry()
                     
                     # Find and update existing agent, or append new one
@@ -270,19 +811,26 @@ class RegistryManager:
         Returns:
             True if successful, False otherwise
         """
-        if self._mode == "distributed":
+        if self._mode == "sqlite":
+            try:
+                return self._sqlite.delete_agents([agent_id]) > 0
+            except sqlite3.Error:
+                return False
+        elif self._mode == "distributed":
             agent_file = self.agents_dir / f"{agent_id}.json"
-            if agent_file.exists():
-                try:
-                    agent_file.unlink()
-                    return True
-                except OSError:
-                    return False
-            return False
+            with self._write_lock(agent_file):
+                if agent_file.exists():
+                    try:
+                        agent_file.unlink()
+                        self._agent_cache.discard(agent_id)
+                        return True
+                    except OSError:
+                        return False
+                return False
         else:
             # Legacy mode
             try:
-                with self._lock_file(self.legacy_registry_file):
+                with self._write_lock(self.legacy_registry_file):
                     registry = self._read_legacy_registry()
                     original_count = len(registry["agents"])
                     registry["agents"] = [a for a in registry["agents"] if a.get("id") != agent_id]
@@ -297,7 +845,9 @@ class RegistryManager:
     
     def get_config(self) -> Dict[str, Any]:
         """Get registry configuration"""
-        if self._mode == "distributed":
+        if self._mode == "sqlite":
+            return self._sqlite.get_document("config", RegistryConfig().__dict__)
+        elif self._mode == "distributed":
             if self.config_file.exists():
                 try:
                     with open(self.config_file, 'r') as f:
@@ -312,9 +862,11 @@ class RegistryManager:
     
     def update_config(self, config_data: Dict[str, Any]) -> bool:
         """Update registry configuration"""
-        if self._mode == "distributed":
+        if self._mode == "sqlite":
+            return self._put_document("config", config_data)
+        elif self._mode == "distributed":
             try:
-                with self._lock_file(self.config_file):
+                with self._write_lock(self.config_file):
                     with open(self.config_file, 'w') as f:
                         json.dump(config_data, f, indent=2)
                 return True
@@ -322,7 +874,7 @@ class RegistryManager:
                 return False
         else:
             try:
-                with self._lock_file(self.legacy_registry_file):
+                with self._write_lock(self.legacy_registry_file):
                     registry = self._read_legacy_registry()
                     registry["config"] = config_data
                     with open(self.legacy_registry_file, 'w') as f:
@@ -333,6 +885,15 @@ class RegistryManager:
     
     def get_metadata(self) -> Dict[str, Any]:
         """Get registry metadata (version, last_spawn, last_evaluation, etc.)"""
+        if self._mode == "sqlite":
+            return self._sqlite.get_document("metadata", {
+                "version": "2.0.0",
+                "last_spawn": None,
+                "last_evaluation": None,
+                "system_lead": None,
+                "specializations_note": "Specializations are dynamically loaded from .github/agents/ directory"
+            })
+        
         # If metadata is in distributed mode, read from individual files
         # This works regardless of whether agents are in distributed or legacy mode
         if self._metadata_mode == "distributed":
@@ -387,25 +948,28 @@ class RegistryManager:
     
     def update_metadata(self, metadata: Dict[str, Any]) -> bool:
         """Update registry metadata"""
-        if self._mode == "distributed":
+        if self._mode == "sqlite":
+            return self._put_document("metadata", metadata)
+        elif self._mode == "distributed":
             if self._metadata_mode == "distributed":
                 # Write to individual files in metadata directory
                 try:
-                    for field, value in metadata.items():
-                        field_file = self.metadata_dir / f"{field}.txt"
-                        with open(field_file, 'w') as f:
-                            # Write value as string, handling None
-                            if value is None:
-                                f.write("null")
-                            else:
-                                f.write(str(value))
+                    with self._write_lock():
+                        for field, value in metadata.items():
+                            field_file = self.metadata_dir / f"{field}.txt"
+                            with open(field_file, 'w') as f:
+                                # Write value as string, handling None
+                                if value is None:
+                                    f.write("null")
+                                else:
+                                    f.write(str(value))
                     return True
                 except IOError:
                     return False
             else:
                 # Write to single metadata.json file
                 try:
-                    with self._lock_file(self.metadata_file):
+                    with self._write_lock(self.metadata_file):
                         with open(self.metadata_file, 'w') as f:
                             json.dump(metadata, f, indent=2)
                     return True
@@ -413,7 +977,7 @@ class RegistryManager:
                     return False
         else:
             try:
-                with self._lock_file(self.legacy_registry_file):
+                with self._write_lock(self.legacy_registry_file):
                     registry = self._read_legacy_registry()
                     registry.update(metadata)
                     with open(self.legacy_registry_file, 'w') as f:
@@ -436,27 +1000,48 @@ class RegistryManager:
         """
         # If metadata is in distributed mode, update the individual file directly
         # This works regardless of whether agents are in distributed or legacy mode
-        if self._metadata_mode == "distributed":
+        if self._mode == "sqlite":
+            try:
+                with self._sqlite.transaction() as conn:
+                    metadata = self.get_metadata()
+                    metadata[field] = value
+                    self._sqlite.put_documents({"metadata": metadata}, conn)
+                return True
+            except sqlite3.Error:
+                return False
+        elif self._metadata_mode == "distributed":
             # Atomic update of individual field file
             field_file = self.metadata_dir / f"{field}.txt"
             try:
-                with open(field_file, 'w') as f:
-                    if value is None:
-                        f.write("null")
-                    else:
-                        f.write(str(value))
+                with self._write_lock():
+                    with open(field_file, 'w') as f:
+                        if value is None:
+                            f.write("null")
+                        else:
+                            f.write(str(value))
                 return True
             except IOError:
                 return False
         else:
             # Fall back to full metadata update
-            metadata = self.get_metadata()
-            metadata[field] = value
-            return self.update_metadata(metadata)
+            with self._write_lock():
+                metadata = self.get_metadata()
+                metadata[field] = value
+                return self.update_metadata(metadata)
+    
+    def _put_document(self, name: str, value: Any) -> bool:
+        """Store config, metadata or hall of fame in SQLite mode"""
+        try:
+            self._sqlite.put_documents({name: value})
+            return True
+        except sqlite3.Error:
+            return False
     
     def get_hall_of_fame(self) -> List[Dict[str, Any]]:
         """Get hall of fame entries"""
-        if self._mode == "distributed":
+        if self._mode == "sqlite":
+            return self._sqlite.get_document("hall_of_fame", [])
+        elif self._mode == "distributed":
             if self.hall_of_fame_file.exists():
                 try:
                     with open(self.hall_of_fame_file, 'r') as f:
@@ -471,9 +1056,11 @@ class RegistryManager:
     
     def update_hall_of_fame(self, hall_of_fame: List[Dict[str, Any]]) -> bool:
         """Update hall of fame entries"""
-        if self._mode == "distributed":
+        if self._mode == "sqlite":
+            return self._put_document("hall_of_fame", hall_of_fame)
+        elif self._mode == "distributed":
             try:
-                with self._lock_file(self.hall_of_fame_file):
+                with self._write_lock(self.hall_of_fame_file):
                     with open(self.hall_of_fame_file, 'w') as f:
                         json.dump(hall_of_fame, f, indent=2)
                 return True
@@ -481,7 +1068,7 @@ class RegistryManager:
                 return False
         else:
             try:
-                with self._lock_file(self.legacy_registry_file):
+                with self._write_lock(self.legacy_registry_file):
                     registry = self._read_legacy_registry()
                     registry["hall_of_fame"] = hall_of_fame
                     with open(self.legacy_registry_file, 'w') as f:
@@ -500,6 +1087,8 @@ class RegistryManager:
         if self._mode == "distributed":
             print("Already in distributed mode")
             return True
+        if self._mode == "sqlite":
+            return self.export_from_sqlite("distributed")
         
         print("Migrating from legacy to distributed format...")
         
@@ -606,6 +1195,111 @@ class RegistryManager:
             print(f"Metadata migration failed: {e}")
             return False
     
+    def migrate_to_sqlite(self) -> bool:
+        """
+        Import the current legacy or distributed registry into a SQLite
+        database, which then becomes the registry.
+        
+        The JSON files are left in place; export_from_sqlite writes the
+        database back to them.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if self._mode == "sqlite":
+            print("Already in SQLite mode")
+            return True
+        
+        print(f"Migrating from {self._mode} format to SQLite...")
+        
+        tmp_db = self.db_file.with_name(f".{self.db_file.name}.tmp")
+        try:
+            agents = self.list_agents()
+            documents = {
+                "config": self.get_config(),
+                "metadata": self.get_metadata(),
+                "hall_of_fame": self.get_hall_of_fame(),
+            }
+            
+            # Build the database under a temporary name so an interrupted
+            # import never switches the registry to a partial database
+            tmp_db.unlink(missing_ok=True)
+            database = SQLiteRegistry(tmp_db)
+            database.import_registry(agents, documents)
+            database.close()
+            os.replace(tmp_db, self.db_file)
+            print(f"Imported {len(agents)} agents into {self.db_file.name}")
+            
+            self._sqlite = SQLiteRegistry(self.db_file)
+            self._mode = "sqlite"
+            
+            print("Migration completed successfully!")
+            print(f"The JSON registry files are no longer read while {self.db_file.name} exists")
+            return True
+        
+        except Exception as e:
+            tmp_db.unlink(missing_ok=True)
+            print(f"Migration failed: {e}")
+            return False
+    
+    def export_from_sqlite(self, target_mode: str = "distributed") -> bool:
+        """
+        Export the SQLite registry to the legacy or distributed JSON layout
+        and switch back to it.
+        
+        Agents missing from the database are removed from the JSON layout.
+        The database is kept as registry.db.backup.
+        
+        Args:
+            target_mode: "distributed" or "legacy"
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if self._mode != "sqlite":
+            print("Not in SQLite mode")
+            return False
+        if target_mode not in ("distributed", "legacy"):
+            raise ValueError(f"Unknown registry mode '{target_mode}'")
+        
+        print(f"Exporting SQLite registry to {target_mode} format...")
+        
+        database = self._sqlite
+        try:
+            agents, documents = database.export_registry()
+            
+            # Write through the JSON backend as one batch
+            self._mode = target_mode
+            self._sqlite = None
+            with self.batch() as tx:
+                exported = {agent["id"] for agent in agents}
+                for agent in self.list_agents():
+                    if agent.get("id") not in exported:
+                        tx.delete_agent(agent["id"])
+                for agent in agents:
+                    tx.update_agent(agent)
+                if "config" in documents:
+                    tx.update_config(documents["config"])
+                if "hall_of_fame" in documents:
+                    tx.update_hall_of_fame(documents["hall_of_fame"])
+                if "metadata" in documents:
+                    tx.update_metadata(documents["metadata"])
+            print(f"Exported {len(agents)} agents")
+            
+            database.close()
+            backup_file = self.db_file.with_suffix('.db.backup')
+            os.replace(self.db_file, backup_file)
+            
+            print("Export completed successfully!")
+            print(f"Backup of the database: {backup_file}")
+            return True
+        
+        except Exception as e:
+            self._mode = "sqlite"
+            self._sqlite = database
+            print(f"Export failed: {e}")
+            return False
+    
     def get_mode(self) -> str:
         """Get current registry mode"""
         return self._mode
@@ -616,10 +1310,16 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Agent Registry Manager")
-    parser.add_argument("command", choices=["migrate", "migrate-metadata", "list", "get", "mode"],
+    parser.add_argument("command", choices=["migrate", "migrate-metadata", "migrate-sqlite", "export-sqlite",
+                                            "list", "get", "mode"],
                        help="Command to execute")
     parser.add_argument("--agent-id", help="Agent ID (for 'get' command)")
     parser.add_argument("--status", help="Filter agents by status")
+    parser.add_argument("--specialization", help="Filter agents by specialization")
+    parser.add_argument("--by-score", action="store_true", help="Sort agents by overall score")
+    parser.add_argument("--limit", type=int, help="Maximum number of agents to list")
+    parser.add_argument("--target", choices=["distributed", "legacy"], default="distributed",
+                       help="Format to export to (for 'export-sqlite' command)")
     
     args = parser.parse_args()
     
@@ -633,8 +1333,17 @@ def main():
         success = registry.migrate_metadata_to_distributed()
         sys.exit(0 if success else 1)
     
+    elif args.command == "migrate-sqlite":
+        success = registry.migrate_to_sqlite()
+        sys.exit(0 if success else 1)
+    
+    elif args.command == "export-sqlite":
+        success = registry.export_from_sqlite(args.target)
+        sys.exit(0 if success else 1)
+    
     elif args.command == "list":
-        agents = registry.list_agents(status=args.status)
+        agents = registry.list_agents(status=args.status, specialization=args.specialization,
+                                      sort_by_score=args.by_score, limit=args.limit)
         print(json.dumps(agents, indent=2))
     
     elif args.command == "get":
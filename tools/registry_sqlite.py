@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+SQLite Registry Backend - Indexed agent registry storage
+
+Storage for RegistryManager's "sqlite" mode: one local database file
+instead of registry.json or one JSON file per agent.
+
+- agents: one row per agent with the full agent JSON, plus status,
+  specialization and overall score columns indexed for filtered and
+  sorted queries ("active agents with specialization X by score")
+- documents: config, metadata and hall of fame as JSON values
+
+Agent JSON is stored as written; the indexed columns are derived from it
+on every write, so they never disagree with the agent data.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agents (
+    id TEXT PRIMARY KEY,
+    status TEXT,
+    specialization TEXT,
+    score REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS agents_status ON agents (status, specialization, score);
+CREATE INDEX IF NOT EXISTS agents_specialization ON agents (specialization, score);
+CREATE INDEX IF NOT EXISTS agents_score ON agents (score);
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+
+def agent_score(agent: Dict[str, Any]) -> Optional[float]:
+    """Overall score used to rank agents (metrics.overall_score)"""
+    metrics = agent.get("metrics")
+    score = metrics.get("overall_score") if isinstance(metrics, dict) else None
+    return float(score) if isinstance(score, (int, float)) else None
+
+
+def _row(agent: Dict[str, Any]) -> Tuple[str, Optional[str], Optional[str], Optional[float], str]:
+    return (
+        agent["id"],
+        agent.get("status"),
+        agent.get("specialization"),
+        agent_score(agent),
+        json.dumps(agent),
+    )
+
+
+class SQLiteRegistry:
+    """Agents and registry documents in a SQLite database"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise ValueError(f"Registry database {self.db_path} has newer schema version {version}")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """One write transaction; rolled back if the block raises"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+
+    # === Agents ===
+
+    def get_agent(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM agents WHERE id = ?", (agent_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_agents(self, status: Optional[str] = None, specialization: Optional[str] = None,
+                    sort_by_score: bool = False, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Agents matching the filters, by id or by descending score (agents
+        without a score last). Filters and ordering use the indexes.
+        """
+        conditions = []
+        params: List[Any] = []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if specialization is not None:
+            conditions.append("specialization = ?")
+            params.append(specialization)
+
+        sql = "SELECT data FROM agents"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY score IS NULL, score DESC, id" if sort_by_score else " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def put_agents(self, agents: Iterable[Dict[str, Any]], conn: Optional[sqlite3.Connection] = None):
+        """Insert or replace agents (inside `conn`'s transaction when given)"""
+        rows = [_row(agent) for agent in agents]
+        if conn is not None:
+            conn.executemany("INSERT OR REPLACE INTO agents VALUES (?, ?, ?, ?, ?)", rows)
+            return
+        with self.transaction() as conn:
+            conn.executemany("INSERT OR REPLACE INTO agents VALUES (?, ?, ?, ?, ?)", rows)
+
+    def delete_agents(self, agent_ids: Iterable[str], conn: Optional[sqlite3.Connection] = None) -> int:
+        """Delete agents; returns how many existed"""
+        ids = [(agent_id,) for agent_id in agent_ids]
+        if conn is not None:
+            return conn.executemany("DELETE FROM agents WHERE id = ?", ids).rowcount
+        with self.transaction() as conn:
+            return conn.executemany("DELETE FROM agents WHERE id = ?", ids).rowcount
+
+    # === Documents ===
+
+    def get_document(self, name: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM documents WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def put_documents(self, documents: Dict[str, Any], conn: Optional[sqlite3.Connection] = None):
+        rows = [(name, json.dumps(value)) for name, value in documents.items()]
+        if conn is not None:
+            conn.executemany("INSERT OR REPLACE INTO documents VALUES (?, ?)", rows)
+            return
+        with self.transaction() as conn:
+            conn.executemany("INSERT OR REPLACE INTO documents VALUES (?, ?)", rows)
+
+    # === Import / export ===
+
+    def import_registry(self, agents: List[Dict[str, Any]], documents: Dict[str, Any]):
+        """Replace the whole database contents in one transaction"""
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM agents")
+            conn.execute("DELETE FROM documents")
+            self.put_agents(agents, conn)
+            self.put_documents(documents, conn)
+
+    def export_registry(self) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """All agents (by id) and documents"""
+        with self._lock:
+            rows = self._conn.execute("SELECT name, data FROM documents").fetchall()
+        return self.list_agents(), {name: json.loads(data) for name, data in rows}
@@ -13,6 +13,7 @@ import os
 import re
 import subprocess
 import sys
+import threading
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -20,6 +21,15 @@ from typing import Dict, List, Any, Optional, Set, Tuple
 from hashlib import md5
 
 
+# Version of the on-disk commit cache; bump when the stored fields change
+COMMIT_CACHE_VERSION = 1
+
+# Field and record separators for streamed git log output
+_FIELD_SEP = '\x1f'
+_RECORD_SEP = '\x1e'
+_LOG_FORMAT = _RECORD_SEP + _FIELD_SEP.join(['%H', '%an', '%ae', '%s', '%cd'])
+
+
 # System actors to exclude from diversity analysis
 # These are automation bots and human maintainers that should be excluded from AI agent diversity analysis
 EXCLUDED_ACTORS = [
@@ -53,8 +63,12 @@ class ASTHasher(ast.NodeVisitor):
 class RepetitionDetector:
     """Detects repetitive patterns in AI agent contributions"""
     
-    def __init__(self, repo_dir: str, since_days: int = 30):
+    def __init__(self, repo_dir: str, since_days: int = 30, cache_path: Optional[str] = None,
+                 use_cache: bool = True):
         self.repo_dir = Path(repo_dir)
+        self.cache_path = (Path(cache_path) if cache_path
+                           else self.repo_dir / '.cache' / 'repetition-detector' / 'commits.json')
+        self.use_cache = use_cache
         self.since_days = since_days
         self.since_date = datetime.now(timezone.utc) - timedelta(days=since_days)
         self.contributions = defaultdict(list)
@@ -95,32 +109,142 @@ class RepetitionDetector:
             
         return None
     
+    def _load_commit_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load parsed commits from the on-disk cache, keyed by commit hash"""
+        if not self.use_cache or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Ignoring unreadable commit cache {self.cache_path}: {e}", file=sys.stderr)
+            return {}
+        if data.get('version') != COMMIT_CACHE_VERSION:
+            return {}
+        return data.get('commits', {})
+    
+    def _save_commit_cache(self, commits: Dict[str, Dict[str, Any]]):
+        """Write parsed commits to the on-disk cache atomically"""
+        if not self.use_cache:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(self.cache_path.suffix + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'version': COMMIT_CACHE_VERSION,
+                    'commits': commits
+                }, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not write commit cache {self.cache_path}: {e}", file=sys.stderr)
+    
+    def _stream_commits(self, commit_hashes: List[str]):
+        """
+        Parse commits and their changed files from one streamed git log.
+        
+        The hashes are fed to a single `git log --stdin --no-walk` process and
+        its output is parsed line by line, so memory stays proportional to one
+        commit and no per-commit subprocess is spawned.
+        
+        Yields:
+            (commit_hash, record) pairs in the order git reports them
+        """
+        if not commit_hashes:
+            return
+        
+        proc = subprocess.Popen(
+            [
+                'git', '-C', str(self.repo_dir),
+                'log', '--stdin', '--no-walk=unsorted',
+                '--name-only', '--no-renames',
+                f'--pretty=format:{_LOG_FORMAT}', '--date=iso'
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        
+        # Feed hashes from a thread so a full stdout pipe cannot deadlock us
+        def feed():
+            try:
+                proc.stdin.write('\n'.join(commit_hashes) + '\n')
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        
+        current = None
+        for line in proc.stdout:
+            line = line.rstrip('\n')
+            if line.startswith(_RECORD_SEP):
+                if current:
+                    yield current
+                parts = line[1:].split(_FIELD_SEP)
+                if len(parts) != 5:
+                    current = None
+                    continue
+                commit_hash, author_name, author_email, message, date = parts
+                current = (commit_hash, {
+                    'author_name': author_name,
+                    'author_email': author_email,
+                    'message': message,
+                    'date': date,
+                    'files': []
+                })
+            elif line and current:
+                current[1]['files'].append(line)
+        if current:
+            yield current
+        
+        feeder.join()
+        stderr = proc.stderr.read()
+        if proc.wait() != 0:
+            print(f"Git command failed: {stderr.strip()}", file=sys.stderr)
+    
     def collect_contributions(self):
         """Collect all AI agent contributions from git history"""
-        # Get all commits since the specified date
+        # List commits since the specified date (cheap: no diffs are computed)
         since_str = self.since_date.strftime('%Y-%m-%d')
-        log_output = self._run_git_command([
-            'log',
+        rev_output = self._run_git_command([
+            'rev-list',
             '--all',
-            '--pretty=format:%H|%an|%ae|%s|%cd',
-            '--date=iso',
             f'--since={since_str}'
         ])
         
-        if not log_output:
+        if not rev_output:
             print("No commits found in the specified time range", file=sys.stderr)
             return
         
-        for line in log_output.split('\n'):
-            if not line:
-                continue
-                
-            parts = line.split('|')
-            if len(parts) < 5:
+        commit_hashes = [h for h in rev_output.split('\n') if h]
+        
+        # Only commits missing from the cache are read from git; commits that
+        # left the window (or are no longer reachable) are dropped from it
+        cache = self._load_commit_cache()
+        listed = set(commit_hashes)
+        stale = [h for h in cache if h not in listed]
+        for commit_hash in stale:
+            del cache[commit_hash]
+        missing = [h for h in commit_hashes if h not in cache]
+        for commit_hash, record in self._stream_commits(missing):
+            cache[commit_hash] = record
+        
+        if missing or stale:
+            self._save_commit_cache(cache)
+        print(f"Ingested {len(missing)} new commits ({len(commit_hashes) - len(missing)} cached)",
+              file=sys.stderr)
+        
+        for commit_hash in commit_hashes:
+            record = cache.get(commit_hash)
+            if record is None:
                 continue
-                
-            commit_hash, author_name, author_email, message, date = parts
-            agent_id = self._extract_agent_id(author_email, author_name)
+            
+            author_name = record['author_name']
+            message = record['message']
+            agent_id = self._extract_agent_id(record['author_email'], author_name)
             
             if not agent_id:
                 continue  # Skip human contributors
@@ -129,23 +253,14 @@ class RepetitionDetector:
             if agent_id in EXCLUDED_ACTORS:
                 continue
             
-            # Get files changed in this commit
-            files_output = self._run_git_command([
-                'diff-tree',
-                '--no-commit-id',
-                '--name-only',
-                '-r',
-                commit_hash
-            ])
-            
-            files = files_output.split('\n') if files_output else []
+            files = record['files']
             
             contribution = {
                 'commit_hash': commit_hash,
                 'agent_id': agent_id,
                 'author_name': author_name,
                 'message': message,
-                'date': date,
+                'date': record['date'],
                 'files': files
             }
             
@@ -438,11 +553,21 @@ def main():
         '-o', '--output',
         help='Output file for JSON report (default: stdout)'
     )
+    parser.add_argument(
+        '--cache',
+        help='Commit cache file (default: <directory>/.cache/repetition-detector/commits.json)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Read every commit from git without using the commit cache'
+    )
     
     args = parser.parse_args()
     
     # Initialize detector
-    detector = RepetitionDetector(args.directory, args.since_days)
+    detector = RepetitionDetector(args.directory, args.since_days,
+                                  cache_path=args.cache, use_cache=not args.no_cache)
     
     # Collect and analyze contributions
     print("Collecting contributions...", file=sys.stderr)
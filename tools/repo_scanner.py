@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Shared Repository Scan Driver
+Author: @engineer-master
+
+One file discovery and per-file analysis driver used by the knowledge graph
+builder, the code analyzer, the readability scorer and the unsupervised
+pattern learner, so every scanner sees the same files.
+
+Features:
+- Shared ignore rules (VCS metadata, virtual environments, build output,
+  tool caches) and deterministic, sorted file discovery
+- Per-file analysis fanned out to a process pool with --jobs N
+- Results merged in discovery order, so output does not depend on N
+- Per-file exceptions captured instead of aborting the scan
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+# Directory names skipped at any depth by every scanner
+IGNORED_DIRS = frozenset({
+    '.git', '.hg', '.svn',
+    '.venv', 'venv',
+    'node_modules', '__pycache__',
+    'build', 'dist', '.eggs',
+    '.tox', '.nox', '.cache',
+    '.mypy_cache', '.pytest_cache', '.ruff_cache',
+})
+
+# Files per worker task; small enough to balance uneven file sizes
+DEFAULT_CHUNKSIZE = 8
+
+# Analysis callable for forked workers (inherited, so it is never pickled)
+_worker_analyze: Optional[Callable[[str], Any]] = None
+
+
+@dataclass
+class ScanResult:
+    """Outcome of analyzing one file"""
+    path: str
+    value: Any = None
+    error: Optional[str] = None
+
+
+def is_ignored_dir(name: str) -> bool:
+    """Check whether a directory name is excluded from scans."""
+    return name in IGNORED_DIRS or name.endswith('.egg-info')
+
+
+def discover_files(
+    directory: str,
+    extensions: Iterable[str] = ('.py',),
+    recursive: bool = True
+) -> List[str]:
+    """
+    Find files to scan under a directory.
+
+    Args:
+        directory: Directory to search
+        extensions: File name suffixes to include
+        recursive: Descend into subdirectories
+
+    Returns:
+        Paths joined onto directory, in sorted walk order
+    """
+    extensions = tuple(extensions)
+    found = []
+
+    if not recursive:
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if name.endswith(extensions) and os.path.isfile(path):
+                found.append(path)
+        return found
+
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not is_ignored_dir(d))
+        for name in sorted(files):
+            if name.endswith(extensions):
+                found.append(os.path.join(root, name))
+    return found
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """Turn a --jobs value into a worker count (0 or None means all CPUs)."""
+    if not jobs or jobs < 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def _analyze_one(analyze: Callable[[str], Any], path: str) -> ScanResult:
+    try:
+        return ScanResult(path, analyze(path))
+    except Exception as e:
+        return ScanResult(path, error=str(e))
+
+
+def _run_forked(path: str) -> ScanResult:
+    return _analyze_one(_worker_analyze, path)
+
+
+def scan_files(
+    paths: Sequence[str],
+    analyze: Callable[[str], Any],
+    jobs: int = 1,
+    chunksize: int = DEFAULT_CHUNKSIZE
+) -> List[ScanResult]:
+    """
+    Run a per-file analysis over many files.
+
+    With jobs > 1 the files are spread over a process pool. Where the fork
+    start method exists, workers inherit analyze from the parent, so bound
+    methods of objects holding large state are never pickled; otherwise
+    analyze must be picklable.
+
+    Args:
+        paths: Files to analyze
+        analyze: Callable taking a path and returning a picklable result
+        jobs: Worker processes (1 runs in this process, 0 uses all CPUs)
+        chunksize: Files handed to a worker at a time
+
+    Returns:
+        One ScanResult per path, in the order of paths
+    """
+    jobs = resolve_jobs(jobs)
+    if jobs == 1 or len(paths) < 2:
+        return [_analyze_one(analyze, path) for path in paths]
+
+    global _worker_analyze
+    workers = min(jobs, len(paths))
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        _worker_analyze = analyze
+        try:
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork')) as pool:
+                return list(pool.map(_run_forked, paths, chunksize=chunksize))
+        finally:
+            _worker_analyze = None
+
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(_analyze_one, [analyze] * len(paths), paths, chunksize=chunksize))
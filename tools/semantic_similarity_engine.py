@@ -8,6 +8,8 @@ Built with meticulous attention to correctness and performance.
 Inspired by Margaret Hamilton's systematic approach to engineering.
 """
 
+import hashlib
+import heapq
 import json
 import math
 import re
@@ -66,8 +68,15 @@ class SemanticSimilarityEngine:
     - Cosine similarity for document comparison
     - Stop word filtering
     - Stemming-like normalization
+    - Inverted postings index with precomputed L2 norms, so a query only
+      touches documents that share at least one term with it
+    - Persisted index snapshot next to the history file, so loading does
+      not re-tokenize every record
     """
     
+    # Bump whenever the snapshot layout or weighting scheme changes
+    INDEX_VERSION = 1
+    
     # Common stop words to filter out
     STOP_WORDS = {
         'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
@@ -76,21 +85,38 @@ class SemanticSimilarityEngine:
         'what', 'when', 'where', 'who', 'which', 'why', 'how'
     }
     
-    def __init__(self, history_path: str = '.github/agent-system/issue_history.json'):
+    def __init__(
+        self,
+        history_path: str = '.github/agent-system/issue_history.json',
+        index_path: Optional[str] = None
+    ):
         """
         Initialize the semantic similarity engine.
         
         Args:
             history_path: Path to issue history JSON file
+            index_path: Path to the index snapshot (defaults to
+                <history stem>.index.json next to the history file)
         """
         self.history_path = Path(history_path)
+        if index_path is None:
+            self.index_path = self.history_path.with_name(f"{self.history_path.stem}.index.json")
+        else:
+            self.index_path = Path(index_path)
         self.issue_records: List[IssueRecord] = []
-        self.document_terms: List[Set[str]] = []
-        self.idf_scores: Dict[str, float] = {}
-        self.tfidf_vectors: List[Dict[str, float]] = []
+        # Max-normalized term frequencies; independent of corpus size
+        self.tf_vectors: List[Dict[str, float]] = []
+        self.doc_freq: Dict[str, int] = {}
+        # Inverted index: term -> [(doc_id, tf), ...] in doc_id order
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        self.doc_norms: List[float] = []
+        self._norms_stale = False
+        self._history_fingerprint: Optional[str] = None
         
         self._load_history()
-        self._build_index()
+        if self.issue_records and not self._load_index_snapshot():
+            self._build_index()
+            self._write_index_snapshot()
     
     def _load_history(self):
         """Load issue history from JSON file."""
@@ -100,8 +126,9 @@ class SemanticSimilarityEngine:
             return
         
         try:
-            with open(self.history_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            raw = self.history_path.read_bytes()
+            self._history_fingerprint = hashlib.sha256(raw).hexdigest()
+            data = json.loads(raw.decode('utf-8'))
                 
             # Validate structure
             if not isinstance(data, dict) or 'issues' not in data:
@@ -172,29 +199,42 @@ class SemanticSimilarityEngine:
         
         return tf
     
-    def _calculate_idf(self):
-        """
-        Calculate inverse document frequency for all terms.
-        
-        IDF(term) = log(N / df(term))
-        where N is total documents and df is document frequency
+    def _idf(self, term: str) -> float:
         """
-        if not self.document_terms:
-            return
+        Calculate inverse document frequency for a term.
         
-        n_documents = len(self.document_terms)
+        IDF(term) = log(N / (df(term) + 1))
+        where N is total documents and df is document frequency.
+        Unknown terms score 0.
         
-        # Count document frequency for each term
-        doc_freq = defaultdict(int)
-        for doc_terms in self.document_terms:
-            for term in doc_terms:
-                doc_freq[term] += 1
-        
-        # Calculate IDF
-        self.idf_scores = {}
-        for term, df in doc_freq.items():
-            # Add 1 to avoid division by zero
-            self.idf_scores[term] = math.log(n_documents / (df + 1))
+        Args:
+            term: Term to score
+            
+        Returns:
+            IDF score
+        """
+        df = self.doc_freq.get(term)
+        if not df:
+            return 0.0
+        # Add 1 to avoid division by zero
+        return math.log(len(self.tf_vectors) / (df + 1))
+    
+    @property
+    def idf_scores(self) -> Dict[str, float]:
+        """IDF scores for every indexed term."""
+        return {term: self._idf(term) for term in self.doc_freq}
+    
+    @property
+    def tfidf_vectors(self) -> List[Dict[str, float]]:
+        """TF-IDF vectors for every indexed document."""
+        idf = self.idf_scores
+        return [{term: tf * idf[term] for term, tf in vector.items()}
+                for vector in self.tf_vectors]
+    
+    @property
+    def document_terms(self) -> List[Set[str]]:
+        """Distinct terms of every indexed document."""
+        return [set(vector) for vector in self.tf_vectors]
     
     def _calculate_tfidf_vector(self, tokens: List[str]) -> Dict[str, float]:
         """
@@ -210,7 +250,7 @@ class SemanticSimilarityEngine:
         
         tfidf = {}
         for term, tf_score in tf.items():
-            idf_score = self.idf_scores.get(term, 0)
+            idf_score = self._idf(term)
             tfidf[term] = tf_score * idf_score
         
         return tfidf
@@ -251,31 +291,149 @@ class SemanticSimilarityEngine:
         # Ensure result is in [0, 1]
         return max(0.0, min(1.0, similarity))
     
+    @staticmethod
+    def _vector_norm(vector: Dict[str, float]) -> float:
+        """
+        Calculate the L2 norm of a TF-IDF vector.
+        
+        Args:
+            vector: TF-IDF vector
+            
+        Returns:
+            Euclidean magnitude of the vector
+        """
+        return math.sqrt(sum(score ** 2 for score in vector.values()))
+    
+    def _index_document(self, tf_vector: Dict[str, float]):
+        """
+        Append one document's term frequencies to df counts and postings.
+        
+        Args:
+            tf_vector: Max-normalized term frequencies of the document
+        """
+        doc_id = len(self.tf_vectors)
+        self.tf_vectors.append(tf_vector)
+        for term, tf in tf_vector.items():
+            self.doc_freq[term] = self.doc_freq.get(term, 0) + 1
+            self.postings.setdefault(term, []).append((doc_id, tf))
+        # Every IDF depends on the corpus size, so norms must be recomputed
+        self._norms_stale = True
+    
+    def _compute_norms(self):
+        """Recompute the L2 norm of every TF-IDF document vector."""
+        idf = self.idf_scores
+        self.doc_norms = [
+            math.sqrt(sum((tf * idf[term]) ** 2 for term, tf in vector.items()))
+            for vector in self.tf_vectors
+        ]
+        self._norms_stale = False
+    
+    def _ensure_norms(self):
+        """Refresh document norms if documents were added since they were computed."""
+        if self._norms_stale:
+            self._compute_norms()
+    
+    def _score_candidates(self, query_vector: Dict[str, float]) -> Dict[int, float]:
+        """
+        Accumulate dot products for every document sharing a term with the query.
+        
+        Args:
+            query_vector: TF-IDF vector of the query
+            
+        Returns:
+            Dictionary mapping document ids to their dot product with the query
+        """
+        dot_products: Dict[int, float] = defaultdict(float)
+        for term, query_weight in query_vector.items():
+            idf = self._idf(term)
+            for doc_id, doc_tf in self.postings.get(term, ()):
+                dot_products[doc_id] += query_weight * (doc_tf * idf)
+        return dot_products
+    
+    @staticmethod
+    def _document_text(issue: IssueRecord) -> str:
+        """Combine title, body, and solution for comprehensive matching."""
+        return f"{issue.title} {issue.body} {issue.solution_summary}"
+    
     def _build_index(self):
         """Build TF-IDF index for all historical issues."""
+        self.tf_vectors = []
+        self.doc_freq = {}
+        self.postings = {}
+        self.doc_norms = []
+        
         if not self.issue_records:
             return
         
-        # Tokenize all documents
-        self.document_terms = []
+        # Tokenize each document exactly once
         for issue in self.issue_records:
-            # Combine title, body, and solution for comprehensive matching
-            combined_text = f"{issue.title} {issue.body} {issue.solution_summary}"
-            tokens = self._tokenize(combined_text)
-            self.document_terms.append(set(tokens))
+            tokens = self._tokenize(self._document_text(issue))
+            self._index_document(self._calculate_term_frequency(tokens))
         
-        # Calculate IDF scores
-        self._calculate_idf()
+        self._compute_norms()
         
-        # Calculate TF-IDF vectors for all documents
-        self.tfidf_vectors = []
-        for issue in self.issue_records:
-            combined_text = f"{issue.title} {issue.body} {issue.solution_summary}"
-            tokens = self._tokenize(combined_text)
-            tfidf_vector = self._calculate_tfidf_vector(tokens)
-            self.tfidf_vectors.append(tfidf_vector)
+        print(f"Built index for {len(self.tf_vectors)} documents")
+    
+    def _load_index_snapshot(self) -> bool:
+        """
+        Load the persisted index snapshot if it matches the loaded history.
+        
+        Returns:
+            True if the snapshot was loaded, False if it is missing or stale
+        """
+        if not self.index_path.exists():
+            return False
+        
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable index snapshot: {e}")
+            return False
+        
+        if not isinstance(snapshot, dict):
+            return False
+        tf_vectors = snapshot.get('tf_vectors')
+        doc_norms = snapshot.get('doc_norms')
+        if (snapshot.get('version') != self.INDEX_VERSION
+                or snapshot.get('history_sha256') != self._history_fingerprint
+                or not isinstance(tf_vectors, list)
+                or not isinstance(doc_norms, list)
+                or len(tf_vectors) != len(self.issue_records)
+                or len(doc_norms) != len(self.issue_records)):
+            return False
+        
+        self.tf_vectors = []
+        self.doc_freq = {}
+        self.postings = {}
+        for tf_vector in tf_vectors:
+            self._index_document(tf_vector)
+        self.doc_norms = doc_norms
+        self._norms_stale = False
+        return True
+    
+    def _write_index_snapshot(self):
+        """Persist document frequencies, TF vectors and norms next to the history."""
+        if self._history_fingerprint is None:
+            return
+        
+        self._ensure_norms()
+        snapshot = {
+            'version': self.INDEX_VERSION,
+            'history_sha256': self._history_fingerprint,
+            'total_documents': len(self.tf_vectors),
+            'doc_freq': self.doc_freq,
+            'tf_vectors': self.tf_vectors,
+            'doc_norms': self.doc_norms
+        }
         
-        print(f"Built index for {len(self.tfidf_vectors)} documents")
+        try:
+            tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, separators=(',', ':'))
+            tmp_path.replace(self.index_path)
+        except OSError as e:
+            print(f"Could not write index snapshot: {e}")
     
     def find_similar_issues(
         self, 
@@ -308,34 +466,55 @@ class SemanticSimilarityEngine:
         
         # Calculate TF-IDF vector for query
         query_vector = self._calculate_tfidf_vector(query_tokens)
+        self._ensure_norms()
+        
+        query_norm = self._vector_norm(query_vector)
+        
+        # Only documents sharing a term with the query can score above zero
+        dot_products = self._score_candidates(query_vector)
+        if min_similarity <= 0:
+            # A zero threshold admits non-overlapping documents as well
+            candidate_ids = range(len(self.issue_records))
+        else:
+            candidate_ids = sorted(dot_products)
+        
+        scored = []
+        for doc_id in candidate_ids:
+            doc_norm = self.doc_norms[doc_id]
+            if doc_id not in dot_products or query_norm == 0 or doc_norm == 0:
+                similarity = 0.0
+            else:
+                similarity = dot_products[doc_id] / (query_norm * doc_norm)
+                similarity = max(0.0, min(1.0, similarity))
+            
+            if similarity >= min_similarity:
+                scored.append((doc_id, similarity))
+        
+        # Bounded heap keeps the top_k; ties keep document order like a stable sort
+        top_scored = heapq.nlargest(max(top_k, 0), scored, key=lambda item: item[1])
         
-        # Calculate similarity with all documents
         similarities = []
-        for i, (issue, doc_vector) in enumerate(zip(self.issue_records, self.tfidf_vectors)):
-            similarity = self._cosine_similarity(query_vector, doc_vector)
+        for doc_id, similarity in top_scored:
+            issue = self.issue_records[doc_id]
+            doc_vector = self.tf_vectors[doc_id]
             
-            if similarity >= min_similarity:
-                # Find matching terms
-                common_terms = set(query_vector.keys()) & set(doc_vector.keys())
-                matching_terms = sorted(common_terms, 
-                                       key=lambda t: query_vector[t] * doc_vector[t],
-                                       reverse=True)[:5]
-                
-                match = SimilarityMatch(
-                    issue_number=issue.issue_number,
-                    title=issue.title,
-                    similarity_score=similarity,
-                    agent_assigned=issue.agent_assigned,
-                    solution_summary=issue.solution_summary,
-                    matching_terms=matching_terms,
-                    labels=issue.labels
-                )
-                similarities.append(match)
-        
-        # Sort by similarity score
-        similarities.sort(key=lambda x: x.similarity_score, reverse=True)
-        
-        return similarities[:top_k]
+            # Find matching terms
+            common_terms = [t for t in query_vector if t in doc_vector]
+            matching_terms = sorted(common_terms,
+                                    key=lambda t: query_vector[t] * (doc_vector[t] * self._idf(t)),
+                                    reverse=True)[:5]
+            
+            similarities.append(SimilarityMatch(
+                issue_number=issue.issue_number,
+                title=issue.title,
+                similarity_score=similarity,
+                agent_assigned=issue.agent_assigned,
+                solution_summary=issue.solution_summary,
+                matching_terms=matching_terms,
+                labels=issue.labels
+            ))
+        
+        return similarities
     
     def add_issue(self, issue: IssueRecord):
         """
@@ -344,8 +523,10 @@ class SemanticSimilarityEngine:
         Args:
             issue: Issue record to add
         """
+        tokens = self._tokenize(self._document_text(issue))
         self.issue_records.append(issue)
-        self._build_index()  # Rebuild index
+        # Only the new document is tokenized; df and postings grow in place
+        self._index_document(self._calculate_term_frequency(tokens))
     
     def save_history(self):
         """Save issue history to JSON file."""
@@ -361,8 +542,10 @@ class SemanticSimilarityEngine:
         }
         
         # Write to file
-        with open(self.history_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        raw = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        self.history_path.write_bytes(raw)
+        self._history_fingerprint = hashlib.sha256(raw).hexdigest()
+        self._write_index_snapshot()
         
         print(f"Saved {len(self.issue_records)} issues to {self.history_path}")
     
@@ -377,8 +560,8 @@ class SemanticSimilarityEngine:
             }
         
         # Count terms
-        total_terms = sum(len(terms) for terms in self.document_terms)
-        avg_terms = total_terms / len(self.document_terms) if self.document_terms else 0
+        total_terms = sum(len(vector) for vector in self.tf_vectors)
+        avg_terms = total_terms / len(self.tf_vectors) if self.tf_vectors else 0
         
         # Count by agent
         agent_counts = defaultdict(int)
@@ -388,7 +571,7 @@ class SemanticSimilarityEngine:
         
         return {
             'total_issues': len(self.issue_records),
-            'total_unique_terms': len(self.idf_scores),
+            'total_unique_terms': len(self.doc_freq),
             'avg_terms_per_issue': round(avg_terms, 2),
             'agents': dict(agent_counts)
         }
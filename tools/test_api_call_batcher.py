@@ -23,6 +23,7 @@ from api_call_batcher import (
     APIRequest,
     RequestFuture,
     BatchStrategy,
+    ConcurrentBatchExecutor,
     get_batcher
 )
 
@@ -271,6 +272,26 @@ class TestBatchedAPIClient(unittest.TestCase):
             result = future.result(timeout=1.0)
             self.assertIsNotNone(result)
     
+    def test_stop_timeout_and_pool_shutdown(self):
+        """stop() returns after its timeout and shuts down the default pool"""
+        release = threading.Event()
+        with patch.object(BatchedAPIClient, '_default_request', lambda self, request: release.wait(5.0)):
+            batcher = BatchedAPIClient(BatchConfig(flush_interval=10.0))
+        future = batcher.add_request('GET', '/api/slow')
+        
+        started = time.monotonic()
+        batcher.stop(timeout=0.2)
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertIsNone(batcher.executor._pool)
+        
+        # The request still completes, and a restarted batcher gets a new pool
+        release.set()
+        self.assertTrue(future.result(timeout=2.0))
+        again = batcher.add_request('GET', '/api/again')
+        batcher.flush()
+        self.assertTrue(again.result(timeout=2.0))
+        batcher.stop()
+    
     def test_auto_flush_on_size(self):
         """Test automatic flush when batch size is reached"""
         config = BatchConfig(batch_size=3, flush_interval=10.0)  # Long interval
@@ -439,6 +460,81 @@ class TestSingletonBatcher(unittest.TestCase):
         batcher1.stop()
 
 
+class TestConcurrentExecution(unittest.TestCase):
+    """Test per-request completion and executing batches outside the lock"""
+    
+    def slow_executor(self, request):
+        """Sleep for /slow requests, fail for /bad ones"""
+        if request.endpoint == '/slow':
+            time.sleep(1.0)
+        if request.endpoint == '/bad':
+            raise ValueError('bad request')
+        return {'endpoint': request.endpoint}
+    
+    def test_futures_resolve_independently(self):
+        """Test that fast requests do not wait for a slow one in their batch"""
+        executor = ConcurrentBatchExecutor(self.slow_executor, max_workers=4)
+        batcher = BatchedAPIClient(BatchConfig(batch_size=4, flush_interval=10.0), executor=executor)
+        
+        start = time.time()
+        slow = batcher.add_request('GET', '/slow')
+        fast = [batcher.add_request('GET', f'/fast/{i}') for i in range(3)]
+        for future in fast:
+            self.assertIsNotNone(future.result(timeout=0.5))
+        self.assertLess(time.time() - start, 0.5)
+        self.assertFalse(slow.is_done())
+        
+        batcher.stop()
+        self.assertTrue(slow.is_done())
+        self.assertEqual(slow.result(), {'endpoint': '/slow'})
+        executor.shutdown()
+    
+    def test_request_errors_are_isolated(self):
+        """Test that one failing request only fails its own futures"""
+        executor = ConcurrentBatchExecutor(self.slow_executor)
+        batcher = BatchedAPIClient(BatchConfig(batch_size=2, flush_interval=10.0), executor=executor)
+        
+        bad = batcher.add_request('GET', '/bad')
+        good = batcher.add_request('GET', '/good')
+        with self.assertRaises(ValueError):
+            bad.result(timeout=2.0)
+        self.assertEqual(good.result(timeout=2.0), {'endpoint': '/good'})
+        
+        batcher.stop()
+        self.assertEqual(batcher.get_stats()['in_flight_requests'], 0)
+        executor.shutdown()
+    
+    def test_add_request_during_batch(self):
+        """Test that a batch executor in flight does not block add_request"""
+        release = threading.Event()
+        
+        def blocking_executor(requests):
+            release.wait(5.0)
+            return [{'endpoint': r.endpoint} for r in requests]
+        
+        batcher = BatchedAPIClient(BatchConfig(batch_size=1, flush_interval=10.0),
+                                   executor=blocking_executor)
+        first = batcher.add_request('GET', '/first')
+        time.sleep(0.3)
+        
+        start = time.time()
+        second = batcher.add_request('GET', '/second')
+        self.assertLess(time.time() - start, 0.1)
+        self.assertFalse(first.is_done())
+        
+        release.set()
+        self.assertEqual(first.result(timeout=2.0), {'endpoint': '/first'})
+        self.assertEqual(second.result(timeout=2.0), {'endpoint': '/second'})
+        batcher.stop()
+    
+    def test_batch_call(self):
+        """Test calling the concurrent executor as a plain batch executor"""
+        executor = ConcurrentBatchExecutor(self.slow_executor)
+        requests = [APIRequest(method='GET', endpoint=f'/fast/{i}') for i in range(5)]
+        self.assertEqual(executor(requests), [{'endpoint': f'/fast/{i}'} for i in range(5)])
+        executor.shutdown()
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests"""
     
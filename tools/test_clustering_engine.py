@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared K-means clustering engine
+Author: @engineer-master
+
+Tests cover:
+- K-means++ seeding semantics
+- Lloyd iterations in the pure-Python path
+- Mini-batch k-means
+- Agreement between the NumPy and pure-Python paths (when NumPy is installed)
+- Exact, sampled and centroid silhouette scoring
+"""
+
+import os
+import random
+import sys
+import unittest
+
+# Add tools directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+import clustering_engine
+from clustering_engine import (
+    assign_to_centroids,
+    kmeans,
+    distance_rows,
+    kmeans_plus_plus,
+    silhouette_score,
+    squared_euclidean,
+)
+
+
+def make_blobs(n_per_cluster=60, seed=11):
+    """Three well separated 2D blobs."""
+    rng = random.Random(seed)
+    centers = [(0.0, 0.0), (10.0, 10.0), (-10.0, 10.0)]
+    vectors = []
+    for cx, cy in centers:
+        for _ in range(n_per_cluster):
+            vectors.append([cx + rng.gauss(0, 0.5), cy + rng.gauss(0, 0.5)])
+    return vectors
+
+
+def reference_seeding(vectors, k, rng):
+    """Original k-means++ seeding that recomputes every distance each round."""
+    n = len(vectors)
+    centroids = [vectors[rng.randint(0, n - 1)][:]]
+    for _ in range(k - 1):
+        distances = [min(squared_euclidean(v, c) ** 0.5 for c in centroids) for v in vectors]
+        total = sum(d ** 2 for d in distances)
+        if total == 0:
+            centroids.append(vectors[rng.randint(0, n - 1)][:])
+            continue
+        r = rng.uniform(0, total)
+        cumsum = 0
+        for i, d in enumerate(distances):
+            cumsum += d ** 2
+            if cumsum >= r:
+                centroids.append(vectors[i][:])
+                break
+    return centroids
+
+
+class TestClusteringEngine(unittest.TestCase):
+    """Test suite for the clustering engine"""
+
+    def test_seeding_matches_reference(self):
+        """Incremental k-means++ picks the same seeds as the original loop"""
+        vectors = make_blobs()
+        for seed in range(5):
+            expected = reference_seeding(vectors, 3, random.Random(seed))
+            actual = kmeans_plus_plus(vectors, 3, random.Random(seed))
+            self.assertEqual(actual, expected)
+
+    def test_seeding_identical_points(self):
+        """Identical points fall back to uniform choice without failing"""
+        vectors = [[1.0, 1.0]] * 5
+        centroids = kmeans_plus_plus(vectors, 3, random.Random(0))
+        self.assertEqual(len(centroids), 3)
+
+    def test_kmeans_recovers_blobs(self):
+        """Lloyd iterations separate well separated clusters"""
+        vectors = make_blobs()
+        clusters, centroids = kmeans(vectors, 3, rng=random.Random(1), use_numpy=False)
+
+        self.assertEqual(len(clusters), len(vectors))
+        self.assertEqual(len(centroids), 3)
+        for start in range(0, len(vectors), 60):
+            self.assertEqual(len(set(clusters[start:start + 60])), 1)
+        self.assertEqual(len(set(clusters)), 3)
+
+    def test_assignments_are_nearest_centroid(self):
+        """Every returned assignment is the nearest returned centroid"""
+        vectors = make_blobs()
+        clusters, centroids = kmeans(vectors, 4, rng=random.Random(2), use_numpy=False)
+        self.assertEqual(clusters, assign_to_centroids(vectors, centroids))
+
+    def test_minibatch(self):
+        """Mini-batch k-means converges to the same partition on easy data"""
+        vectors = make_blobs()
+        clusters, centroids = kmeans(
+            vectors, 3, batch_size=32, rng=random.Random(3), use_numpy=False
+        )
+        self.assertEqual(len(centroids), 3)
+        for start in range(0, len(vectors), 60):
+            self.assertEqual(len(set(clusters[start:start + 60])), 1)
+
+    def test_empty_input(self):
+        """Empty input and non-positive k return empty results"""
+        self.assertEqual(kmeans([], 3), ([], []))
+        self.assertEqual(kmeans([[1.0]], 0), ([], []))
+
+    def test_global_random_state(self):
+        """Without an rng, random.seed() makes results reproducible"""
+        vectors = make_blobs()
+        random.seed(42)
+        first = kmeans(vectors, 3, use_numpy=False)
+        random.seed(42)
+        second = kmeans(vectors, 3, use_numpy=False)
+        self.assertEqual(first, second)
+
+    @unittest.skipUnless(clustering_engine.NUMPY_AVAILABLE, "NumPy not installed")
+    def test_numpy_matches_python(self):
+        """NumPy and pure-Python paths produce the same partition"""
+        vectors = make_blobs()
+        py_clusters, py_centroids = kmeans(vectors, 3, rng=random.Random(5), use_numpy=False)
+        np_clusters, np_centroids = kmeans(vectors, 3, rng=random.Random(5), use_numpy=True)
+
+        self.assertEqual(py_clusters, np_clusters)
+        for a, b in zip(py_centroids, np_centroids):
+            for x, y in zip(a, b):
+                self.assertAlmostEqual(x, y, places=9)
+
+    @unittest.skipIf(clustering_engine.NUMPY_AVAILABLE, "NumPy is installed")
+    def test_numpy_required_when_forced(self):
+        """Forcing the NumPy path without NumPy raises ImportError"""
+        with self.assertRaises(ImportError):
+            kmeans([[1.0]], 1, use_numpy=True)
+
+
+def reference_silhouette(vectors, labels):
+    """Original O(n²) silhouette with explicit same/other cluster lists."""
+    n = len(vectors)
+    scores = []
+    for i in range(n):
+        same = [j for j in range(n) if labels[j] == labels[i] and j != i]
+        if not same:
+            continue
+        a = sum(squared_euclidean(vectors[i], vectors[j]) ** 0.5 for j in same) / len(same)
+        b = min(
+            sum(squared_euclidean(vectors[i], vectors[j]) ** 0.5 for j in range(n) if labels[j] == other)
+            / labels.count(other)
+            for other in set(labels) - {labels[i]}
+        )
+        scores.append((b - a) / max(a, b) if max(a, b) > 0 else 0)
+    return sum(scores) / len(scores)
+
+
+class TestSilhouette(unittest.TestCase):
+    """Test suite for silhouette scoring"""
+
+    def setUp(self):
+        self.vectors = make_blobs()
+        self.labels, self.centroids = kmeans(
+            self.vectors, 3, rng=random.Random(1), use_numpy=False
+        )
+
+    def test_exact_matches_reference(self):
+        """Exact mode equals the quadratic reference, with a zero-width interval"""
+        labels = [i % 4 for i in range(len(self.vectors))]
+        estimate = silhouette_score(self.vectors, labels, mode='exact')
+        self.assertAlmostEqual(estimate.score, reference_silhouette(self.vectors, labels), places=9)
+        self.assertEqual(estimate.ci_low, estimate.ci_high)
+        self.assertEqual(estimate.sample_size, len(self.vectors))
+
+    def test_sampled_close_to_exact(self):
+        """Sampled mode lands near the exact score and reports an interval"""
+        exact = silhouette_score(self.vectors, self.labels, mode='exact').score
+        estimate = silhouette_score(
+            self.vectors, self.labels, mode='sampled', sample_size=60, rng=random.Random(4)
+        )
+        self.assertEqual(estimate.sample_size, 60)
+        self.assertLess(estimate.ci_low, estimate.ci_high)
+        self.assertLessEqual(estimate.ci_low, estimate.score)
+        self.assertGreaterEqual(estimate.ci_high, estimate.score)
+        self.assertAlmostEqual(estimate.score, exact, delta=0.05)
+
+    def test_auto_mode(self):
+        """Auto mode is exact for small inputs and sampled for large ones"""
+        self.assertEqual(silhouette_score(self.vectors, self.labels).mode, 'exact')
+        estimate = silhouette_score(self.vectors, self.labels, sample_size=50)
+        self.assertEqual(estimate.mode, 'sampled')
+
+    def test_centroid_mode(self):
+        """Centroid mode rates well separated blobs highly"""
+        estimate = silhouette_score(
+            self.vectors, self.labels, mode='centroid', centroids=self.centroids
+        )
+        self.assertGreater(estimate.score, 0.8)
+        with self.assertRaises(ValueError):
+            silhouette_score(self.vectors, self.labels, mode='centroid')
+
+    def test_precomputed_rows(self):
+        """Precomputed distance rows give the same score for any labelling"""
+        indices = list(range(0, len(self.vectors), 3))
+        rows = distance_rows(self.vectors, indices)
+        for labels in (self.labels, [i % 5 for i in range(len(self.vectors))]):
+            expected = silhouette_score(
+                self.vectors, labels, mode='sampled', sample_indices=indices
+            )
+            reused = silhouette_score(
+                self.vectors, labels, mode='sampled', sample_indices=indices, rows=rows
+            )
+            self.assertAlmostEqual(reused.score, expected.score, places=12)
+
+    @unittest.skipUnless(clustering_engine.NUMPY_AVAILABLE, "NumPy not installed")
+    def test_vectorized_rows_match_lists(self):
+        """Array rows score the same as the pure-Python path over list rows"""
+        indices = list(range(0, len(self.vectors), 2))
+        rows = distance_rows(self.vectors, indices)
+        self.assertIsInstance(rows, clustering_engine.np.ndarray)
+        # One-point cluster: skipped by both paths
+        labels = [0] + [1 + i % 4 for i in range(1, len(self.vectors))]
+        vectorized, listed = (
+            silhouette_score(self.vectors, labels, mode='sampled', sample_indices=indices, rows=r).score
+            for r in (rows, rows.tolist())
+        )
+        self.assertAlmostEqual(vectorized, listed, places=12)
+
+    def test_single_cluster_and_bad_mode(self):
+        """One cluster scores 0.0 and unknown modes are rejected"""
+        self.assertEqual(silhouette_score(self.vectors, [0] * len(self.vectors)).score, 0.0)
+        with self.assertRaises(ValueError):
+            silhouette_score(self.vectors, self.labels, mode='fast')
+
+
+if __name__ == '__main__':
+    unittest.main()
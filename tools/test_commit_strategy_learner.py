@@ -293,6 +293,69 @@ class TestCommitStrategyLearner(unittest.TestCase):
         self.assertTrue(metrics.follows_conventional)
         self.assertEqual(metrics.conventional_type, "fix")
     
+    def test_get_commit_metrics_line_counts(self):
+        """Test line and file counts parsed from numstat"""
+        learner = CommitStrategyLearner(repo_path=str(self.repo_dir))
+        
+        (self.repo_dir / "a.py").write_text("one\ntwo\nthree\n")
+        (self.repo_dir / "b.md").write_text("doc\n")
+        os.system('git add a.py b.md')
+        os.system('git commit -m "docs: add files (#12)" >/dev/null 2>&1')
+        
+        metrics = learner._get_commit_metrics("HEAD")
+        
+        self.assertIsNotNone(metrics)
+        self.assertEqual(metrics.files_changed, 2)
+        self.assertEqual(metrics.lines_added, 4)
+        self.assertEqual(metrics.lines_deleted, 0)
+        self.assertEqual(sorted(metrics.file_types), ["md", "py"])
+        self.assertEqual(learner._get_merge_info(metrics.commit_hash)[1], 12)
+    
+    def test_analyze_commits_reuses_metrics_store(self):
+        """Test repeat analyses only read new commits from git"""
+        learner = CommitStrategyLearner(repo_path=str(self.repo_dir))
+        result = learner.analyze_commits(since_days=30)
+        
+        self.assertEqual(result["total_analyzed"], 2)
+        self.assertEqual(result["successful"], 2)
+        with open(module.COMMIT_METRICS_STORE_FILE) as f:
+            self.assertEqual(len(f.readlines()), 2)
+        
+        (self.repo_dir / "test.txt").write_text("Third content")
+        os.system('git add test.txt')
+        os.system('git commit -m "fix: third change" >/dev/null 2>&1')
+        
+        learner2 = CommitStrategyLearner(repo_path=str(self.repo_dir))
+        streamed = []
+        original = learner2._stream_commit_records
+        
+        def recording_stream(hashes):
+            streamed.extend(hashes)
+            return original(hashes)
+        
+        learner2._stream_commit_records = recording_stream
+        result = learner2.analyze_commits(since_days=30)
+        
+        self.assertEqual(result["total_analyzed"], 3)
+        self.assertEqual(len(streamed), 1)
+        with open(module.COMMIT_METRICS_STORE_FILE) as f:
+            self.assertEqual(len(f.readlines()), 3)
+    
+    def test_metrics_store_pruned_to_window(self):
+        """Test the metrics store only keeps the analyzed commits"""
+        learner = CommitStrategyLearner(repo_path=str(self.repo_dir))
+        learner.analyze_commits(since_days=30)
+        with open(module.COMMIT_METRICS_STORE_FILE, 'a') as f:
+            f.write('{"torn": ')
+        
+        learner = CommitStrategyLearner(repo_path=str(self.repo_dir))
+        result = learner.analyze_commits(since_days=30, max_commits=1)
+        self.assertEqual(result["total_analyzed"], 1)
+        head = os.popen('git rev-parse HEAD').read().strip()
+        with open(module.COMMIT_METRICS_STORE_FILE) as f:
+            self.assertEqual([json.loads(line)["commit_hash"] for line in f], [head])
+        self.assertEqual(len(CommitStrategyLearner(repo_path=str(self.repo_dir)).metrics_store), 1)
+    
     def test_save_and_load_strategies(self):
         """Test saving and loading strategies database"""
         learner = CommitStrategyLearner(repo_path=str(self.repo_dir))
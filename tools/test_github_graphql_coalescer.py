@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Tests for the GitHub GraphQL Coalescer
+
+Runs the executor against a local fake GitHub API that answers aliased
+GraphQL queries and REST requests, and counts the requests it receives.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add tools directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from api_call_batcher import APIRequest, BatchConfig, BatchedAPIClient
+from github_graphql_coalescer import GraphQLCoalescingExecutor, build_query, parse_read
+from github_integration import GitHubAPIClient, GitHubAPIException, RetryConfig
+
+REPO_ALIAS = re.compile(r'^\s*(\w+): repository\(owner: "([^"]+)", name: "([^"]+)"\)')
+FIELD_ALIAS = re.compile(r'^\s*(\w+): (issueOrPullRequest|pullRequest)\(number: (\d+)\)')
+USER_ALIAS = re.compile(r'^\s*(\w+): user\(login: "([^"]+)"\)')
+
+# Types of the Issue and PullRequest fields the fragments select (GitHub schema)
+SCHEMA = {
+    'Issue': {
+        'number': 'Int!', 'title': 'String!', 'body': 'String!', 'state': 'IssueState!', 'url': 'URI!',
+        'createdAt': 'DateTime!', 'updatedAt': 'DateTime!', 'closedAt': 'DateTime', 'author': 'Actor',
+        'labels': 'LabelConnection', 'comments': 'IssueCommentConnection!',
+    },
+    'PullRequest': {
+        'number': 'Int!', 'title': 'String!', 'body': 'String!', 'state': 'PullRequestState!', 'url': 'URI!',
+        'createdAt': 'DateTime!', 'updatedAt': 'DateTime!', 'closedAt': 'DateTime', 'author': 'Actor',
+        'labels': 'LabelConnection', 'comments': 'IssueCommentConnection!', 'mergedAt': 'DateTime',
+        'merged': 'Boolean!', 'isDraft': 'Boolean!', 'additions': 'Int!', 'deletions': 'Int!',
+        'changedFiles': 'Int!', 'headRefName': 'String!', 'baseRefName': 'String!',
+    },
+}
+FRAGMENT = re.compile(r'fragment (\w+) on (\w+) \{(.*?)\n\}', re.DOTALL)
+
+
+def fragment_fields(query):
+    """Per fragment, its type and top-level selections as {response key: field}"""
+    fragments = {}
+    for name, on_type, body in FRAGMENT.findall(query):
+        # Drop arguments and sub-selections, leaving `alias: field` and `field`
+        while re.search(r'\([^()]*\)|\{[^{}]*\}', body):
+            body = re.sub(r'\([^()]*\)|\{[^{}]*\}', ' ', body)
+        fields = {}
+        for alias, field in re.findall(r'(\w+)(?:\s*:\s*(\w+))?', body):
+            fields[alias] = field or alias
+        fragments[name] = (on_type, fields)
+    return fragments
+
+
+# Issue numbers at or above this are pull requests; MISSING does not exist
+FIRST_PULL = 100
+MISSING = 999
+
+
+def issue_node(number):
+    pull = number >= FIRST_PULL
+    node = {
+        '__typename': 'PullRequest' if pull else 'Issue',
+        'number': number,
+        'title': f'Issue {number}',
+        'body': 'x' * number,
+        'prState' if pull else 'state': 'MERGED' if pull else 'OPEN',
+        'url': f'https://github.com/owner/repo/issues/{number}',
+        'createdAt': '2026-01-01T00:00:00Z',
+        'updatedAt': '2026-01-02T00:00:00Z',
+        'closedAt': None,
+        'author': {'login': 'octocat'} if number % 2 else None,
+        'labels': {'nodes': [{'name': 'agent-work'}]},
+        'comments': {'totalCount': number % 3},
+    }
+    if pull:
+        node.update({'mergedAt': '2026-01-03T00:00:00Z', 'merged': True, 'isDraft': False,
+                     'additions': 10, 'deletions': 2, 'changedFiles': 1,
+                     'headRefName': 'feature', 'baseRefName': 'main'})
+    return node
+
+
+def user_node(login):
+    return {
+        'login': login, 'name': login.title(), 'company': None, 'location': None, 'bio': None,
+        'url': f'https://github.com/{login}', 'createdAt': '2020-01-01T00:00:00Z',
+        'followers': {'totalCount': 3}, 'following': {'totalCount': 1}, 'repositories': {'totalCount': 7},
+    }
+
+
+class FakeGitHub(BaseHTTPRequestHandler):
+    """Answers /graphql by alias and a few REST endpoints"""
+
+    counts = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _count(self, key):
+        with self.server.lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._count('GET')
+        path = self.path.split('?')[0]
+        match = re.match(r'^/repos/owner/repo/issues/(\d+)$', path)
+        if match and int(match.group(1)) != MISSING:
+            return self._send(200, {'number': int(match.group(1)), 'source': 'rest'})
+        match = re.match(r'^/users/([\w-]+)$', path)
+        if match:
+            return self._send(200, {'login': match.group(1), 'type': 'Organization'})
+        self._send(404, {'message': 'Not Found'})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length))
+        if self.path != '/graphql':
+            self._count('POST')
+            return self._send(201, {'created': payload})
+        self._count('GRAPHQL')
+        data, errors = {}, []
+        repository = None
+        for line in payload['query'].splitlines():
+            match = REPO_ALIAS.match(line)
+            if match:
+                repository = data[match.group(1)] = {}
+                continue
+            match = FIELD_ALIAS.match(line)
+            if match:
+                alias, field, number = match.group(1), match.group(2), int(match.group(3))
+                if number == MISSING:
+                    repository[alias] = None
+                    errors.append({'type': 'NOT_FOUND', 'path': ['r0', alias]})
+                else:
+                    repository[alias] = issue_node(number)
+                continue
+            match = USER_ALIAS.match(line)
+            if match:
+                alias, login = match.groups()
+                # Organizations are not users in GraphQL
+                data[alias] = None if login.startswith('org-') else user_node(login)
+        self._send(200, {'data': data, 'errors': errors})
+
+
+class TestGraphQLCoalescer(unittest.TestCase):
+    """Test coalescing against a fake GitHub API"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGitHub)
+        cls.server.lock = threading.Lock()
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FakeGitHub.counts = {}
+        client = GitHubAPIClient(
+            token='test-token',
+            base_url=f'http://127.0.0.1:{self.server.server_address[1]}',
+            retry_config=RetryConfig(max_attempts=1)
+        )
+        self.executor = GraphQLCoalescingExecutor(client, max_workers=4)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_parse_read(self):
+        self.assertEqual(parse_read(APIRequest('GET', '/repos/o/r.js/issues/5')), ('issue', 'o', 'r.js', 5))
+        self.assertEqual(parse_read(APIRequest('GET', 'repos/o/r/pulls/7/')), ('pull', 'o', 'r', 7))
+        self.assertEqual(parse_read(APIRequest('GET', '/users/octo-cat')), ('user', 'octo-cat'))
+        self.assertIsNone(parse_read(APIRequest('GET', '/repos/o/r/issues/5/comments')))
+        self.assertIsNone(parse_read(APIRequest('GET', '/repos/o/r/issues', params={'state': 'open'})))
+        self.assertIsNone(parse_read(APIRequest('PATCH', '/repos/o/r/issues/5')))
+
+    def test_build_query_groups_and_dedupes(self):
+        query, paths = build_query([('issue', 'o', 'r', 1), ('user', 'a'), ('issue', 'o', 'r', 1),
+                                    ('pull', 'o', 'r', 2), ('issue', 'x', 'y', 1), ('user', 'a')])
+        self.assertEqual(paths, [('r0', 'i1'), ('u0',), ('r0', 'i1'), ('r0', 'p2'), ('r1', 'i1'), ('u0',)])
+        self.assertEqual(query.count('repository('), 2)
+        self.assertEqual(query.count('issueOrPullRequest('), 2)
+        self.assertEqual(query.count('user(login'), 1)
+
+    def test_union_fragments_do_not_conflict(self):
+        """Fields selected under issueOrPullRequest with one name have one type"""
+        query, _ = build_query([('issue', 'o', 'r', 1)])
+        fragments = fragment_fields(query)
+        (issue_type, issue_fields), (pull_type, pull_fields) = fragments['IssueFields'], fragments['PullRequestFields']
+        for key in issue_fields.keys() & pull_fields.keys():
+            self.assertEqual(SCHEMA[issue_type][issue_fields[key]], SCHEMA[pull_type][pull_fields[key]], key)
+        self.assertEqual(pull_fields['prState'], 'state')
+
+    def test_reads_share_one_query(self):
+        requests = [APIRequest('GET', f'/repos/owner/repo/issues/{n}') for n in range(1, 31)]
+        requests += [APIRequest('GET', f'/users/user-{n}') for n in range(10)]
+        outcomes = self.executor.execute(requests)
+
+        self.assertEqual(FakeGitHub.counts, {'GRAPHQL': 1})
+        self.assertTrue(all(error is None for _, error in outcomes))
+        issue = outcomes[4][0]
+        self.assertEqual(issue['number'], 5)
+        self.assertEqual(issue['state'], 'open')
+        self.assertEqual(issue['user'], {'login': 'octocat'})
+        self.assertEqual(issue['labels'], [{'name': 'agent-work'}])
+        self.assertEqual(len(issue['body']), 5)
+        self.assertIsNone(outcomes[5][0]['user'])
+        user = outcomes[30][0]
+        self.assertEqual((user['login'], user['followers'], user['public_repos']), ('user-0', 3, 7))
+        self.assertEqual(self.executor.get_stats()['api_requests'], 1)
+
+    def test_pull_requests(self):
+        issue, pull = self.executor([APIRequest('GET', '/repos/owner/repo/issues/101'),
+                                     APIRequest('GET', '/repos/owner/repo/pulls/102')])
+        self.assertEqual(issue['state'], 'closed')
+        self.assertEqual(issue['pull_request']['merged_at'], '2026-01-03T00:00:00Z')
+        self.assertTrue(pull['merged'])
+        self.assertEqual((pull['head']['ref'], pull['base']['ref']), ('feature', 'main'))
+        self.assertNotIn('pull_request', self.executor([APIRequest('GET', '/repos/owner/repo/issues/1')])[0])
+
+    def test_chunks_by_max_reads(self):
+        self.executor.max_reads_per_query = 10
+        self.executor([APIRequest('GET', f'/repos/owner/repo/issues/{n}') for n in range(1, 26)])
+        self.assertEqual(FakeGitHub.counts, {'GRAPHQL': 3})
+
+    def test_unanswered_reads_fall_back_to_rest(self):
+        outcomes = self.executor.execute([
+            APIRequest('GET', '/repos/owner/repo/issues/1'),
+            APIRequest('GET', f'/repos/owner/repo/issues/{MISSING}'),
+            APIRequest('GET', '/users/org-acme'),
+        ])
+        self.assertEqual(FakeGitHub.counts, {'GRAPHQL': 1, 'GET': 2})
+        self.assertIsNone(outcomes[0][1])
+        self.assertIsInstance(outcomes[1][1], GitHubAPIException)
+        self.assertTrue(outcomes[1][1].error.is_not_found)
+        self.assertEqual(outcomes[2], ({'login': 'org-acme', 'type': 'Organization'}, None))
+
+    def test_other_requests_use_rest(self):
+        created, listed = self.executor([
+            APIRequest('POST', '/repos/owner/repo/issues', body=json.dumps({'title': 'New'})),
+            APIRequest('GET', '/repos/owner/repo/issues/3', params={'fields': 'all'}),
+        ])
+        self.assertEqual(created, {'created': {'title': 'New'}})
+        self.assertEqual(listed['source'], 'rest')
+        self.assertEqual(FakeGitHub.counts, {'POST': 1, 'GET': 1})
+
+    def test_inside_batched_client(self):
+        batcher = BatchedAPIClient(BatchConfig(batch_size=20, flush_interval=0.05), executor=self.executor)
+        batcher.start()
+        try:
+            futures = [batcher.add_request('GET', f'/repos/owner/repo/issues/{n}') for n in range(1, 21)]
+            missing = batcher.add_request('GET', f'/repos/owner/repo/issues/{MISSING}')
+            self.assertEqual([future.result(timeout=5)['number'] for future in futures], list(range(1, 21)))
+            with self.assertRaises(GitHubAPIException):
+                missing.result(timeout=5)
+        finally:
+            batcher.stop()
+        self.assertLessEqual(FakeGitHub.counts['GRAPHQL'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -26,8 +26,10 @@ from issue_clustering_system import (
     IssueClusteringSystem,
     IssueData,
     IssueCluster,
-    ClusteringMetrics
+    ClusteringMetrics,
+    KSweepResult
 )
+import issue_clustering_system
 
 
 class TestIssueClusteringSystem(unittest.TestCase):
@@ -224,6 +226,47 @@ class TestIssueClusteringSystem(unittest.TestCase):
         # Should have cluster sizes
         self.assertEqual(len(self.system.metrics.cluster_sizes), len(self.system.clusters))
     
+    def test_silhouette_modes(self):
+        """Test sampled and centroid silhouette modes in perform_clustering"""
+        self.system.load_issues_from_github(self.test_issues)
+        
+        self.system.perform_clustering(n_clusters=2, min_cluster_size=1, silhouette_mode='sampled',
+                                       silhouette_sample_size=4)
+        self.assertEqual(self.system.metrics.silhouette_mode, 'sampled')
+        low, high = self.system.metrics.silhouette_ci
+        self.assertLessEqual(low, self.system.metrics.silhouette_score)
+        self.assertGreaterEqual(high, self.system.metrics.silhouette_score)
+        
+        self.system.perform_clustering(n_clusters=2, min_cluster_size=1, silhouette_mode='centroid')
+        self.assertEqual(self.system.metrics.silhouette_mode, 'centroid')
+    
+    def test_sweep_k(self):
+        """Test k-sweep reuses vectors and distance rows across k"""
+        self.system.load_issues_from_github(self.test_issues)
+        
+        calls = []
+        original = issue_clustering_system.distance_rows
+        
+        def counting_distance_rows(vectors, indices):
+            calls.append(len(indices))
+            return original(vectors, indices)
+        
+        issue_clustering_system.distance_rows = counting_distance_rows
+        try:
+            results = self.system.sweep_k([2, 3, 4, 10])
+        finally:
+            issue_clustering_system.distance_rows = original
+        
+        # k=10 exceeds the number of issues and is skipped
+        self.assertEqual([r.k for r in results], [2, 3, 4])
+        self.assertEqual(calls, [len(self.test_issues)])
+        for result in results:
+            self.assertIsInstance(result, KSweepResult)
+            self.assertEqual(sum(result.cluster_sizes), len(self.test_issues))
+            self.assertGreaterEqual(result.silhouette_score, -1)
+            self.assertLessEqual(result.silhouette_score, 1)
+            self.assertGreaterEqual(result.inertia, 0)
+    
     def test_cluster_naming(self):
         """Test automatic cluster naming"""
         # Create issues with similar labels
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Tests for Metrics Sketch
+
+Checks quantile accuracy against exact percentiles, merging and snapshots,
+the sliding error window, and the monitors built on top of them.
+"""
+
+import unittest
+import json
+import random
+import statistics
+import sys
+import os
+
+# Add tools directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from metrics_sketch import LatencyHistogram, SlidingWindowCounter, RequestStats
+from api_performance_monitor import APIMetrics, APIMonitor
+from api_monitoring_bridge import APIMonitoringBridge
+
+
+def exact_quantile(sorted_values, q):
+    """Sample at rank q * (n - 1), the rank the histogram estimates"""
+    return sorted_values[int(q * (len(sorted_values) - 1))]
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test the log-bucketed histogram"""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.values = [rng.lognormvariate(-1, 1.2) for _ in range(20000)]
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Every quantile is within 1% of the true sample value"""
+        histogram = LatencyHistogram(relative_accuracy=0.01)
+        for value in self.values:
+            histogram.add(value)
+        ordered = sorted(self.values)
+        for q in (0.0, 0.1, 0.5, 0.9, 0.95, 0.99, 0.999, 1.0):
+            expected = exact_quantile(ordered, q)
+            self.assertAlmostEqual(histogram.quantile(q) / expected, 1, delta=0.0101, msg=q)
+
+    def test_exact_moments(self):
+        """Count, mean, stddev, min and max are exact"""
+        histogram = LatencyHistogram()
+        for value in self.values:
+            histogram.add(value)
+        self.assertEqual(histogram.count, len(self.values))
+        self.assertAlmostEqual(histogram.mean, statistics.mean(self.values))
+        self.assertAlmostEqual(histogram.stddev, statistics.stdev(self.values))
+        self.assertEqual((histogram.min, histogram.max), (min(self.values), max(self.values)))
+
+    def test_bounded_buckets(self):
+        """Memory stays bounded however wide the range of values"""
+        histogram = LatencyHistogram(max_buckets=100)
+        for exponent in range(-6, 7):
+            for i in range(1, 100):
+                histogram.add(i * 10.0 ** exponent)
+        self.assertLessEqual(len(histogram._buckets), 100)
+        # Only the low end loses accuracy
+        ordered = sorted(i * 10.0 ** exponent for exponent in range(-6, 7) for i in range(1, 100))
+        self.assertAlmostEqual(histogram.quantile(0.9) / exact_quantile(ordered, 0.9), 1, delta=0.0101)
+
+    def test_merge_matches_single_histogram(self):
+        """Merging split data gives the same histogram as adding it all"""
+        combined, left, right = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for i, value in enumerate(self.values):
+            combined.add(value)
+            (left if i % 3 else right).add(value)
+        left.merge(right)
+        self.assertEqual(left._buckets, combined._buckets)
+        self.assertEqual(left.count, combined.count)
+        self.assertAlmostEqual(left.mean, combined.mean)
+        self.assertAlmostEqual(left.stddev, combined.stddev)
+        self.assertEqual(left.quantile(0.99), combined.quantile(0.99))
+
+        with self.assertRaises(ValueError):
+            left.merge(LatencyHistogram(relative_accuracy=0.05))
+
+    def test_zero_and_empty(self):
+        """Zero durations and empty histograms"""
+        histogram = LatencyHistogram()
+        self.assertEqual(histogram.quantile(0.5), 0.0)
+        histogram.add(0.0)
+        histogram.add(2.0)
+        self.assertEqual(histogram.quantile(0.0), 0.0)
+        self.assertEqual(histogram.quantile(1.0), 2.0)
+        self.assertEqual(histogram.quantile(0.5), 0.0)
+
+
+class TestSlidingWindowCounter(unittest.TestCase):
+    """Test the time-bucketed request/error window"""
+
+    def test_counts_expire(self):
+        """Requests drop out one bucket at a time"""
+        window = SlidingWindowCounter(window_seconds=60, buckets=6)
+        window.add(1000, error=True)
+        window.add(1025)
+        window.add(1055, error=True)
+        self.assertEqual(window.counts(1055), {'requests': 3, 'errors': 2})
+        self.assertEqual(window.counts(1065), {'requests': 2, 'errors': 1})
+        self.assertAlmostEqual(window.error_rate(1075), 0.5)
+        self.assertAlmostEqual(window.error_rate(1085), 1.0)
+        self.assertEqual(window.counts(2000), {'requests': 0, 'errors': 0})
+        self.assertEqual(window.error_rate(2000), 0.0)
+
+    def test_reused_slot_and_late_request(self):
+        """A slot is reset when reused; requests older than it are ignored"""
+        window = SlidingWindowCounter(window_seconds=60, buckets=6)
+        window.add(1000, error=True)
+        window.add(1060)
+        window.add(1001, error=True)
+        self.assertEqual(window.counts(1060), {'requests': 1, 'errors': 0})
+
+    def test_merge(self):
+        """Merging adds counts for the same time buckets"""
+        first, second = SlidingWindowCounter(60, 6), SlidingWindowCounter(60, 6)
+        first.add(1000)
+        second.add(1005, error=True)
+        second.add(1050)
+        first.merge(second)
+        self.assertEqual(first.counts(1050), {'requests': 3, 'errors': 1})
+
+        with self.assertRaises(ValueError):
+            first.merge(SlidingWindowCounter(120, 6))
+
+
+class TestRequestStats(unittest.TestCase):
+    """Test combined endpoint statistics"""
+
+    def test_snapshot_round_trip(self):
+        """Snapshots survive JSON and restore identical statistics"""
+        stats = RequestStats()
+        for i in range(500):
+            stats.record(0.1 + i / 1000, 500 if i % 50 == 0 else 200, 1000 + i, error=i % 50 == 0)
+        restored = RequestStats.from_snapshot(json.loads(json.dumps(stats.snapshot())))
+        self.assertEqual(restored.snapshot(), stats.snapshot())
+        self.assertEqual(restored.status_codes, {200: 490, 500: 10})
+        self.assertEqual(restored.latency.quantile(0.95), stats.latency.quantile(0.95))
+
+    def test_merge(self):
+        """Merging adds requests, errors and status codes and widens the time range"""
+        first, second = RequestStats(), RequestStats()
+        first.record(0.2, 200, 1000)
+        second.record(0.4, 404, 990, error=True)
+        second.record(0.6, 200, 1010)
+        first.merge(second)
+        self.assertEqual(first.total_requests, 3)
+        self.assertEqual(first.error_count, 1)
+        self.assertEqual(first.status_codes, {200: 2, 404: 1})
+        self.assertEqual((first.first_timestamp, first.last_timestamp), (990, 1010))
+
+
+class TestAPIMonitor(unittest.TestCase):
+    """Test APIMonitor on the sketch backend"""
+
+    def test_stats_report_format(self):
+        """get_stats keeps its keys and its exact values"""
+        metrics = APIMetrics(endpoint='/api/users', method='GET')
+        durations = [0.1, 0.2, 0.3, 0.4, 1.5]
+        for i, duration in enumerate(durations):
+            metrics.add_request(duration, 200 if i else 500, 1000.0 + i)
+        stats = metrics.get_stats()
+        for key in ('endpoint', 'method', 'total_requests', 'error_count', 'error_rate', 'success_rate',
+                    'avg_response_time', 'median_response_time', 'p50_response_time', 'p75_response_time',
+                    'p90_response_time', 'p95_response_time', 'p99_response_time', 'max_response_time',
+                    'min_response_time', 'stddev_response_time', 'status_codes', 'first_request',
+                    'last_request', 'duration_seconds', 'requests_per_second'):
+            self.assertIn(key, stats)
+        self.assertEqual(stats['total_requests'], 5)
+        self.assertEqual(stats['error_count'], 1)
+        self.assertEqual(stats['status_codes'], {'200': 4, '500': 1})
+        self.assertAlmostEqual(stats['avg_response_time'], statistics.mean(durations))
+        self.assertAlmostEqual(stats['stddev_response_time'], statistics.stdev(durations))
+        self.assertEqual((stats['min_response_time'], stats['max_response_time']), (0.1, 1.5))
+        self.assertAlmostEqual(stats['median_response_time'], 0.3, delta=0.003)
+        self.assertEqual(stats['duration_seconds'], 4.0)
+
+    def test_snapshot_merge(self):
+        """Snapshots from several monitors merge into one"""
+        monitors = [APIMonitor(), APIMonitor()]
+        for n, monitor in enumerate(monitors):
+            for i in range(10):
+                monitor.track_request('/api/items', 'GET', 0.1 * (i + 1), 500 if i == n else 200)
+        merged = APIMonitor()
+        snapshots = [metrics.snapshot() for monitor in monitors for metrics in monitor.metrics.values()]
+        merged.merge_snapshots(json.loads(json.dumps(snapshots)))
+        stats = merged.get_endpoint_stats('/api/items', 'GET')
+        self.assertEqual(stats['total_requests'], 20)
+        self.assertEqual(stats['error_count'], 2)
+
+
+class TestAPIMonitoringBridge(unittest.TestCase):
+    """Test APIMonitoringBridge on the sketch backend"""
+
+    def test_bounded_history(self):
+        """Statistics cover every request while stored requests stay bounded"""
+        bridge = APIMonitoringBridge(history_size=50, error_history=10, slowest_size=5)
+        for i in range(1000):
+            bridge.record_request('/api/users', 'GET', 100 + i, 500 if i % 10 == 0 else 200,
+                                  error='boom' if i % 10 == 0 else None)
+        stats = bridge.get_endpoint_stats('/api/users', 'GET')
+        self.assertEqual(stats.total_requests, 1000)
+        self.assertEqual(stats.error_count, 100)
+        self.assertAlmostEqual(stats.error_rate, 0.1)
+        self.assertEqual((stats.min_duration_ms, stats.max_duration_ms), (100, 1099))
+        self.assertAlmostEqual(stats.p95_duration_ms / 1049, 1, delta=0.01)
+        self.assertAlmostEqual(bridge.get_recent_error_rate('/api/users', 'GET'), 0.1)
+
+        self.assertEqual(len(bridge.metrics['GET:/api/users']), 50)
+        self.assertEqual(len(bridge.get_recent_errors(limit=100)), 10)
+        slowest = bridge.get_slowest_requests(limit=10)
+        self.assertEqual([m['duration_ms'] for m in slowest], [1099, 1098, 1097, 1096, 1095])
+
+    def test_reports_and_snapshots(self):
+        """Reports count every request; JSON exports merge into another bridge"""
+        bridge = APIMonitoringBridge(history_size=5)
+        for i in range(20):
+            bridge.record_request('/api/data', 'POST', 200 + i, 200)
+        report = json.loads(bridge.generate_report(format='json'))
+        self.assertEqual(report['metadata']['total_requests'], 20)
+        self.assertIn('Total Requests: 20', bridge.generate_report(format='text'))
+
+        other = APIMonitoringBridge()
+        other.record_request('/api/data', 'POST', 500, 503, error='unavailable')
+        other.merge_snapshots(json.loads(json.dumps({k: s.snapshot() for k, s in bridge.stats.items()})))
+        stats = other.get_endpoint_stats('/api/data', 'POST')
+        self.assertEqual((stats.total_requests, stats.error_count), (21, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
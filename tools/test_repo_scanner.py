@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared repository scan driver
+Author: @engineer-master
+
+Tests cover:
+- Shared ignore rules and sorted file discovery
+- Non-recursive discovery
+- Serial and process-pool scans returning identical, ordered results
+- Per-file exceptions captured as errors
+- Parallel scans through the code analyzer and pattern learner
+"""
+
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add tools directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from repo_scanner import discover_files, is_ignored_dir, resolve_jobs, scan_files
+from unsupervised_pattern_learner import UnsupervisedPatternLearner
+
+spec = importlib.util.spec_from_file_location(
+    "code_analyzer", os.path.join(os.path.dirname(__file__), "code-analyzer.py")
+)
+code_analyzer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(code_analyzer)
+
+
+def line_count(path):
+    """Module-level analysis so it also works with spawned workers."""
+    with open(path) as f:
+        return len(f.read().splitlines())
+
+
+def fail_on_bad(path):
+    if path.endswith('bad.py'):
+        raise ValueError("cannot analyze")
+    return os.path.basename(path)
+
+
+class TestRepoScanner(unittest.TestCase):
+    """Test suite for the scan driver"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        files = {
+            'b.py': 'def b():\n    return 1\n',
+            'a.py': 'import os\n\n\nclass A:\n    """Doc"""\n    def run(self):\n        return os.getcwd()\n',
+            'notes.md': '# notes\n',
+            'pkg/z.py': 'x = 1\n',
+            'pkg/sub/y.py': 'def y(v):\n    if v:\n        return v\n    return None\n',
+            '.github/scripts/ci.py': 'print("ci")\n',
+            '.git/hooks/hook.py': 'x = 1\n',
+            'venv/lib/site.py': 'x = 1\n',
+            'node_modules/m/index.py': 'x = 1\n',
+            'build/out.py': 'x = 1\n',
+            'pkg/__pycache__/z.py': 'x = 1\n',
+            'demo.egg-info/setup.py': 'x = 1\n',
+        }
+        for name, content in files.items():
+            path = os.path.join(self.test_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _relative(self, paths):
+        return [os.path.relpath(p, self.test_dir) for p in paths]
+
+    def test_discovery_is_sorted_and_ignores_dirs(self):
+        """Ignored directories are skipped and the order is deterministic"""
+        found = self._relative(discover_files(self.test_dir))
+        self.assertEqual(found, [
+            'a.py',
+            'b.py',
+            os.path.join('.github', 'scripts', 'ci.py'),
+            os.path.join('pkg', 'z.py'),
+            os.path.join('pkg', 'sub', 'y.py'),
+        ])
+        self.assertTrue(is_ignored_dir('demo.egg-info'))
+        self.assertFalse(is_ignored_dir('src'))
+
+    def test_discovery_extensions_and_non_recursive(self):
+        """Extensions filter files and recursive=False stays at the top level"""
+        self.assertEqual(
+            self._relative(discover_files(self.test_dir, ('.md',))), ['notes.md']
+        )
+        self.assertEqual(
+            self._relative(discover_files(self.test_dir, recursive=False)), ['a.py', 'b.py']
+        )
+
+    def test_parallel_matches_serial(self):
+        """A process pool returns the same results, in the same order"""
+        paths = discover_files(self.test_dir)
+        serial = scan_files(paths, line_count, jobs=1)
+        parallel = scan_files(paths, line_count, jobs=2, chunksize=1)
+
+        self.assertEqual([r.path for r in parallel], paths)
+        self.assertEqual(
+            [(r.path, r.value, r.error) for r in parallel],
+            [(r.path, r.value, r.error) for r in serial]
+        )
+
+    def test_errors_are_captured(self):
+        """An exception in one file is reported without stopping the scan"""
+        paths = [os.path.join(self.test_dir, name) for name in ('a.py', 'bad.py', 'b.py')]
+        for jobs in (1, 2):
+            results = scan_files(paths, fail_on_bad, jobs=jobs)
+            self.assertEqual([r.value for r in results], ['a.py', None, 'b.py'])
+            self.assertIn('cannot analyze', results[1].error)
+
+    def test_resolve_jobs(self):
+        """Zero or a missing value means one worker per CPU"""
+        self.assertEqual(resolve_jobs(3), 3)
+        self.assertEqual(resolve_jobs(0), os.cpu_count() or 1)
+        self.assertEqual(resolve_jobs(None), os.cpu_count() or 1)
+
+    def test_code_analyzer_jobs(self):
+        """Code analyzer reports are identical for serial and parallel scans"""
+        analyzer = code_analyzer.CodeAnalyzer(patterns_file=os.path.join(self.test_dir, 'patterns.json'))
+        serial = analyzer.analyze_directory(self.test_dir)
+        parallel = analyzer.analyze_directory(self.test_dir, jobs=2)
+
+        self.assertEqual(serial['files_analyzed'], parallel['files_analyzed'])
+        self.assertEqual(serial['summary'], parallel['summary'])
+        self.assertEqual(serial['summary']['total_files'], 5)
+
+    def test_pattern_learner_jobs(self):
+        """Feature extraction yields the same features in the same order"""
+        serial = UnsupervisedPatternLearner()
+        parallel = UnsupervisedPatternLearner()
+        count = serial.extract_features_from_directory(self.test_dir)
+        self.assertEqual(parallel.extract_features_from_directory(self.test_dir, jobs=2), count)
+        self.assertEqual(serial.features, parallel.features)
+
+
+if __name__ == '__main__':
+    unittest.main()
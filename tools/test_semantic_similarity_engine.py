@@ -10,8 +10,10 @@ import unittest
 import json
 import tempfile
 import os
+import shutil
 from pathlib import Path
 from datetime import datetime
+from unittest.mock import patch
 
 from semantic_similarity_engine import (
     SemanticSimilarityEngine,
@@ -85,10 +87,8 @@ class TestSemanticSimilarityEngine(unittest.TestCase):
     
     def tearDown(self):
         """Clean up test fixtures."""
-        # Remove temporary files
-        if os.path.exists(self.history_path):
-            os.remove(self.history_path)
-        os.rmdir(self.temp_dir)
+        # Remove temporary files (history and its index snapshot)
+        shutil.rmtree(self.temp_dir)
     
     def test_init_empty_engine(self):
         """Test initializing engine with no history."""
@@ -371,6 +371,159 @@ class TestSemanticSimilarityEngine(unittest.TestCase):
         self.assertEqual(matches[0].labels, ["bug", "api", "urgent"])
 
 
+    def test_inverted_index_matches_brute_force(self):
+        """Test that indexed search scores match a full cosine scan."""
+        engine = SemanticSimilarityEngine(self.history_path)
+        
+        vocabulary = ["api", "database", "cache", "timeout", "error",
+                      "workflow", "agent", "test", "coverage", "deploy"]
+        for i in range(30):
+            words = [vocabulary[(i * 7 + j * 3) % len(vocabulary)] for j in range(i % 5 + 2)]
+            engine.add_issue(IssueRecord(
+                issue_number=i,
+                title=" ".join(words),
+                body=" ".join(reversed(words)),
+                labels=[],
+                solution_summary="Resolved",
+                agent_assigned="agent",
+                resolved_at="2024-01-01T00:00:00Z"
+            ))
+        
+        self.assertIn("api", engine.postings)
+        
+        query_vector = engine._calculate_tfidf_vector(engine._tokenize("api timeout error"))
+        expected = sorted(
+            ((engine._cosine_similarity(query_vector, vec), i)
+             for i, vec in enumerate(engine.tfidf_vectors)),
+            key=lambda item: item[0],
+            reverse=True
+        )
+        expected = [(score, i) for score, i in expected if score >= 0.05][:10]
+        
+        matches = engine.find_similar_issues("api timeout error", top_k=10, min_similarity=0.05)
+        
+        self.assertEqual(len(engine.doc_norms), 30)
+        self.assertEqual(len(matches), len(expected))
+        for match, (score, doc_id) in zip(matches, expected):
+            self.assertAlmostEqual(match.similarity_score, score, places=12)
+            self.assertAlmostEqual(
+                engine._cosine_similarity(query_vector, engine.tfidf_vectors[match.issue_number]),
+                score, places=12
+            )
+    
+    def test_zero_threshold_includes_non_overlapping(self):
+        """Test that a zero threshold still returns issues without shared terms."""
+        engine = SemanticSimilarityEngine(self.history_path)
+        for number, title in [(1, "API failure"), (2, "Database migration")]:
+            engine.add_issue(IssueRecord(
+                issue_number=number,
+                title=title,
+                body="",
+                labels=[],
+                solution_summary="Resolved",
+                agent_assigned="agent",
+                resolved_at="2024-01-01T00:00:00Z"
+            ))
+        
+        matches = engine.find_similar_issues("unrelated words", min_similarity=0.0)
+        self.assertEqual([m.issue_number for m in matches], [1, 2])
+
+
+class TestIndexSnapshot(unittest.TestCase):
+    """Test the persisted index snapshot and incremental maintenance."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.history_path = os.path.join(self.temp_dir, 'issue_history.json')
+        self.index_path = os.path.join(self.temp_dir, 'issue_history.index.json')
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+    
+    def _make_issue(self, number, title, body="", solution="Resolved"):
+        return IssueRecord(
+            issue_number=number,
+            title=title,
+            body=body,
+            labels=[],
+            solution_summary=solution,
+            agent_assigned="agent",
+            resolved_at="2024-01-01T00:00:00Z"
+        )
+    
+    def _populated_engine(self):
+        engine = SemanticSimilarityEngine(self.history_path)
+        engine.add_issue(self._make_issue(1, "API endpoint error", "500 error from users API"))
+        engine.add_issue(self._make_issue(2, "Database timeout", "Slow queries time out"))
+        engine.add_issue(self._make_issue(3, "API rate limit", "Too many API requests"))
+        return engine
+    
+    def test_save_writes_versioned_snapshot(self):
+        """Test that saving history writes a snapshot next to it."""
+        engine = self._populated_engine()
+        engine.save_history()
+        
+        self.assertTrue(os.path.exists(self.index_path))
+        with open(self.index_path) as f:
+            snapshot = json.load(f)
+        self.assertEqual(snapshot['version'], SemanticSimilarityEngine.INDEX_VERSION)
+        self.assertEqual(snapshot['total_documents'], 3)
+        self.assertEqual(snapshot['doc_freq']['api'], 2)
+        self.assertEqual(len(snapshot['doc_norms']), 3)
+    
+    def test_load_snapshot_without_tokenizing(self):
+        """Test that a fresh snapshot is loaded without re-tokenizing history."""
+        engine1 = self._populated_engine()
+        engine1.save_history()
+        expected = engine1.find_similar_issues("API error", min_similarity=0.0)
+        
+        with patch.object(SemanticSimilarityEngine, '_tokenize', side_effect=AssertionError("tokenized")):
+            engine2 = SemanticSimilarityEngine(self.history_path)
+        
+        self.assertEqual(engine2.doc_norms, engine1.doc_norms)
+        matches = engine2.find_similar_issues("API error", min_similarity=0.0)
+        self.assertEqual([m.to_dict() for m in matches], [m.to_dict() for m in expected])
+    
+    def test_stale_snapshot_is_rebuilt(self):
+        """Test that a snapshot for different history contents is ignored."""
+        engine1 = self._populated_engine()
+        engine1.save_history()
+        
+        with open(self.history_path) as f:
+            data = json.load(f)
+        data['issues'] = data['issues'][:2]
+        with open(self.history_path, 'w') as f:
+            json.dump(data, f)
+        
+        engine2 = SemanticSimilarityEngine(self.history_path)
+        self.assertEqual(len(engine2.tf_vectors), 2)
+        self.assertEqual(engine2.doc_freq['api'], 1)
+        
+        # The rebuilt index is written back for the next cold start
+        with open(self.index_path) as f:
+            self.assertEqual(json.load(f)['total_documents'], 2)
+    
+    def test_incremental_add_matches_full_rebuild(self):
+        """Test that incremental add_issue gives the same index as a rebuild."""
+        engine = self._populated_engine()
+        engine.add_issue(self._make_issue(4, "API docs", "Document the API error codes"))
+        results = engine.find_similar_issues("API error codes", min_similarity=0.0)
+        
+        rebuilt = SemanticSimilarityEngine(self.history_path)
+        rebuilt.issue_records = list(engine.issue_records)
+        rebuilt._build_index()
+        
+        self.assertEqual(engine.doc_freq, rebuilt.doc_freq)
+        self.assertEqual(engine.postings, rebuilt.postings)
+        self.assertEqual(engine.doc_norms, rebuilt.doc_norms)
+        self.assertEqual(
+            [m.to_dict() for m in results],
+            [m.to_dict() for m in rebuilt.find_similar_issues("API error codes", min_similarity=0.0)]
+        )
+
+
 class TestSimilarityMatch(unittest.TestCase):
     """Test SimilarityMatch dataclass."""
     
@@ -417,9 +570,7 @@ class TestIntegration(unittest.TestCase):
     
     def tearDown(self):
         """Clean up test fixtures."""
-        if os.path.exists(self.history_path):
-            os.remove(self.history_path)
-        os.rmdir(self.temp_dir)
+        shutil.rmtree(self.temp_dir)
     
     def test_full_workflow(self):
         """Test complete workflow: add, search, save, load."""
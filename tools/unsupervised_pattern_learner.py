@@ -26,6 +26,9 @@ from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional, Any
 import re
 
+from clustering_engine import kmeans
+from repo_scanner import discover_files, scan_files
+
 
 @dataclass
 class CodeFeatures:
@@ -303,37 +306,33 @@ class UnsupervisedPatternLearner:
         
         return complexity
     
-    def extract_features_from_directory(self, directory: str, recursive: bool = True) -> int:
-        """Extract features from all Python files in a directory"""
+    def extract_features_from_directory(self, directory: str, recursive: bool = True,
+                                        jobs: int = 1) -> int:
+        """
+        Extract features from all Python files in a directory.
+        
+        With jobs > 1 files are parsed in a process pool; features are
+        appended in discovery order, so the result does not depend on jobs.
+        """
         count = 0
+        filepaths = discover_files(directory, ('.py',), recursive)
         
-        if recursive:
-            for root, dirs, files in os.walk(directory):
-                # Skip hidden and common ignore directories
-                dirs[:] = [d for d in dirs if not d.startswith('.') and 
-                          d not in ['node_modules', '__pycache__', 'venv', 'dist', 'build']]
-                
-                for file in files:
-                    if file.endswith('.py'):
-                        filepath = os.path.join(root, file)
-                        features = self.extract_features_from_file(filepath)
-                        self.features.extend(features)
-                        count += len(features)
-        else:
-            for file in os.listdir(directory):
-                if file.endswith('.py'):
-                    filepath = os.path.join(directory, file)
-                    features = self.extract_features_from_file(filepath)
-                    self.features.extend(features)
-                    count += len(features)
+        for scanned in scan_files(filepaths, self.extract_features_from_file, jobs):
+            if scanned.error is not None:
+                print(f"Error processing {scanned.path}: {scanned.error}", file=sys.stderr)
+                continue
+            self.features.extend(scanned.value)
+            count += len(scanned.value)
         
         return count
     
-    def discover_patterns(self, n_clusters: int = 10, min_samples: int = 3) -> List[DiscoveredPattern]:
+    def discover_patterns(self, n_clusters: int = 10, min_samples: int = 3,
+                          batch_size: Optional[int] = None) -> List[DiscoveredPattern]:
         """
         Discover patterns using clustering algorithms.
         
-        Uses simple K-means-like clustering (implemented without sklearn for minimal dependencies)
+        Uses the shared k-means engine (NumPy when installed, pure Python otherwise,
+        no sklearn). Pass batch_size to use mini-batch k-means on large codebases.
         """
         if not self.features:
             print("No features extracted. Run extract_features_from_directory first.", file=sys.stderr)
@@ -347,8 +346,8 @@ class UnsupervisedPatternLearner:
         # Normalize vectors (simple min-max scaling)
         vectors = self._normalize_vectors(vectors)
         
-        # Simple K-means clustering
-        clusters, centroids = self._kmeans_clustering(vectors, n_clusters)
+        # K-means clustering
+        clusters, centroids = self._kmeans_clustering(vectors, n_clusters, batch_size=batch_size)
         
         # Create pattern objects
         patterns = []
@@ -397,67 +396,10 @@ class UnsupervisedPatternLearner:
         
         return normalized
     
-    def _kmeans_clustering(self, vectors: List[List[float]], k: int, max_iterations: int = 100) -> Tuple[List[int], List[List[float]]]:
-        """Simple K-means clustering implementation"""
-        import random
-        
-        if not vectors or k <= 0:
-            return [], []
-        
-        n = len(vectors)
-        n_features = len(vectors[0])
-        
-        # Initialize centroids using k-means++ for better initialization
-        centroids = []
-        # First centroid is random
-        centroids.append(vectors[random.randint(0, n-1)][:])
-        
-        # Select remaining centroids
-        for _ in range(k - 1):
-            distances = []
-            for vector in vectors:
-                # Distance to nearest existing centroid
-                min_dist = min(self._euclidean_distance(vector, c) for c in centroids)
-                distances.append(min_dist)
-            
-            # Choose next centroid with probability proportional to distance squared
-            total = sum(d**2 for d in distances)
-            if total == 0:
-                centroids.append(vectors[random.randint(0, n-1)][:])
-            else:
-                r = random.uniform(0, total)
-                cumsum = 0
-                for i, d in enumerate(distances):
-                    cumsum += d**2
-                    if cumsum >= r:
-                        centroids.append(vectors[i][:])
-                        break
-        
-        clusters = [0] * n
-        
-        for iteration in range(max_iterations):
-            # Assign points to nearest centroid
-            new_clusters = []
-            for vector in vectors:
-                distances = [self._euclidean_distance(vector, centroid) for centroid in centroids]
-                new_clusters.append(distances.index(min(distances)))
-            
-            # Check for convergence
-            if new_clusters == clusters:
-                break
-            
-            clusters = new_clusters
-            
-            # Update centroids
-            for cluster_id in range(k):
-                cluster_points = [vectors[i] for i, c in enumerate(clusters) if c == cluster_id]
-                if cluster_points:
-                    centroids[cluster_id] = [
-                        sum(p[i] for p in cluster_points) / len(cluster_points)
-                        for i in range(n_features)
-                    ]
-        
-        return clusters, centroids
+    def _kmeans_clustering(self, vectors: List[List[float]], k: int, max_iterations: int = 100,
+                           batch_size: Optional[int] = None) -> Tuple[List[int], List[List[float]]]:
+        """K-means clustering with k-means++ seeding via the shared clustering engine"""
+        return kmeans(vectors, k, max_iterations=max_iterations, batch_size=batch_size)
     
     def _euclidean_distance(self, v1: List[float], v2: List[float]) -> float:
         """Calculate Euclidean distance between two vectors"""
@@ -768,11 +710,15 @@ Examples:
                        help='Number of clusters for pattern discovery (default: 10)')
     parser.add_argument('--min-samples', type=int, default=3,
                        help='Minimum samples per pattern (default: 3)')
+    parser.add_argument('--batch-size', type=int,
+                       help='Use mini-batch k-means with this batch size (large codebases)')
     parser.add_argument('-o', '--output', help='Output file for report')
     parser.add_argument('--format', choices=['markdown', 'json'], default='markdown',
                        help='Output format (default: markdown)')
     parser.add_argument('--save-patterns', action='store_true',
                        help='Save discovered patterns to JSON file')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                       help='Worker processes for feature extraction (default: 1, 0 = all CPUs)')
     
     args = parser.parse_args()
     
@@ -781,7 +727,7 @@ Examples:
     
     # Extract features
     print(f"Extracting features from: {args.directory}")
-    feature_count = learner.extract_features_from_directory(args.directory)
+    feature_count = learner.extract_features_from_directory(args.directory, jobs=args.jobs)
     print(f"Extracted {feature_count} features from code")
     
     if feature_count == 0:
@@ -790,7 +736,8 @@ Examples:
     
     # Discover patterns
     print(f"\nDiscovering patterns with {args.clusters} clusters...")
-    patterns = learner.discover_patterns(n_clusters=args.clusters, min_samples=args.min_samples)
+    patterns = learner.discover_patterns(n_clusters=args.clusters, min_samples=args.min_samples,
+                                         batch_size=args.batch_size)
     print(f"Discovered {len(patterns)} patterns")
     
     # Generate report
@@ -5,16 +5,25 @@ Handles agent movement and navigation through inspiration regions.
 """
 
 import random
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
+from spatial_index import RegionIndex, SpatialIndex, coordinates, plan_route
 
-def build_navigation_path(inspiration_regions: List[Dict[str, Any]]) -> List[str]:
+
+def build_navigation_path(
+    inspiration_regions: List[Dict[str, Any]],
+    start: Optional[Tuple[float, float]] = None
+) -> List[str]:
     """
     Build a navigation path from inspiration regions.
-    Currently uses simple weight-based ordering.
+    
+    Without a start position, regions are ordered by weight. From a start
+    position, the agent always travels to the nearest remaining region;
+    regions without coordinates follow by weight.
     
     Args:
         inspiration_regions: List of region dicts with region_id, lat, lng, weight
+        start: Optional (lat, lng) the agent sets off from
     
     Returns:
         List of region IDs in navigation order
@@ -29,7 +38,18 @@ def build_navigation_path(inspiration_regions: List[Dict[str, Any]]) -> List[str
         reverse=True
     )
     
-    return [r['region_id'] for r in sorted_regions]
+    if start is None:
+        return [r['region_id'] for r in sorted_regions]
+    
+    stops = []
+    unplaced = []
+    for region in sorted_regions:
+        position = coordinates(region)
+        if position is None:
+            unplaced.append(region['region_id'])
+        else:
+            stops.append((position[0], position[1], region['region_id']))
+    return plan_route(start, stops) + unplaced
 
 
 def move_agent_one_step(agent: Dict[str, Any]) -> Optional[str]:
@@ -67,7 +87,8 @@ def move_agent_one_step(agent: Dict[str, Any]) -> Optional[str]:
 
 def assign_idea_to_agent(
     agent: Dict[str, Any],
-    idea: Dict[str, Any]
+    idea: Dict[str, Any],
+    regions: Optional[RegionIndex] = None
 ) -> None:
     """
     Assign an idea to an agent and set up navigation path.
@@ -75,20 +96,36 @@ def assign_idea_to_agent(
     Args:
         agent: Agent dict to update
         idea: Idea dict with inspiration_regions
+        regions: Optional index of world regions; when it knows the agent's
+            location, the path is planned from there by distance
     """
     agent['current_idea_id'] = idea.get('id')
     agent['status'] = 'exploring'
     
     # Build navigation path from inspiration regions
     inspiration_regions = idea.get('inspiration_regions', [])
-    path = build_navigation_path(inspiration_regions)
+    start = regions.coordinates(agent.get('location_region_id')) if regions is not None else None
+    path = build_navigation_path(inspiration_regions, start)
     agent['path'] = path
 
 
+def build_idea_index(ideas: List[Dict[str, Any]]) -> SpatialIndex:
+    """Index ideas by the positions of their inspiration regions."""
+    points = []
+    for idea in ideas:
+        for region in idea.get('inspiration_regions', []):
+            position = coordinates(region)
+            if position is not None:
+                points.append((position[0], position[1], idea))
+    return SpatialIndex(points)
+
+
 def select_next_idea_for_agent(
     agent: Dict[str, Any],
     ideas: List[Dict[str, Any]],
-    strategy: str = 'random'
+    strategy: str = 'random',
+    regions: Optional[RegionIndex] = None,
+    idea_index: Optional[SpatialIndex] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Select the next idea for an agent.
@@ -97,6 +134,8 @@ def select_next_idea_for_agent(
         agent: Agent dict
         ideas: List of available ideas
         strategy: Selection strategy ('random', 'nearest', 'most_patterns')
+        regions: Optional index of world regions, to locate the agent for 'nearest'
+        idea_index: Optional build_idea_index(ideas), shared across agents in a tick
     
     Returns:
         Selected idea or None if no ideas available
@@ -117,6 +156,15 @@ def select_next_idea_for_agent(
         if not current_location:
             return random.choice(ideas)
         
+        # Idea with an inspiration region nearest the agent's position
+        position = regions.coordinates(current_location) if regions is not None else None
+        if position is not None:
+            if idea_index is None:
+                idea_index = build_idea_index(ideas)
+            nearest = idea_index.nearest(*position)
+            if nearest:
+                return nearest[0][1]
+        
         # Find idea with current location in inspiration regions
         for idea in ideas:
             for region in idea.get('inspiration_regions', []):
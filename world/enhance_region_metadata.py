@@ -4,12 +4,14 @@ Enhance Region Metadata
 Adds timezone, region type, tech ecosystem, and other metadata to regions.
 """
 
-import json
 import os
+import sys
 from typing import Dict, Any
 
 WORLD_DIR = os.path.dirname(os.path.abspath(__file__))
-WORLD_STATE_FILE = os.path.join(WORLD_DIR, "world_state.json")
+sys.path.insert(0, WORLD_DIR)
+
+from world_state_manager import WORLD_STATE_FILE, load_world_state, save_world_state
 
 # Region metadata database
 REGION_METADATA = {
@@ -216,8 +218,7 @@ def main():
     
     # Load world state
     print(f"\n📖 Loading world state from: {WORLD_STATE_FILE}")
-    with open(WORLD_STATE_FILE, 'r', encoding='utf-8') as f:
-        world_state = json.load(f)
+    world_state = load_world_state()
     
     total_regions = len(world_state.get('regions', []))
     print(f"   Found {total_regions} regions")
@@ -228,8 +229,7 @@ def main():
     
     # Save world state
     print(f"\n💾 Saving enhanced world state...")
-    with open(WORLD_STATE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(world_state, f, indent=2, ensure_ascii=False)
+    save_world_state(world_state)
     
     print(f"\n" + "=" * 70)
     print(f"✅ SUCCESS: Enhanced {enhanced_count}/{total_regions} regions")
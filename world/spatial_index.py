@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Spatial Index
+Nearest-neighbour and radius queries over world regions by lat/lng.
+
+Points are stored as unit vectors in a k-d tree, so distances have no
+date-line or pole special cases: the straight-line (chord) distance
+between two unit vectors orders points exactly like the great-circle
+distance. Points added after the tree was built are kept in a small
+pending list that queries scan directly, until enough accumulate to
+rebuild.
+"""
+
+import bisect
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+# Pending points are folded into the tree once there are this many plus
+# the square root of the tree size
+REBUILD_PENDING = 16
+
+Point = Tuple[float, float, float]
+
+
+def _unit_vector(lat: float, lng: float) -> Point:
+    phi = math.radians(lat)
+    lam = math.radians(lng)
+    cos_phi = math.cos(phi)
+    return (cos_phi * math.cos(lam), cos_phi * math.sin(lam), math.sin(phi))
+
+
+def _chord_to_km(chord: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def _km_to_chord(km: float) -> float:
+    if km >= math.pi * EARTH_RADIUS_KM:
+        return 2.0
+    return 2 * math.sin(km / (2 * EARTH_RADIUS_KM))
+
+
+def distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two lat/lng positions"""
+    return _chord_to_km(math.dist(_unit_vector(lat1, lng1), _unit_vector(lat2, lng2)))
+
+
+def coordinates(place: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """(lat, lng) of a region or inspiration region dict, if it has them"""
+    lat, lng = place.get('lat'), place.get('lng')
+    if isinstance(lat, (int, float)) and isinstance(lng, (int, float)):
+        return (float(lat), float(lng))
+    return None
+
+
+class SpatialIndex:
+    """Items at lat/lng positions, for nearest and radius queries"""
+
+    def __init__(self, points: Iterable[Tuple[float, float, Any]] = ()):
+        self._points: List[Point] = []
+        self._items: List[Any] = []
+        # k-d tree over point indexes; children are -1 when absent
+        self._root = -1
+        self._left: List[int] = []
+        self._right: List[int] = []
+        self._axis: List[int] = []
+        self._pending: List[int] = []
+        for lat, lng, item in points:
+            self._append(lat, lng, item)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, lat: float, lng: float, item: Any) -> None:
+        self._append(lat, lng, item)
+        if len(self._pending) > REBUILD_PENDING + math.isqrt(len(self._items)):
+            self._build()
+
+    def _append(self, lat: float, lng: float, item: Any) -> None:
+        self._points.append(_unit_vector(lat, lng))
+        self._items.append(item)
+        self._pending.append(len(self._items) - 1)
+
+    def _build(self) -> None:
+        n = len(self._points)
+        self._left = [-1] * n
+        self._right = [-1] * n
+        self._axis = [0] * n
+        self._root = self._build_range(list(range(n)))
+        self._pending = []
+
+    def _build_range(self, indexes: List[int]) -> int:
+        if not indexes:
+            return -1
+        points = self._points
+        # Split on the axis with the widest spread
+        axis = max(range(3), key=lambda a: max(points[i][a] for i in indexes) - min(points[i][a] for i in indexes))
+        indexes.sort(key=lambda i: points[i][axis])
+        middle = len(indexes) // 2
+        node = indexes[middle]
+        self._axis[node] = axis
+        self._left[node] = self._build_range(indexes[:middle])
+        self._right[node] = self._build_range(indexes[middle + 1:])
+        return node
+
+    def _search(self, lat: float, lng: float, k: Optional[int], radius_km: Optional[float]) -> List[Tuple[float, Any]]:
+        """The k nearest points (all when None) within radius_km (any when None)"""
+        if k is not None and k <= 0:
+            return []
+        query = _unit_vector(lat, lng)
+        limit = _km_to_chord(radius_km) ** 2 if radius_km is not None else math.inf
+        points = self._points
+        # (squared chord, index) of the matches so far
+        found: List[Tuple[float, int]] = []
+
+        def bound() -> float:
+            if k is not None and len(found) >= k:
+                return found[-1][0]
+            return limit
+
+        def consider(index: int) -> None:
+            d2 = sum((a - b) ** 2 for a, b in zip(query, points[index]))
+            if d2 <= bound():
+                bisect.insort(found, (d2, index))
+                if k is not None and len(found) > k:
+                    found.pop()
+
+        def visit(node: int) -> None:
+            if node == -1:
+                return
+            consider(node)
+            diff = query[self._axis[node]] - points[node][self._axis[node]]
+            near, far = (self._left[node], self._right[node]) if diff < 0 else (self._right[node], self._left[node])
+            visit(near)
+            if diff * diff <= bound():
+                visit(far)
+
+        visit(self._root)
+        for index in self._pending:
+            consider(index)
+        return [(_chord_to_km(math.sqrt(d2)), self._items[index]) for d2, index in found]
+
+    def nearest(self, lat: float, lng: float, k: int = 1) -> List[Tuple[float, Any]]:
+        """The k items nearest to a position, as (distance_km, item), nearest first"""
+        return self._search(lat, lng, k, None)
+
+    def within(self, lat: float, lng: float, radius_km: float) -> List[Tuple[float, Any]]:
+        """Items within radius_km of a position, as (distance_km, item), nearest first"""
+        return self._search(lat, lng, None, radius_km)
+
+
+class RegionIndex(SpatialIndex):
+    """World regions (dicts with id, lat and lng) by position and by id"""
+
+    def __init__(self, regions: Iterable[Dict[str, Any]] = (), id_key: str = 'id'):
+        super().__init__()
+        self.id_key = id_key
+        self._by_id: Dict[Any, Dict[str, Any]] = {}
+        for region in regions:
+            self._add_region(region, self._append)
+        self._build()
+
+    def add_region(self, region: Dict[str, Any]) -> bool:
+        """Index a region; returns False if its id is missing or already indexed"""
+        return self._add_region(region, self.add)
+
+    def _add_region(self, region: Dict[str, Any], add) -> bool:
+        region_id = region.get(self.id_key)
+        if region_id is None or region_id in self._by_id:
+            return False
+        self._by_id[region_id] = region
+        position = coordinates(region)
+        if position is not None:
+            add(position[0], position[1], region)
+        return True
+
+    def get(self, region_id: Any) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(region_id)
+
+    def coordinates(self, region_id: Any) -> Optional[Tuple[float, float]]:
+        region = self._by_id.get(region_id)
+        return coordinates(region) if region is not None else None
+
+    def nearest_region(self, lat: float, lng: float, exclude: Optional[Any] = None) -> Optional[Dict[str, Any]]:
+        """Region nearest to a position, other than the one with id `exclude`"""
+        for _, region in self.nearest(lat, lng, k=2):
+            if region.get(self.id_key) != exclude:
+                return region
+        return None
+
+    def regions_within(self, lat: float, lng: float, radius_km: float) -> List[Dict[str, Any]]:
+        """Regions within radius_km of a position, nearest first"""
+        return [region for _, region in self.within(lat, lng, radius_km)]
+
+
+def plan_route(start: Tuple[float, float], stops: List[Tuple[float, float, Any]]) -> List[Any]:
+    """
+    Order stops (lat, lng, item) from a start position, always travelling to
+    the nearest remaining stop next. Returns the items in visiting order.
+    """
+    remaining = list(stops)
+    route = []
+    lat, lng = start
+    while remaining:
+        i = min(range(len(remaining)), key=lambda i: distance_km(lat, lng, remaining[i][0], remaining[i][1]))
+        lat, lng, item = remaining.pop(i)
+        route.append(item)
+    return route
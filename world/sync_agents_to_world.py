@@ -13,7 +13,11 @@ from typing import Dict, List, Any
 
 # Path constants
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-WORLD_STATE_PATH = os.path.join(SCRIPT_DIR, 'world_state.json')
+sys.path.insert(0, SCRIPT_DIR)
+
+from world_state_manager import (
+    WORLD_STATE_FILE as WORLD_STATE_PATH, get_region_by_id, load_world_state, save_world_state
+)
 
 # Add tools directory to path for RegistryManager
 TOOLS_DIR = os.path.join(SCRIPT_DIR, '..', 'tools')
@@ -83,9 +87,9 @@ def ensure_charlotte_region_exists(world_state: Dict[str, Any]) -> None:
     regions = world_state.get('regions', [])
     
     # Check if Charlotte already exists
-    charlotte_exists = any(r.get('id') == CHARLOTTE_NC['id'] for r in regions)
+    charlotte = get_region_by_id(world_state, CHARLOTTE_NC['id'])
     
-    if not charlotte_exists:
+    if not charlotte:
         # Add Charlotte as home base region
         charlotte_region = {
             "id": CHARLOTTE_NC["id"],
@@ -101,12 +105,9 @@ def ensure_charlotte_region_exists(world_state: Dict[str, Any]) -> None:
         print(f"✅ Added Charlotte, NC as home base region")
     else:
         # Update existing Charlotte to mark as home base
-        for region in regions:
-            if region.get('id') == CHARLOTTE_NC['id']:
-                region['is_home_base'] = True
-                region['description'] = "Home base for all Chained autonomous agents"
-                print(f"✅ Updated Charlotte, NC as home base")
-                break
+        charlotte['is_home_base'] = True
+        charlotte['description'] = "Home base for all Chained autonomous agents"
+        print(f"✅ Updated Charlotte, NC as home base")
 
 
 def sync_agents_to_world() -> Dict[str, Any]:
@@ -138,7 +139,7 @@ def sync_agents_to_world() -> Dict[str, Any]:
     
     # Load world state
     print(f"\n🌍 Loading world state from: {WORLD_STATE_PATH}")
-    world_state = load_json_file(WORLD_STATE_PATH)
+    world_state = load_world_state()
     current_world_agents = world_state.get('agents', [])
     print(f"   Current agents in world: {len(current_world_agents)}")
     
@@ -179,7 +180,7 @@ def sync_agents_to_world() -> Dict[str, Any]:
     
     # Save updated world state
     print(f"\n💾 Saving updated world state...")
-    save_json_file(WORLD_STATE_PATH, world_state)
+    save_world_state(world_state)
     print(f"   ✓ Saved to: {WORLD_STATE_PATH}")
     
     summary = {
@@ -19,7 +19,10 @@ from pathlib import Path
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 LEARNINGS_DIR = os.path.join(SCRIPT_DIR, '..', 'learnings')
 KNOWLEDGE_PATH = os.path.join(SCRIPT_DIR, 'knowledge.json')
-WORLD_STATE_PATH = os.path.join(SCRIPT_DIR, 'world_state.json')
+sys.path.insert(0, SCRIPT_DIR)
+
+from world_state_manager import add_or_update_region, load_world_state, save_world_state
+from spatial_index import RegionIndex
 
 # Technology to company/location mapping
 TECH_COMPANY_MAP = {
@@ -238,18 +241,17 @@ def update_world_state_regions(world_state: Dict[str, Any], ideas: List[Dict[str
                 region_idea_counts[region_id] = region_idea_counts.get(region_id, 0) + 1
     
     # Update world state regions
-    regions = world_state.get('regions', [])
-    for region in regions:
-        region_id = region.get('id')
-        if region_id in region_idea_counts:
-            region['idea_count'] = region_idea_counts[region_id]
+    regions = RegionIndex(world_state.setdefault('regions', []))
+    for region_id, idea_count in region_idea_counts.items():
+        region = regions.get(region_id)
+        if region:
+            region['idea_count'] = idea_count
     
     # Add new regions from ideas if needed
-    existing_region_ids = {r.get('id') for r in regions}
     for idea in ideas:
         for insp_region in idea.get('inspiration_regions', []):
             region_id = insp_region.get('region_id')
-            if region_id and region_id not in existing_region_ids:
+            if region_id and not regions.get(region_id):
                 # Extract city and country from region_id (format: "US:San Francisco")
                 parts = region_id.split(':', 1)
                 if len(parts) == 2:
@@ -261,11 +263,9 @@ def update_world_state_regions(world_state: Dict[str, Any], ideas: List[Dict[str
                         'lng': insp_region.get('lng'),
                         'idea_count': region_idea_counts.get(region_id, 0)
                     }
-                    regions.append(new_region)
-                    existing_region_ids.add(region_id)
+                    add_or_update_region(world_state, new_region)
+                    regions.add_region(new_region)
                     print(f"   ✓ Added new region: {city} ({region_id})")
-    
-    world_state['regions'] = regions
 
 
 def generate_idea_content_hash(idea: Dict[str, Any]) -> str:
@@ -463,7 +463,7 @@ def sync_learnings_to_ideas(max_ideas: int = 10, enable_deep_discovery: bool = T
     
     # Load and update world state
     print(f"\n🌍 Updating world state regions...")
-    world_state = load_json_file(WORLD_STATE_PATH)
+    world_state = load_world_state()
     update_world_state_regions(world_state, all_ideas)
     
     # Update metrics
@@ -471,7 +471,7 @@ def sync_learnings_to_ideas(max_ideas: int = 10, enable_deep_discovery: bool = T
     world_state['time'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
     
     # Save world state
-    save_json_file(WORLD_STATE_PATH, world_state)
+    save_world_state(world_state)
     print(f"   ✓ Regions updated")
     
     summary = {
@@ -2,33 +2,345 @@
 """
 World State Manager
 Handles reading and writing the persistent world state for the Chained world model.
+
+The state is persisted as a snapshot (world_state.json) plus an append-only
+journal (world_state.journal.jsonl). Each save appends one line with the
+operations that turn the previously persisted state into the new one, so
+moving a few agents writes a few hundred bytes instead of the whole world.
+The journal is folded into the snapshot once it grows past
+JOURNAL_COMPACT_BYTES, or by compact_world_state() (run
+`python world/world_state_manager.py --compact` before reading
+world_state.json directly). The journal is local to a checkout and not
+committed; workflows compact after saving so world_state.json in git is
+always complete.
 """
 
+import copy
+import hashlib
 import json
 import os
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 WORLD_DIR = os.path.dirname(os.path.abspath(__file__))
 WORLD_STATE_FILE = os.path.join(WORLD_DIR, "world_state.json")
+WORLD_JOURNAL_FILE = os.path.join(WORLD_DIR, "world_state.journal.jsonl")
+
+# Journal size at which save_world_state rewrites the snapshot
+JOURNAL_COMPACT_BYTES = 256 * 1024
+# Lists of dicts keyed by 'id' are diffed entity by entity
+ID_KEY = 'id'
+
+# Last persisted state per snapshot path: snapshot stat, journal size,
+# snapshot hash, whether the journal extends that snapshot, and the state
+_persisted: Dict[str, Tuple[Tuple[int, int], int, Optional[str], bool, Dict[str, Any]]] = {}
+
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return (0, -1)
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _remember(state: Dict[str, Any], snapshot_hash: Optional[str], journal_valid: bool) -> None:
+    """Record the state now on disk, so the next save only diffs against it"""
+    _persisted[WORLD_STATE_FILE] = (
+        _file_signature(WORLD_STATE_FILE),
+        _file_size(WORLD_JOURNAL_FILE),
+        snapshot_hash,
+        journal_valid,
+        copy.deepcopy(dict(state)),
+    )
+
+
+def _persisted_state() -> Tuple[Optional[str], bool, Dict[str, Any]]:
+    """
+    (snapshot hash, journal valid, state) on disk, from memory when no
+    other writer touched the files since this process last did
+    """
+    cached = _persisted.get(WORLD_STATE_FILE)
+    if (cached is None or cached[0] != _file_signature(WORLD_STATE_FILE)
+            or cached[1] != _file_size(WORLD_JOURNAL_FILE)):
+        load_world_state()
+        cached = _persisted[WORLD_STATE_FILE]
+    return cached[2], cached[3], cached[4]
+
+
+# === Journal operations ===
+
+def _is_keyed(items: List[Any]) -> bool:
+    """True for lists of dicts with distinct ids (agents, regions, ...)"""
+    ids = [item.get(ID_KEY) if isinstance(item, dict) else None for item in items]
+    return None not in ids and len(set(ids)) == len(ids)
+
+
+def _diff(old: Any, new: Any, path: List[Any], ops: List[Dict[str, Any]]) -> None:
+    """
+    Append the operations that turn `old` into `new` to `ops`.
+    
+    Path elements are dict keys, list indexes, or {'id': ...} for an
+    entity of a keyed list. Keyed lists are diffed per entity, other
+    lists per position; items past the old end become an append.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'del', 'path': path + [key]})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({'op': 'set', 'path': path + [key], 'value': value})
+            elif old[key] != value:
+                _diff(old[key], value, path + [key], ops)
+        return
+    
+    if isinstance(old, list) and isinstance(new, list) and path:
+        if old and new and _is_keyed(old) and _is_keyed(new):
+            new_ids = [item[ID_KEY] for item in new]
+            kept = set(new_ids)
+            old_by_id = {item[ID_KEY]: item for item in old}
+            survivors = [item[ID_KEY] for item in old if item[ID_KEY] in kept]
+            added = [item for item in new if item[ID_KEY] not in old_by_id]
+            # Entities may be removed or appended, but not reordered
+            if survivors + [item[ID_KEY] for item in added] == new_ids:
+                for item in old:
+                    if item[ID_KEY] not in kept:
+                        ops.append({'op': 'del', 'path': path + [{ID_KEY: item[ID_KEY]}]})
+                for item in new:
+                    previous = old_by_id.get(item[ID_KEY])
+                    if previous is not None and previous != item:
+                        _diff(previous, item, path + [{ID_KEY: item[ID_KEY]}], ops)
+                if added:
+                    ops.append({'op': 'append', 'path': path, 'values': added})
+                return
+        # Otherwise items are matched by position, as long as the list
+        # did not shrink
+        if len(new) >= len(old):
+            for i, (previous, item) in enumerate(zip(old, new)):
+                if previous != item:
+                    _diff(previous, item, path + [i], ops)
+            if len(new) > len(old):
+                ops.append({'op': 'append', 'path': path, 'values': new[len(old):]})
+            return
+    
+    ops.append({'op': 'set', 'path': path, 'value': new})
+
+
+def _child_index(container: Any, element: Any) -> Any:
+    """Index or key of a path element within its container"""
+    if isinstance(element, dict):
+        for i, item in enumerate(container):
+            if isinstance(item, dict) and item.get(ID_KEY) == element[ID_KEY]:
+                return i
+        raise KeyError(element[ID_KEY])
+    return element
+
+
+def _apply(state: Dict[str, Any], op: Dict[str, Any]) -> None:
+    """Apply one journal operation in place."""
+    *parents, last = op['path']
+    target = state
+    for element in parents:
+        target = target[_child_index(target, element)]
+    
+    if op['op'] == 'append':
+        target[_child_index(target, last)].extend(op['values'])
+    elif op['op'] == 'set':
+        if isinstance(last, dict):
+            target[_child_index(target, last)] = op['value']
+        else:
+            target[last] = op['value']
+    elif op['op'] == 'del':
+        del target[_child_index(target, last)]
+    else:
+        raise ValueError(f"Unknown world state operation: {op['op']}")
+
+
+def _snapshot_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+# === Indexed state ===
+
+class WorldState(dict):
+    """
+    The world state dict, with id -> object indexes for agents and regions.
+    
+    Serializes exactly like the plain dict it wraps. Indexes are built on
+    first lookup and rebuilt when a list is replaced or changes length or
+    last item, or when a hit has moved or no longer carries the looked-up
+    value. Misses are answered from the index without a scan, so after
+    changing an item's id (or another looked-up field) in place, or
+    replacing an item in the middle of a list, call reindex() before
+    looking up the new value.
+    """
+    
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # (collection, field) -> (list, length, last item, value -> (position, item))
+        self._indexes: Dict[Tuple[str, str], Tuple[List[Any], int, Any, Dict[Any, Tuple[int, Any]]]] = {}
+    
+    def _index(self, collection: str, field: str) -> Dict[Any, Tuple[int, Any]]:
+        items = self.get(collection)
+        if not isinstance(items, list):
+            return {}
+        last = items[-1] if items else None
+        cached = self._indexes.get((collection, field))
+        if cached is None or cached[0] is not items or cached[1] != len(items) or cached[2] is not last:
+            index: Dict[Any, Tuple[int, Any]] = {}
+            for position, item in enumerate(items):
+                if isinstance(item, dict):
+                    # First match wins, like a linear scan
+                    index.setdefault(item.get(field), (position, item))
+            cached = (items, len(items), last, index)
+            self._indexes[(collection, field)] = cached
+        return cached[3]
+    
+    def find(self, collection: str, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        """First item of `collection` whose `field` equals `value`"""
+        hit = self._index(collection, field).get(value)
+        if hit is None:
+            return None
+        position, item = hit
+        if self[collection][position] is not item or item.get(field) != value:
+            # Moved or edited in place since it was indexed
+            del self._indexes[(collection, field)]
+            hit = self._index(collection, field).get(value)
+        return hit[1] if hit else None
+    
+    def append(self, collection: str, item: Dict[str, Any]) -> None:
+        """Append an item to `collection`, keeping its indexes current"""
+        items = self.setdefault(collection, [])
+        # Bring the existing indexes up to date, then extend them
+        fields = [field for name, field in self._indexes if name == collection]
+        indexes = {field: self._index(collection, field) for field in fields}
+        items.append(item)
+        for field, index in indexes.items():
+            index.setdefault(item.get(field), (len(items) - 1, item))
+            self._indexes[(collection, field)] = (items, len(items), item, index)
+    
+    def reindex(self) -> None:
+        """Drop every index; needed after editing looked-up fields in place"""
+        self._indexes.clear()
+    
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'WorldState':
+        return WorldState(copy.deepcopy(dict(self), memo))
+
+
+def _find(state: Dict[str, Any], collection: str, field: str, value: Any) -> Optional[Dict[str, Any]]:
+    """Indexed lookup for WorldState, linear scan for plain dicts"""
+    if isinstance(state, WorldState):
+        return state.find(collection, field, value)
+    for item in state.get(collection, []):
+        if item.get(field) == value:
+            return item
+    return None
+
+
+def _find_agent(state: Dict[str, Any], agent_id: str) -> Optional[Dict[str, Any]]:
+    """Agent by ID, or else by specialization"""
+    return _find(state, 'agents', 'id', agent_id) or _find(state, 'agents', 'specialization', agent_id)
 
 
+# === Persistence ===
+
 def load_world_state() -> Dict[str, Any]:
-    """Load the current world state from disk."""
+    """Load the current world state from disk (snapshot plus journal)."""
     if not os.path.exists(WORLD_STATE_FILE):
-        return _create_default_world_state()
-    
-    with open(WORLD_STATE_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+        state = _create_default_world_state()
+        snapshot_hash = None
+    else:
+        with open(WORLD_STATE_FILE, 'rb') as f:
+            data = f.read()
+        state = json.loads(data.decode('utf-8'))
+        snapshot_hash = _snapshot_hash(data)
+    
+    # The journal header names the snapshot it extends; a journal for any
+    # other snapshot was already compacted into it (or overwritten)
+    journal_valid = False
+    if snapshot_hash is not None and os.path.exists(WORLD_JOURNAL_FILE):
+        with open(WORLD_JOURNAL_FILE, 'r', encoding='utf-8') as f:
+            lines = f.read().split('\n')
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            header = {}
+        if header.get('snapshot') == snapshot_hash:
+            journal_valid = True
+            for line in lines[1:]:
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A save interrupted mid-write; it never completed
+                    break
+                for op in entry['ops']:
+                    _apply(state, op)
+    
+    state = WorldState(state)
+    _remember(state, snapshot_hash, journal_valid)
+    return state
 
 
 def save_world_state(state: Dict[str, Any]) -> None:
-    """Save the world state to disk."""
+    """Save the world state to disk, appending only what changed to the journal."""
     # Update timestamp
     state['time'] = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
     
-    with open(WORLD_STATE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(state, f, indent=2, ensure_ascii=False)
+    if not os.path.exists(WORLD_STATE_FILE):
+        compact_world_state(state)
+        return
+    
+    snapshot_hash, journal_valid, persisted = _persisted_state()
+    ops: List[Dict[str, Any]] = []
+    _diff(persisted, state, [], ops)
+    if not ops:
+        return
+    
+    # One line per save, so an interrupted write drops the whole save
+    line = json.dumps({'tick': state.get('tick'), 'ops': ops}, ensure_ascii=False) + '\n'
+    if journal_valid:
+        with open(WORLD_JOURNAL_FILE, 'a', encoding='utf-8') as f:
+            f.write(line)
+    else:
+        with open(WORLD_JOURNAL_FILE, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'snapshot': snapshot_hash}) + '\n' + line)
+    
+    if _file_size(WORLD_JOURNAL_FILE) > JOURNAL_COMPACT_BYTES:
+        compact_world_state(state)
+    else:
+        _remember(state, snapshot_hash, True)
+
+
+def compact_world_state(state: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Write the full state as the new snapshot and drop the journal.
+    
+    Args:
+        state: State to write; defaults to the state on disk
+    """
+    if state is None:
+        state = load_world_state()
+    
+    data = json.dumps(state, indent=2, ensure_ascii=False).encode('utf-8')
+    tmp_file = WORLD_STATE_FILE + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_file, WORLD_STATE_FILE)
+    # A crash here leaves a journal whose header no longer matches the
+    # snapshot, so it is ignored
+    if os.path.exists(WORLD_JOURNAL_FILE):
+        os.remove(WORLD_JOURNAL_FILE)
+    _remember(state, _snapshot_hash(data), False)
 
 
 def _create_default_world_state() -> Dict[str, Any]:
@@ -49,18 +361,12 @@ def _create_default_world_state() -> Dict[str, Any]:
 
 def get_agent_by_id(state: Dict[str, Any], agent_id: str) -> Optional[Dict[str, Any]]:
     """Get an agent by ID."""
-    for agent in state.get('agents', []):
-        if agent.get('id') == agent_id:
-            return agent
-    return None
+    return _find(state, 'agents', 'id', agent_id)
 
 
 def get_region_by_id(state: Dict[str, Any], region_id: str) -> Optional[Dict[str, Any]]:
     """Get a region by ID."""
-    for region in state.get('regions', []):
-        if region.get('id') == region_id:
-            return region
-    return None
+    return _find(state, 'regions', 'id', region_id)
 
 
 def add_or_update_region(state: Dict[str, Any], region: Dict[str, Any]) -> None:
@@ -71,7 +377,10 @@ def add_or_update_region(state: Dict[str, Any], region: Dict[str, Any]) -> None:
         existing.update(region)
     else:
         # Add new region
-        state['regions'].append(region)
+        if isinstance(state, WorldState):
+            state.append('regions', region)
+        else:
+            state['regions'].append(region)
         state['metrics']['total_regions'] = len(state['regions'])
 
 
@@ -133,14 +442,8 @@ def update_agent_mission(
         True if agent was updated, False if not found
     """
     # Try to find agent by ID first
-    agent = get_agent_by_id(state, agent_id)
-    
-    # If not found by ID, try by specialization
-    if not agent:
-        for a in state.get('agents', []):
-            if a.get('specialization') == agent_id:
-                agent = a
-                break
+    # By ID, or else by specialization
+    agent = _find_agent(state, agent_id)
     
     if not agent:
         return False
@@ -174,13 +477,8 @@ def clear_agent_mission(state: Dict[str, Any], agent_id: str) -> bool:
     Returns:
         True if agent was updated, False if not found
     """
-    agent = get_agent_by_id(state, agent_id)
-    
-    if not agent:
-        for a in state.get('agents', []):
-            if a.get('specialization') == agent_id:
-                agent = a
-                break
+    # By ID, or else by specialization
+    agent = _find_agent(state, agent_id)
     
     if not agent:
         return False
@@ -210,13 +508,8 @@ def add_agent_path_entry(
     Returns:
         True if path was added, False if not found
     """
-    agent = get_agent_by_id(state, agent_id)
-    
-    if not agent:
-        for a in state.get('agents', []):
-            if a.get('specialization') == agent_id:
-                agent = a
-                break
+    # By ID, or else by specialization
+    agent = _find_agent(state, agent_id)
     
     if not agent:
         return False
@@ -256,13 +549,8 @@ def record_agent_arrival(
     Returns:
         True if recorded, False if not found
     """
-    agent = get_agent_by_id(state, agent_id)
-    
-    if not agent:
-        for a in state.get('agents', []):
-            if a.get('specialization') == agent_id:
-                agent = a
-                break
+    # By ID, or else by specialization
+    agent = _find_agent(state, agent_id)
     
     if not agent:
         return False
@@ -316,13 +604,8 @@ def add_agent_discovery(
     Returns:
         True if added, False if not found
     """
-    agent = get_agent_by_id(state, agent_id)
-    
-    if not agent:
-        for a in state.get('agents', []):
-            if a.get('specialization') == agent_id:
-                agent = a
-                break
+    # By ID, or else by specialization
+    agent = _find_agent(state, agent_id)
     
     if not agent:
         return False
@@ -336,6 +619,13 @@ def add_agent_discovery(
 
 
 if __name__ == '__main__':
+    import sys
+    
+    if '--compact' in sys.argv[1:]:
+        compact_world_state()
+        print(f"Compacted world state into {WORLD_STATE_FILE}")
+        sys.exit(0)
+    
     # Test the module
     state = load_world_state()
     print("Current world state:")